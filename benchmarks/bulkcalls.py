@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Compare polling many objects one call at a time with the bulk getters
+#
+# Fleet-wide polling typically runs the same getter over every domain,
+# e.g. [dom.info() for dom in doms]. This times such loops against the
+# libvirt.bulk variant of the same getter, which makes all the calls in
+# C with the GIL released once, optionally spread over worker threads.
+# The same test driver domain is looked up over and over to get that
+# many distinct objects.
+#
+# The results are printed as JSON, e.g. to see what worker threads buy
+# on a remote connection:
+#
+#   python3 benchmarks/bulkcalls.py --workers 8 qemu+ssh://host/system
+#
+
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Tuple  # noqa F401
+
+import libvirt
+
+
+def getters(workers: int) -> List[Tuple[str, Callable[[Any], Any], Callable[[List[Any]], List[Any]]]]:
+    bulk = libvirt.bulk
+    return [
+        ("info", lambda dom: dom.info(),
+         lambda doms: bulk.virDomainGetInfo(doms, workers)),
+        ("state", lambda dom: dom.state(),
+         lambda doms: bulk.virDomainGetState(doms, 0, workers)),
+        ("isActive", lambda dom: dom.isActive(),
+         lambda doms: bulk.virDomainIsActive(doms, workers)),
+        ("maxMemory", lambda dom: dom.maxMemory(),
+         lambda doms: bulk.virDomainGetMaxMemory(doms, workers)),
+    ]
+
+
+def best(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(uri: str, count: int, repeat: int, workers: int) -> List[Dict[str, Any]]:
+    conn = libvirt.open(uri)
+    name = conn.listAllDomains()[0].name()
+    doms = [conn.lookupByName(name) for _ in range(count)]
+
+    results = []
+    for getter, one, many in getters(workers):
+        loop = best(lambda: [one(dom) for dom in doms], repeat)
+        bulk = best(lambda: many(doms), repeat)
+        results.append({
+            "getter": getter,
+            "count": count,
+            "workers": workers,
+            "ns_per_object_loop": 1e9 * loop / count,
+            "ns_per_object_bulk": 1e9 * bulk / count,
+        })
+
+    conn.close()
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Bulk getter benchmark")
+    parser.add_argument("--count", "-n", type=int, default=10000, help="Number of domain objects")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Number of timing runs, the fastest is reported")
+    parser.add_argument("--workers", "-w", type=int, default=0, help="Extra threads of the bulk getters")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON results to this file")
+    parser.add_argument("uri", nargs="?", default="test:///default")
+    args = parser.parse_args()
+
+    report = {
+        "uri": args.uri,
+        "python": sys.version.split()[0],
+        "libvirt": libvirt.getVersion(),
+        "results": run(args.uri, args.count, args.repeat, args.workers),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
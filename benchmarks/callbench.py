@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+# Measure the per call overhead of the C wrappers
+#
+# Every API is called in a tight loop against the test driver, whose
+# implementation does next to no work, so the figures are dominated by
+# the binding itself: argument parsing, releasing and re-acquiring the
+# GIL and building the return value. Both the raw libvirtmod functions
+# and the Python methods wrapping them are measured, the difference
+# between the two being the cost of the generated Python layer.
+#
+# The results are printed as JSON, e.g. to compare a METH_VARARGS build
+# against a METH_FASTCALL one:
+#
+#   python3 benchmarks/callbench.py --number 200000 > before.json
+#
+
+import json
+import sys
+import timeit
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Tuple  # noqa F401
+
+import libvirt
+
+libvirtmod = libvirt.libvirtmod
+
+
+def calls(conn: libvirt.virConnect, dom: libvirt.virDomain) -> List[Tuple[str, Callable[[], Any]]]:
+    o = dom._o
+    c = conn._o
+    uuid = dom.UUIDString()
+    return [
+        # Generated wrappers
+        ("libvirtmod.virDomainGetName", lambda: libvirtmod.virDomainGetName(o)),
+        ("libvirtmod.virDomainGetID", lambda: libvirtmod.virDomainGetID(o)),
+        ("libvirtmod.virDomainIsActive", lambda: libvirtmod.virDomainIsActive(o)),
+        ("libvirtmod.virDomainGetMaxMemory", lambda: libvirtmod.virDomainGetMaxMemory(o)),
+        ("libvirtmod.virConnectGetType", lambda: libvirtmod.virConnectGetType(c)),
+        # Hand written overrides
+        ("libvirtmod.virDomainGetState", lambda: libvirtmod.virDomainGetState(o, 0)),
+        ("libvirtmod.virDomainGetInfo", lambda: libvirtmod.virDomainGetInfo(o)),
+        ("libvirtmod.virDomainGetUUIDString", lambda: libvirtmod.virDomainGetUUIDString(o)),
+        # Through the Python classes
+        ("virDomain.name", dom.name),
+        ("virDomain.ID", dom.ID),
+        ("virDomain.isActive", dom.isActive),
+        ("virDomain.state", dom.state),
+        ("virDomain.info", dom.info),
+        ("virDomain.UUIDString", dom.UUIDString),
+        ("virConnect.lookupByUUIDString", lambda: conn.lookupByUUIDString(uuid)),
+    ]
+
+
+def run(uri: str, number: int, repeat: int, match: str) -> List[Dict[str, Any]]:
+    conn = libvirt.open(uri)
+    dom = conn.listAllDomains()[0]
+
+    results = []
+    for name, func in calls(conn, dom):
+        if match not in name:
+            continue
+        timings = timeit.repeat(func, number=number, repeat=repeat)
+        results.append({
+            "call": name,
+            "number": number,
+            "ns_per_call": 1e9 * min(timings) / number,
+            "ns_per_call_mean": 1e9 * sum(timings) / (number * len(timings)),
+        })
+
+    conn.close()
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description="C wrapper call overhead benchmark")
+    parser.add_argument("--number", "-n", type=int, default=100000, help="Number of calls per timing run")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Number of timing runs, the fastest is reported")
+    parser.add_argument("--match", "-m", default="", help="Only measure calls whose name contains this string")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON results to this file")
+    parser.add_argument("uri", nargs="?", default="test:///default")
+    args = parser.parse_args()
+
+    report = {
+        "uri": args.uri,
+        "python": sys.version.split()[0],
+        "libvirt": libvirt.getVersion(),
+        "results": run(args.uri, args.number, args.repeat, args.match),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
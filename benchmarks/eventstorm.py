@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+#
+# Measure event delivery throughput and latency
+#
+# The main thread drives domain, network and storage pool lifecycle
+# changes against the test driver as fast as it can, while callbacks
+# registered with the *EventRegisterAny() APIs record when each event
+# arrives. With libvirtaio the changes are driven from the thread
+# running the asyncio loop instead, as libvirt may register timers
+# from the thread calling it and the asyncio loop is not thread safe.
+# Every event loop implementation needs a fresh process, as libvirt
+# only allows registering one, so "--loop all" re-runs this script
+# once per implementation and merges the results.
+#
+# The results are printed as JSON, e.g. to compare before and after a
+# change to the C trampolines or the Python dispatchers:
+#
+#   python3 benchmarks/eventstorm.py --loop all --iterations 500 > before.json
+#
+
+import asyncio
+import collections
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple  # noqa F401
+
+import libvirt
+
+LOOPS = ("native", "asyncio", "hybrid", "poll")
+
+DOMAIN_XML = """<domain type='test'>
+  <name>%s</name>
+  <memory>8192</memory>
+  <os><type>hvm</type></os>
+</domain>"""
+
+NETWORK_XML = """<network>
+  <name>storm-net</name>
+  <bridge name='stormbr0'/>
+  <ip address='192.168.199.1' netmask='255.255.255.0'/>
+</network>"""
+
+POOL_XML = """<pool type='dir'>
+  <name>storm-pool</name>
+  <target><path>/storm-pool</path></target>
+</pool>"""
+
+
+def start_loop(name: str) -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Start the event loop implementation @name, returning the asyncio
+    loop if the libvirt calls must be made from its thread
+    """
+    if name == "native":
+        libvirt.startDefaultEventLoopThread()
+    elif name in ("asyncio", "hybrid"):
+        import libvirtaio
+        loop = asyncio.new_event_loop()
+        if name == "asyncio":
+            libvirtaio.virEventRegisterAsyncIOImpl(loop=loop)
+        else:
+            libvirtaio.virEventRegisterAsyncIOHybridImpl(loop=loop)
+        threading.Thread(target=loop.run_forever, name="libvirtEventLoop",
+                         daemon=True).start()
+        return loop
+    elif name == "poll":
+        # Use the pure python poll() loop from the example as is
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "..", "examples", "event-test.py")
+        spec = importlib.util.spec_from_file_location("event_test", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore
+        module.virEventLoopPollStart()
+    else:
+        raise ValueError("unknown event loop %s" % name)
+    return None
+
+
+class Recorder:
+    """
+    Match received events against the time the change causing them
+    was made
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sent = collections.defaultdict(collections.deque)  # type: Dict[Tuple[str, str, int], Deque[float]]
+        self.expected = 0
+        self.unmatched = 0
+        self.latencies = []  # type: List[float]
+        self.last = 0.0
+        self.start = 0.0
+        self.generated = 0.0
+        self.generating = True
+        self.done = threading.Event()
+
+    def expect(self, kind: str, name: str, event: int) -> None:
+        with self.lock:
+            self.sent[(kind, name, event)].append(time.perf_counter())
+            self.expected += 1
+
+    def receive(self, kind: str, name: str, event: int) -> None:
+        now = time.perf_counter()
+        with self.lock:
+            self.last = now
+            try:
+                self.latencies.append(now - self.sent[(kind, name, event)].popleft())
+            except IndexError:
+                # e.g. the DEFINED events from setting up the storm
+                self.unmatched += 1
+            if not self.generating and len(self.latencies) >= self.expected:
+                self.done.set()
+
+    def finish(self) -> None:
+        with self.lock:
+            self.generating = False
+            if len(self.latencies) >= self.expected:
+                self.done.set()
+
+    def domainLifecycle(self, conn: libvirt.virConnect, dom: libvirt.virDomain, event: int, detail: int, opaque: Any) -> None:
+        self.receive("domain", dom.name(), event)
+
+    def networkLifecycle(self, conn: libvirt.virConnect, net: libvirt.virNetwork, event: int, detail: int, opaque: Any) -> None:
+        self.receive("network", net.name(), event)
+
+    def poolLifecycle(self, conn: libvirt.virConnect, pool: libvirt.virStoragePool, event: int, detail: int, opaque: Any) -> None:
+        self.receive("pool", pool.name(), event)
+
+
+def storm(conn: libvirt.virConnect, rec: Recorder, iterations: int, domains: int) -> Iterator[float]:
+    """
+    Make the changes, yielding after each one for how long the caller
+    should let the event loop run
+    """
+    doms = [conn.defineXML(DOMAIN_XML % ("storm-%d" % i)) for i in range(domains)]
+    net = conn.networkDefineXML(NETWORK_XML)
+    pool = conn.storagePoolDefineXML(POOL_XML)
+
+    try:
+        for i in range(iterations):
+            for dom in doms:
+                name = dom.name()
+                for op, event in ((dom.create, libvirt.VIR_DOMAIN_EVENT_STARTED),
+                                  (dom.suspend, libvirt.VIR_DOMAIN_EVENT_SUSPENDED),
+                                  (dom.resume, libvirt.VIR_DOMAIN_EVENT_RESUMED),
+                                  (dom.destroy, libvirt.VIR_DOMAIN_EVENT_STOPPED)):
+                    rec.expect("domain", name, event)
+                    op()
+                    yield 0
+
+            rec.expect("domain", "storm-scratch", libvirt.VIR_DOMAIN_EVENT_DEFINED)
+            scratch = conn.defineXML(DOMAIN_XML % "storm-scratch")
+            yield 0
+            rec.expect("domain", "storm-scratch", libvirt.VIR_DOMAIN_EVENT_UNDEFINED)
+            scratch.undefine()
+            yield 0
+
+            rec.expect("network", "storm-net", libvirt.VIR_NETWORK_EVENT_STARTED)
+            net.create()
+            yield 0
+            rec.expect("network", "storm-net", libvirt.VIR_NETWORK_EVENT_STOPPED)
+            net.destroy()
+            yield 0
+
+            rec.expect("pool", "storm-pool", libvirt.VIR_STORAGE_POOL_EVENT_STARTED)
+            pool.create()
+            yield 0
+            rec.expect("pool", "storm-pool", libvirt.VIR_STORAGE_POOL_EVENT_STOPPED)
+            pool.destroy()
+            yield 0
+    finally:
+        for dom in doms:
+            dom.undefine()
+        net.undefine()
+        pool.undefine()
+
+
+def measure(uri: str, rec: Recorder, iterations: int, domains: int) -> Iterator[float]:
+    """
+    Run the storm over a new connection and wait for its events, as
+    storm() yielding to let the event loop run
+    """
+    conn = libvirt.open(uri)
+    callbacks = [
+        conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, rec.domainLifecycle, None),
+        conn.networkEventRegisterAny(None, libvirt.VIR_NETWORK_EVENT_ID_LIFECYCLE, rec.networkLifecycle, None),
+        conn.storagePoolEventRegisterAny(None, libvirt.VIR_STORAGE_POOL_EVENT_ID_LIFECYCLE, rec.poolLifecycle, None),
+    ]
+
+    rec.start = time.perf_counter()
+    yield from storm(conn, rec, iterations, domains)
+    rec.generated = time.perf_counter()
+    rec.finish()
+
+    deadline = time.monotonic() + 60
+    while not rec.done.is_set() and time.monotonic() < deadline:
+        yield 0.01
+
+    conn.domainEventDeregisterAny(callbacks[0])
+    conn.networkEventDeregisterAny(callbacks[1])
+    conn.storagePoolEventDeregisterAny(callbacks[2])
+    conn.close()
+
+
+async def measure_async(uri: str, rec: Recorder, iterations: int, domains: int) -> None:
+    for delay in measure(uri, rec, iterations, domains):
+        await asyncio.sleep(delay)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+
+def run(loop: str, uri: str, iterations: int, domains: int, stats: bool) -> Dict[str, Any]:
+    aioloop = start_loop(loop)
+    if stats:
+        libvirt.enableEventStats()
+
+    rec = Recorder()
+    if aioloop is None:
+        for delay in measure(uri, rec, iterations, domains):
+            if delay:
+                time.sleep(delay)
+    else:
+        asyncio.run_coroutine_threadsafe(
+            measure_async(uri, rec, iterations, domains), aioloop).result()
+    start = rec.start
+    generated = rec.generated
+    complete = rec.done.is_set()
+
+    elapsed = (rec.last or time.perf_counter()) - start
+    latencies = sorted(rec.latencies)
+    result = {
+        "loop": loop,
+        "iterations": iterations,
+        "domains": domains,
+        "complete": complete,
+        "events_expected": rec.expected,
+        "events_received": len(rec.latencies),
+        "events_unmatched": rec.unmatched,
+        "generate_seconds": generated - start,
+        "elapsed_seconds": elapsed,
+        "events_per_second": len(rec.latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": 1000 * percentile(latencies, 50),
+            "p90": 1000 * percentile(latencies, 90),
+            "p99": 1000 * percentile(latencies, 99),
+            "max": 1000 * (latencies[-1] if latencies else 0.0),
+        },
+    }  # type: Dict[str, Any]
+    if stats:
+        result["event_stats"] = libvirt.getEventStats()
+    return result
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Event storm throughput benchmark")
+    parser.add_argument("--loop", "-l", choices=LOOPS + ("all",), default="all", help="Event loop implementation to measure")
+    parser.add_argument("--iterations", "-n", type=int, default=200, help="Number of storm rounds")
+    parser.add_argument("--domains", type=int, default=10, help="Number of domains cycled per round")
+    parser.add_argument("--stats", action="store_true", help="Include libvirt.getEventStats() in the results")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON results to this file")
+    parser.add_argument("uri", nargs="?", default="test:///default")
+    args = parser.parse_args()
+
+    results = []
+    if args.loop == "all":
+        for loop in LOOPS:
+            cmd = [sys.executable, os.path.abspath(__file__),
+                   "--loop", loop,
+                   "--iterations", str(args.iterations),
+                   "--domains", str(args.domains),
+                   args.uri]
+            if args.stats:
+                cmd.append("--stats")
+            out = subprocess.check_output(cmd, universal_newlines=True)
+            results.extend(json.loads(out)["results"])
+    else:
+        results.append(run(args.loop, args.uri, args.iterations, args.domains, args.stats))
+
+    report = {
+        "uri": args.uri,
+        "python": sys.version.split()[0],
+        "libvirt": libvirt.getVersion(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# Measure the cost of importing the libvirt module
+#
+# Every run imports the module in a fresh interpreter started with
+# "python -X importtime", whose report gives the time spent in libvirt
+# itself and in the modules it pulls in. The child also reports the wall
+# clock time of the import and the growth of its maximum resident set
+# size, then touches a constant and a rarely used class, which is where
+# the lazy module layout (LIBVIRT_PYTHON_LAZY=1 at build time) pays back
+# part of what it saved.
+#
+# The results are printed as JSON, e.g. to compare the default and the
+# lazy layouts:
+#
+#   python3 benchmarks/importtime.py --runs 20 > eager.json
+#
+
+import json
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+from typing import Any, Dict, List  # noqa F401
+
+CHILD = """
+import json, resource, sys, time
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+import libvirt
+imported = time.perf_counter()
+libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE
+libvirt.VIR_DOMAIN_RUNNING
+libvirt.virDomainCheckpoint
+used = time.perf_counter()
+
+lazy = bool(getattr(libvirt, "_lazyClassSources", None))
+json.dump({
+    "import_us": 1e6 * (imported - start),
+    "first_use_us": 1e6 * (used - imported),
+    "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+    "layout": "lazy" if lazy else "eager",
+}, sys.stdout)
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """
+    Parse the "import time: self [us] | cumulative | imported package"
+    lines written by -X importtime
+    """
+    modules = {}  # type: Dict[str, Dict[str, int]]
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if len(fields) != 3 or not fields[0].isdigit():
+            continue
+        modules[fields[2]] = {"self_us": int(fields[0]),
+                              "cumulative_us": int(fields[1])}
+    return modules
+
+
+def run_once() -> Dict[str, Any]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+    result = json.loads(proc.stdout)
+    modules = parse_importtime(proc.stderr)
+    result["modules"] = {name: times for name, times in modules.items()
+                         if name.startswith("libvirt")}
+    return result
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description="libvirt module import time benchmark")
+    parser.add_argument("--runs", "-n", type=int, default=10, help="Number of interpreters to start")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    modules = {}  # type: Dict[str, Dict[str, Dict[str, float]]]
+    for name in runs[0]["modules"]:
+        modules[name] = {
+            key: summarize([run["modules"][name][key] for run in runs if name in run["modules"]])
+            for key in ("self_us", "cumulative_us")
+        }
+
+    report = {
+        "python": sys.version.split()[0],
+        "layout": runs[0]["layout"],
+        "runs": args.runs,
+        "import_us": summarize([run["import_us"] for run in runs]),
+        "first_use_us": summarize([run["first_use_us"] for run in runs]),
+        "maxrss_kb": summarize([run["maxrss_kb"] for run in runs]),
+        "modules": modules,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
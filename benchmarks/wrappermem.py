@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+#
+# Measure the memory and construction cost of the wrapper objects
+#
+# Applications keeping inventories of domains and storage volumes hold
+# many virDomain and virStorageVol objects. This looks up the same test
+# driver object over and over to get that many distinct C references,
+# then wraps them all, measuring the Python memory the wrappers take on
+# top of the capsules holding the C pointers, and the time spent in the
+# constructors.
+#
+# The results are printed as JSON, e.g. to compare two builds:
+#
+#   python3 benchmarks/wrappermem.py --count 100000 > before.json
+#
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List  # noqa F401
+
+import libvirt
+
+libvirtmod = libvirt.libvirtmod
+
+VOLUME_XML = """<volume>
+  <name>wrappermem.img</name>
+  <capacity>1048576</capacity>
+  <allocation>0</allocation>
+</volume>"""
+
+
+def measure(name: str, count: int, lookup: Callable[[], object], wrap: Callable[[object], object]) -> Dict[str, Any]:
+    capsules = [lookup() for _ in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    wrappers = [wrap(capsule) for capsule in capsules]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list holding the wrappers is not part of their cost
+    allocated -= sys.getsizeof(wrappers)
+
+    sample = wrappers[0]
+    instance = sys.getsizeof(sample)
+    if hasattr(sample, "__dict__"):
+        instance += sys.getsizeof(sample.__dict__)
+
+    result = {
+        "class": name,
+        "count": count,
+        "bytes_per_wrapper": allocated / count,
+        "instance_bytes": instance,
+        "slots": hasattr(type(sample), "__slots__"),
+        "ns_per_construction": 1e9 * elapsed / count,
+    }
+    del wrappers
+    del capsules
+    return result
+
+
+def run(uri: str, count: int) -> List[Dict[str, Any]]:
+    conn = libvirt.open(uri)
+    dom = conn.listAllDomains()[0]
+    pool = conn.listAllStoragePools()[0]
+    if not pool.isActive():
+        pool.create()
+    vol = pool.createXML(VOLUME_XML)
+
+    try:
+        return [
+            measure("virDomain", count,
+                    lambda: libvirtmod.virDomainLookupByName(conn._o, dom.name()),
+                    lambda o: libvirt.virDomain(conn, _obj=o)),
+            measure("virStorageVol", count,
+                    lambda: libvirtmod.virStorageVolLookupByName(pool._o, vol.name()),
+                    lambda o: libvirt.virStorageVol(conn, _obj=o)),
+        ]
+    finally:
+        vol.delete()
+        conn.close()
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Wrapper object memory benchmark")
+    parser.add_argument("--count", "-n", type=int, default=100000, help="Number of wrappers of each class")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON results to this file")
+    parser.add_argument("uri", nargs="?", default="test:///default")
+    args = parser.parse_args()
+
+    report = {
+        "uri": args.uri,
+        "python": sys.version.split()[0],
+        "libvirt": libvirt.getVersion(),
+        "results": run(args.uri, args.count),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -429,11 +429,6 @@ def virEventLoopAIORun(loop) -> None:
     loop.run_forever()
 
 
-def virEventLoopNativeRun() -> None:
-    while True:
-        libvirt.virEventRunDefaultImpl()
-
-
 # Spawn a background thread to run the event loop
 def virEventLoopPollStart() -> None:
     global eventLoopThread
@@ -458,12 +453,7 @@ def virEventLoopAIOStart() -> None:
 
 
 def virEventLoopNativeStart() -> None:
-    global eventLoopThread
-    libvirt.virEventRegisterDefaultImpl()
-    eventLoopThread = threading.Thread(target=virEventLoopNativeRun,
-                                       name="libvirtEventLoop",
-                                       daemon=True)
-    eventLoopThread.start()
+    libvirt.startDefaultEventLoopThread()
 
 
 ##########################################################################
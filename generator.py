@@ -3,6 +3,7 @@
 # generate python wrappers from the XML API description
 #
 
+import io
 import os
 import re
 import sys
@@ -505,6 +506,17 @@ skip_function = {
     'virDomainSnapshotListAllChildren',  # overridden in virDomainSnapshot.py
     'virConnectListAllStoragePools',  # overridden in virConnect.py
     'virStoragePoolListAllVolumes',  # overridden in virStoragePool.py
+    'virStoragePoolListAllVolumesInfo',  # overridden in virStoragePool.py
+    'virDomainLookupByNames',  # overridden in virConnect.py
+    'virDomainLookupByUUIDStrings',  # overridden in virConnect.py
+    'virDomainLookupByIDs',  # overridden in virConnect.py
+    'virNetworkLookupByNames',  # overridden in virConnect.py
+    'virNetworkLookupByUUIDStrings',  # overridden in virConnect.py
+    'virStoragePoolLookupByNames',  # overridden in virConnect.py
+    'virStoragePoolLookupByUUIDStrings',  # overridden in virConnect.py
+    'virStorageVolLookupByNames',  # overridden in virStoragePool.py
+    'virStorageVolLookupByKeys',  # overridden in virConnect.py
+    'virStorageVolLookupByPaths',  # overridden in virConnect.py
     'virConnectListAllNetworks',  # overridden in virConnect.py
     'virNetworkListAllPorts',  # overridden in virConnect.py
     'virConnectListAllInterfaces',  # overridden in virConnect.py
@@ -608,6 +620,31 @@ skip_function = {
 function_skip_python_impl = {
     "virStreamFree",  # Needed in custom virStream __del__, but free shouldn't
                       # be exposed in bindings
+    "virDomainGetXMLDesc",  # overridden in virDomain.py to use the XML cache
+
+    # Implemented in C by the native base types, see native_classes
+    "virConnectGetType",
+    "virConnectGetURI",
+    "virConnectGetHostname",
+    "virConnectIsAlive",
+    "virDomainGetName",
+    "virDomainGetID",
+    "virDomainGetUUID",
+    "virDomainGetUUIDString",
+    "virDomainIsActive",
+    "virDomainIsPersistent",
+    "virDomainGetMaxMemory",
+    "virDomainGetInfo",
+    "virDomainGetState",
+    "virStoragePoolGetName",
+    "virStoragePoolGetUUIDString",
+    "virStoragePoolIsActive",
+    "virStoragePoolIsPersistent",
+    "virStoragePoolGetInfo",
+    "virStorageVolGetName",
+    "virStorageVolGetKey",
+    "virStorageVolGetPath",
+    "virStorageVolGetInfo",
 }
 
 function_skip_index_one = {
@@ -711,6 +748,19 @@ def skip_py_impl(name: str) -> bool:
     return False
 
 
+# Converters used by the METH_FASTCALL wrappers instead of the
+# PyArg_ParseTuple format units, along with the pointer type they fill in.
+fastcall_unwrappers = {
+    'i': ("libvirt_intUnwrap", "int *"),
+    'I': ("libvirt_uintMaskUnwrap", "unsigned int *"),
+    'l': ("libvirt_longUnwrap", "long *"),
+    'L': ("libvirt_longlongUnwrap", "long long *"),
+    'd': ("libvirt_doubleUnwrap", "double *"),
+    'n': ("libvirt_ssizeUnwrap", "Py_ssize_t *"),
+    'z': ("libvirt_constcharPtrUnwrap", "const char **"),
+}  # type: Dict[str, Tuple[str, str]]
+
+
 def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[str], include: IO[str]) -> bool:
     """
     :returns: True if generated, False if skipped
@@ -723,11 +773,12 @@ def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[
     c_call = ""
     format = ""
     format_args = ""
+    fast_args = ""
     c_args = ""
     c_return = ""
     c_convert = ""
     num_bufs = 0
-    for a_name, a_type, a_info in args:
+    for idx, (a_name, a_type, a_info) in enumerate(args):
         # This should be correct
         if a_type[0:6] == "const ":
             a_type = a_type[6:]
@@ -738,12 +789,18 @@ def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[
                 format += f
             if t:
                 format_args += ", &pyobj_%s" % (a_name)
+                fast_args += "    pyobj_%s = args[%d];\n" % (a_name, idx)
                 c_args += "    PyObject *pyobj_%s;\n" % (a_name)
                 c_convert += \
                     "    %s = (%s) Py%s_Get(pyobj_%s);\n" % (
                         a_name, a_type, t, a_name)
             else:
                 format_args += ", &%s" % (a_name)
+                unwrap, ptr = fastcall_unwrappers[f]
+                fast_args += \
+                    "    if (%s(args[%d], (%s) &%s) < 0)\n" \
+                    "        return NULL;\n" % (
+                        unwrap, idx, ptr, a_name)
             if f == 't#':
                 format_args += ", &py_buffsize%d" % num_bufs
                 c_args += "    int py_buffsize%d;\n" % num_bufs
@@ -789,31 +846,30 @@ def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[
         export.write("#if %s\n" % cond)
         output.write("#if %s\n" % cond)
 
-    include.write("PyObject * ")
-    include.write("%s_%s(PyObject *self, PyObject *args);\n" % (package, name))
-    export.write("    { (char *)\"%s\", %s_%s, METH_VARARGS, NULL },\n" %
-                 (name, package, name))
-
-    if file == "python":
-        # Those have been manually generated
-        if cond:
-            include.write("#endif\n")
-            export.write("#endif\n")
-            output.write("#endif\n")
-        return True
-    if file == "python_accessor" and r_type != "void" and not r_field:
+    if file == "python" or \
+       (file == "python_accessor" and r_type != "void" and not r_field):
         # Those have been manually generated
+        include.write("PyObject * ")
+        include.write("%s_%s(PyObject *self, PyObject *args);\n" % (package, name))
+        export.write("    { (char *)\"%s\", %s_%s, METH_VARARGS, NULL },\n" %
+                     (name, package, name))
         if cond:
             include.write("#endif\n")
             export.write("#endif\n")
             output.write("#endif\n")
         return True
 
+    include.write("PyObject * ")
+    include.write("%s_%s(PyObject *self, LIBVIRT_METH_ARGS);\n" % (package, name))
+    export.write("    { (char *)\"%s\", LIBVIRT_METH(%s_%s), LIBVIRT_METH_FLAGS, NULL },\n" %
+                 (name, package, name))
+
     output.write("PyObject *\n")
     output.write("%s_%s(PyObject *self ATTRIBUTE_UNUSED," % (package, name))
-    output.write(" PyObject *args")
     if format == "":
-        output.write(" ATTRIBUTE_UNUSED")
+        output.write(" LIBVIRT_METH_NOARGS")
+    else:
+        output.write(" LIBVIRT_METH_ARGS")
     output.write(") {\n")
     if r_type != 'void':
         output.write("    PyObject *py_retval;\n")
@@ -822,9 +878,16 @@ def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[
     if c_args:
         output.write(c_args)
     if format:
-        output.write("\n    if (!PyArg_ParseTuple(args, (char *)\"%s\"%s))\n" %
+        output.write("\n#ifdef LIBVIRT_FASTCALL\n")
+        output.write("    if (libvirt_checkArgs(\"%s\", nargs, %d) < 0)\n" %
+                     (name, len(args)))
+        output.write("        return NULL;\n")
+        output.write(fast_args)
+        output.write("#else\n")
+        output.write("    if (!PyArg_ParseTuple(args, (char *)\"%s\"%s))\n" %
                      (format, format_args))
         output.write("        return NULL;\n")
+        output.write("#endif\n")
     if c_convert:
         output.write(c_convert + "\n")
 
@@ -841,6 +904,112 @@ def print_function_wrapper(package: str, name: str, output: IO[str], export: IO[
     return True
 
 
+# Side effect free per object getters also get a bulk variant, running
+# them over a list of objects in C, see virPyBulkCall(). These ones are
+# written by hand in libvirt-override.c as their results are not plain
+# values, along with the Python type of their results.
+bulk_impl = {
+    'virDomainGetInfo': "List[int]",
+    'virDomainGetState': "List[int]",
+    'virStoragePoolGetInfo': "List[int]",
+    'virStorageVolGetInfo': "List[int]",
+}  # type: Dict[str, str]
+
+
+def is_bulk_getter(name: str) -> bool:
+    """
+    Whether @name is a getter of some object, taking nothing else than
+    flags and returning a plain value, which gets a bulk variant
+    """
+    if name in bulk_impl:
+        return True
+    if skip_c_impl(name):
+        return False
+
+    (desc, ret, args, file, mod, cond) = functions[name]
+    if file in ("python", "python_accessor") or len(args) not in (1, 2):
+        return False
+
+    a_type = args[0][1]
+    if a_type not in py_types or py_types[a_type][1] in ("", "pythonObject"):
+        return False
+    if not re.match(r"%s(Get|Is|Has)[A-Z]" % py_types[a_type][1], name):
+        return False
+    if len(args) == 2 and args[1][:2] != ("flags", "unsigned int"):
+        return False
+
+    r_type = ret[0]
+    return r_type != "void" and r_type in py_types and py_types[r_type][1] == ""
+
+
+def print_bulk_wrapper(package: str, name: str, output: IO[str], export: IO[str], include: IO[str]) -> None:
+    (desc, ret, args, file, mod, cond) = functions[name]
+
+    a_type = args[0][1]
+    r_type = ret[0]
+    (f, t, n, c, p) = py_types[r_type]
+    r_ptr = r_type + "*" if r_type.endswith("*") else r_type + " *"
+    bulk = "%s_%sBulk" % (package, name)
+
+    if len(args) == 2:
+        flags = "unsigned int flags"
+        c_call = "%s((%s) obj, flags)" % (name, a_type)
+        format = "OI|i"
+        format_args = ", &pyobj_objs, &flags, &nworkers"
+    else:
+        flags = "unsigned int flags ATTRIBUTE_UNUSED"
+        c_call = "%s((%s) obj)" % (name, a_type)
+        format = "O|i"
+        format_args = ", &pyobj_objs, &nworkers"
+
+    if cond:
+        include.write("#if %s\n" % cond)
+        export.write("#if %s\n" % cond)
+        output.write("#if %s\n" % cond)
+
+    include.write("PyObject * %s(PyObject *self, PyObject *args);\n" % bulk)
+    export.write("    { (char *)\"%sBulk\", %s, METH_VARARGS, NULL },\n" %
+                 (name, bulk))
+
+    output.write("static void\n")
+    output.write("%sOne(void *obj, %s, void *result) {\n" % (bulk, flags))
+    output.write("    *(%s) result = %s;\n" % (r_ptr, c_call))
+    output.write("}\n\n")
+
+    output.write("static PyObject *\n")
+    output.write("%sWrap(void *result) {\n" % bulk)
+    output.write("    return libvirt_%sWrap((%s) *(%s) result);\n" % (n, c, r_ptr))
+    output.write("}\n\n")
+
+    release = "NULL"
+    if n == "charPtr":
+        release = "%sFree" % bulk
+        output.write("static void\n")
+        output.write("%sFree(void *result) {\n" % bulk)
+        output.write("    free(*(%s) result);\n" % r_ptr)
+        output.write("}\n\n")
+
+    output.write("PyObject *\n")
+    output.write("%s(PyObject *self ATTRIBUTE_UNUSED, PyObject *args) {\n" % bulk)
+    output.write("    PyObject *pyobj_objs;\n")
+    if len(args) == 2:
+        output.write("    unsigned int flags;\n")
+    output.write("    int nworkers = 0;\n\n")
+    output.write("    if (!PyArg_ParseTuple(args, (char *)\"%s:%sBulk\"%s))\n" %
+                 (format, name, format_args))
+    output.write("        return NULL;\n\n")
+    output.write("    return virPyBulkCall(\"%sBulk\", \"%s\", pyobj_objs, %s, nworkers,\n" %
+                 (name, a_type, "flags" if len(args) == 2 else "0"))
+    output.write("                         sizeof(%s), %sOne, %sWrap, %s);\n" %
+                 (r_type, bulk, bulk, release))
+    output.write("}\n\n")
+
+    if cond:
+        include.write("#endif /* %s */\n" % cond)
+        export.write("#endif /* %s */\n" % cond)
+        output.write("#endif /* %s */\n" % cond)
+
+
 def print_c_pointer(classname: str, output: IO[str], export: IO[str], include: IO[str]) -> None:
     output.write("PyObject *\n")
     output.write("libvirt_%s_pointer(PyObject *self ATTRIBUTE_UNUSED, PyObject *args)\n" % classname)
@@ -915,12 +1084,18 @@ def emit_c_code(module: str) -> None:
     wrapper.write("#include <stdlib.h>\n")
     wrapper.write("#include <libvirt/%s.h>\n" % (module,))
     wrapper.write("#include \"typewrappers.h\"\n")
+    wrapper.write("#include \"libvirt-utils.h\"\n")
     wrapper.write("#include \"%s.h\"\n\n" % (module))
 
     for function in sorted(functions):
         if print_function_wrapper(package, function, wrapper, export, include):
             nb_wrap += 1
 
+    if module == "libvirt":
+        for function in sorted(functions):
+            if is_bulk_getter(function) and function not in bulk_impl:
+                print_bulk_wrapper(package, function, wrapper, export, include)
+
     if module == "libvirt":
         # Write C pointer conversion functions.
         for classname in primary_classes:
@@ -950,19 +1125,22 @@ def emit_c_code(module: str) -> None:
 # The type automatically remapped to generated classes
 # "C-type" -> (accessor, create, class, parent-class)
 #
+# Domains, networks, storage pools and storage volumes are created
+# through the wrapper cache of their connection, see _wrapObject()
+#
 classes_type = {
-    "virDomainPtr": ("._o", "virDomain(%(p)s, _obj=%(o)s)", "virDomain", "virConnect"),
-    "virDomain *": ("._o", "virDomain(%(p)s, _obj=%(o)s)", "virDomain", "virConnect"),
-    "virNetworkPtr": ("._o", "virNetwork(%(p)s, _obj=%(o)s)", "virNetwork", "virConnect"),
-    "virNetwork *": ("._o", "virNetwork(%(p)s, _obj=%(o)s)", "virNetwork", "virConnect"),
+    "virDomainPtr": ("._o", "_wrapObject(virDomain, %(p)s, %(o)s)", "virDomain", "virConnect"),
+    "virDomain *": ("._o", "_wrapObject(virDomain, %(p)s, %(o)s)", "virDomain", "virConnect"),
+    "virNetworkPtr": ("._o", "_wrapObject(virNetwork, %(p)s, %(o)s)", "virNetwork", "virConnect"),
+    "virNetwork *": ("._o", "_wrapObject(virNetwork, %(p)s, %(o)s)", "virNetwork", "virConnect"),
     "virNetworkPortPtr": ("._o", "virNetworkPort(%(p)s, _obj=%(o)s)", "virNetworkPort", "virNetwork"),
     "virNetworkPort *": ("._o", "virNetworkPort(%(p)s, _obj=%(o)s)", "virNetworkPort", "virNetwork"),
     "virInterfacePtr": ("._o", "virInterface(%(p)s, _obj=%(o)s)", "virInterface", "virConnect"),
     "virInterface *": ("._o", "virInterface(%(p)s, _obj=%(o)s)", "virInterface", "virConnect"),
-    "virStoragePoolPtr": ("._o", "virStoragePool(%(p)s, _obj=%(o)s)", "virStoragePool", "virConnect"),
-    "virStoragePool *": ("._o", "virStoragePool(%(p)s, _obj=%(o)s)", "virStoragePool", "virConnect"),
-    "virStorageVolPtr": ("._o", "virStorageVol(%(p)s, _obj=%(o)s)", "virStorageVol", "virConnect"),
-    "virStorageVol *": ("._o", "virStorageVol(%(p)s, _obj=%(o)s)", "virStorageVol", "virConnect"),
+    "virStoragePoolPtr": ("._o", "_wrapObject(virStoragePool, %(p)s, %(o)s)", "virStoragePool", "virConnect"),
+    "virStoragePool *": ("._o", "_wrapObject(virStoragePool, %(p)s, %(o)s)", "virStoragePool", "virConnect"),
+    "virStorageVolPtr": ("._o", "_wrapObject(virStorageVol, %(p)s, %(o)s)", "virStorageVol", "virConnect"),
+    "virStorageVol *": ("._o", "_wrapObject(virStorageVol, %(p)s, %(o)s)", "virStorageVol", "virConnect"),
     "virNodeDevicePtr": ("._o", "virNodeDevice(%(p)s, _obj=%(o)s)", "virNodeDevice", "virConnect"),
     "virNodeDevice *": ("._o", "virNodeDevice(%(p)s, _obj=%(o)s)", "virNodeDevice", "virConnect"),
     "virSecretPtr": ("._o", "virSecret(%(p)s, _obj=%(o)s)", "virSecret", "virConnect"),
@@ -987,6 +1165,26 @@ primary_classes = ["virDomain", "virNetwork", "virNetworkPort",
                    "virNWFilter", "virNWFilterBinding",
                    "virStream", "virDomainCheckpoint", "virDomainSnapshot"]
 
+# Attributes set by the manually written methods, on top of the ones
+# set by the generated constructors, for the classes' __slots__
+class_slots = {
+    "virConnect": ["domainEventCallbacks", "domainEventCallbackID",
+                   "networkEventCallbackID", "storagePoolEventCallbackID",
+                   "nodeDeviceEventCallbackID", "secretEventCallbackID",
+                   "qemuMonitorEventCallbackID",
+                   "_domainXMLCache", "_wrapperCache"],
+    "virStream": ["cb"],
+}
+
+# Classes deriving from the native types libvirtmod exports as
+# _<classname>Base, which hold the C pointer behind _o themselves
+native_classes = ["virConnect", "virDomain", "virStoragePool",
+                  "virStorageVol", "virStream"]
+
+# Rarely used classes whose code is only compiled on first access
+# with the lazy module layout
+lazy_classes = ["virNetworkPort", "virNWFilterBinding", "virDomainCheckpoint"]
+
 classes_destructors = {
     "virDomain": "virDomainFree",
     "virNetwork": "virNetworkFree",
@@ -1038,6 +1236,14 @@ function_classes = {
     "None": []
 }  # type: Dict[str, List[Tuple[int, str, str, ArgumentType, List[ArgumentType], str, str]]]
 
+# Functions returning an object which belongs to the connection passed
+# as argument rather than to the one of the object they are called on
+functions_result_parent = {
+    'virDomainMigrate': 'dconn',
+    'virDomainMigrate2': 'dconn',
+    'virDomainMigrate3': 'dconn',
+}
+
 # Functions returning an integral type which need special rules to
 # check for errors and raise exceptions.
 functions_int_exception_test = {
@@ -1269,17 +1475,49 @@ def functionSortKey(info: Tuple) -> Tuple[str, str]:
     return func, filename
 
 
-def writeDoc(module: str, name: str, args: List[ArgumentType], indent: str, output: IO) -> None:
+def writeDoc(module: str, name: str, args: List[ArgumentType], indent: str, output: IO,
+             docs: Optional[Dict[str, str]] = None, qualname: str = "") -> None:
     if not functions[name][0]:
         return
     val = functions[name][0]
     val = val.replace("NULL", "None")
+    if docs is not None:
+        # Split into the side module instead
+        docs[qualname] = val
+        return
     sep = '\n%s' % (indent,)
     output.write('%s"""%s """\n' % (indent, sep.join(val.splitlines())))
 
 
-def emit_py_code(module: str) -> None:
+def classCreate(tinfo: Tuple[str, str, str, str], lazy: bool) -> str:
+    """
+    The expression creating an instance of the class, going through
+    the loader for the classes which may not be defined yet
+    """
+    if lazy and tinfo[2] in lazy_classes:
+        return '_lazyClass("%s")%s' % (tinfo[2], tinfo[1][len(tinfo[2]):])
+    return tinfo[1]
+
+
+def overrideConstants(module: str) -> Set[str]:
+    """
+    The constants referenced by the manually written code, which must
+    stay plain globals in the lazy module layout
+    """
+    names = set()  # type: Set[str]
+    prefix = "%s-override" % module
+    for filename in os.listdir(sourceDir):
+        if filename.startswith(prefix) and filename.endswith(".py"):
+            with open(os.path.join(sourceDir, filename)) as f:
+                names.update(re.findall(r"\bVIR_[A-Z0-9_]+\b", f.read()))
+    return names
+
+
+def emit_py_code(module: str, lazy: bool = False, splitDoc: bool = False) -> None:
     package = module.replace('-', '_')
+    # The loaders for both live in libvirt-override.py
+    lazy = lazy and module == "libvirt"
+    splitDoc = splitDoc and module == "libvirt"
     if module == "libvirt":
         pymod = "libvirtmod"
         cygmod = "cygvirtmod"
@@ -1390,6 +1628,8 @@ def emit_py_code(module: str) -> None:
     types_map = {name: types[-1] for name, types in py_types.items()}
     types_map.update(py_types_only)
 
+    docs = {} if splitDoc else None  # type: Optional[Dict[str, str]]
+
     if "None" in function_classes:
         flist = function_classes["None"]
         oldfile = ""
@@ -1414,7 +1654,7 @@ def emit_py_code(module: str) -> None:
             if r_type in types_map:
                 classes.write(" -> \"%s\"" % types_map[r_type])
             classes.write(":\n")
-            writeDoc(module, name, args, '    ', classes)
+            writeDoc(module, name, args, '    ', classes, docs, func)
 
             for a_name, a_type, a_info in args:
                 if a_type in classes_type:
@@ -1454,7 +1694,7 @@ def emit_py_code(module: str) -> None:
 
                     tinfo = classes_type[r_type]
                     classes.write("    return ")
-                    classes.write(tinfo[1] % {"o": "ret"})
+                    classes.write(classCreate(tinfo, lazy) % {"o": "ret"})
                     classes.write("\n")
 
                 # For functions returning an integral type there are
@@ -1485,7 +1725,12 @@ def emit_py_code(module: str) -> None:
     modclasses = []
     if module == "libvirt":
         modclasses = classes_list
+    mainfile = classes
+    lazy_sources = {}  # type: Dict[str, str]
     for classname in modclasses:
+        if lazy and classname in lazy_classes:
+            # Written as a string, compiled on first access
+            classes = io.StringIO()
         PARENTS = {
             "virConnect": "self._conn",
             "virDomain": "self._dom",
@@ -1496,7 +1741,23 @@ def emit_py_code(module: str) -> None:
         if classname == "None":
             pass
         else:
-            classes.write("class %s(object):\n" % (classname))
+            if classname in native_classes:
+                classes.write("class %s(%s._%sBase):\n" % (classname, pymod, classname))
+            else:
+                classes.write("class %s(object):\n" % (classname))
+            if classname in ["virDomainCheckpoint", "virDomainSnapshot"]:
+                slots = ["_dom", "_conn", "_o"]
+            elif classname in ["virNetworkPort"]:
+                slots = ["_net", "_conn", "_o"]
+            elif classname in ["virConnect"]:
+                slots = ["_o"]
+            else:
+                slots = ["_conn", "_o"]
+            if classname in native_classes:
+                slots.remove("_o")
+            slots += class_slots.get(classname, []) + ["__weakref__"]
+            classes.write("    __slots__ = (%s)\n\n" %
+                          ", ".join('"%s"' % slot for slot in slots))
             if classname == "virStorageVol":
                 classes.write("    # The size (in bytes) of buffer used in sendAll(),\n")
                 classes.write("    # recvAll(), sparseSendAll() and sparseRecvAll()\n")
@@ -1519,7 +1780,7 @@ def emit_py_code(module: str) -> None:
             else:
                 classes.write("    def __init__(self, _obj: object=None):\n")
 
-            classes.write("        if type(_obj).__name__ not in [\"PyCapsule\", \"PyCObject\"]:\n")
+            classes.write("        if type(_obj) is not _CapsuleType:\n")
             classes.write("            raise Exception(\"Expected a wrapped C Object but got %s\" % type(_obj))\n")
             classes.write("        self._o = _obj\n\n")
             destruct = None
@@ -1583,7 +1844,8 @@ def emit_py_code(module: str) -> None:
                 if r_type in types_map:
                     classes.write(" -> \"%s\"" % types_map[r_type])
                 classes.write(":\n")
-                writeDoc(module, name, args, '        ', classes)
+                writeDoc(module, name, args, '        ', classes,
+                         docs, "%s.%s" % (classname, func))
                 for n, (a_name, a_type, a_info) in enumerate(args):
                     if a_type in classes_type:
                         if n != index:
@@ -1635,7 +1897,8 @@ def emit_py_code(module: str) -> None:
                         #
                         tinfo = classes_type[r_type]
                         classes.write("        __tmp = ")
-                        classes.write(tinfo[1] % {"o": "ret", "p": PARENTS[tinfo[3]]})
+                        parent = functions_result_parent.get(name, PARENTS[tinfo[3]])
+                        classes.write(classCreate(tinfo, lazy) % {"o": "ret", "p": parent})
                         classes.write("\n")
 
                         #
@@ -1717,6 +1980,52 @@ def emit_py_code(module: str) -> None:
                 classes.write("\n")
                 extra.close()
 
+        if classes is not mainfile:
+            lazy_sources[classname] = classes.getvalue()
+            classes = mainfile
+
+    if module == "libvirt":
+        if lazy:
+            classes = io.StringIO()
+        classes.write("class _Bulk(object):\n")
+        classes.write("    \"\"\"\n")
+        classes.write("    The per object getters run over many objects at once, e.g.\n")
+        classes.write("    libvirt.bulk.virDomainGetInfo(doms)\n")
+        classes.write("\n")
+        classes.write("    Each returns a list holding, for every object, the result of\n")
+        classes.write("    the getter or the libvirtError it failed with. The calls are\n")
+        classes.write("    made in C with the GIL released, @workers extra threads, up\n")
+        classes.write("    to 32, sharing them with the calling one, which helps with\n")
+        classes.write("    remote connections.\n")
+        classes.write("    \"\"\"\n")
+        classes.write("    __slots__ = ()\n\n")
+        for name in sorted(functions):
+            if not is_bulk_getter(name):
+                continue
+            (desc, ret, args, file, mod, cond) = functions[name]
+            a_type = args[0][1]
+            classe = classes_type[a_type][2]
+            r_type = bulk_impl.get(name, types_map.get(ret[0], "Any"))
+            classes.write("    @staticmethod\n")
+            classes.write("    def %s(objs: Iterable[\"%s\"], " % (name, classe))
+            if len(args) == 2:
+                classes.write("flags: int = 0, ")
+            classes.write("workers: int = 0) -> List[Union[%s, libvirtError]]:\n" % r_type)
+            classes.write("        \"\"\"Run %s.%s() over @objs\"\"\"\n" %
+                          (classe, nameFixup(name, classe, a_type, file)))
+            # The objects free their handles when deleted, so the ones
+            # only referenced by @objs are kept until the call returns
+            classes.write("        objs = list(objs)\n")
+            classes.write("        return %s.%sBulk([obj._o for obj in objs], " % (pymod, name))
+            if len(args) == 2:
+                classes.write("flags, ")
+            classes.write("workers)\n\n")
+        classes.write("\n")
+        classes.write("bulk = _Bulk()\n\n")
+        if lazy:
+            lazy_sources["bulk"] = classes.getvalue()
+            classes = mainfile
+
     direct_functions = {}
     if module != "libvirt":
         direct_functions = functions
@@ -1802,22 +2111,65 @@ def emit_py_code(module: str) -> None:
     for type, enum in enumvals:
         enumData.update(enum)
 
+    # With the lazy layout only the constants used by the module itself
+    # are defined up front, the others are listed in a table which is
+    # only parsed when one of them is first looked up
+    eager = overrideConstants(module) if lazy else None
+    lazy_enums = []  # type: List[str]
+    lazy_params = []  # type: List[str]
+
     for type, enum in sorted(enumvals):
         classes.write("# %s\n" % type)
         items = sorted(resolveEnum(enum, enumData).items(), key=enumsSortKey)
         if items[-1][0].endswith('_LAST'):
             del items[-1]
         for name, value in items:
+            if eager is not None and name not in eager:
+                try:
+                    lazy_enums.append("%s %d\n" % (name, int(value)))
+                    continue
+                except ValueError:
+                    pass
             classes.write("%s = %s\n" % (name, value))
         classes.write("\n")
 
     if params:
         classes.write("# typed parameter names\n")
         for name, value in params:
+            if eager is not None and name not in eager:
+                lazy_params.append("%s %s\n" % (name, value))
+                continue
             classes.write("%s = \"%s\"\n" % (name, value))
 
+    if module == "libvirt":
+        classes.write("\n# lazily loaded classes and constants\n")
+        classes.write("_lazyClassSources = {\n")
+        for classname, source in sorted(lazy_sources.items()):
+            classes.write("    %r: %r,\n" % (classname, source))
+        classes.write("}  # type: Dict[str, str]\n")
+        classes.write("_lazyConstantsTable = \"\"\"\\\n%s\"\"\"\n" % "".join(lazy_enums))
+        classes.write("_lazyParamsTable = \"\"\"\\\n%s\"\"\"\n" % "".join(lazy_params))
+
     classes.close()
 
+    if docs is not None:
+        with open("%s/%s_docstrings.py" % (buildDir, package), "w") as f:
+            f.write("#\n")
+            f.write("# WARNING WARNING WARNING WARNING\n")
+            f.write("#\n")
+            f.write("# This file is automatically written by generator.py. Any changes\n")
+            f.write("# made here will be lost.\n")
+            f.write("#\n")
+            f.write("# Docstrings of the generated functions and methods of %s,\n" % package)
+            f.write("# attached by %s.loadDocstrings()\n" % package)
+            f.write("#\n")
+            f.write("# WARNING WARNING WARNING WARNING\n")
+            f.write("#\n")
+            f.write("docstrings = {\n")
+            for qualname, doc in sorted(docs.items()):
+                f.write("    %r: %r,\n" % (qualname, doc))
+            f.write("}\n")
+
 if sys.argv[1] not in ["libvirt", "libvirt-lxc", "libvirt-qemu"]:
     print("ERROR: unknown module %s" % sys.argv[1])
     sys.exit(1)
@@ -1842,7 +2194,13 @@ if len(sys.argv) >= 4:
 if output == "c" or output == "c+py" or output is None:
     emit_c_code(sys.argv[1])
 
+# The Python code generation takes optional comma separated flags,
+# e.g. "py,lazy,splitdoc"
+options = []  # type: List[str]
+if output is not None:
+    output, *options = output.split(",")
+
 if output == "py" or output == "c+py" or output is None:
-    emit_py_code(sys.argv[1])
+    emit_py_code(sys.argv[1], lazy="lazy" in options, splitDoc="splitdoc" in options)
 
 sys.exit(0)
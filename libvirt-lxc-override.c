@@ -122,7 +122,15 @@ PyInit_cygvirtmod_lxc
     if (virInitialize() < 0)
         return NULL;
 
-    module = PyModule_Create(&moduledef);
+    if (!(module = PyModule_Create(&moduledef)))
+        return NULL;
+
+#ifdef Py_GIL_DISABLED
+    if (PyUnstable_Module_SetGIL(module, Py_MOD_GIL_NOT_USED) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+#endif
 
     return module;
 }
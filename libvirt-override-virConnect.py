@@ -29,13 +29,18 @@
         except AttributeError:
             pass
 
-    def domainEventRegister(self, cb: _DomainCB[_T], opaque: _T) -> None:
+    def domainEventRegister(self, cb: _DomainCB[_T], opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> None:
         """Adds a Domain Event Callback. Registering for a domain
-           callback will enable delivery of the events """
+           callback will enable delivery of the events
+
+           If @dispatcher is given, it is used to run @cb instead of
+           the one set by setEventDispatcher(), see
+           libvirtevents.ExecutorDispatcher"""
+        wrapped = _eventCallbackWrap(cb, dispatcher, "VIR_DOMAIN_EVENT_ID_", VIR_DOMAIN_EVENT_ID_LIFECYCLE)
         try:
-            self.domainEventCallbacks[cb] = opaque
+            self.domainEventCallbacks[cb] = (wrapped, opaque)
         except AttributeError:
-            self.domainEventCallbacks = {cb: opaque}  # type: Dict[_DomainCB[_T], _T]
+            self.domainEventCallbacks = {cb: (wrapped, opaque)}  # type: Dict[_DomainCB[_T], Tuple[Callable[..., Any], _T]]
             ret = libvirtmod.virConnectDomainEventRegister(self._o, self)
             if ret == -1:
                 raise libvirtError('virConnectDomainEventRegister() failed')
@@ -44,8 +49,8 @@
         """Dispatches events to python user domain event callbacks
         """
         try:
-            for cb, opaque in self.domainEventCallbacks.items():
-                cb(self, virDomain(self, _obj=dom), event, detail, opaque)
+            for wrapped, opaque in self.domainEventCallbacks.values():
+                wrapped(self, virDomain(self, _obj=dom), event, detail, opaque)
         except AttributeError:
             pass
 
@@ -328,12 +333,12 @@
         except AttributeError:
             pass
 
-    def networkEventRegisterAny(self, net: Optional['virNetwork'], eventID: int, cb: Callable, opaque: _T) -> int:
+    def networkEventRegisterAny(self, net: Optional['virNetwork'], eventID: int, cb: Callable, opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a Network Event Callback. Registering for a network
            callback will enable delivery of the events"""
         if not hasattr(self, 'networkEventCallbackID'):
             self.networkEventCallbackID = {}  # type: Dict[int, _T]
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "VIR_NETWORK_EVENT_ID_", eventID), "conn": self, "opaque": opaque}
         if net is None:
             ret = libvirtmod.virConnectNetworkEventRegisterAny(self._o, None, eventID, cbData)
         else:
@@ -343,12 +348,16 @@
         self.networkEventCallbackID[ret] = opaque
         return ret
 
-    def domainEventRegisterAny(self, dom: Optional['virDomain'], eventID: int, cb: Callable, opaque: _T) -> int:
+    def domainEventRegisterAny(self, dom: Optional['virDomain'], eventID: int, cb: Callable, opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a Domain Event Callback. Registering for a domain
-           callback will enable delivery of the events """
+           callback will enable delivery of the events
+
+           If @dispatcher is given, it is used to run @cb instead of
+           the one set by setEventDispatcher(), see
+           libvirtevents.ExecutorDispatcher"""
         if not hasattr(self, 'domainEventCallbackID'):
             self.domainEventCallbackID = {}  # type: Dict[int, _T]
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "VIR_DOMAIN_EVENT_ID_", eventID), "conn": self, "opaque": opaque}
         if dom is None:
             ret = libvirtmod.virConnectDomainEventRegisterAny(self._o, None, eventID, cbData)
         else:
@@ -389,12 +398,12 @@
         except AttributeError:
             pass
 
-    def storagePoolEventRegisterAny(self, pool: Optional['virStoragePool'], eventID: int, cb: Callable, opaque: _T) -> int:
+    def storagePoolEventRegisterAny(self, pool: Optional['virStoragePool'], eventID: int, cb: Callable, opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a Storage Pool Event Callback. Registering for a storage pool
            callback will enable delivery of the events"""
         if not hasattr(self, 'storagePoolEventCallbackID'):
             self.storagePoolEventCallbackID = {}  # type: Dict[int, _T]
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "VIR_STORAGE_POOL_EVENT_ID_", eventID), "conn": self, "opaque": opaque}
         if pool is None:
             ret = libvirtmod.virConnectStoragePoolEventRegisterAny(self._o, None, eventID, cbData)
         else:
@@ -435,12 +444,12 @@
         except AttributeError:
             pass
 
-    def nodeDeviceEventRegisterAny(self, dev: Optional['virNodeDevice'], eventID: int, cb: Callable, opaque: _T) -> int:
+    def nodeDeviceEventRegisterAny(self, dev: Optional['virNodeDevice'], eventID: int, cb: Callable, opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a Node Device Event Callback. Registering for a node device
            callback will enable delivery of the events"""
         if not hasattr(self, 'nodeDeviceEventCallbackID'):
             self.nodeDeviceEventCallbackID = {}  # type: Dict[int, _T]
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "VIR_NODE_DEVICE_EVENT_ID_", eventID), "conn": self, "opaque": opaque}
         if dev is None:
             ret = libvirtmod.virConnectNodeDeviceEventRegisterAny(self._o, None, eventID, cbData)
         else:
@@ -479,12 +488,12 @@
         except AttributeError:
             pass
 
-    def secretEventRegisterAny(self, secret: Optional['virSecret'], eventID: int, cb: Callable, opaque: _T) -> int:
+    def secretEventRegisterAny(self, secret: Optional['virSecret'], eventID: int, cb: Callable, opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a Secret Event Callback. Registering for a secret
            callback will enable delivery of the events"""
         if not hasattr(self, 'secretEventCallbackID'):
             self.secretEventCallbackID = {}  # type: Dict[int, _T]
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "VIR_SECRET_EVENT_ID_", eventID), "conn": self, "opaque": opaque}
         if secret is None:
             ret = libvirtmod.virConnectSecretEventRegisterAny(self._o, None, eventID, cbData)
         else:
@@ -500,7 +509,7 @@
         if ret is None:
             raise libvirtError("virConnectListAllDomains() failed")
 
-        return [virDomain(self, _obj=domptr) for domptr in ret]
+        return _wrapObjects(virDomain, self, ret)
 
     def listAllStoragePools(self, flags: int = 0) -> List['virStoragePool']:
         """Returns a list of storage pool objects"""
@@ -508,7 +517,7 @@
         if ret is None:
             raise libvirtError("virConnectListAllStoragePools() failed")
 
-        return [virStoragePool(self, _obj=poolptr) for poolptr in ret]
+        return _wrapObjects(virStoragePool, self, ret)
 
     def listAllNetworks(self, flags: int = 0) -> List['virNetwork']:
         """Returns a list of network objects"""
@@ -516,7 +525,7 @@
         if ret is None:
             raise libvirtError("virConnectListAllNetworks() failed")
 
-        return [virNetwork(self, _obj=netptr) for netptr in ret]
+        return _wrapObjects(virNetwork, self, ret)
 
     def listAllInterfaces(self, flags: int = 0) -> List['virInterface']:
         """Returns a list of interface objects"""
@@ -548,7 +557,7 @@
         if ret is None:
             raise libvirtError("virConnectListAllNWFilterBindings() failed")
 
-        return [virNWFilterBinding(self, _obj=filter_ptr) for filter_ptr in ret]
+        return [_lazyClass("virNWFilterBinding")(self, _obj=filter_ptr) for filter_ptr in ret]
 
     def listAllSecrets(self, flags: int = 0) -> List['virSecret']:
         """Returns a list of secret objects"""
@@ -558,6 +567,85 @@
 
         return [virSecret(self, _obj=secret_ptr) for secret_ptr in ret]
 
+    def lookupByNames(self, names: Iterable[str], workers: int = 0) -> List[Optional['virDomain']]:
+        """Look up the domains with the given names
+
+        Returns a list holding, for each of @names, the domain
+        object or None if there is no such domain. The lookups are
+        made in one go without going back and forth with the Python
+        interpreter, @workers extra threads, up to 32, sharing them
+        with the calling one, which helps with remote connections.
+        Any error other than the domain not existing is raised."""
+        ret = libvirtmod.virDomainLookupByNames(self._o, list(names), workers)
+        if ret is None:
+            raise libvirtError("virDomainLookupByNames() failed")
+
+        return [None if obj is None else _wrapObject(virDomain, self, obj) for obj in ret]
+
+    def lookupByUUIDStrings(self, uuids: Iterable[str], workers: int = 0) -> List[Optional['virDomain']]:
+        """Look up the domains with the given UUID strings, as lookupByNames() does"""
+        ret = libvirtmod.virDomainLookupByUUIDStrings(self._o, list(uuids), workers)
+        if ret is None:
+            raise libvirtError("virDomainLookupByUUIDStrings() failed")
+
+        return [None if obj is None else _wrapObject(virDomain, self, obj) for obj in ret]
+
+    def lookupByIDs(self, ids: Iterable[int], workers: int = 0) -> List[Optional['virDomain']]:
+        """Look up the running domains with the given IDs, as lookupByNames() does"""
+        ret = libvirtmod.virDomainLookupByIDs(self._o, list(ids), workers)
+        if ret is None:
+            raise libvirtError("virDomainLookupByIDs() failed")
+
+        return [None if obj is None else _wrapObject(virDomain, self, obj) for obj in ret]
+
+    def networkLookupByNames(self, names: Iterable[str], workers: int = 0) -> List[Optional['virNetwork']]:
+        """Look up the networks with the given names, as lookupByNames() does"""
+        ret = libvirtmod.virNetworkLookupByNames(self._o, list(names), workers)
+        if ret is None:
+            raise libvirtError("virNetworkLookupByNames() failed")
+
+        return [None if obj is None else _wrapObject(virNetwork, self, obj) for obj in ret]
+
+    def networkLookupByUUIDStrings(self, uuids: Iterable[str], workers: int = 0) -> List[Optional['virNetwork']]:
+        """Look up the networks with the given UUID strings, as lookupByNames() does"""
+        ret = libvirtmod.virNetworkLookupByUUIDStrings(self._o, list(uuids), workers)
+        if ret is None:
+            raise libvirtError("virNetworkLookupByUUIDStrings() failed")
+
+        return [None if obj is None else _wrapObject(virNetwork, self, obj) for obj in ret]
+
+    def storagePoolLookupByNames(self, names: Iterable[str], workers: int = 0) -> List[Optional['virStoragePool']]:
+        """Look up the storage pools with the given names, as lookupByNames() does"""
+        ret = libvirtmod.virStoragePoolLookupByNames(self._o, list(names), workers)
+        if ret is None:
+            raise libvirtError("virStoragePoolLookupByNames() failed")
+
+        return [None if obj is None else _wrapObject(virStoragePool, self, obj) for obj in ret]
+
+    def storagePoolLookupByUUIDStrings(self, uuids: Iterable[str], workers: int = 0) -> List[Optional['virStoragePool']]:
+        """Look up the storage pools with the given UUID strings, as lookupByNames() does"""
+        ret = libvirtmod.virStoragePoolLookupByUUIDStrings(self._o, list(uuids), workers)
+        if ret is None:
+            raise libvirtError("virStoragePoolLookupByUUIDStrings() failed")
+
+        return [None if obj is None else _wrapObject(virStoragePool, self, obj) for obj in ret]
+
+    def storageVolLookupByKeys(self, keys: Iterable[str], workers: int = 0) -> List[Optional['virStorageVol']]:
+        """Look up the storage volumes with the given keys, as lookupByNames() does"""
+        ret = libvirtmod.virStorageVolLookupByKeys(self._o, list(keys), workers)
+        if ret is None:
+            raise libvirtError("virStorageVolLookupByKeys() failed")
+
+        return [None if obj is None else _wrapObject(virStorageVol, self, obj) for obj in ret]
+
+    def storageVolLookupByPaths(self, paths: Iterable[str], workers: int = 0) -> List[Optional['virStorageVol']]:
+        """Look up the storage volumes with the given paths, as lookupByNames() does"""
+        ret = libvirtmod.virStorageVolLookupByPaths(self._o, list(paths), workers)
+        if ret is None:
+            raise libvirtError("virStorageVolLookupByPaths() failed")
+
+        return [None if obj is None else _wrapObject(virStorageVol, self, obj) for obj in ret]
+
     def _dispatchCloseCallback(self, reason: int, cbData: Dict[str, Any]) -> int:
         """Dispatches events to python user close callback"""
         cb = cbData["cb"]
@@ -572,10 +660,10 @@
         if ret == -1:
             raise libvirtError('virConnectUnregisterCloseCallback() failed')
 
-    def registerCloseCallback(self, cb: Callable[['virConnect', int, _T], None], opaque: _T) -> int:
+    def registerCloseCallback(self, cb: Callable[['virConnect', int, _T], None], opaque: _T, dispatcher: Optional[_EventDispatcher] = None) -> int:
         """Adds a close event callback, providing a notification
          when a connection fails / closes"""
-        cbData = {"cb": cb, "conn": self, "opaque": opaque}
+        cbData = {"cb": _eventCallbackWrap(cb, dispatcher, "close"), "conn": self, "opaque": opaque}
         ret = libvirtmod.virConnectRegisterCloseCallback(self._o, cbData)
         if ret == -1:
             raise libvirtError('virConnectRegisterCloseCallback() failed')
@@ -609,7 +697,7 @@
         ret = libvirtmod.virDomainCreateXMLWithFiles(self._o, xmlDesc, files, flags)
         if ret is None:
             raise libvirtError('virDomainCreateXMLWithFiles() failed')
-        __tmp = virDomain(self, _obj=ret)
+        __tmp = _wrapObject(virDomain, self, ret)
         return __tmp
 
     def getAllDomainStats(self, stats: int = 0, flags: int = 0) -> List[Tuple['virDomain', Dict[str, Any]]]:
@@ -658,7 +746,7 @@
         if ret is None:
             raise libvirtError("virConnectGetAllDomainStats() failed")
 
-        return [(virDomain(self, _obj=elem[0]), elem[1]) for elem in ret]
+        return [(_wrapObject(virDomain, self, elem[0]), elem[1]) for elem in ret]
 
     def domainListGetStats(self, doms: List['virDomain'], stats: int = 0, flags: int = 0) -> List[Tuple['virDomain', Dict[str, Any]]]:
         """ Query statistics for given domains.
@@ -700,4 +788,234 @@
         if ret is None:
             raise libvirtError("virDomainListGetStats() failed")
 
-        return [(virDomain(self, _obj=elem[0]), elem[1]) for elem in ret]
+        return [(_wrapObject(virDomain, self, elem[0]), elem[1]) for elem in ret]
+
+    def enableDomainXMLCache(self, maxsize: int = 256) -> None:
+        """Serve virDomain.XMLDesc() from a cache
+
+        Up to @maxsize documents, keyed by domain UUID and flags, are
+        kept, the least recently used one being dropped first. A domain's
+        documents are dropped when a lifecycle, device added or removed,
+        tunable, metadata change, block job, disk change or tray change
+        event is received for it, so an event loop implementation must
+        be registered and running.
+
+        Events are asynchronous: a change made through this connection
+        is only seen by XMLDesc() once its event has been delivered.
+
+        Calling it again changes the size and drops the cached documents."""
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.disableDomainXMLCache()
+        self._domainXMLCache = _DomainXMLCache(self, maxsize)
+
+    def disableDomainXMLCache(self) -> None:
+        """Stop caching domain XML, see enableDomainXMLCache()"""
+        cache = getattr(self, '_domainXMLCache', None)
+        if cache is not None:
+            self._domainXMLCache = None
+            cache.close(self)
+
+    def getDomainXMLCacheStats(self) -> Optional[Dict[str, int]]:
+        """Return the counters of the domain XML cache, or None if it is
+        not enabled
+
+        The result has the keys "size", "maxsize", "hits", "misses",
+        "evictions" and "invalidations"."""
+        cache = getattr(self, '_domainXMLCache', None)
+        if cache is None:
+            return None
+        return cache.stats()
+
+    def enableWrapperCache(self) -> None:
+        """Return the same object for a domain, network, storage pool or
+        storage volume for as long as it is referenced
+
+        Lookups such as lookupByName() or lookupByUUIDString(), the
+        listAllDomains(), listAllNetworks(), listAllStoragePools() and
+        virStoragePool.listAllVolumes() lists and the getAllDomainStats()
+        and domainListGetStats() results then return the object already
+        wrapping the same domain, network or pool, identified by its UUID,
+        or volume, identified by its key, and release the handle they
+        obtained at once. Objects are only referenced weakly by the
+        cache, so objects that are no longer used are still freed.
+
+        A domain whose ID() changed, as it was started or stopped since
+        it was wrapped, gets a new object. The objects passed to event
+        callbacks are not taken from the cache."""
+        if getattr(self, '_wrapperCache', None) is None:
+            self._wrapperCache = _WrapperCache()
+
+    def disableWrapperCache(self) -> None:
+        """Stop reusing objects, see enableWrapperCache()"""
+        self._wrapperCache = None
+
+    def getWrapperCacheStats(self) -> Optional[Dict[str, int]]:
+        """Return the counters of the wrapper cache, or None if it is not
+        enabled
+
+        The result has the keys "size", the number of objects alive in
+        the cache, "hits" and "misses"."""
+        cache = getattr(self, '_wrapperCache', None)
+        if cache is None:
+            return None
+        return cache.stats()
+
+    def waitForDomainsState(self, doms: List['virDomain'], states: Union[int, Iterable[int]], timeout: Optional[float] = None) -> List[Optional[int]]:
+        """Wait for each of @doms to be in one of @states, given as one
+        or more virDomainState values such as VIR_DOMAIN_SHUTOFF.
+
+        This is the bulk version of virDomain.waitForState(): a single
+        lifecycle event registration covers all the domains, and their
+        current state is checked with a single domainListGetStats()
+        call once registered, so no change can be missed.
+
+        @timeout is in seconds, None waits forever. Returns a list with
+        the state each domain reached, in the order of @doms, holding
+        None for the domains still not in one of @states when @timeout
+        expired."""
+        if not doms:
+            return []
+        if isinstance(states, int):
+            states = (states,)
+        wanted = frozenset(states)
+        result = [None] * len(doms)  # type: List[Optional[int]]
+        pending = {}  # type: Dict[str, List[int]]
+        for idx, dom in enumerate(doms):
+            pending.setdefault(dom.UUIDString(), []).append(idx)
+        cond = threading.Condition()
+
+        def reached(uuid: str, state: int) -> None:
+            with cond:
+                for idx in pending.pop(uuid, ()):
+                    result[idx] = state
+                if not pending:
+                    cond.notify()
+
+        def lifecycle(conn: 'virConnect', dom: 'virDomain', event: int, detail: int, opaque: Any) -> None:
+            state = _domainEventState(event, detail)
+            if state in wanted:
+                reached(dom.UUIDString(), state)  # type: ignore
+
+        # Delivered straight from the event loop, a dispatcher could
+        # queue it on the thread waiting here
+        callbackID = self.domainEventRegisterAny(
+            None, VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycle, None,
+            dispatcher=_directEventDispatch)
+        try:
+            for dom, stats in self.domainListGetStats(doms, VIR_DOMAIN_STATS_STATE):
+                if stats["state.state"] in wanted:
+                    reached(dom.UUIDString(), stats["state.state"])
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with cond:
+                while pending:
+                    remaining = None  # type: Optional[float]
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                    cond.wait(remaining)
+        finally:
+            self.domainEventDeregisterAny(callbackID)
+
+        return result
+
+    def waitForBlockJobs(self, jobs: List[Tuple['virDomain', str]], timeout: Optional[float] = None, pivot: bool = False, abort: bool = False, interval: Optional[float] = None, progress: Optional[Callable[['virDomain', str, Dict[str, int]], None]] = None) -> List[Optional[int]]:
+        """Wait for the block jobs given as (domain, disk) pairs in @jobs.
+
+        This is the bulk version of virDomain.waitForBlockJob(), with one
+        VIR_DOMAIN_EVENT_ID_BLOCK_JOB_2 registration covering all the
+        jobs; see there for the meaning of the other arguments.
+
+        Returns a list with the final status of each job, in the order
+        of @jobs, holding None for the jobs which had not finished when
+        @timeout expired or whose final status is not known."""
+        if not jobs:
+            return []
+        result = [None] * len(jobs)  # type: List[Optional[int]]
+        pending = {}  # type: Dict[Tuple[str, str], List[int]]
+        for idx, (dom, disk) in enumerate(jobs):
+            pending.setdefault((dom.UUIDString(), disk), []).append(idx)
+        # Jobs pivoted or aborted, waiting for their final event
+        finishing = set()  # type: Set[Tuple[str, str]]
+        # Jobs found gone by the last poll, whose event may still come
+        gone = set()  # type: Set[Tuple[str, str]]
+        events = []  # type: List[Tuple[Tuple[str, str], int]]
+        cond = threading.Condition()
+
+        def blockJob(conn: 'virConnect', dom: 'virDomain', disk: str, type: int, status: int, opaque: Any) -> None:
+            with cond:
+                events.append(((dom.UUIDString(), disk), status))
+                cond.notify()
+
+        def finish(key: Tuple[str, str], status: Optional[int]) -> None:
+            for idx in pending.pop(key, ()):
+                result[idx] = status
+
+        def handle(key: Tuple[str, str], status: int) -> None:
+            if key not in pending:
+                return
+            if status != VIR_DOMAIN_BLOCK_JOB_READY:
+                finish(key, status)
+            elif pivot or abort:
+                if key not in finishing:
+                    finishing.add(key)
+                    dom, disk = jobs[pending[key][0]]
+                    dom.blockJobAbort(disk, VIR_DOMAIN_BLOCK_JOB_ABORT_PIVOT if pivot else 0)
+            else:
+                finish(key, status)
+
+        # Delivered straight from the event loop, a dispatcher could
+        # queue it on the thread waiting here
+        callbackID = self.domainEventRegisterAny(
+            None, VIR_DOMAIN_EVENT_ID_BLOCK_JOB_2, blockJob, None,
+            dispatcher=_directEventDispatch)
+        try:
+            # Catch up with jobs which finished, or got ready, before
+            # the registration
+            for key in list(pending):
+                dom, disk = jobs[pending[key][0]]
+                info = dom.blockJobInfo(disk)
+                if not info:
+                    # Gone before the registration, whichever way it ended
+                    finish(key, None)
+                elif (info["type"] in (VIR_DOMAIN_BLOCK_JOB_TYPE_COPY,
+                                       VIR_DOMAIN_BLOCK_JOB_TYPE_ACTIVE_COMMIT) and
+                      info["end"] and info["cur"] == info["end"]):
+                    handle(key, VIR_DOMAIN_BLOCK_JOB_READY)
+
+            now = time.monotonic()
+            deadline = None if timeout is None else now + timeout
+            nextPoll = None if interval is None else now + interval
+            while pending:
+                with cond:
+                    if not events:
+                        wakeup = min((t for t in (deadline, nextPoll) if t is not None), default=None)
+                        if deadline is not None and time.monotonic() >= deadline:
+                            break
+                        cond.wait(None if wakeup is None else max(0.0, wakeup - time.monotonic()))
+                    received = events[:]
+                    del events[:]
+
+                for key, status in received:
+                    handle(key, status)
+
+                if nextPoll is not None and time.monotonic() >= nextPoll:
+                    for key in list(pending):
+                        dom, disk = jobs[pending[key][0]]
+                        info = dom.blockJobInfo(disk)
+                        if progress is not None:
+                            progress(dom, disk, info)
+                        if info:
+                            gone.discard(key)
+                        elif key in gone:
+                            # The event got lost, so how it ended is unknown
+                            finish(key, None)
+                        else:
+                            gone.add(key)
+                    nextPoll = time.monotonic() + interval  # type: ignore
+        finally:
+            self.domainEventDeregisterAny(callbackID)
+
+        return result
@@ -12,7 +12,7 @@
         if ret is None:
             raise libvirtError("virDomainListAllCheckpoints() failed")
 
-        return [virDomainCheckpoint(self, _obj=chkptr) for chkptr in ret]
+        return [_lazyClass("virDomainCheckpoint")(self, _obj=chkptr) for chkptr in ret]
 
     def createWithFiles(self, files: List[int], flags: int = 0) -> 'virDomain':
         """Launch a defined domain. If the call succeeds the domain moves from the
@@ -108,3 +108,60 @@
             raise libvirtError('virDomainFDAssociate() failed')
         return ret
 
+    def waitForState(self, states: Union[int, Iterable[int]], timeout: Optional[float] = None) -> Optional[int]:
+        """Wait for the domain to be in one of @states, given as one or
+        more virDomainState values such as VIR_DOMAIN_SHUTOFF.
+
+        Rather than polling, this registers for lifecycle events, checks
+        the current state once and then waits for a matching event, so
+        an event loop implementation must be running, see
+        startDefaultEventLoopThread(). It must not be called from an
+        event callback.
+
+        @timeout is in seconds, None waits forever. Returns the state
+        reached, or None if @timeout expired first.
+
+        See virConnect.waitForDomainsState() to wait for many domains."""
+        return self._conn.waitForDomainsState([self], states, timeout)[0]
+
+    def waitForBlockJob(self, disk: str, timeout: Optional[float] = None, pivot: bool = False, abort: bool = False, interval: Optional[float] = None, progress: Optional[Callable[['virDomain', str, Dict[str, int]], None]] = None) -> Optional[int]:
+        """Wait for the block job on @disk to finish, or to become ready
+        for copy and active commit jobs, instead of polling blockJobInfo().
+
+        @disk must be the target name, e.g. "vda", as that is what
+        VIR_DOMAIN_EVENT_ID_BLOCK_JOB_2 events report. If @pivot is set
+        a ready job is pivoted with blockJobAbort(), and with @abort it is
+        cancelled; either way the wait continues until the job ends.
+
+        If @interval is given, blockJobInfo() is called that often in
+        seconds and its result passed to @progress(dom, disk, info), if
+        set. @timeout is in seconds, None waits forever.
+
+        An event loop implementation must be running, see
+        startDefaultEventLoopThread(). This must not be called from an
+        event callback.
+
+        Returns the final VIR_DOMAIN_BLOCK_JOB_COMPLETED, _FAILED,
+        _CANCELED or _READY status, or None if @timeout expired first. None
+        is also returned if the job ended without its final status being
+        known, i.e. it was already gone when the wait started, or its event
+        was missed and two polls in a row found it gone.
+
+        See virConnect.waitForBlockJobs() to wait for many jobs."""
+        return self._conn.waitForBlockJobs([(self, disk)], timeout, pivot,
+                                           abort, interval, progress)[0]
+
+    def XMLDesc(self, flags: int = 0) -> str:
+        """Provide an XML description of the domain. The description may be reused
+        later to relaunch the domain with virDomainCreateXML().
+
+        If virConnect.enableDomainXMLCache() was called on the connection,
+        repeated calls with the same @flags are answered from memory until
+        an event reports a change to the domain."""
+        cache = getattr(self._conn, '_domainXMLCache', None)
+        if cache is not None:
+            return cache.get(self, flags)
+        ret = libvirtmod.virDomainGetXMLDesc(self._o, flags)
+        if ret is None:
+            raise libvirtError('virDomainGetXMLDesc() failed')
+        return ret
@@ -4,4 +4,4 @@
         if ret is None:
             raise libvirtError("virNetworkListAllPorts() failed")
 
-        return [virNetworkPort(self, _obj=domptr) for domptr in ret]
+        return [_lazyClass("virNetworkPort")(self, _obj=domptr) for domptr in ret]
@@ -4,4 +4,31 @@
         if ret is None:
             raise libvirtError("virStoragePoolListAllVolumes() failed")
 
-        return [virStorageVol(self._conn, _obj=volptr) for volptr in ret]
+        return _wrapObjects(virStorageVol, self._conn, ret)
+
+    def listAllVolumesInfo(self, flags: int = 0, workers: int = 0) -> List[Tuple[str, str, str, int, int, int]]:
+        """List all storage volumes along with their details
+
+        Returns a list of (name, key, path, type, capacity, allocation)
+        tuples, as listAllVolumes() followed by name(), key(), path()
+        and info() on every volume would, but with the lookups made
+        without going back and forth with the Python interpreter.
+        Volumes deleted while being listed are left out, any other
+        failure to look one up raises libvirtError.
+
+        @workers extra threads, up to 32, share the per volume lookups
+        with the calling one, which helps with remote connections to
+        pools with many volumes."""
+        ret = libvirtmod.virStoragePoolListAllVolumesInfo(self._o, flags, workers)
+        if ret is None:
+            raise libvirtError("virStoragePoolListAllVolumesInfo() failed")
+        return ret
+
+    def storageVolLookupByNames(self, names: Iterable[str], workers: int = 0) -> List[Optional['virStorageVol']]:
+        """Look up the storage volumes of the pool with the given names,
+        as virConnect.lookupByNames() does for domains"""
+        ret = libvirtmod.virStorageVolLookupByNames(self._o, list(names), workers)
+        if ret is None:
+            raise libvirtError("virStorageVolLookupByNames() failed")
+
+        return [None if obj is None else _wrapObject(virStorageVol, self._conn, obj) for obj in ret]
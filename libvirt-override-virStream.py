@@ -90,43 +90,6 @@
                 raise libvirtError("cannot use sendAll with "
                                    "nonblocking stream")
 
-    def recv(self, nbytes: int) -> bytes:
-        """Reads a series of bytes from the stream. This method may
-        block the calling application for an arbitrary amount
-        of time.
-
-        Errors are not guaranteed to be reported synchronously
-        with the call, but may instead be delayed until a
-        subsequent call.
-
-        On success, the received data is returned. On failure, an
-        exception is raised. If the stream is a NONBLOCK stream and
-        the request would block, integer -2 is returned.
-        """
-        ret = libvirtmod.virStreamRecv(self._o, nbytes)
-        if ret is None:
-            raise libvirtError('virStreamRecv() failed')
-        return ret
-
-    def send(self, data: bytes) -> int:
-        """Write a series of bytes to the stream. This method may
-        block the calling application for an arbitrary amount
-        of time. Once an application has finished sending data
-        it should call virStreamFinish to wait for successful
-        confirmation from the driver, or detect any error
-
-        This method may not be used if a stream source has been
-        registered
-
-        Errors are not guaranteed to be reported synchronously
-        with the call, but may instead be delayed until a
-        subsequent call.
-        """
-        ret = libvirtmod.virStreamSend(self._o, data)
-        if ret == -1:
-            raise libvirtError('virStreamSend() failed')
-        return ret
-
     def recvHole(self, flags: int = 0) -> int:
         """This method is used to determine the length in bytes
         of the empty space to be created in a stream's target
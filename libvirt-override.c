@@ -57,13 +57,13 @@ getPyNodeCPUCount(virConnectPtr conn)
     int i_retval;
 
 #if LIBVIR_CHECK_VERSION(1, 0, 0)
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeGetCPUMap");
     i_retval = virNodeGetCPUMap(conn, NULL, NULL, 0);
     LIBVIRT_END_ALLOW_THREADS;
 #else /* fallback: use nodeinfo */
     virNodeInfo nodeinfo;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeGetInfo");
     i_retval = virNodeGetInfo(conn, &nodeinfo);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -482,7 +482,7 @@ libvirt_virDomainGetSchedulerParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerType");
     c_retval = virDomainGetSchedulerType(domain, &nparams);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -530,7 +530,7 @@ libvirt_virDomainGetSchedulerParametersFlags(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerType");
     c_retval = virDomainGetSchedulerType(domain, &nparams);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -588,7 +588,7 @@ libvirt_virDomainSetSchedulerParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerType");
     c_retval = virDomainGetSchedulerType(domain, &nparams);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -605,7 +605,7 @@ libvirt_virDomainSetSchedulerParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerParameters");
     i_retval = virDomainGetSchedulerParameters(domain, params, &nparams);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -664,7 +664,7 @@ libvirt_virDomainSetSchedulerParametersFlags(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerType");
     c_retval = virDomainGetSchedulerType(domain, &nparams);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -681,7 +681,7 @@ libvirt_virDomainSetSchedulerParametersFlags(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetSchedulerParametersFlags");
     i_retval = virDomainGetSchedulerParametersFlags(domain, params, &nparams,
                                                     flags);
     LIBVIRT_END_ALLOW_THREADS;
@@ -741,7 +741,7 @@ libvirt_virDomainSetBlkioParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetBlkioParameters");
     i_retval = virDomainGetBlkioParameters(domain, NULL, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -757,7 +757,7 @@ libvirt_virDomainSetBlkioParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetBlkioParameters");
     i_retval = virDomainGetBlkioParameters(domain, params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -861,7 +861,7 @@ libvirt_virDomainSetMemoryParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetMemoryParameters");
     i_retval = virDomainGetMemoryParameters(domain, NULL, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -877,7 +877,7 @@ libvirt_virDomainSetMemoryParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetMemoryParameters");
     i_retval = virDomainGetMemoryParameters(domain, params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -981,7 +981,7 @@ libvirt_virDomainSetNumaParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetNumaParameters");
     i_retval = virDomainGetNumaParameters(domain, NULL, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -997,7 +997,7 @@ libvirt_virDomainSetNumaParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetNumaParameters");
     i_retval = virDomainGetNumaParameters(domain, params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -1102,7 +1102,7 @@ libvirt_virDomainSetInterfaceParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetInterfaceParameters");
     i_retval = virDomainGetInterfaceParameters(domain, device, NULL, &nparams,
                                                flags);
     LIBVIRT_END_ALLOW_THREADS;
@@ -1119,7 +1119,7 @@ libvirt_virDomainSetInterfaceParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetInterfaceParameters");
     i_retval = virDomainGetInterfaceParameters(domain, device, params, &nparams,
                                                flags);
     LIBVIRT_END_ALLOW_THREADS;
@@ -1222,7 +1222,7 @@ libvirt_virDomainGetVcpus(PyObject *self ATTRIBUTE_UNUSED,
     if ((cpunum = getPyNodeCPUCount(virDomainGetConnect(domain))) < 0)
         return VIR_PY_NONE;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetInfo");
     i_retval = virDomainGetInfo(domain, &dominfo);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -1405,7 +1405,7 @@ libvirt_virDomainGetVcpuPinInfo(PyObject *self ATTRIBUTE_UNUSED,
     if ((cpunum = getPyNodeCPUCount(virDomainGetConnect(domain))) < 0)
         return VIR_PY_NONE;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetInfo");
     i_retval = virDomainGetInfo(domain, &dominfo);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -1749,35 +1749,13 @@ libvirt_virDomainSetIOThreadParams(PyObject *self ATTRIBUTE_UNUSED,
 
 static PyObject *libvirt_virPythonErrorFuncHandler = NULL;
 static PyObject *libvirt_virPythonErrorFuncCtxt = NULL;
+VIR_PY_MUTEX(libvirt_virPythonErrorFuncLock);
 
 static PyObject *
 libvirt_virGetLastError(PyObject *self ATTRIBUTE_UNUSED,
                         PyObject *args ATTRIBUTE_UNUSED)
 {
-    virError *err;
-    PyObject *info;
-
-    if ((err = virGetLastError()) == NULL)
-        return VIR_PY_NONE;
-
-    if ((info = PyTuple_New(9)) == NULL)
-        return NULL;
-
-    VIR_PY_TUPLE_SET_GOTO(info, 0, libvirt_intWrap(err->code), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 1, libvirt_intWrap(err->domain), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 2, libvirt_constcharPtrWrap(err->message), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 3, libvirt_intWrap(err->level), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 4, libvirt_constcharPtrWrap(err->str1), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 5, libvirt_constcharPtrWrap(err->str2), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 6, libvirt_constcharPtrWrap(err->str3), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 7, libvirt_intWrap(err->int1), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 8, libvirt_intWrap(err->int2), error);
-
-    return info;
-
- error:
-    Py_XDECREF(info);
-    return NULL;
+    return libvirt_virErrorPtrWrap(virGetLastError());
 }
 
 static PyObject *
@@ -1785,7 +1763,6 @@ libvirt_virConnGetLastError(PyObject *self ATTRIBUTE_UNUSED,
                             PyObject *args)
 {
     virError *err;
-    PyObject *info;
     virConnectPtr conn;
     PyObject *pyobj_conn;
 
@@ -1797,27 +1774,7 @@ libvirt_virConnGetLastError(PyObject *self ATTRIBUTE_UNUSED,
     err = virConnGetLastError(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
-    if (err == NULL)
-        return VIR_PY_NONE;
-
-    if ((info = PyTuple_New(9)) == NULL)
-        return NULL;
-
-    VIR_PY_TUPLE_SET_GOTO(info, 0, libvirt_intWrap(err->code), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 1, libvirt_intWrap(err->domain), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 2, libvirt_constcharPtrWrap(err->message), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 3, libvirt_intWrap(err->level), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 4, libvirt_constcharPtrWrap(err->str1), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 5, libvirt_constcharPtrWrap(err->str2), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 6, libvirt_constcharPtrWrap(err->str3), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 7, libvirt_intWrap(err->int1), error);
-    VIR_PY_TUPLE_SET_GOTO(info, 8, libvirt_intWrap(err->int2), error);
-
-    return info;
-
- error:
-    Py_XDECREF(info);
-    return NULL;
+    return libvirt_virErrorPtrWrap(err);
 }
 
 static void
@@ -1826,6 +1783,8 @@ libvirt_virErrorFuncHandler(ATTRIBUTE_UNUSED void *ctx,
 {
     PyObject *list = NULL, *info = NULL;
     PyObject *result;
+    PyObject *handler;
+    PyObject *handlerCtxt;
 
     DEBUG("libvirt_virErrorFuncHandler(%p, %s, ...) called\n", ctx,
           err->message);
@@ -1835,15 +1794,23 @@ libvirt_virErrorFuncHandler(ATTRIBUTE_UNUSED void *ctx,
 
     LIBVIRT_ENSURE_THREAD_STATE;
 
-    if ((libvirt_virPythonErrorFuncHandler == NULL) ||
-        (libvirt_virPythonErrorFuncHandler == Py_None)) {
+    /* The handler may be replaced by another thread meanwhile */
+    VIR_PY_MUTEX_LOCK(libvirt_virPythonErrorFuncLock);
+    handler = libvirt_virPythonErrorFuncHandler;
+    handlerCtxt = libvirt_virPythonErrorFuncCtxt;
+    Py_XINCREF(handler);
+    Py_XINCREF(handlerCtxt);
+    VIR_PY_MUTEX_UNLOCK(libvirt_virPythonErrorFuncLock);
+
+    if ((handler == NULL) ||
+        (handler == Py_None)) {
         virDefaultErrorFunc(err);
     } else {
         if ((list = PyTuple_New(2)) == NULL)
             goto cleanup;
 
-        Py_XINCREF(libvirt_virPythonErrorFuncCtxt);
-        VIR_PY_TUPLE_SET_GOTO(list, 0, libvirt_virPythonErrorFuncCtxt, cleanup);
+        Py_XINCREF(handlerCtxt);
+        VIR_PY_TUPLE_SET_GOTO(list, 0, handlerCtxt, cleanup);
 
         if ((info = PyTuple_New(9)) == NULL)
             goto cleanup;
@@ -1861,12 +1828,14 @@ libvirt_virErrorFuncHandler(ATTRIBUTE_UNUSED void *ctx,
         VIR_PY_TUPLE_SET_GOTO(info, 8, libvirt_intWrap(err->int2), cleanup);
 
         /* TODO pass conn and dom if available */
-        result = PyObject_Call(libvirt_virPythonErrorFuncHandler, list, NULL);
+        result = PyObject_Call(handler, list, NULL);
         Py_XDECREF(result);
     }
 
  cleanup:
     Py_XDECREF(list);
+    Py_XDECREF(handler);
+    Py_XDECREF(handlerCtxt);
     LIBVIRT_RELEASE_THREAD_STATE;
 }
 
@@ -1877,6 +1846,8 @@ libvirt_virRegisterErrorHandler(ATTRIBUTE_UNUSED PyObject *self,
     PyObject *py_retval;
     PyObject *pyobj_f;
     PyObject *pyobj_ctx;
+    PyObject *oldHandler;
+    PyObject *oldCtxt;
 
     if (!PyArg_ParseTuple(args, (char *) "OO:virRegisterErrorHandler",
                           &pyobj_f, &pyobj_ctx))
@@ -1887,21 +1858,27 @@ libvirt_virRegisterErrorHandler(ATTRIBUTE_UNUSED PyObject *self,
 
     virSetErrorFunc(NULL, libvirt_virErrorFuncHandler);
 
-    Py_XDECREF(libvirt_virPythonErrorFuncHandler);
-    Py_XDECREF(libvirt_virPythonErrorFuncCtxt);
-
     if ((pyobj_f == Py_None) && (pyobj_ctx == Py_None)) {
-        libvirt_virPythonErrorFuncHandler = NULL;
-        libvirt_virPythonErrorFuncCtxt = NULL;
+        pyobj_f = NULL;
+        pyobj_ctx = NULL;
     } else {
         Py_XINCREF(pyobj_ctx);
         Py_XINCREF(pyobj_f);
-
-        /* TODO: check f is a function ! */
-        libvirt_virPythonErrorFuncHandler = pyobj_f;
-        libvirt_virPythonErrorFuncCtxt = pyobj_ctx;
     }
 
+    /* The previous handler is released once swapped out, as releasing
+     * it may run python code */
+    VIR_PY_MUTEX_LOCK(libvirt_virPythonErrorFuncLock);
+    oldHandler = libvirt_virPythonErrorFuncHandler;
+    oldCtxt = libvirt_virPythonErrorFuncCtxt;
+    /* TODO: check f is a function ! */
+    libvirt_virPythonErrorFuncHandler = pyobj_f;
+    libvirt_virPythonErrorFuncCtxt = pyobj_ctx;
+    VIR_PY_MUTEX_UNLOCK(libvirt_virPythonErrorFuncLock);
+
+    Py_XDECREF(oldHandler);
+    Py_XDECREF(oldCtxt);
+
     py_retval = libvirt_intWrap(1);
     return py_retval;
 }
@@ -2194,7 +2171,7 @@ libvirt_virConnectListDomainsID(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfDomains");
     c_retval = virConnectNumOfDomains(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -2205,7 +2182,7 @@ libvirt_virConnectListDomainsID(PyObject *self ATTRIBUTE_UNUSED,
         if (VIR_ALLOC_N(ids, c_retval) < 0)
             return PyErr_NoMemory();
 
-        LIBVIRT_BEGIN_ALLOW_THREADS;
+        LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectListDomains");
         c_retval = virConnectListDomains(conn, ids, c_retval);
         LIBVIRT_END_ALLOW_THREADS;
 
@@ -2296,7 +2273,7 @@ libvirt_virConnectListDefinedDomains(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfDefinedDomains");
     c_retval = virConnectNumOfDefinedDomains(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -2447,7 +2424,7 @@ libvirt_virDomainSnapshotListNames(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainSnapshotNum");
     c_retval = virDomainSnapshotNum(dom, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -2550,7 +2527,7 @@ libvirt_virDomainSnapshotListChildrenNames(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     snap = (virDomainSnapshotPtr) PyvirDomainSnapshot_Get(pyobj_snap);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainSnapshotNumChildren");
     c_retval = virDomainSnapshotNumChildren(snap, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -2664,7 +2641,7 @@ libvirt_virDomainRevertToSnapshot(PyObject *self ATTRIBUTE_UNUSED,
 
 static PyObject *
 libvirt_virDomainGetInfo(PyObject *self ATTRIBUTE_UNUSED,
-                         PyObject *args)
+                         LIBVIRT_METH_ARGS)
 {
     PyObject *py_retval;
     int c_retval;
@@ -2672,8 +2649,14 @@ libvirt_virDomainGetInfo(PyObject *self ATTRIBUTE_UNUSED,
     PyObject *pyobj_domain;
     virDomainInfo info;
 
+#ifdef LIBVIRT_FASTCALL
+    if (libvirt_checkArgs("virDomainGetInfo", nargs, 1) < 0)
+        return NULL;
+    pyobj_domain = args[0];
+#else
     if (!PyArg_ParseTuple(args, (char *)"O:virDomainGetInfo", &pyobj_domain))
         return NULL;
+#endif
     domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
@@ -2703,7 +2686,7 @@ libvirt_virDomainGetInfo(PyObject *self ATTRIBUTE_UNUSED,
 
 static PyObject *
 libvirt_virDomainGetState(PyObject *self ATTRIBUTE_UNUSED,
-                          PyObject *args)
+                          LIBVIRT_METH_ARGS)
 {
     PyObject *py_retval;
     int c_retval;
@@ -2713,9 +2696,16 @@ libvirt_virDomainGetState(PyObject *self ATTRIBUTE_UNUSED,
     int reason;
     unsigned int flags;
 
+#ifdef LIBVIRT_FASTCALL
+    if (libvirt_checkArgs("virDomainGetState", nargs, 2) < 0 ||
+        libvirt_uintMaskUnwrap(args[1], &flags) < 0)
+        return NULL;
+    pyobj_domain = args[0];
+#else
     if (!PyArg_ParseTuple(args, (char *)"OI:virDomainGetState",
                           &pyobj_domain, &flags))
         return NULL;
+#endif
 
     domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
 
@@ -2989,15 +2979,21 @@ libvirt_virDomainGetSecurityLabelList(PyObject *self ATTRIBUTE_UNUSED,
 
 static PyObject *
 libvirt_virDomainGetUUID(PyObject *self ATTRIBUTE_UNUSED,
-                         PyObject *args)
+                         LIBVIRT_METH_ARGS)
 {
     unsigned char uuid[VIR_UUID_BUFLEN];
     virDomainPtr domain;
     PyObject *pyobj_domain;
     int c_retval;
 
+#ifdef LIBVIRT_FASTCALL
+    if (libvirt_checkArgs("virDomainGetUUID", nargs, 1) < 0)
+        return NULL;
+    pyobj_domain = args[0];
+#else
     if (!PyArg_ParseTuple(args, (char *)"O:virDomainGetUUID", &pyobj_domain))
         return NULL;
+#endif
     domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
 
     if (domain == NULL)
@@ -3015,16 +3011,22 @@ libvirt_virDomainGetUUID(PyObject *self ATTRIBUTE_UNUSED,
 
 static PyObject *
 libvirt_virDomainGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
-                               PyObject *args)
+                               LIBVIRT_METH_ARGS)
 {
     char uuidstr[VIR_UUID_STRING_BUFLEN];
     virDomainPtr dom;
     PyObject *pyobj_dom;
     int c_retval;
 
+#ifdef LIBVIRT_FASTCALL
+    if (libvirt_checkArgs("virDomainGetUUIDString", nargs, 1) < 0)
+        return NULL;
+    pyobj_dom = args[0];
+#else
     if (!PyArg_ParseTuple(args, (char *)"O:virDomainGetUUIDString",
                           &pyobj_dom))
         return NULL;
+#endif
     dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
 
     if (dom == NULL)
@@ -3083,7 +3085,7 @@ libvirt_virConnectListNetworks(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfNetworks");
     c_retval = virConnectNumOfNetworks(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -3142,7 +3144,7 @@ libvirt_virConnectListDefinedNetworks(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfDefinedNetworks");
     c_retval = virConnectNumOfDefinedNetworks(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -3567,7 +3569,7 @@ libvirt_virConnectListStoragePools(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfStoragePools");
     c_retval = virConnectNumOfStoragePools(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -3624,7 +3626,7 @@ libvirt_virConnectListDefinedStoragePools(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfDefinedStoragePools");
     c_retval = virConnectNumOfDefinedStoragePools(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -3730,7 +3732,7 @@ libvirt_virStoragePoolListVolumes(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virStoragePoolNumOfVolumes");
     c_retval = virStoragePoolNumOfVolumes(pool);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -3820,437 +3822,769 @@ libvirt_virStoragePoolListAllVolumes(PyObject *self ATTRIBUTE_UNUSED,
 }
 #endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
 
-
-static PyObject *
-libvirt_virStoragePoolGetAutostart(PyObject *self ATTRIBUTE_UNUSED,
-                                   PyObject *args)
+#if LIBVIR_CHECK_VERSION(0, 10, 2)
+typedef struct {
+    virStorageVolPtr *vols;
+    virStorageVolInfo *infos;
+    char **paths;
+    bool *failed;               /* volumes failing otherwise than by
+                                 * having been deleted */
+} libvirtVolInfoJob;
+
+/* Fills the info and path of volume @i in, returns -1 on failure,
+ * its path staying NULL */
+static int
+libvirt_volInfoGet(libvirtVolInfoJob *job,
+                   ssize_t i)
 {
-    int c_retval, autostart;
-    virStoragePoolPtr pool;
-    PyObject *pyobj_pool;
-
-    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetAutostart",
-                          &pyobj_pool))
-        return NULL;
+    if (virStorageVolGetInfo(job->vols[i], &job->infos[i]) < 0 ||
+        !(job->paths[i] = virStorageVolGetPath(job->vols[i])))
+        return -1;
+    return 0;
+}
 
-    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
+/* Whether the last error only reports that the volume was deleted
+ * since it was listed */
+static bool
+libvirt_volInfoMissing(void)
+{
+    virErrorPtr err = virGetLastError();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStoragePoolGetAutostart(pool, &autostart);
-    LIBVIRT_END_ALLOW_THREADS;
+    return err && err->code == VIR_ERR_NO_STORAGE_VOL;
+}
 
-    if (c_retval < 0)
-        return VIR_PY_INT_FAIL;
+/* Called without the GIL, must not touch any Python object */
+static void
+libvirt_volInfoOne(void *opaque,
+                   ssize_t i)
+{
+    libvirtVolInfoJob *job = opaque;
 
-    return libvirt_intWrap(autostart);
+    /* A volume deleted since it was listed is left out, paths[i]
+     * staying NULL marks it */
+    if (libvirt_volInfoGet(job, i) < 0 && !libvirt_volInfoMissing())
+        job->failed[i] = true;
 }
 
 static PyObject *
-libvirt_virStoragePoolGetInfo(PyObject *self ATTRIBUTE_UNUSED,
-                              PyObject *args)
+libvirt_virStoragePoolListAllVolumesInfo(PyObject *self ATTRIBUTE_UNUSED,
+                                         PyObject *args)
 {
-    PyObject *py_retval;
-    int c_retval;
+    PyObject *py_retval = NULL;
+    PyObject *info = NULL;
     virStoragePoolPtr pool;
+    libvirtVolInfoJob job;
+    int c_retval = 0;
+    ssize_t nvols = 0;
+    ssize_t i;
+    unsigned int flags;
+    int nworkers = 0;
+    bool failed = false;
     PyObject *pyobj_pool;
-    virStoragePoolInfo info;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetInfo", &pyobj_pool))
+    if (!PyArg_ParseTuple(args, (char *)"OI|i:virStoragePoolListAllVolumesInfo",
+                          &pyobj_pool, &flags, &nworkers))
         return NULL;
+
     pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStoragePoolGetInfo(pool, &info);
+    memset(&job, 0, sizeof(job));
+
+    /* The list and every per volume lookup happen in one go, the
+     * calling thread taking its share of the volumes */
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolListAllVolumes(pool, &job.vols, flags);
+    if (c_retval > 0 &&
+        VIR_ALLOC_N(job.infos, c_retval) == 0 &&
+        VIR_ALLOC_N(job.paths, c_retval) == 0 &&
+        VIR_ALLOC_N(job.failed, c_retval) == 0) {
+        nvols = c_retval;
+        virPyParallelRun(nvols, nworkers, libvirt_volInfoOne, &job);
+
+        /* Other failures, such as a lost connection, are not taken for
+         * deletions, which would leave the volumes out. The lookups are
+         * made again by the calling thread, so that the libvirt error
+         * is its own. */
+        for (i = 0; i < nvols; i++) {
+            if (job.failed[i] &&
+                libvirt_volInfoGet(&job, i) < 0 &&
+                !libvirt_volInfoMissing()) {
+                failed = true;
+                break;
+            }
+        }
+        if (!failed)
+            virResetLastError();
+    }
     LIBVIRT_END_ALLOW_THREADS;
 
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+    if (c_retval < 0 || failed) {
+        py_retval = VIR_PY_NONE;
+        goto cleanup;
+    }
 
-    if ((py_retval = PyList_New(4)) == NULL)
-        return NULL;
+    if (c_retval > 0 && nvols == 0) {
+        PyErr_NoMemory();
+        goto cleanup;
+    }
 
-    VIR_PY_LIST_SET_GOTO(py_retval, 0,
-                         libvirt_intWrap(info.state), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 1,
-                         libvirt_ulonglongWrap(info.capacity), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 2,
-                         libvirt_ulonglongWrap(info.allocation), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 3,
-                         libvirt_ulonglongWrap(info.available), error);
+    if (!(py_retval = PyList_New(0)))
+        goto cleanup;
+
+    for (i = 0; i < nvols; i++) {
+        if (!job.paths[i])
+            continue;
+
+        if (!(info = PyTuple_New(6)))
+            goto error;
+
+        VIR_PY_TUPLE_SET_GOTO(info, 0,
+                              libvirt_constcharPtrWrap(virStorageVolGetName(job.vols[i])),
+                              error);
+        VIR_PY_TUPLE_SET_GOTO(info, 1,
+                              libvirt_constcharPtrWrap(virStorageVolGetKey(job.vols[i])),
+                              error);
+        VIR_PY_TUPLE_SET_GOTO(info, 2,
+                              libvirt_constcharPtrWrap(job.paths[i]), error);
+        VIR_PY_TUPLE_SET_GOTO(info, 3,
+                              libvirt_intWrap(job.infos[i].type), error);
+        VIR_PY_TUPLE_SET_GOTO(info, 4,
+                              libvirt_ulonglongWrap(job.infos[i].capacity), error);
+        VIR_PY_TUPLE_SET_GOTO(info, 5,
+                              libvirt_ulonglongWrap(job.infos[i].allocation), error);
+
+        if (PyList_Append(py_retval, info) < 0)
+            goto error;
+        Py_CLEAR(info);
+    }
 
+ cleanup:
+    for (i = 0; i < c_retval; i++) {
+        virStorageVolFree(job.vols[i]);
+        if (job.paths)
+            VIR_FREE(job.paths[i]);
+    }
+    VIR_FREE(job.vols);
+    VIR_FREE(job.infos);
+    VIR_FREE(job.paths);
+    VIR_FREE(job.failed);
     return py_retval;
 
  error:
-    Py_XDECREF(py_retval);
-    return NULL;
+    Py_XDECREF(info);
+    Py_CLEAR(py_retval);
+    goto cleanup;
 }
+#endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
 
+typedef struct _libvirtLookupJob libvirtLookupJob;
 
-static PyObject *
-libvirt_virStorageVolGetInfo(PyObject *self ATTRIBUTE_UNUSED,
-                             PyObject *args)
-{
-    PyObject *py_retval;
-    int c_retval;
-    virStorageVolPtr pool;
-    PyObject *pyobj_pool;
-    virStorageVolInfo info;
-
-    if (!PyArg_ParseTuple(args, (char *)"O:virStorageVolGetInfo", &pyobj_pool))
-        return NULL;
-    pool = (virStorageVolPtr) PyvirStorageVol_Get(pyobj_pool);
+/* Called without the GIL, returns the object for key @i or NULL */
+typedef void *(*libvirtLookupFunc)(libvirtLookupJob *job, ssize_t i);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStorageVolGetInfo(pool, &info);
-    LIBVIRT_END_ALLOW_THREADS;
+struct _libvirtLookupJob {
+    void *parent;               /* connection or storage pool */
+    libvirtLookupFunc lookup;
+    char **names;               /* the keys, unless looking up by ID */
+    int *ids;
+    void **objs;
+    bool *failed;               /* keys failing otherwise than by not
+                                 * existing */
+};
 
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+/* Whether the last error only reports that the object looked up does
+ * not exist, which the batch lookups report as None */
+static bool
+libvirt_lookupMissing(void)
+{
+    virErrorPtr err = virGetLastError();
 
-    if ((py_retval = PyList_New(3)) == NULL)
-        return NULL;
+    if (!err)
+        return false;
 
-    VIR_PY_LIST_SET_GOTO(py_retval, 0,
-                         libvirt_intWrap(info.type), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 1,
-                         libvirt_ulonglongWrap(info.capacity), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 2,
-                         libvirt_ulonglongWrap(info.allocation), error);
+    switch (err->code) {
+    case VIR_ERR_NO_DOMAIN:
+    case VIR_ERR_NO_NETWORK:
+    case VIR_ERR_NO_STORAGE_POOL:
+    case VIR_ERR_NO_STORAGE_VOL:
+    case VIR_ERR_INVALID_ARG:
+        return true;
+    default:
+        return false;
+    }
+}
 
-    return py_retval;
+/* Called without the GIL, must not touch any Python object */
+static void
+libvirt_lookupOne(void *opaque,
+                  ssize_t i)
+{
+    libvirtLookupJob *job = opaque;
 
- error:
-    Py_DECREF(py_retval);
-    return NULL;
+    if (!(job->objs[i] = job->lookup(job, i)) && !libvirt_lookupMissing())
+        job->failed[i] = true;
 }
 
-#if LIBVIR_CHECK_VERSION(3, 0, 0)
+/*
+ * Look the objects named by the list @pyobj_keys up with @lookup, the
+ * calling thread and up to @nworkers extra ones sharing the keys, all
+ * of it without the GIL. Keys are strings, or integers if @byID. The
+ * objects are turned into capsules by @wrap and freed by @release, the
+ * ones which do not exist being None.
+ *
+ * If a lookup fails for another reason, it is made again by the calling
+ * thread, so that the libvirt error is its own, and None is returned
+ * if it fails again. The lookups are accounted to @name in the call
+ * statistics.
+ */
 static PyObject *
-libvirt_virStorageVolGetInfoFlags(PyObject *self ATTRIBUTE_UNUSED,
-                                  PyObject *args)
+libvirt_lookupBatch(const char *name,
+                    void *parent,
+                    PyObject *pyobj_keys,
+                    bool byID,
+                    int nworkers,
+                    libvirtLookupFunc lookup,
+                    PyObject *(*wrap)(void *obj),
+                    void (*release)(void *obj))
 {
-    PyObject *py_retval;
-    int c_retval;
-    virStorageVolPtr pool;
-    PyObject *pyobj_pool;
-    virStorageVolInfo info;
-    unsigned int flags;
+    PyObject *py_retval = NULL;
+    libvirtLookupJob job;
+    ssize_t nkeys;
+    ssize_t i;
+    int c_retval = 0;
 
-    if (!PyArg_ParseTuple(args, (char *)"OI:virStorageVolGetInfoFlags", &pyobj_pool, &flags))
+    if (!PyList_Check(pyobj_keys)) {
+        PyErr_SetString(PyExc_TypeError, "keys must be a list");
         return NULL;
-    pool = (virStorageVolPtr) PyvirStorageVol_Get(pyobj_pool);
+    }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStorageVolGetInfoFlags(pool, &info, flags);
+    memset(&job, 0, sizeof(job));
+    job.parent = parent;
+    job.lookup = lookup;
+    nkeys = PyList_Size(pyobj_keys);
+
+    if (VIR_ALLOC_N(job.objs, nkeys > 0 ? nkeys : 1) < 0 ||
+        VIR_ALLOC_N(job.failed, nkeys > 0 ? nkeys : 1) < 0 ||
+        (byID && VIR_ALLOC_N(job.ids, nkeys > 0 ? nkeys : 1) < 0) ||
+        (!byID && VIR_ALLOC_N(job.names, nkeys > 0 ? nkeys : 1) < 0)) {
+        PyErr_NoMemory();
+        goto cleanup;
+    }
+
+    /* The keys are copied as the list may change once the GIL is
+     * released */
+    for (i = 0; i < nkeys; i++) {
+        PyObject *key = PyList_GetItem(pyobj_keys, i);
+
+        if (byID ? libvirt_intUnwrap(key, &job.ids[i]) < 0 :
+            libvirt_charPtrUnwrap(key, &job.names[i]) < 0)
+            goto cleanup;
+    }
+
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS(name);
+    virPyParallelRun(nkeys, nworkers, libvirt_lookupOne, &job);
+
+    for (i = 0; i < nkeys; i++) {
+        if (job.failed[i] &&
+            !(job.objs[i] = lookup(&job, i)) &&
+            !libvirt_lookupMissing()) {
+            c_retval = -1;
+            break;
+        }
+    }
+    /* Only an error other than a miss is reported */
+    if (c_retval == 0)
+        virResetLastError();
     LIBVIRT_END_ALLOW_THREADS;
 
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+    if (c_retval < 0) {
+        py_retval = VIR_PY_NONE;
+        goto cleanup;
+    }
 
-    if ((py_retval = PyList_New(3)) == NULL)
-        return NULL;
+    if (!(py_retval = PyList_New(nkeys)))
+        goto cleanup;
 
-    VIR_PY_LIST_SET_GOTO(py_retval, 0,
-                         libvirt_intWrap(info.type), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 1,
-                         libvirt_ulonglongWrap(info.capacity), error);
-    VIR_PY_LIST_SET_GOTO(py_retval, 2,
-                         libvirt_ulonglongWrap(info.allocation), error);
+    for (i = 0; i < nkeys; i++) {
+        VIR_PY_LIST_SET_GOTO(py_retval, i, wrap(job.objs[i]), error);
+        /* python steals the pointer */
+        job.objs[i] = NULL;
+    }
 
+ cleanup:
+    for (i = 0; i < nkeys; i++) {
+        if (job.objs && job.objs[i])
+            release(job.objs[i]);
+        if (job.names)
+            VIR_FREE(job.names[i]);
+    }
+    VIR_FREE(job.objs);
+    VIR_FREE(job.failed);
+    VIR_FREE(job.names);
+    VIR_FREE(job.ids);
     return py_retval;
 
  error:
-    Py_DECREF(py_retval);
-    return NULL;
+    Py_CLEAR(py_retval);
+    goto cleanup;
 }
-#endif
 
-static PyObject *
-libvirt_virStoragePoolGetUUID(PyObject *self ATTRIBUTE_UNUSED,
-                              PyObject *args)
-{
-    unsigned char uuid[VIR_UUID_BUFLEN];
-    virStoragePoolPtr pool;
-    PyObject *pyobj_pool;
-    int c_retval;
+#define LIBVIRT_LOOKUP_BATCH(pyname, lookupFunc, parentType, parentGet, \
+                             objType, key, byID) \
+static void * \
+libvirt_##pyname##One(libvirtLookupJob *job, \
+                      ssize_t i) \
+{ \
+    return lookupFunc((parentType) job->parent, job->key[i]); \
+} \
+ \
+static PyObject * \
+libvirt_##pyname##Wrap(void *obj) \
+{ \
+    return libvirt_##objType##PtrWrap(obj); \
+} \
+ \
+static void \
+libvirt_##pyname##Free(void *obj) \
+{ \
+    objType##Free(obj); \
+} \
+ \
+static PyObject * \
+libvirt_##pyname(PyObject *self ATTRIBUTE_UNUSED, \
+                 PyObject *args) \
+{ \
+    PyObject *pyobj_parent; \
+    PyObject *pyobj_keys; \
+    int nworkers = 0; \
+ \
+    if (!PyArg_ParseTuple(args, (char *)"OO|i:" #pyname, \
+                          &pyobj_parent, &pyobj_keys, &nworkers)) \
+        return NULL; \
+ \
+    return libvirt_lookupBatch(#pyname, parentGet(pyobj_parent), \
+                               pyobj_keys, byID, \
+                               nworkers, libvirt_##pyname##One, \
+                               libvirt_##pyname##Wrap, \
+                               libvirt_##pyname##Free); \
+}
+
+LIBVIRT_LOOKUP_BATCH(virDomainLookupByNames, virDomainLookupByName,
+                     virConnectPtr, PyvirConnect_Get, virDomain, names, false)
+LIBVIRT_LOOKUP_BATCH(virDomainLookupByUUIDStrings, virDomainLookupByUUIDString,
+                     virConnectPtr, PyvirConnect_Get, virDomain, names, false)
+LIBVIRT_LOOKUP_BATCH(virDomainLookupByIDs, virDomainLookupByID,
+                     virConnectPtr, PyvirConnect_Get, virDomain, ids, true)
+LIBVIRT_LOOKUP_BATCH(virNetworkLookupByNames, virNetworkLookupByName,
+                     virConnectPtr, PyvirConnect_Get, virNetwork, names, false)
+LIBVIRT_LOOKUP_BATCH(virNetworkLookupByUUIDStrings, virNetworkLookupByUUIDString,
+                     virConnectPtr, PyvirConnect_Get, virNetwork, names, false)
+LIBVIRT_LOOKUP_BATCH(virStoragePoolLookupByNames, virStoragePoolLookupByName,
+                     virConnectPtr, PyvirConnect_Get, virStoragePool, names, false)
+LIBVIRT_LOOKUP_BATCH(virStoragePoolLookupByUUIDStrings, virStoragePoolLookupByUUIDString,
+                     virConnectPtr, PyvirConnect_Get, virStoragePool, names, false)
+LIBVIRT_LOOKUP_BATCH(virStorageVolLookupByNames, virStorageVolLookupByName,
+                     virStoragePoolPtr, PyvirStoragePool_Get, virStorageVol, names, false)
+LIBVIRT_LOOKUP_BATCH(virStorageVolLookupByKeys, virStorageVolLookupByKey,
+                     virConnectPtr, PyvirConnect_Get, virStorageVol, names, false)
+LIBVIRT_LOOKUP_BATCH(virStorageVolLookupByPaths, virStorageVolLookupByPath,
+                     virConnectPtr, PyvirConnect_Get, virStorageVol, names, false)
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetUUID", &pyobj_pool))
-        return NULL;
-    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
-
-    if (pool == NULL)
-        return VIR_PY_NONE;
-
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStoragePoolGetUUID(pool, &uuid[0]);
-    LIBVIRT_END_ALLOW_THREADS;
-
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+/*
+ * The bulk variants of the per object getters whose results are not
+ * plain values, see virPyBulkCall(). generator.py emits the other ones.
+ */
 
-    return libvirt_charPtrSizeWrap((char *) &uuid[0], VIR_UUID_BUFLEN);
+static void
+libvirt_virDomainGetInfoBulkOne(void *obj,
+                                unsigned int flags ATTRIBUTE_UNUSED,
+                                void *result)
+{
+    virDomainGetInfo(obj, result);
 }
 
 static PyObject *
-libvirt_virStoragePoolGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
-                                    PyObject *args)
+libvirt_virDomainGetInfoBulkWrap(void *result)
 {
-    char uuidstr[VIR_UUID_STRING_BUFLEN];
-    virStoragePoolPtr pool;
-    PyObject *pyobj_pool;
-    int c_retval;
+    virDomainInfo *info = result;
+    PyObject *py_retval;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetUUIDString",
-                          &pyobj_pool))
+    if ((py_retval = PyList_New(5)) == NULL)
         return NULL;
-    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
-
-    if (pool == NULL)
-        return VIR_PY_NONE;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStoragePoolGetUUIDString(pool, &uuidstr[0]);
-    LIBVIRT_END_ALLOW_THREADS;
+    VIR_PY_LIST_SET_GOTO(py_retval, 0, libvirt_intWrap(info->state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1, libvirt_ulongWrap(info->maxMem), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2, libvirt_ulongWrap(info->memory), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 3,
+                         libvirt_intWrap(info->nrVirtCpu), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 4,
+                         libvirt_ulonglongWrap(info->cpuTime), error);
 
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+    return py_retval;
 
-    return libvirt_constcharPtrWrap((char *) &uuidstr[0]);
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
 }
 
 static PyObject *
-libvirt_virStoragePoolLookupByUUID(PyObject *self ATTRIBUTE_UNUSED,
-                                   PyObject *args)
+libvirt_virDomainGetInfoBulk(PyObject *self ATTRIBUTE_UNUSED,
+                             PyObject *args)
 {
-    virStoragePoolPtr c_retval;
-    virConnectPtr conn;
-    PyObject *pyobj_conn;
-    unsigned char * uuid;
-    Py_ssize_t len;
+    PyObject *pyobj_doms;
+    int nworkers = 0;
 
-    if (!PyArg_ParseTuple(args, (char *)"Oz#:virStoragePoolLookupByUUID",
-                          &pyobj_conn, &uuid, &len))
+    if (!PyArg_ParseTuple(args, (char *)"O|i:virDomainGetInfoBulk",
+                          &pyobj_doms, &nworkers))
         return NULL;
-    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    if ((uuid == NULL) || (len != VIR_UUID_BUFLEN))
-        return VIR_PY_NONE;
+    return virPyBulkCall("virDomainGetInfoBulk", "virDomainPtr",
+                         pyobj_doms, 0, nworkers, sizeof(virDomainInfo),
+                         libvirt_virDomainGetInfoBulkOne,
+                         libvirt_virDomainGetInfoBulkWrap, NULL);
+}
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virStoragePoolLookupByUUID(conn, uuid);
-    LIBVIRT_END_ALLOW_THREADS;
+typedef struct {
+    int state;
+    int reason;
+} libvirtDomainState;
 
-    return libvirt_virStoragePoolPtrWrap((virStoragePoolPtr) c_retval);
+static void
+libvirt_virDomainGetStateBulkOne(void *obj,
+                                 unsigned int flags,
+                                 void *result)
+{
+    libvirtDomainState *state = result;
+
+    virDomainGetState(obj, &state->state, &state->reason, flags);
 }
 
 static PyObject *
-libvirt_virNodeListDevices(PyObject *self ATTRIBUTE_UNUSED,
-                           PyObject *args)
+libvirt_virDomainGetStateBulkWrap(void *result)
 {
+    libvirtDomainState *state = result;
     PyObject *py_retval;
-    char **names = NULL;
-    int c_retval;
-    ssize_t i;
-    virConnectPtr conn;
-    PyObject *pyobj_conn;
-    char *cap;
-    unsigned int flags;
 
-    if (!PyArg_ParseTuple(args, (char *)"OzI:virNodeListDevices",
-                          &pyobj_conn, &cap, &flags))
+    if ((py_retval = PyList_New(2)) == NULL)
         return NULL;
-    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
-
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virNodeNumOfDevices(conn, cap, flags);
-    LIBVIRT_END_ALLOW_THREADS;
-
-    if (c_retval < 0)
-        return VIR_PY_NONE;
-
-    if (c_retval) {
-        if (VIR_ALLOC_N(names, c_retval) < 0)
-            return PyErr_NoMemory();
-
-        LIBVIRT_BEGIN_ALLOW_THREADS;
-        c_retval = virNodeListDevices(conn, cap, names, c_retval, flags);
-        LIBVIRT_END_ALLOW_THREADS;
-
-        if (c_retval < 0) {
-            py_retval = VIR_PY_NONE;
-            goto cleanup;
-        }
-    }
-
-    if ((py_retval = PyList_New(c_retval)) == NULL)
-        goto cleanup;
 
-    if (names)
-        for (i = 0; i < c_retval; i++)
-            VIR_PY_LIST_SET_GOTO(py_retval, i,
-                                 libvirt_constcharPtrWrap(names[i]), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 0, libvirt_intWrap(state->state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1, libvirt_intWrap(state->reason), error);
 
- cleanup:
-    if (c_retval > 0)
-        for (i = 0; i < c_retval; i++)
-            VIR_FREE(names[i]);
-    VIR_FREE(names);
     return py_retval;
 
  error:
-    Py_CLEAR(py_retval);
-    goto cleanup;
+    Py_XDECREF(py_retval);
+    return NULL;
 }
 
-#if LIBVIR_CHECK_VERSION(0, 10, 2)
 static PyObject *
-libvirt_virConnectListAllNodeDevices(PyObject *self ATTRIBUTE_UNUSED,
-                                     PyObject *args)
+libvirt_virDomainGetStateBulk(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
 {
-    PyObject *pyobj_conn;
-    PyObject *py_retval = NULL;
-    virConnectPtr conn;
-    virNodeDevicePtr *devices = NULL;
-    int c_retval = 0;
-    ssize_t i;
+    PyObject *pyobj_doms;
     unsigned int flags;
+    int nworkers = 0;
 
-    if (!PyArg_ParseTuple(args, (char *)"OI:virConnectListAllNodeDevices",
-                          &pyobj_conn, &flags))
+    if (!PyArg_ParseTuple(args, (char *)"OI|i:virDomainGetStateBulk",
+                          &pyobj_doms, &flags, &nworkers))
         return NULL;
-    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virConnectListAllNodeDevices(conn, &devices, flags);
-    LIBVIRT_END_ALLOW_THREADS;
+    return virPyBulkCall("virDomainGetStateBulk", "virDomainPtr",
+                         pyobj_doms, flags, nworkers,
+                         sizeof(libvirtDomainState),
+                         libvirt_virDomainGetStateBulkOne,
+                         libvirt_virDomainGetStateBulkWrap, NULL);
+}
 
-    if (c_retval < 0)
-        return VIR_PY_NONE;
+static void
+libvirt_virStoragePoolGetInfoBulkOne(void *obj,
+                                     unsigned int flags ATTRIBUTE_UNUSED,
+                                     void *result)
+{
+    virStoragePoolGetInfo(obj, result);
+}
 
-    if (!(py_retval = PyList_New(c_retval)))
-        goto cleanup;
+static PyObject *
+libvirt_virStoragePoolGetInfoBulkWrap(void *result)
+{
+    virStoragePoolInfo *info = result;
+    PyObject *py_retval;
 
-    for (i = 0; i < c_retval; i++) {
-        VIR_PY_LIST_SET_GOTO(py_retval, i,
-                             libvirt_virNodeDevicePtrWrap(devices[i]), error);
-        /* python steals the pointer */
-        devices[i] = NULL;
-    }
+    if ((py_retval = PyList_New(4)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info->state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info->capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info->allocation), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 3,
+                         libvirt_ulonglongWrap(info->available), error);
 
- cleanup:
-    for (i = 0; i < c_retval; i++)
-        if (devices[i])
-            virNodeDeviceFree(devices[i]);
-    VIR_FREE(devices);
     return py_retval;
 
  error:
-    Py_CLEAR(py_retval);
-    goto cleanup;
+    Py_XDECREF(py_retval);
+    return NULL;
 }
-#endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
 
 static PyObject *
-libvirt_virNodeDeviceListCaps(PyObject *self ATTRIBUTE_UNUSED,
-                              PyObject *args)
+libvirt_virStoragePoolGetInfoBulk(PyObject *self ATTRIBUTE_UNUSED,
+                                  PyObject *args)
 {
-    PyObject *py_retval;
-    char **names = NULL;
-    int c_retval;
-    ssize_t i;
-    virNodeDevicePtr dev;
-    PyObject *pyobj_dev;
+    PyObject *pyobj_pools;
+    int nworkers = 0;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virNodeDeviceListCaps", &pyobj_dev))
+    if (!PyArg_ParseTuple(args, (char *)"O|i:virStoragePoolGetInfoBulk",
+                          &pyobj_pools, &nworkers))
         return NULL;
-    dev = (virNodeDevicePtr) PyvirNodeDevice_Get(pyobj_dev);
-
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virNodeDeviceNumOfCaps(dev);
-    LIBVIRT_END_ALLOW_THREADS;
-
-    if (c_retval < 0)
-        return VIR_PY_NONE;
 
-    if (c_retval) {
-        if (VIR_ALLOC_N(names, c_retval) < 0)
-            return PyErr_NoMemory();
+    return virPyBulkCall("virStoragePoolGetInfoBulk", "virStoragePoolPtr",
+                         pyobj_pools, 0, nworkers, sizeof(virStoragePoolInfo),
+                         libvirt_virStoragePoolGetInfoBulkOne,
+                         libvirt_virStoragePoolGetInfoBulkWrap, NULL);
+}
 
-        LIBVIRT_BEGIN_ALLOW_THREADS;
-        c_retval = virNodeDeviceListCaps(dev, names, c_retval);
-        LIBVIRT_END_ALLOW_THREADS;
+static void
+libvirt_virStorageVolGetInfoBulkOne(void *obj,
+                                    unsigned int flags ATTRIBUTE_UNUSED,
+                                    void *result)
+{
+    virStorageVolGetInfo(obj, result);
+}
 
-        if (c_retval < 0) {
-            py_retval = VIR_PY_NONE;
-            goto cleanup;
-        }
-    }
+static PyObject *
+libvirt_virStorageVolGetInfoBulkWrap(void *result)
+{
+    virStorageVolInfo *info = result;
+    PyObject *py_retval;
 
-    if ((py_retval = PyList_New(c_retval)) == NULL)
-        goto cleanup;
+    if ((py_retval = PyList_New(3)) == NULL)
+        return NULL;
 
-    if (names)
-        for (i = 0; i < c_retval; i++)
-            VIR_PY_LIST_SET_GOTO(py_retval, i,
-                                 libvirt_constcharPtrWrap(names[i]), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info->type), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info->capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info->allocation), error);
 
- cleanup:
-    if (c_retval > 0)
-        for (i = 0; i < c_retval; i++)
-            VIR_FREE(names[i]);
-    VIR_FREE(names);
     return py_retval;
 
  error:
-    Py_CLEAR(py_retval);
-    goto cleanup;
+    Py_XDECREF(py_retval);
+    return NULL;
 }
 
 static PyObject *
-libvirt_virSecretGetUUID(PyObject *self ATTRIBUTE_UNUSED,
-                         PyObject *args)
+libvirt_virStorageVolGetInfoBulk(PyObject *self ATTRIBUTE_UNUSED,
+                                 PyObject *args)
 {
-    unsigned char uuid[VIR_UUID_BUFLEN];
-    virSecretPtr secret;
-    PyObject *pyobj_secret;
-    int c_retval;
+    PyObject *pyobj_vols;
+    int nworkers = 0;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virSecretGetUUID", &pyobj_secret))
+    if (!PyArg_ParseTuple(args, (char *)"O|i:virStorageVolGetInfoBulk",
+                          &pyobj_vols, &nworkers))
         return NULL;
-    secret = (virSecretPtr) PyvirSecret_Get(pyobj_secret);
 
-    if (secret == NULL)
-        return VIR_PY_NONE;
+    return virPyBulkCall("virStorageVolGetInfoBulk", "virStorageVolPtr",
+                         pyobj_vols, 0, nworkers, sizeof(virStorageVolInfo),
+                         libvirt_virStorageVolGetInfoBulkOne,
+                         libvirt_virStorageVolGetInfoBulkWrap, NULL);
+}
+
+
+static PyObject *
+libvirt_virStoragePoolGetAutostart(PyObject *self ATTRIBUTE_UNUSED,
+                                   PyObject *args)
+{
+    int c_retval, autostart;
+    virStoragePoolPtr pool;
+    PyObject *pyobj_pool;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetAutostart",
+                          &pyobj_pool))
+        return NULL;
+
+    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virSecretGetUUID(secret, &uuid[0]);
+    c_retval = virStoragePoolGetAutostart(pool, &autostart);
     LIBVIRT_END_ALLOW_THREADS;
 
     if (c_retval < 0)
-        return VIR_PY_NONE;
+        return VIR_PY_INT_FAIL;
 
-    return libvirt_charPtrSizeWrap((char *) &uuid[0], VIR_UUID_BUFLEN);
+    return libvirt_intWrap(autostart);
 }
 
 static PyObject *
-libvirt_virSecretGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
-                               PyObject *args)
+libvirt_virStoragePoolGetInfo(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
+{
+    PyObject *py_retval;
+    int c_retval;
+    virStoragePoolPtr pool;
+    PyObject *pyobj_pool;
+    virStoragePoolInfo info;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetInfo", &pyobj_pool))
+        return NULL;
+    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolGetInfo(pool, &info);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    if ((py_retval = PyList_New(4)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info.state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info.capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info.allocation), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 3,
+                         libvirt_ulonglongWrap(info.available), error);
+
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
+}
+
+
+static PyObject *
+libvirt_virStorageVolGetInfo(PyObject *self ATTRIBUTE_UNUSED,
+                             PyObject *args)
+{
+    PyObject *py_retval;
+    int c_retval;
+    virStorageVolPtr pool;
+    PyObject *pyobj_pool;
+    virStorageVolInfo info;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virStorageVolGetInfo", &pyobj_pool))
+        return NULL;
+    pool = (virStorageVolPtr) PyvirStorageVol_Get(pyobj_pool);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStorageVolGetInfo(pool, &info);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    if ((py_retval = PyList_New(3)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info.type), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info.capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info.allocation), error);
+
+    return py_retval;
+
+ error:
+    Py_DECREF(py_retval);
+    return NULL;
+}
+
+#if LIBVIR_CHECK_VERSION(3, 0, 0)
+static PyObject *
+libvirt_virStorageVolGetInfoFlags(PyObject *self ATTRIBUTE_UNUSED,
+                                  PyObject *args)
+{
+    PyObject *py_retval;
+    int c_retval;
+    virStorageVolPtr pool;
+    PyObject *pyobj_pool;
+    virStorageVolInfo info;
+    unsigned int flags;
+
+    if (!PyArg_ParseTuple(args, (char *)"OI:virStorageVolGetInfoFlags", &pyobj_pool, &flags))
+        return NULL;
+    pool = (virStorageVolPtr) PyvirStorageVol_Get(pyobj_pool);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStorageVolGetInfoFlags(pool, &info, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    if ((py_retval = PyList_New(3)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info.type), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info.capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info.allocation), error);
+
+    return py_retval;
+
+ error:
+    Py_DECREF(py_retval);
+    return NULL;
+}
+#endif
+
+static PyObject *
+libvirt_virStoragePoolGetUUID(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
+{
+    unsigned char uuid[VIR_UUID_BUFLEN];
+    virStoragePoolPtr pool;
+    PyObject *pyobj_pool;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetUUID", &pyobj_pool))
+        return NULL;
+    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
+
+    if (pool == NULL)
+        return VIR_PY_NONE;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolGetUUID(pool, &uuid[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    return libvirt_charPtrSizeWrap((char *) &uuid[0], VIR_UUID_BUFLEN);
+}
+
+static PyObject *
+libvirt_virStoragePoolGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
+                                    PyObject *args)
 {
     char uuidstr[VIR_UUID_STRING_BUFLEN];
-    virSecretPtr dom;
-    PyObject *pyobj_dom;
+    virStoragePoolPtr pool;
+    PyObject *pyobj_pool;
     int c_retval;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virSecretGetUUIDString",
-                          &pyobj_dom))
+    if (!PyArg_ParseTuple(args, (char *)"O:virStoragePoolGetUUIDString",
+                          &pyobj_pool))
         return NULL;
-    dom = (virSecretPtr) PyvirSecret_Get(pyobj_dom);
+    pool = (virStoragePoolPtr) PyvirStoragePool_Get(pyobj_pool);
 
-    if (dom == NULL)
+    if (pool == NULL)
         return VIR_PY_NONE;
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virSecretGetUUIDString(dom, &uuidstr[0]);
+    c_retval = virStoragePoolGetUUIDString(pool, &uuidstr[0]);
     LIBVIRT_END_ALLOW_THREADS;
 
     if (c_retval < 0)
@@ -4260,16 +4594,16 @@ libvirt_virSecretGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
 }
 
 static PyObject *
-libvirt_virSecretLookupByUUID(PyObject *self ATTRIBUTE_UNUSED,
-                              PyObject *args)
+libvirt_virStoragePoolLookupByUUID(PyObject *self ATTRIBUTE_UNUSED,
+                                   PyObject *args)
 {
-    virSecretPtr c_retval;
+    virStoragePoolPtr c_retval;
     virConnectPtr conn;
     PyObject *pyobj_conn;
     unsigned char * uuid;
     Py_ssize_t len;
 
-    if (!PyArg_ParseTuple(args, (char *)"Oz#:virSecretLookupByUUID",
+    if (!PyArg_ParseTuple(args, (char *)"Oz#:virStoragePoolLookupByUUID",
                           &pyobj_conn, &uuid, &len))
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
@@ -4278,41 +4612,43 @@ libvirt_virSecretLookupByUUID(PyObject *self ATTRIBUTE_UNUSED,
         return VIR_PY_NONE;
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virSecretLookupByUUID(conn, uuid);
+    c_retval = virStoragePoolLookupByUUID(conn, uuid);
     LIBVIRT_END_ALLOW_THREADS;
 
-    return libvirt_virSecretPtrWrap((virSecretPtr) c_retval);
+    return libvirt_virStoragePoolPtrWrap((virStoragePoolPtr) c_retval);
 }
 
-
 static PyObject *
-libvirt_virConnectListSecrets(PyObject *self ATTRIBUTE_UNUSED,
-                              PyObject *args)
+libvirt_virNodeListDevices(PyObject *self ATTRIBUTE_UNUSED,
+                           PyObject *args)
 {
     PyObject *py_retval;
-    char **uuids = NULL;
-    virConnectPtr conn;
+    char **names = NULL;
     int c_retval;
     ssize_t i;
+    virConnectPtr conn;
     PyObject *pyobj_conn;
+    char *cap;
+    unsigned int flags;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virConnectListSecrets", &pyobj_conn))
+    if (!PyArg_ParseTuple(args, (char *)"OzI:virNodeListDevices",
+                          &pyobj_conn, &cap, &flags))
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virConnectNumOfSecrets(conn);
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeNumOfDevices");
+    c_retval = virNodeNumOfDevices(conn, cap, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
     if (c_retval < 0)
         return VIR_PY_NONE;
 
     if (c_retval) {
-        if (VIR_ALLOC_N(uuids, c_retval) < 0)
+        if (VIR_ALLOC_N(names, c_retval) < 0)
             return PyErr_NoMemory();
 
         LIBVIRT_BEGIN_ALLOW_THREADS;
-        c_retval = virConnectListSecrets(conn, uuids, c_retval);
+        c_retval = virNodeListDevices(conn, cap, names, c_retval, flags);
         LIBVIRT_END_ALLOW_THREADS;
 
         if (c_retval < 0) {
@@ -4324,17 +4660,16 @@ libvirt_virConnectListSecrets(PyObject *self ATTRIBUTE_UNUSED,
     if ((py_retval = PyList_New(c_retval)) == NULL)
         goto cleanup;
 
-    if (uuids) {
+    if (names)
         for (i = 0; i < c_retval; i++)
             VIR_PY_LIST_SET_GOTO(py_retval, i,
-                                 libvirt_constcharPtrWrap(uuids[i]), error);
-    }
+                                 libvirt_constcharPtrWrap(names[i]), error);
 
  cleanup:
     if (c_retval > 0)
         for (i = 0; i < c_retval; i++)
-            VIR_FREE(uuids[i]);
-    VIR_FREE(uuids);
+            VIR_FREE(names[i]);
+    VIR_FREE(names);
     return py_retval;
 
  error:
@@ -4344,24 +4679,24 @@ libvirt_virConnectListSecrets(PyObject *self ATTRIBUTE_UNUSED,
 
 #if LIBVIR_CHECK_VERSION(0, 10, 2)
 static PyObject *
-libvirt_virConnectListAllSecrets(PyObject *self ATTRIBUTE_UNUSED,
-                                 PyObject *args)
+libvirt_virConnectListAllNodeDevices(PyObject *self ATTRIBUTE_UNUSED,
+                                     PyObject *args)
 {
     PyObject *pyobj_conn;
     PyObject *py_retval = NULL;
     virConnectPtr conn;
-    virSecretPtr *secrets = NULL;
+    virNodeDevicePtr *devices = NULL;
     int c_retval = 0;
     ssize_t i;
     unsigned int flags;
 
-    if (!PyArg_ParseTuple(args, (char *)"OI:virConnectListAllSecrets",
+    if (!PyArg_ParseTuple(args, (char *)"OI:virConnectListAllNodeDevices",
                           &pyobj_conn, &flags))
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virConnectListAllSecrets(conn, &secrets, flags);
+    c_retval = virConnectListAllNodeDevices(conn, &devices, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
     if (c_retval < 0)
@@ -4372,16 +4707,16 @@ libvirt_virConnectListAllSecrets(PyObject *self ATTRIBUTE_UNUSED,
 
     for (i = 0; i < c_retval; i++) {
         VIR_PY_LIST_SET_GOTO(py_retval, i,
-                             libvirt_virSecretPtrWrap(secrets[i]), error);
+                             libvirt_virNodeDevicePtrWrap(devices[i]), error);
         /* python steals the pointer */
-        secrets[i] = NULL;
+        devices[i] = NULL;
     }
 
  cleanup:
     for (i = 0; i < c_retval; i++)
-        if (secrets[i])
-            virSecretFree(secrets[i]);
-    VIR_FREE(secrets);
+        if (devices[i])
+            virNodeDeviceFree(devices[i]);
+    VIR_FREE(devices);
     return py_retval;
 
  error:
@@ -4391,32 +4726,272 @@ libvirt_virConnectListAllSecrets(PyObject *self ATTRIBUTE_UNUSED,
 #endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
 
 static PyObject *
-libvirt_virSecretGetValue(PyObject *self ATTRIBUTE_UNUSED,
-                          PyObject *args)
+libvirt_virNodeDeviceListCaps(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
 {
     PyObject *py_retval;
-    unsigned char *c_retval;
-    size_t size;
-    virSecretPtr secret;
-    PyObject *pyobj_secret;
-    unsigned int flags;
+    char **names = NULL;
+    int c_retval;
+    ssize_t i;
+    virNodeDevicePtr dev;
+    PyObject *pyobj_dev;
 
-    if (!PyArg_ParseTuple(args, (char *)"OI:virSecretGetValue", &pyobj_secret,
-                          &flags))
+    if (!PyArg_ParseTuple(args, (char *)"O:virNodeDeviceListCaps", &pyobj_dev))
         return NULL;
-    secret = (virSecretPtr) PyvirSecret_Get(pyobj_secret);
+    dev = (virNodeDevicePtr) PyvirNodeDevice_Get(pyobj_dev);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virSecretGetValue(secret, &size, flags);
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeDeviceNumOfCaps");
+    c_retval = virNodeDeviceNumOfCaps(dev);
     LIBVIRT_END_ALLOW_THREADS;
 
-    if (c_retval == NULL)
+    if (c_retval < 0)
         return VIR_PY_NONE;
 
-    py_retval = libvirt_charPtrSizeWrap((char*)c_retval, size);
-    VIR_FREE(c_retval);
+    if (c_retval) {
+        if (VIR_ALLOC_N(names, c_retval) < 0)
+            return PyErr_NoMemory();
 
-    return py_retval;
+        LIBVIRT_BEGIN_ALLOW_THREADS;
+        c_retval = virNodeDeviceListCaps(dev, names, c_retval);
+        LIBVIRT_END_ALLOW_THREADS;
+
+        if (c_retval < 0) {
+            py_retval = VIR_PY_NONE;
+            goto cleanup;
+        }
+    }
+
+    if ((py_retval = PyList_New(c_retval)) == NULL)
+        goto cleanup;
+
+    if (names)
+        for (i = 0; i < c_retval; i++)
+            VIR_PY_LIST_SET_GOTO(py_retval, i,
+                                 libvirt_constcharPtrWrap(names[i]), error);
+
+ cleanup:
+    if (c_retval > 0)
+        for (i = 0; i < c_retval; i++)
+            VIR_FREE(names[i]);
+    VIR_FREE(names);
+    return py_retval;
+
+ error:
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
+
+static PyObject *
+libvirt_virSecretGetUUID(PyObject *self ATTRIBUTE_UNUSED,
+                         PyObject *args)
+{
+    unsigned char uuid[VIR_UUID_BUFLEN];
+    virSecretPtr secret;
+    PyObject *pyobj_secret;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virSecretGetUUID", &pyobj_secret))
+        return NULL;
+    secret = (virSecretPtr) PyvirSecret_Get(pyobj_secret);
+
+    if (secret == NULL)
+        return VIR_PY_NONE;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virSecretGetUUID(secret, &uuid[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    return libvirt_charPtrSizeWrap((char *) &uuid[0], VIR_UUID_BUFLEN);
+}
+
+static PyObject *
+libvirt_virSecretGetUUIDString(PyObject *self ATTRIBUTE_UNUSED,
+                               PyObject *args)
+{
+    char uuidstr[VIR_UUID_STRING_BUFLEN];
+    virSecretPtr dom;
+    PyObject *pyobj_dom;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virSecretGetUUIDString",
+                          &pyobj_dom))
+        return NULL;
+    dom = (virSecretPtr) PyvirSecret_Get(pyobj_dom);
+
+    if (dom == NULL)
+        return VIR_PY_NONE;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virSecretGetUUIDString(dom, &uuidstr[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    return libvirt_constcharPtrWrap((char *) &uuidstr[0]);
+}
+
+static PyObject *
+libvirt_virSecretLookupByUUID(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
+{
+    virSecretPtr c_retval;
+    virConnectPtr conn;
+    PyObject *pyobj_conn;
+    unsigned char * uuid;
+    Py_ssize_t len;
+
+    if (!PyArg_ParseTuple(args, (char *)"Oz#:virSecretLookupByUUID",
+                          &pyobj_conn, &uuid, &len))
+        return NULL;
+    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
+
+    if ((uuid == NULL) || (len != VIR_UUID_BUFLEN))
+        return VIR_PY_NONE;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virSecretLookupByUUID(conn, uuid);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_virSecretPtrWrap((virSecretPtr) c_retval);
+}
+
+
+static PyObject *
+libvirt_virConnectListSecrets(PyObject *self ATTRIBUTE_UNUSED,
+                              PyObject *args)
+{
+    PyObject *py_retval;
+    char **uuids = NULL;
+    virConnectPtr conn;
+    int c_retval;
+    ssize_t i;
+    PyObject *pyobj_conn;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virConnectListSecrets", &pyobj_conn))
+        return NULL;
+    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfSecrets");
+    c_retval = virConnectNumOfSecrets(conn);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    if (c_retval) {
+        if (VIR_ALLOC_N(uuids, c_retval) < 0)
+            return PyErr_NoMemory();
+
+        LIBVIRT_BEGIN_ALLOW_THREADS;
+        c_retval = virConnectListSecrets(conn, uuids, c_retval);
+        LIBVIRT_END_ALLOW_THREADS;
+
+        if (c_retval < 0) {
+            py_retval = VIR_PY_NONE;
+            goto cleanup;
+        }
+    }
+
+    if ((py_retval = PyList_New(c_retval)) == NULL)
+        goto cleanup;
+
+    if (uuids) {
+        for (i = 0; i < c_retval; i++)
+            VIR_PY_LIST_SET_GOTO(py_retval, i,
+                                 libvirt_constcharPtrWrap(uuids[i]), error);
+    }
+
+ cleanup:
+    if (c_retval > 0)
+        for (i = 0; i < c_retval; i++)
+            VIR_FREE(uuids[i]);
+    VIR_FREE(uuids);
+    return py_retval;
+
+ error:
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
+
+#if LIBVIR_CHECK_VERSION(0, 10, 2)
+static PyObject *
+libvirt_virConnectListAllSecrets(PyObject *self ATTRIBUTE_UNUSED,
+                                 PyObject *args)
+{
+    PyObject *pyobj_conn;
+    PyObject *py_retval = NULL;
+    virConnectPtr conn;
+    virSecretPtr *secrets = NULL;
+    int c_retval = 0;
+    ssize_t i;
+    unsigned int flags;
+
+    if (!PyArg_ParseTuple(args, (char *)"OI:virConnectListAllSecrets",
+                          &pyobj_conn, &flags))
+        return NULL;
+    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virConnectListAllSecrets(conn, &secrets, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_NONE;
+
+    if (!(py_retval = PyList_New(c_retval)))
+        goto cleanup;
+
+    for (i = 0; i < c_retval; i++) {
+        VIR_PY_LIST_SET_GOTO(py_retval, i,
+                             libvirt_virSecretPtrWrap(secrets[i]), error);
+        /* python steals the pointer */
+        secrets[i] = NULL;
+    }
+
+ cleanup:
+    for (i = 0; i < c_retval; i++)
+        if (secrets[i])
+            virSecretFree(secrets[i]);
+    VIR_FREE(secrets);
+    return py_retval;
+
+ error:
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
+#endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
+
+static PyObject *
+libvirt_virSecretGetValue(PyObject *self ATTRIBUTE_UNUSED,
+                          PyObject *args)
+{
+    PyObject *py_retval;
+    unsigned char *c_retval;
+    size_t size;
+    virSecretPtr secret;
+    PyObject *pyobj_secret;
+    unsigned int flags;
+
+    if (!PyArg_ParseTuple(args, (char *)"OI:virSecretGetValue", &pyobj_secret,
+                          &flags))
+        return NULL;
+    secret = (virSecretPtr) PyvirSecret_Get(pyobj_secret);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virSecretGetValue(secret, &size, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval == NULL)
+        return VIR_PY_NONE;
+
+    py_retval = libvirt_charPtrSizeWrap((char*)c_retval, size);
+    VIR_FREE(c_retval);
+
+    return py_retval;
 }
 
 static PyObject *
@@ -4539,7 +5114,7 @@ libvirt_virConnectListNWFilters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfNWFilters");
     c_retval = virConnectNumOfNWFilters(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -4693,7 +5268,7 @@ libvirt_virConnectListInterfaces(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfInterfaces");
     c_retval = virConnectNumOfInterfaces(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -4752,7 +5327,7 @@ libvirt_virConnectListDefinedInterfaces(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virConnectNumOfDefinedInterfaces");
     c_retval = virConnectNumOfDefinedInterfaces(conn);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -5318,41 +5893,75 @@ libvirt_virDomainInterfaceAddresses(PyObject *self ATTRIBUTE_UNUSED,
  *******************************************/
 static PyObject *libvirt_module    = NULL;
 static PyObject *libvirt_dict      = NULL;
+/* Threads may race to fill the cache in, the first one wins */
+VIR_PY_MUTEX(libvirt_moduleLock);
 
 static PyObject *
 getLibvirtModuleObject(void)
 {
-    if (libvirt_module)
-        return libvirt_module;
+    PyObject *module;
+
+    VIR_PY_MUTEX_LOCK(libvirt_moduleLock);
+    module = libvirt_module;
+    VIR_PY_MUTEX_UNLOCK(libvirt_moduleLock);
+    if (module)
+        return module;
 
     // PyImport_ImportModule returns a new reference
     /* Bogus (char *) cast for RHEL-5 python API brokenness */
-    libvirt_module = PyImport_ImportModule((char *)"libvirt");
-    if (!libvirt_module) {
+    module = PyImport_ImportModule((char *)"libvirt");
+    if (!module) {
         DEBUG("%s Error importing libvirt module\n", __FUNCTION__);
         PyErr_Print();
         return NULL;
     }
 
-    return libvirt_module;
+    /* sys.modules holds another reference, so the one of a thread
+     * which lost the race can be dropped with the lock held */
+    VIR_PY_MUTEX_LOCK(libvirt_moduleLock);
+    if (libvirt_module)
+        Py_DECREF(module);
+    else
+        libvirt_module = module;
+    module = libvirt_module;
+    VIR_PY_MUTEX_UNLOCK(libvirt_moduleLock);
+
+    return module;
 }
 
 static PyObject *
 getLibvirtDictObject(void)
 {
-    if (libvirt_dict)
-        return libvirt_dict;
+    PyObject *module;
+    PyObject *dict;
+
+    VIR_PY_MUTEX_LOCK(libvirt_moduleLock);
+    dict = libvirt_dict;
+    VIR_PY_MUTEX_UNLOCK(libvirt_moduleLock);
+    if (dict)
+        return dict;
+
+    if (!(module = getLibvirtModuleObject()))
+        return NULL;
 
     // PyModule_GetDict returns a borrowed reference
-    libvirt_dict = PyModule_GetDict(getLibvirtModuleObject());
-    if (!libvirt_dict) {
+    dict = PyModule_GetDict(module);
+    if (!dict) {
         DEBUG("%s Error importing libvirt dictionary\n", __FUNCTION__);
         PyErr_Print();
         return NULL;
     }
 
-    Py_INCREF(libvirt_dict);
-    return libvirt_dict;
+    /* The dictionary of a module never changes, so threads racing
+     * here all find the same one */
+    VIR_PY_MUTEX_LOCK(libvirt_moduleLock);
+    if (!libvirt_dict) {
+        Py_INCREF(dict);
+        libvirt_dict = dict;
+    }
+    VIR_PY_MUTEX_UNLOCK(libvirt_moduleLock);
+
+    return dict;
 }
 
 
@@ -5486,12 +6095,16 @@ libvirt_virConnectDomainEventDeregister(PyObject *self ATTRIBUTE_UNUSED,
 /*******************************************
  * Event Impl
  *******************************************/
+/* These are set once and for all, before libvirt can call any of the
+ * functions below. The lock serializes the registration of an event
+ * loop implementation, be it these or the default one in a thread. */
 static PyObject *addHandleObj;
 static PyObject *updateHandleObj;
 static PyObject *removeHandleObj;
 static PyObject *addTimeoutObj;
 static PyObject *updateTimeoutObj;
 static PyObject *removeTimeoutObj;
+VIR_PY_MUTEX(libvirt_eventImplLock);
 
 static int
 libvirt_virEventAddHandleFunc(int fd,
@@ -5732,35 +6345,53 @@ static PyObject *
 libvirt_virEventRegisterImpl(PyObject *self ATTRIBUTE_UNUSED,
                              PyObject *args)
 {
+    PyObject *addHandle;
+    PyObject *updateHandle;
+    PyObject *removeHandle;
+    PyObject *addTimeout;
+    PyObject *updateTimeout;
+    PyObject *removeTimeout;
+
+    /* Parse and check arguments */
+    if (!PyArg_ParseTuple(args, (char *) "OOOOOO:virEventRegisterImpl",
+                          &addHandle, &updateHandle,
+                          &removeHandle, &addTimeout,
+                          &updateTimeout, &removeTimeout) ||
+        !PyCallable_Check(addHandle) ||
+        !PyCallable_Check(updateHandle) ||
+        !PyCallable_Check(removeHandle) ||
+        !PyCallable_Check(addTimeout) ||
+        !PyCallable_Check(updateTimeout) ||
+        !PyCallable_Check(removeTimeout))
+        return NULL;
+
+    VIR_PY_MUTEX_LOCK(libvirt_eventImplLock);
+
     if (addHandleObj || updateHandleObj || removeHandleObj ||
         addTimeoutObj || updateTimeoutObj || removeTimeoutObj) {
+        VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
         PyErr_SetString(PyExc_RuntimeError,
                         "Event loop is already registered");
         return NULL;
     }
 
-    /* Parse and check arguments */
-    if (!PyArg_ParseTuple(args, (char *) "OOOOOO:virEventRegisterImpl",
-                          &addHandleObj, &updateHandleObj,
-                          &removeHandleObj, &addTimeoutObj,
-                          &updateTimeoutObj, &removeTimeoutObj) ||
-        !PyCallable_Check(addHandleObj) ||
-        !PyCallable_Check(updateHandleObj) ||
-        !PyCallable_Check(removeHandleObj) ||
-        !PyCallable_Check(addTimeoutObj) ||
-        !PyCallable_Check(updateTimeoutObj) ||
-        !PyCallable_Check(removeTimeoutObj))
-        return NULL;
-
     /* Inc refs since we're holding on to these objects until
      * the next call (if any) to this function.
      */
-    Py_INCREF(addHandleObj);
-    Py_INCREF(updateHandleObj);
-    Py_INCREF(removeHandleObj);
-    Py_INCREF(addTimeoutObj);
-    Py_INCREF(updateTimeoutObj);
-    Py_INCREF(removeTimeoutObj);
+    Py_INCREF(addHandle);
+    Py_INCREF(updateHandle);
+    Py_INCREF(removeHandle);
+    Py_INCREF(addTimeout);
+    Py_INCREF(updateTimeout);
+    Py_INCREF(removeTimeout);
+    addHandleObj = addHandle;
+    updateHandleObj = updateHandle;
+    removeHandleObj = removeHandle;
+    addTimeoutObj = addTimeout;
+    updateTimeoutObj = updateTimeout;
+    removeTimeoutObj = removeTimeout;
+
+    VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
 
     /* Now register our C EventImpl, which will dispatch
      * to the Python callbacks passed in as args.
@@ -5980,6 +6611,175 @@ libvirt_virEventAddTimeout(PyObject *self ATTRIBUTE_UNUSED,
     return libvirt_intWrap(ret);
 }
 
+/*******************************************
+ * Default event loop thread
+ *******************************************/
+
+typedef struct {
+    PyThread_type_lock done;    /* held until the thread exits */
+    unsigned long ident;
+    int quit;                   /* only touched by the event loop */
+} libvirtEventLoopThread;
+
+/* These are only touched with libvirt_eventImplLock held. The thread
+ * being stopped stays in eventLoopThread until it is joined, so that it
+ * is not started again in the meantime. */
+static libvirtEventLoopThread *eventLoopThread;
+static bool eventLoopThreadStopping;
+
+static void
+libvirt_virEventDefaultImplThread(void *opaque)
+{
+    libvirtEventLoopThread *thread = opaque;
+
+    /* The GIL is not held here; it is only acquired by the
+     * LIBVIRT_ENSURE_THREAD_STATE in the callback trampolines
+     * for as long as python code is being dispatched. */
+    while (!thread->quit) {
+        if (virEventRunDefaultImpl() < 0)
+            break;
+    }
+
+    PyThread_release_lock(thread->done);
+}
+
+static void
+libvirt_virEventDefaultImplQuitCallback(int timer,
+                                        void *opaque)
+{
+    libvirtEventLoopThread *thread = opaque;
+
+    /* Runs on the event loop thread, so there is no race with the
+     * loop condition above. */
+    thread->quit = 1;
+    virEventRemoveTimeout(timer);
+}
+
+static PyObject *
+libvirt_virEventStartDefaultImplThread(PyObject *self ATTRIBUTE_UNUSED,
+                                       PyObject *args ATTRIBUTE_UNUSED)
+{
+    libvirtEventLoopThread *thread = NULL;
+    PyObject *errorType = NULL;
+    const char *error = NULL;
+    unsigned long ident;
+    int ret = 0;
+
+    /* No python code may run with the lock held, so errors are only
+     * raised once it is released */
+    VIR_PY_MUTEX_LOCK(libvirt_eventImplLock);
+
+    if (addHandleObj) {
+        errorType = PyExc_RuntimeError;
+        error = "A python event loop implementation is registered";
+        goto cleanup;
+    }
+
+    if (eventLoopThreadStopping) {
+        errorType = PyExc_RuntimeError;
+        error = "The event loop thread is being stopped";
+        goto cleanup;
+    }
+
+    if (eventLoopThread)
+        goto cleanup;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    ret = virEventRegisterDefaultImpl();
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (ret < 0)
+        goto cleanup;
+
+    if (VIR_ALLOC(thread) < 0 ||
+        !(thread->done = PyThread_allocate_lock())) {
+        VIR_FREE(thread);
+        errorType = PyExc_MemoryError;
+        error = "Unable to allocate the event loop thread lock";
+        goto cleanup;
+    }
+
+    PyThread_acquire_lock(thread->done, WAIT_LOCK);
+
+    ident = PyThread_start_new_thread(libvirt_virEventDefaultImplThread,
+                                      thread);
+    if (ident == (unsigned long)-1) {
+        PyThread_release_lock(thread->done);
+        PyThread_free_lock(thread->done);
+        VIR_FREE(thread);
+        errorType = PyExc_RuntimeError;
+        error = "Unable to start event loop thread";
+        goto cleanup;
+    }
+
+    thread->ident = ident;
+    eventLoopThread = thread;
+
+ cleanup:
+    VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
+
+    if (errorType) {
+        PyErr_SetString(errorType, error);
+        return NULL;
+    }
+    if (ret < 0)
+        return VIR_PY_INT_FAIL;
+
+    return VIR_PY_INT_SUCCESS;
+}
+
+static PyObject *
+libvirt_virEventStopDefaultImplThread(PyObject *self ATTRIBUTE_UNUSED,
+                                      PyObject *args ATTRIBUTE_UNUSED)
+{
+    libvirtEventLoopThread *thread;
+    int timer;
+
+    VIR_PY_MUTEX_LOCK(libvirt_eventImplLock);
+
+    /* A concurrent caller which got the GIL while another one waits
+     * below does not join the thread twice */
+    if (!(thread = eventLoopThread) || eventLoopThreadStopping) {
+        VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
+        return VIR_PY_INT_SUCCESS;
+    }
+
+    if (thread->ident == PyThread_get_thread_ident()) {
+        VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Cannot stop the event loop thread from itself");
+        return NULL;
+    }
+
+    eventLoopThreadStopping = true;
+
+    VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
+
+    /* Adding a timer interrupts the poll() the loop thread is
+     * sleeping in, and the timer then asks the loop to quit. */
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    timer = virEventAddTimeout(0, libvirt_virEventDefaultImplQuitCallback,
+                               thread, NULL);
+    if (timer >= 0)
+        PyThread_acquire_lock(thread->done, WAIT_LOCK);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    VIR_PY_MUTEX_LOCK(libvirt_eventImplLock);
+    eventLoopThreadStopping = false;
+    if (timer >= 0)
+        eventLoopThread = NULL;
+    VIR_PY_MUTEX_UNLOCK(libvirt_eventImplLock);
+
+    if (timer < 0)
+        return VIR_PY_INT_FAIL;
+
+    PyThread_release_lock(thread->done);
+    PyThread_free_lock(thread->done);
+    VIR_FREE(thread);
+
+    return VIR_PY_INT_SUCCESS;
+}
+
 static void
 libvirt_virConnectDomainEventFreeFunc(void *opaque)
 {
@@ -8467,7 +9267,7 @@ libvirt_virNodeSetMemoryParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeGetMemoryParameters");
     i_retval = virNodeGetMemoryParameters(conn, NULL, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -8483,7 +9283,7 @@ libvirt_virNodeSetMemoryParameters(PyObject *self ATTRIBUTE_UNUSED,
     if (VIR_ALLOC_N(params, nparams) < 0)
         return PyErr_NoMemory();
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNodeGetMemoryParameters");
     i_retval = virNodeGetMemoryParameters(conn, params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -9449,7 +10249,7 @@ libvirt_virDomainSetPerfEvents(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virDomainGetPerfEvents");
     i_retval = virDomainGetPerfEvents(domain, &params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -10415,7 +11215,7 @@ libvirt_virNetworkPortSetParameters(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS("virNetworkPortGetParameters");
     i_retval = virNetworkPortGetParameters(port, &params, &nparams, flags);
     LIBVIRT_END_ALLOW_THREADS;
 
@@ -10825,226 +11625,1096 @@ libvirt_virDomainSetLaunchSecurityState(PyObject *self ATTRIBUTE_UNUSED,
         return NULL;
     }
 
-    dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
+    dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainSetLaunchSecurityState(dom, params, nparams, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    virTypedParamsFree(params, nparams);
+
+    return libvirt_intWrap(c_retval);
+}
+#endif /* LIBVIR_CHECK_VERSION(8, 0, 0) */
+
+
+#if LIBVIR_CHECK_VERSION(8, 4, 0)
+static virPyTypedParamsHint virPyDomainSaveParams[] = {
+    { VIR_DOMAIN_SAVE_PARAM_FILE, VIR_TYPED_PARAM_STRING },
+    { VIR_DOMAIN_SAVE_PARAM_DXML, VIR_TYPED_PARAM_STRING },
+#ifdef VIR_DOMAIN_SAVE_PARAM_IMAGE_FORMAT
+    { VIR_DOMAIN_SAVE_PARAM_IMAGE_FORMAT, VIR_TYPED_PARAM_STRING },
+#endif
+#ifdef VIR_DOMAIN_SAVE_PARAM_PARALLEL_CHANNELS
+    { VIR_DOMAIN_SAVE_PARAM_PARALLEL_CHANNELS, VIR_TYPED_PARAM_INT },
+#endif
+};
+
+
+static PyObject *
+libvirt_virDomainSaveParams(PyObject *self ATTRIBUTE_UNUSED,
+                            PyObject *args)
+{
+    PyObject *pyobj_dom = NULL;
+    PyObject *pyobj_dict = NULL;
+    virDomainPtr dom;
+    virTypedParameterPtr params = NULL;
+    int nparams = 0;
+    unsigned int flags = 0;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"OO|I:virDomainSaveParams",
+                          &pyobj_dom, &pyobj_dict, &flags))
+        return NULL;
+
+    if (PyDict_Check(pyobj_dict)) {
+        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
+                                   virPyDomainSaveParams,
+                                   VIR_N_ELEMENTS(virPyDomainSaveParams)) < 0) {
+            return NULL;
+        }
+    } else {
+        PyErr_Format(PyExc_TypeError, "Save params must be a dictionary");
+        return NULL;
+    }
+
+    dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainSaveParams(dom, params, nparams, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    virTypedParamsFree(params, nparams);
+
+    return libvirt_intWrap(c_retval);
+}
+
+static PyObject *
+libvirt_virDomainRestoreParams(PyObject *self ATTRIBUTE_UNUSED,
+                               PyObject *args)
+{
+    PyObject *pyobj_conn = NULL;
+    PyObject *pyobj_dict = NULL;
+    virConnectPtr conn;
+    virTypedParameterPtr params = NULL;
+    int nparams = 0;
+    unsigned int flags = 0;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"OO|I:virDomainRestoreParams",
+                          &pyobj_conn, &pyobj_dict, &flags))
+        return NULL;
+
+    if (PyDict_Check(pyobj_dict)) {
+        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
+                                   virPyDomainSaveParams,
+                                   VIR_N_ELEMENTS(virPyDomainSaveParams)) < 0) {
+            return NULL;
+        }
+    } else {
+        PyErr_Format(PyExc_TypeError, "Restore params must be a dictionary");
+        return NULL;
+    }
+
+    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainRestoreParams(conn, params, nparams, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    virTypedParamsFree(params, nparams);
+
+    return libvirt_intWrap(c_retval);
+}
+#endif /* LIBVIR_CHECK_VERSION(8, 4, 0) */
+
+
+#if LIBVIR_CHECK_VERSION(9, 0, 0)
+static PyObject *
+libvirt_virDomainFDAssociate(PyObject *self ATTRIBUTE_UNUSED,
+                             PyObject *args)
+{
+    PyObject *py_retval = NULL;
+    int c_retval;
+    virDomainPtr domain;
+    PyObject *pyobj_domain;
+    PyObject *pyobj_files;
+    const char *name = NULL;
+    unsigned int flags;
+    unsigned int nfiles;
+    int *files = NULL;
+    size_t i;
+
+    if (!PyArg_ParseTuple(args, (char *)"OsOI:virDomainFDAssociate",
+                          &pyobj_domain, &name, &pyobj_files, &flags))
+        return NULL;
+    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
+
+    nfiles = PyList_Size(pyobj_files);
+
+    if (VIR_ALLOC_N(files, nfiles) < 0)
+        return PyErr_NoMemory();
+
+    for (i = 0; i < nfiles; i++) {
+        PyObject *pyfd;
+        int fd;
+
+        pyfd = PyList_GetItem(pyobj_files, i);
+
+        if (libvirt_intUnwrap(pyfd, &fd) < 0)
+            goto cleanup;
+
+        files[i] = fd;
+    }
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainFDAssociate(domain, name, nfiles, files, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    py_retval = libvirt_intWrap(c_retval);
+
+ cleanup:
+    VIR_FREE(files);
+    return py_retval;
+}
+#endif /* LIBVIR_CHECK_VERSION(9, 0, 0) */
+
+
+#if LIBVIR_CHECK_VERSION(11, 2, 0)
+static PyObject *
+libvirt_virDomainGetAutostartOnce(PyObject *self ATTRIBUTE_UNUSED,
+                                  PyObject *args)
+{
+    int c_retval, autostart;
+    virDomainPtr domain;
+    PyObject *pyobj_domain;
+
+    if (!PyArg_ParseTuple(args, (char *)"O:virDomainGetAutostartOnce",
+                          &pyobj_domain))
+        return NULL;
+
+    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetAutostartOnce(domain, &autostart);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return VIR_PY_INT_FAIL;
+
+    return libvirt_intWrap(autostart);
+}
+
+static PyObject *
+libvirt_virDomainSetThrottleGroup(PyObject *self ATTRIBUTE_UNUSED,
+                                  PyObject *args)
+{
+    virDomainPtr domain;
+    PyObject *pyobj_domain;
+    const char *group = NULL;
+    PyObject *pyobj_dict = NULL;
+    virTypedParameterPtr params = NULL;
+    int nparams = 0;
+    unsigned int flags = 0;
+    int c_retval;
+
+    if (!PyArg_ParseTuple(args, (char *)"OsO|I:virDomainSetThrottleGroup",
+                          &pyobj_domain, &group, &pyobj_dict, &flags))
+        return NULL;
+
+    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
+
+    if (PyDict_Check(pyobj_dict)) {
+        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
+                                   virPyDomainSetBlockIoTuneParams,
+                                   VIR_N_ELEMENTS(virPyDomainSetBlockIoTuneParams)) < 0) {
+            return NULL;
+        }
+    } else {
+        PyErr_Format(PyExc_TypeError, "Restore params must be a dictionary");
+        return NULL;
+    }
+
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainSetThrottleGroup(domain, group, params, nparams, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    virTypedParamsFree(params, nparams);
+
+    return libvirt_intWrap(c_retval);
+}
+#endif /* LIBVIR_CHECK_VERSION(11, 2, 0) */
+
+
+/************************************************************************
+ *									*
+ *			Native object types				*
+ *									*
+ ************************************************************************/
+
+/* The Python classes wrapping connections, domains, storage pools,
+ * storage volumes and streams derive from these types instead of
+ * object. They keep the C pointer next to the capsule stored in _o, so
+ * the methods below use it directly and raise libvirtError themselves,
+ * sparing the hottest calls the generated Python method, the lookup of
+ * self._o and the parsing of the libvirtmod function arguments. Their
+ * semantics must match what generator.py emits for the same APIs, which
+ * it skips in the Python classes. */
+
+typedef struct {
+    PyObject_HEAD
+    void *ptr;
+    PyObject *capsule;
+} libvirtNativeObject;
+
+/* _o may be reassigned by another thread, which the GIL no longer
+ * rules out on the free threaded builds, so the fields are only
+ * accessed inside the critical section of the object. */
+static void *
+libvirt_nativePtr(PyObject *self)
+{
+    void *ptr;
+
+    VIR_PY_BEGIN_CRITICAL_SECTION(self);
+    ptr = ((libvirtNativeObject *) self)->ptr;
+    VIR_PY_END_CRITICAL_SECTION();
+    return ptr;
+}
+
+#define LIBVIRT_NATIVE_PTR(self, type) \
+    ((type) libvirt_nativePtr(self))
+
+static PyObject *
+libvirt_raiseError(const char *defmsg)
+{
+    PyObject *dict;
+    PyObject *klass;
+    PyObject *err;
+
+    if (!(dict = getLibvirtDictObject()) ||
+        !(klass = PyDict_GetItemString(dict, "libvirtError"))) {
+        PyErr_SetString(PyExc_RuntimeError, defmsg);
+        return NULL;
+    }
+
+    /* libvirtError picks the thread local libvirt error up itself */
+    if (!(err = PyObject_CallFunction(klass, (char *) "s", defmsg)))
+        return NULL;
+
+    PyErr_SetObject(klass, err);
+    Py_DECREF(err);
+    return NULL;
+}
+
+static PyObject *
+libvirt_nativeIntResult(int c_retval,
+                        const char *defmsg)
+{
+    if (c_retval == -1)
+        return libvirt_raiseError(defmsg);
+    return libvirt_intWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeStringResult(char *c_retval,
+                           const char *defmsg)
+{
+    PyObject *py_retval;
+
+    if (c_retval == NULL)
+        return libvirt_raiseError(defmsg);
+    py_retval = libvirt_charPtrWrap(c_retval);
+    VIR_FREE(c_retval);
+    return py_retval;
+}
+
+static PyObject *
+libvirt_nativeConstStringResult(const char *c_retval,
+                                const char *defmsg)
+{
+    if (c_retval == NULL)
+        return libvirt_raiseError(defmsg);
+    return libvirt_constcharPtrWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeGetCapsule(PyObject *self,
+                         void *closure ATTRIBUTE_UNUSED)
+{
+    libvirtNativeObject *obj = (libvirtNativeObject *) self;
+    PyObject *capsule;
+
+    VIR_PY_BEGIN_CRITICAL_SECTION(self);
+    capsule = obj->capsule;
+    Py_XINCREF(capsule);
+    VIR_PY_END_CRITICAL_SECTION();
+
+    if (!capsule)
+        return VIR_PY_NONE;
+
+    return capsule;
+}
+
+static int
+libvirt_nativeSetCapsule(PyObject *self,
+                         PyObject *value,
+                         void *closure)
+{
+    libvirtNativeObject *obj = (libvirtNativeObject *) self;
+    PyObject *old;
+    void *ptr = NULL;
+
+    if (value == Py_None)
+        value = NULL;
+
+    /* The closure holds the name of the capsules of this type */
+    if (value && !(ptr = PyCapsule_GetPointer(value, closure)))
+        return -1;
+
+    Py_XINCREF(value);
+    VIR_PY_BEGIN_CRITICAL_SECTION(self);
+    old = obj->capsule;
+    obj->capsule = value;
+    obj->ptr = ptr;
+    VIR_PY_END_CRITICAL_SECTION();
+    /* Dropped outside of the critical section, as freeing the old
+     * capsule may run arbitrary code */
+    Py_XDECREF(old);
+    return 0;
+}
+
+static void
+libvirt_nativeDealloc(PyObject *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+    freefunc tp_free = (freefunc) PyType_GetSlot(type, Py_tp_free);
+
+    /* Freeing the C object is left to the __del__ method of the class */
+    Py_CLEAR(((libvirtNativeObject *) self)->capsule);
+    tp_free(self);
+#if PY_VERSION_HEX >= 0x03080000
+    Py_DECREF(type);
+#endif
+}
+
+static char *libvirt_nativeFlagsKwlist[] = { (char *) "flags", NULL };
+
+/* virConnect */
+
+static PyObject *
+libvirt_nativeConnectGetType(PyObject *self,
+                             PyObject *args ATTRIBUTE_UNUSED)
+{
+    virConnectPtr conn = LIBVIRT_NATIVE_PTR(self, virConnectPtr);
+    const char *c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virConnectGetType(conn);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeConstStringResult(c_retval,
+                                           "virConnectGetType() failed");
+}
+
+static PyObject *
+libvirt_nativeConnectGetURI(PyObject *self,
+                            PyObject *args ATTRIBUTE_UNUSED)
+{
+    virConnectPtr conn = LIBVIRT_NATIVE_PTR(self, virConnectPtr);
+    char *c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virConnectGetURI(conn);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeStringResult(c_retval, "virConnectGetURI() failed");
+}
+
+static PyObject *
+libvirt_nativeConnectGetHostname(PyObject *self,
+                                 PyObject *args ATTRIBUTE_UNUSED)
+{
+    virConnectPtr conn = LIBVIRT_NATIVE_PTR(self, virConnectPtr);
+    char *c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virConnectGetHostname(conn);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeStringResult(c_retval,
+                                      "virConnectGetHostname() failed");
+}
+
+static PyObject *
+libvirt_nativeConnectIsAlive(PyObject *self,
+                             PyObject *args ATTRIBUTE_UNUSED)
+{
+    virConnectPtr conn = LIBVIRT_NATIVE_PTR(self, virConnectPtr);
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virConnectIsAlive(conn);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval, "virConnectIsAlive() failed");
+}
+
+static PyMethodDef libvirt_nativeConnectMethods[] = {
+    {(char *) "getType", libvirt_nativeConnectGetType, METH_NOARGS,
+     (char *) "getType($self, /)\n--\n\n"
+     "Get the name of the Hypervisor driver used."},
+    {(char *) "getURI", libvirt_nativeConnectGetURI, METH_NOARGS,
+     (char *) "getURI($self, /)\n--\n\n"
+     "Returns the URI (name) of the hypervisor connection."},
+    {(char *) "getHostname", libvirt_nativeConnectGetHostname, METH_NOARGS,
+     (char *) "getHostname($self, /)\n--\n\n"
+     "Returns the hostname of the hypervisor host."},
+    {(char *) "isAlive", libvirt_nativeConnectIsAlive, METH_NOARGS,
+     (char *) "isAlive($self, /)\n--\n\n"
+     "Determine if the connection to the hypervisor is still alive."},
+    {NULL, NULL, 0, NULL}
+};
+
+/* virDomain */
+
+static PyObject *
+libvirt_nativeDomainGetName(PyObject *self,
+                            PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    const char *c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetName(domain);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_constcharPtrWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeDomainGetID(PyObject *self,
+                          PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    unsigned int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetID(domain);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_uintWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeDomainGetUUID(PyObject *self,
+                            PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    unsigned char uuid[VIR_UUID_BUFLEN];
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetUUID(domain, &uuid[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virDomainGetUUID() failed");
+
+    return libvirt_charPtrSizeWrap((char *) &uuid[0], VIR_UUID_BUFLEN);
+}
+
+static PyObject *
+libvirt_nativeDomainGetUUIDString(PyObject *self,
+                                  PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    char uuidstr[VIR_UUID_STRING_BUFLEN];
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetUUIDString(domain, &uuidstr[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virDomainGetUUIDString() failed");
+
+    return libvirt_constcharPtrWrap((char *) &uuidstr[0]);
+}
+
+static PyObject *
+libvirt_nativeDomainIsActive(PyObject *self,
+                             PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainIsActive(domain);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval, "virDomainIsActive() failed");
+}
+
+static PyObject *
+libvirt_nativeDomainIsPersistent(PyObject *self,
+                                 PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainIsPersistent(domain);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval,
+                                   "virDomainIsPersistent() failed");
+}
+
+static PyObject *
+libvirt_nativeDomainGetMaxMemory(PyObject *self,
+                                 PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    unsigned long c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetMaxMemory(domain);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval == 0)
+        return libvirt_raiseError("virDomainGetMaxMemory() failed");
+
+    return libvirt_ulongWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeDomainGetInfo(PyObject *self,
+                            PyObject *args ATTRIBUTE_UNUSED)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    PyObject *py_retval;
+    virDomainInfo info;
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetInfo(domain, &info);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virDomainGetInfo() failed");
+
+    if ((py_retval = PyList_New(5)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0, libvirt_intWrap(info.state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1, libvirt_ulongWrap(info.maxMem), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2, libvirt_ulongWrap(info.memory), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 3,
+                         libvirt_intWrap(info.nrVirtCpu), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 4,
+                         libvirt_ulonglongWrap(info.cpuTime), error);
+
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
+}
+
+static PyObject *
+libvirt_nativeDomainGetState(PyObject *self,
+                             PyObject *args,
+                             PyObject *kwargs)
+{
+    virDomainPtr domain = LIBVIRT_NATIVE_PTR(self, virDomainPtr);
+    PyObject *py_retval;
+    unsigned int flags = 0;
+    int state;
+    int reason;
+    int c_retval;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, (char *) "|I:state",
+                                     libvirt_nativeFlagsKwlist, &flags))
+        return NULL;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virDomainGetState(domain, &state, &reason, flags);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virDomainGetState() failed");
+
+    if ((py_retval = PyList_New(2)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0, libvirt_intWrap(state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1, libvirt_intWrap(reason), error);
+
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
+}
+
+static PyMethodDef libvirt_nativeDomainMethods[] = {
+    {(char *) "name", libvirt_nativeDomainGetName, METH_NOARGS,
+     (char *) "name($self, /)\n--\n\n"
+     "Get the public name for that domain. Returns None on error"},
+    {(char *) "ID", libvirt_nativeDomainGetID, METH_NOARGS,
+     (char *) "ID($self, /)\n--\n\n"
+     "Get the hypervisor ID number for the domain."},
+    {(char *) "UUID", libvirt_nativeDomainGetUUID, METH_NOARGS,
+     (char *) "UUID($self, /)\n--\n\n"
+     "Extract the UUID unique Identifier of a domain."},
+    {(char *) "UUIDString", libvirt_nativeDomainGetUUIDString, METH_NOARGS,
+     (char *) "UUIDString($self, /)\n--\n\n"
+     "Fetch globally unique ID of the domain as a string."},
+    {(char *) "isActive", libvirt_nativeDomainIsActive, METH_NOARGS,
+     (char *) "isActive($self, /)\n--\n\n"
+     "Determine if the domain is currently running."},
+    {(char *) "isPersistent", libvirt_nativeDomainIsPersistent, METH_NOARGS,
+     (char *) "isPersistent($self, /)\n--\n\n"
+     "Determine if the domain has a persistent configuration."},
+    {(char *) "maxMemory", libvirt_nativeDomainGetMaxMemory, METH_NOARGS,
+     (char *) "maxMemory($self, /)\n--\n\n"
+     "Retrieve the maximum amount of physical memory allocated to a domain."},
+    {(char *) "info", libvirt_nativeDomainGetInfo, METH_NOARGS,
+     (char *) "info($self, /)\n--\n\n"
+     "Extract information about a domain."},
+    {(char *) "state", LIBVIRT_METH(libvirt_nativeDomainGetState),
+     METH_VARARGS | METH_KEYWORDS,
+     (char *) "state($self, /, flags=0)\n--\n\n"
+     "Extract domain state."},
+    {NULL, NULL, 0, NULL}
+};
+
+/* virStoragePool */
+
+static PyObject *
+libvirt_nativeStoragePoolGetName(PyObject *self,
+                                 PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStoragePoolPtr pool = LIBVIRT_NATIVE_PTR(self, virStoragePoolPtr);
+    const char *c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolGetName(pool);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_constcharPtrWrap(c_retval);
+}
+
+static PyObject *
+libvirt_nativeStoragePoolGetUUIDString(PyObject *self,
+                                       PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStoragePoolPtr pool = LIBVIRT_NATIVE_PTR(self, virStoragePoolPtr);
+    char uuidstr[VIR_UUID_STRING_BUFLEN];
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolGetUUIDString(pool, &uuidstr[0]);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virStoragePoolGetUUIDString() failed");
+
+    return libvirt_constcharPtrWrap((char *) &uuidstr[0]);
+}
+
+static PyObject *
+libvirt_nativeStoragePoolIsActive(PyObject *self,
+                                  PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStoragePoolPtr pool = LIBVIRT_NATIVE_PTR(self, virStoragePoolPtr);
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolIsActive(pool);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval,
+                                   "virStoragePoolIsActive() failed");
+}
+
+static PyObject *
+libvirt_nativeStoragePoolIsPersistent(PyObject *self,
+                                      PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStoragePoolPtr pool = LIBVIRT_NATIVE_PTR(self, virStoragePoolPtr);
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolIsPersistent(pool);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval,
+                                   "virStoragePoolIsPersistent() failed");
+}
+
+static PyObject *
+libvirt_nativeStoragePoolGetInfo(PyObject *self,
+                                 PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStoragePoolPtr pool = LIBVIRT_NATIVE_PTR(self, virStoragePoolPtr);
+    PyObject *py_retval;
+    virStoragePoolInfo info;
+    int c_retval;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStoragePoolGetInfo(pool, &info);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (c_retval < 0)
+        return libvirt_raiseError("virStoragePoolGetInfo() failed");
+
+    if ((py_retval = PyList_New(4)) == NULL)
+        return NULL;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainSetLaunchSecurityState(dom, params, nparams, flags);
-    LIBVIRT_END_ALLOW_THREADS;
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info.state), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info.capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info.allocation), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 3,
+                         libvirt_ulonglongWrap(info.available), error);
 
-    virTypedParamsFree(params, nparams);
+    return py_retval;
 
-    return libvirt_intWrap(c_retval);
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
 }
-#endif /* LIBVIR_CHECK_VERSION(8, 0, 0) */
-
 
-#if LIBVIR_CHECK_VERSION(8, 4, 0)
-static virPyTypedParamsHint virPyDomainSaveParams[] = {
-    { VIR_DOMAIN_SAVE_PARAM_FILE, VIR_TYPED_PARAM_STRING },
-    { VIR_DOMAIN_SAVE_PARAM_DXML, VIR_TYPED_PARAM_STRING },
-#ifdef VIR_DOMAIN_SAVE_PARAM_IMAGE_FORMAT
-    { VIR_DOMAIN_SAVE_PARAM_IMAGE_FORMAT, VIR_TYPED_PARAM_STRING },
-#endif
-#ifdef VIR_DOMAIN_SAVE_PARAM_PARALLEL_CHANNELS
-    { VIR_DOMAIN_SAVE_PARAM_PARALLEL_CHANNELS, VIR_TYPED_PARAM_INT },
-#endif
+static PyMethodDef libvirt_nativeStoragePoolMethods[] = {
+    {(char *) "name", libvirt_nativeStoragePoolGetName, METH_NOARGS,
+     (char *) "name($self, /)\n--\n\n"
+     "Fetch the locally unique name of the storage pool."},
+    {(char *) "UUIDString", libvirt_nativeStoragePoolGetUUIDString, METH_NOARGS,
+     (char *) "UUIDString($self, /)\n--\n\n"
+     "Fetch globally unique ID of the storage pool as a string."},
+    {(char *) "isActive", libvirt_nativeStoragePoolIsActive, METH_NOARGS,
+     (char *) "isActive($self, /)\n--\n\n"
+     "Determine if the storage pool is currently running."},
+    {(char *) "isPersistent", libvirt_nativeStoragePoolIsPersistent, METH_NOARGS,
+     (char *) "isPersistent($self, /)\n--\n\n"
+     "Determine if the storage pool has a persistent configuration."},
+    {(char *) "info", libvirt_nativeStoragePoolGetInfo, METH_NOARGS,
+     (char *) "info($self, /)\n--\n\n"
+     "Extract information about a storage pool."},
+    {NULL, NULL, 0, NULL}
 };
 
+/* virStorageVol */
 
 static PyObject *
-libvirt_virDomainSaveParams(PyObject *self ATTRIBUTE_UNUSED,
-                            PyObject *args)
+libvirt_nativeStorageVolGetName(PyObject *self,
+                                PyObject *args ATTRIBUTE_UNUSED)
 {
-    PyObject *pyobj_dom = NULL;
-    PyObject *pyobj_dict = NULL;
-    virDomainPtr dom;
-    virTypedParameterPtr params = NULL;
-    int nparams = 0;
-    unsigned int flags = 0;
-    int c_retval;
+    virStorageVolPtr vol = LIBVIRT_NATIVE_PTR(self, virStorageVolPtr);
+    const char *c_retval;
 
-    if (!PyArg_ParseTuple(args, (char *)"OO|I:virDomainSaveParams",
-                          &pyobj_dom, &pyobj_dict, &flags))
-        return NULL;
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStorageVolGetName(vol);
+    LIBVIRT_END_ALLOW_THREADS;
 
-    if (PyDict_Check(pyobj_dict)) {
-        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
-                                   virPyDomainSaveParams,
-                                   VIR_N_ELEMENTS(virPyDomainSaveParams)) < 0) {
-            return NULL;
-        }
-    } else {
-        PyErr_Format(PyExc_TypeError, "Save params must be a dictionary");
-        return NULL;
-    }
+    return libvirt_constcharPtrWrap(c_retval);
+}
 
-    dom = (virDomainPtr) PyvirDomain_Get(pyobj_dom);
+static PyObject *
+libvirt_nativeStorageVolGetKey(PyObject *self,
+                               PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStorageVolPtr vol = LIBVIRT_NATIVE_PTR(self, virStorageVolPtr);
+    const char *c_retval;
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainSaveParams(dom, params, nparams, flags);
+    c_retval = virStorageVolGetKey(vol);
     LIBVIRT_END_ALLOW_THREADS;
 
-    virTypedParamsFree(params, nparams);
-
-    return libvirt_intWrap(c_retval);
+    return libvirt_nativeConstStringResult(c_retval,
+                                           "virStorageVolGetKey() failed");
 }
 
 static PyObject *
-libvirt_virDomainRestoreParams(PyObject *self ATTRIBUTE_UNUSED,
-                               PyObject *args)
+libvirt_nativeStorageVolGetPath(PyObject *self,
+                                PyObject *args ATTRIBUTE_UNUSED)
 {
-    PyObject *pyobj_conn = NULL;
-    PyObject *pyobj_dict = NULL;
-    virConnectPtr conn;
-    virTypedParameterPtr params = NULL;
-    int nparams = 0;
-    unsigned int flags = 0;
-    int c_retval;
+    virStorageVolPtr vol = LIBVIRT_NATIVE_PTR(self, virStorageVolPtr);
+    char *c_retval;
 
-    if (!PyArg_ParseTuple(args, (char *)"OO|I:virDomainRestoreParams",
-                          &pyobj_conn, &pyobj_dict, &flags))
-        return NULL;
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStorageVolGetPath(vol);
+    LIBVIRT_END_ALLOW_THREADS;
 
-    if (PyDict_Check(pyobj_dict)) {
-        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
-                                   virPyDomainSaveParams,
-                                   VIR_N_ELEMENTS(virPyDomainSaveParams)) < 0) {
-            return NULL;
-        }
-    } else {
-        PyErr_Format(PyExc_TypeError, "Restore params must be a dictionary");
-        return NULL;
-    }
+    return libvirt_nativeStringResult(c_retval,
+                                      "virStorageVolGetPath() failed");
+}
 
-    conn = (virConnectPtr) PyvirConnect_Get(pyobj_conn);
+static PyObject *
+libvirt_nativeStorageVolGetInfo(PyObject *self,
+                                PyObject *args ATTRIBUTE_UNUSED)
+{
+    virStorageVolPtr vol = LIBVIRT_NATIVE_PTR(self, virStorageVolPtr);
+    PyObject *py_retval;
+    virStorageVolInfo info;
+    int c_retval;
 
     LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainRestoreParams(conn, params, nparams, flags);
+    c_retval = virStorageVolGetInfo(vol, &info);
     LIBVIRT_END_ALLOW_THREADS;
 
-    virTypedParamsFree(params, nparams);
+    if (c_retval < 0)
+        return libvirt_raiseError("virStorageVolGetInfo() failed");
 
-    return libvirt_intWrap(c_retval);
+    if ((py_retval = PyList_New(3)) == NULL)
+        return NULL;
+
+    VIR_PY_LIST_SET_GOTO(py_retval, 0,
+                         libvirt_intWrap(info.type), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 1,
+                         libvirt_ulonglongWrap(info.capacity), error);
+    VIR_PY_LIST_SET_GOTO(py_retval, 2,
+                         libvirt_ulonglongWrap(info.allocation), error);
+
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_retval);
+    return NULL;
 }
-#endif /* LIBVIR_CHECK_VERSION(8, 4, 0) */
 
+static PyMethodDef libvirt_nativeStorageVolMethods[] = {
+    {(char *) "name", libvirt_nativeStorageVolGetName, METH_NOARGS,
+     (char *) "name($self, /)\n--\n\n"
+     "Fetch the storage volume name."},
+    {(char *) "key", libvirt_nativeStorageVolGetKey, METH_NOARGS,
+     (char *) "key($self, /)\n--\n\n"
+     "Fetch the storage volume key."},
+    {(char *) "path", libvirt_nativeStorageVolGetPath, METH_NOARGS,
+     (char *) "path($self, /)\n--\n\n"
+     "Fetch the storage volume path."},
+    {(char *) "info", libvirt_nativeStorageVolGetInfo, METH_NOARGS,
+     (char *) "info($self, /)\n--\n\n"
+     "Extract information about a storage volume."},
+    {NULL, NULL, 0, NULL}
+};
+
+/* virStream */
 
-#if LIBVIR_CHECK_VERSION(9, 0, 0)
 static PyObject *
-libvirt_virDomainFDAssociate(PyObject *self ATTRIBUTE_UNUSED,
-                             PyObject *args)
+libvirt_nativeStreamRecv(PyObject *self,
+                         PyObject *args,
+                         PyObject *kwargs)
 {
-    PyObject *py_retval = NULL;
+    static char *kwlist[] = { (char *) "nbytes", NULL };
+    virStreamPtr stream = LIBVIRT_NATIVE_PTR(self, virStreamPtr);
+    PyObject *py_retval;
+    char *buf = NULL;
+    int nbytes;
     int c_retval;
-    virDomainPtr domain;
-    PyObject *pyobj_domain;
-    PyObject *pyobj_files;
-    const char *name = NULL;
-    unsigned int flags;
-    unsigned int nfiles;
-    int *files = NULL;
-    size_t i;
 
-    if (!PyArg_ParseTuple(args, (char *)"OsOI:virDomainFDAssociate",
-                          &pyobj_domain, &name, &pyobj_files, &flags))
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, (char *) "i:recv",
+                                     kwlist, &nbytes))
         return NULL;
-    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
-
-    nfiles = PyList_Size(pyobj_files);
 
-    if (VIR_ALLOC_N(files, nfiles) < 0)
+    if (VIR_ALLOC_N(buf, nbytes > 0 ? nbytes : 1) < 0)
         return PyErr_NoMemory();
 
-    for (i = 0; i < nfiles; i++) {
-        PyObject *pyfd;
-        int fd;
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStreamRecv(stream, buf, nbytes);
+    LIBVIRT_END_ALLOW_THREADS;
 
-        pyfd = PyList_GetItem(pyobj_files, i);
+    if (c_retval == -2)
+        py_retval = libvirt_intWrap(c_retval);
+    else if (c_retval < 0)
+        py_retval = libvirt_raiseError("virStreamRecv() failed");
+    else
+        py_retval = libvirt_charPtrSizeWrap(buf, c_retval);
 
-        if (libvirt_intUnwrap(pyfd, &fd) < 0)
-            goto cleanup;
+    VIR_FREE(buf);
+    return py_retval;
+}
 
-        files[i] = fd;
-    }
+static PyObject *
+libvirt_nativeStreamSend(PyObject *self,
+                         PyObject *args,
+                         PyObject *kwargs)
+{
+    static char *kwlist[] = { (char *) "data", NULL };
+    virStreamPtr stream = LIBVIRT_NATIVE_PTR(self, virStreamPtr);
+    PyObject *pyobj_data;
+    char *data;
+    Py_ssize_t datalen;
+    int c_retval;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainFDAssociate(domain, name, nfiles, files, flags);
-    LIBVIRT_END_ALLOW_THREADS;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, (char *) "O:send",
+                                     kwlist, &pyobj_data) ||
+        libvirt_charPtrSizeUnwrap(pyobj_data, &data, &datalen) < 0)
+        return NULL;
+
+    LIBVIRT_BEGIN_ALLOW_THREADS;
+    c_retval = virStreamSend(stream, data, datalen);
+    LIBVIRT_END_ALLOW_THREADS;
+
+    return libvirt_nativeIntResult(c_retval, "virStreamSend() failed");
+}
+
+static PyMethodDef libvirt_nativeStreamMethods[] = {
+    {(char *) "recv", LIBVIRT_METH(libvirt_nativeStreamRecv),
+     METH_VARARGS | METH_KEYWORDS,
+     (char *) "recv($self, /, nbytes)\n--\n\n"
+     "Reads a series of bytes from the stream. This method may\n"
+     "block the calling application for an arbitrary amount\n"
+     "of time.\n\n"
+     "Errors are not guaranteed to be reported synchronously\n"
+     "with the call, but may instead be delayed until a\n"
+     "subsequent call.\n\n"
+     "On success, the received data is returned. On failure, an\n"
+     "exception is raised. If the stream is a NONBLOCK stream and\n"
+     "the request would block, integer -2 is returned."},
+    {(char *) "send", LIBVIRT_METH(libvirt_nativeStreamSend),
+     METH_VARARGS | METH_KEYWORDS,
+     (char *) "send($self, /, data)\n--\n\n"
+     "Write a series of bytes to the stream. This method may\n"
+     "block the calling application for an arbitrary amount\n"
+     "of time. Once an application has finished sending data\n"
+     "it should call virStreamFinish to wait for successful\n"
+     "confirmation from the driver, or detect any error\n\n"
+     "This method may not be used if a stream source has been\n"
+     "registered\n\n"
+     "Errors are not guaranteed to be reported synchronously\n"
+     "with the call, but may instead be delayed until a\n"
+     "subsequent call."},
+    {NULL, NULL, 0, NULL}
+};
 
-    py_retval = libvirt_intWrap(c_retval);
+#define LIBVIRT_NATIVE_TYPE(cls) \
+    static PyGetSetDef libvirt_native##cls##GetSet[] = { \
+        {(char *) "_o", libvirt_nativeGetCapsule, libvirt_nativeSetCapsule, \
+         NULL, (void *) "vir" #cls "Ptr"}, \
+        {NULL, NULL, NULL, NULL, NULL} \
+    }; \
+    static PyType_Slot libvirt_native##cls##Slots[] = { \
+        {Py_tp_dealloc, (void *) libvirt_nativeDealloc}, \
+        {Py_tp_new, (void *) PyType_GenericNew}, \
+        {Py_tp_methods, libvirt_native##cls##Methods}, \
+        {Py_tp_getset, libvirt_native##cls##GetSet}, \
+        {0, NULL} \
+    }; \
+    static PyType_Spec libvirt_native##cls##Spec = { \
+        "libvirtmod._vir" #cls "Base", \
+        sizeof(libvirtNativeObject), \
+        0, \
+        Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, \
+        libvirt_native##cls##Slots \
+    }
+
+LIBVIRT_NATIVE_TYPE(Connect);
+LIBVIRT_NATIVE_TYPE(Domain);
+LIBVIRT_NATIVE_TYPE(StoragePool);
+LIBVIRT_NATIVE_TYPE(StorageVol);
+LIBVIRT_NATIVE_TYPE(Stream);
+
+static struct {
+    const char *name;
+    PyType_Spec *spec;
+} libvirt_nativeTypes[] = {
+    { "_virConnectBase", &libvirt_nativeConnectSpec },
+    { "_virDomainBase", &libvirt_nativeDomainSpec },
+    { "_virStoragePoolBase", &libvirt_nativeStoragePoolSpec },
+    { "_virStorageVolBase", &libvirt_nativeStorageVolSpec },
+    { "_virStreamBase", &libvirt_nativeStreamSpec },
+};
 
- cleanup:
-    VIR_FREE(files);
-    return py_retval;
+static int
+libvirt_addNativeTypes(PyObject *module)
+{
+    size_t i;
+
+    for (i = 0; i < VIR_N_ELEMENTS(libvirt_nativeTypes); i++) {
+        PyObject *type = PyType_FromSpec(libvirt_nativeTypes[i].spec);
+
+        if (!type)
+            return -1;
+        if (PyModule_AddObject(module, libvirt_nativeTypes[i].name, type) < 0) {
+            Py_DECREF(type);
+            return -1;
+        }
+    }
+
+    return 0;
 }
-#endif /* LIBVIR_CHECK_VERSION(9, 0, 0) */
 
 
-#if LIBVIR_CHECK_VERSION(11, 2, 0)
+/************************************************************************
+ *									*
+ *			Call and GIL statistics				*
+ *									*
+ ************************************************************************/
+
 static PyObject *
-libvirt_virDomainGetAutostartOnce(PyObject *self ATTRIBUTE_UNUSED,
-                                  PyObject *args)
+libvirt_enableCallStats(PyObject *self ATTRIBUTE_UNUSED,
+                        PyObject *args)
 {
-    int c_retval, autostart;
-    virDomainPtr domain;
-    PyObject *pyobj_domain;
+    int enable;
 
-    if (!PyArg_ParseTuple(args, (char *)"O:virDomainGetAutostartOnce",
-                          &pyobj_domain))
+    if (!PyArg_ParseTuple(args, (char *)"p:_enableCallStats", &enable))
         return NULL;
 
-    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
-
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainGetAutostartOnce(domain, &autostart);
-    LIBVIRT_END_ALLOW_THREADS;
+    virPyCallStatsEnabled = enable;
 
-    if (c_retval < 0)
-        return VIR_PY_INT_FAIL;
+    return VIR_PY_NONE;
+}
 
-    return libvirt_intWrap(autostart);
+static PyObject *
+libvirt_getCallStats(PyObject *self ATTRIBUTE_UNUSED,
+                     PyObject *args ATTRIBUTE_UNUSED)
+{
+    return virPyCallStatsGet();
 }
 
 static PyObject *
-libvirt_virDomainSetThrottleGroup(PyObject *self ATTRIBUTE_UNUSED,
-                                  PyObject *args)
+libvirt_resetCallStats(PyObject *self ATTRIBUTE_UNUSED,
+                       PyObject *args ATTRIBUTE_UNUSED)
 {
-    virDomainPtr domain;
-    PyObject *pyobj_domain;
-    const char *group = NULL;
-    PyObject *pyobj_dict = NULL;
-    virTypedParameterPtr params = NULL;
-    int nparams = 0;
-    unsigned int flags = 0;
-    int c_retval;
+    virPyCallStatsReset();
 
-    if (!PyArg_ParseTuple(args, (char *)"OsO|I:virDomainSetThrottleGroup",
-                          &pyobj_domain, &group, &pyobj_dict, &flags))
-        return NULL;
+    return VIR_PY_NONE;
+}
 
-    domain = (virDomainPtr) PyvirDomain_Get(pyobj_domain);
+static PyObject *
+libvirt_enableGILStats(PyObject *self ATTRIBUTE_UNUSED,
+                       PyObject *args)
+{
+    int enable;
 
-    if (PyDict_Check(pyobj_dict)) {
-        if (virPyDictToTypedParams(pyobj_dict, &params, &nparams,
-                                   virPyDomainSetBlockIoTuneParams,
-                                   VIR_N_ELEMENTS(virPyDomainSetBlockIoTuneParams)) < 0) {
-            return NULL;
-        }
-    } else {
-        PyErr_Format(PyExc_TypeError, "Restore params must be a dictionary");
+    if (!PyArg_ParseTuple(args, (char *)"p:_enableGILStats", &enable))
         return NULL;
-    }
 
+    virPyGILStatsEnabled = enable;
 
-    LIBVIRT_BEGIN_ALLOW_THREADS;
-    c_retval = virDomainSetThrottleGroup(domain, group, params, nparams, flags);
-    LIBVIRT_END_ALLOW_THREADS;
+    return VIR_PY_NONE;
+}
 
-    virTypedParamsFree(params, nparams);
+static PyObject *
+libvirt_getGILStats(PyObject *self ATTRIBUTE_UNUSED,
+                    PyObject *args ATTRIBUTE_UNUSED)
+{
+    return virPyGILStatsGet();
+}
 
-    return libvirt_intWrap(c_retval);
+static PyObject *
+libvirt_resetGILStats(PyObject *self ATTRIBUTE_UNUSED,
+                      PyObject *args ATTRIBUTE_UNUSED)
+{
+    virPyGILStatsReset();
+
+    return VIR_PY_NONE;
 }
-#endif /* LIBVIR_CHECK_VERSION(11, 2, 0) */
 
 
 /************************************************************************
@@ -11081,8 +12751,10 @@ static PyMethodDef libvirtMethods[] = {
     {(char *) "virStreamEventAddCallback", libvirt_virStreamEventAddCallback, METH_VARARGS, NULL},
     {(char *) "virStreamRecv", libvirt_virStreamRecv, METH_VARARGS, NULL},
     {(char *) "virStreamSend", libvirt_virStreamSend, METH_VARARGS, NULL},
-    {(char *) "virDomainGetInfo", libvirt_virDomainGetInfo, METH_VARARGS, NULL},
-    {(char *) "virDomainGetState", libvirt_virDomainGetState, METH_VARARGS, NULL},
+    {(char *) "virDomainGetInfo", LIBVIRT_METH(libvirt_virDomainGetInfo), LIBVIRT_METH_FLAGS, NULL},
+    {(char *) "virDomainGetState", LIBVIRT_METH(libvirt_virDomainGetState), LIBVIRT_METH_FLAGS, NULL},
+    {(char *) "virDomainGetInfoBulk", libvirt_virDomainGetInfoBulk, METH_VARARGS, NULL},
+    {(char *) "virDomainGetStateBulk", libvirt_virDomainGetStateBulk, METH_VARARGS, NULL},
     {(char *) "virDomainGetControlInfo", libvirt_virDomainGetControlInfo, METH_VARARGS, NULL},
     {(char *) "virDomainGetBlockInfo", libvirt_virDomainGetBlockInfo, METH_VARARGS, NULL},
     {(char *) "virNodeGetInfo", libvirt_virNodeGetInfo, METH_VARARGS, NULL},
@@ -11093,12 +12765,18 @@ static PyMethodDef libvirtMethods[] = {
 #endif /* LIBVIR_CHECK_VERSION(0, 10, 0) */
     {(char *) "virNodeGetCPUStats", libvirt_virNodeGetCPUStats, METH_VARARGS, NULL},
     {(char *) "virNodeGetMemoryStats", libvirt_virNodeGetMemoryStats, METH_VARARGS, NULL},
-    {(char *) "virDomainGetUUID", libvirt_virDomainGetUUID, METH_VARARGS, NULL},
-    {(char *) "virDomainGetUUIDString", libvirt_virDomainGetUUIDString, METH_VARARGS, NULL},
+    {(char *) "virDomainGetUUID", LIBVIRT_METH(libvirt_virDomainGetUUID), LIBVIRT_METH_FLAGS, NULL},
+    {(char *) "virDomainGetUUIDString", LIBVIRT_METH(libvirt_virDomainGetUUIDString), LIBVIRT_METH_FLAGS, NULL},
     {(char *) "virDomainLookupByUUID", libvirt_virDomainLookupByUUID, METH_VARARGS, NULL},
     {(char *) "virRegisterErrorHandler", libvirt_virRegisterErrorHandler, METH_VARARGS, NULL},
     {(char *) "virGetLastError", libvirt_virGetLastError, METH_VARARGS, NULL},
     {(char *) "virConnGetLastError", libvirt_virConnGetLastError, METH_VARARGS, NULL},
+    {(char *) "_enableCallStats", libvirt_enableCallStats, METH_VARARGS, NULL},
+    {(char *) "_getCallStats", libvirt_getCallStats, METH_NOARGS, NULL},
+    {(char *) "_resetCallStats", libvirt_resetCallStats, METH_NOARGS, NULL},
+    {(char *) "_enableGILStats", libvirt_enableGILStats, METH_VARARGS, NULL},
+    {(char *) "_getGILStats", libvirt_getGILStats, METH_NOARGS, NULL},
+    {(char *) "_resetGILStats", libvirt_resetGILStats, METH_NOARGS, NULL},
     {(char *) "virConnectListNetworks", libvirt_virConnectListNetworks, METH_VARARGS, NULL},
     {(char *) "virConnectListDefinedNetworks", libvirt_virConnectListDefinedNetworks, METH_VARARGS, NULL},
 #if LIBVIR_CHECK_VERSION(0, 10, 2)
@@ -11152,9 +12830,22 @@ static PyMethodDef libvirtMethods[] = {
     {(char *) "virStoragePoolListVolumes", libvirt_virStoragePoolListVolumes, METH_VARARGS, NULL},
 #if LIBVIR_CHECK_VERSION(0, 10, 2)
     {(char *) "virStoragePoolListAllVolumes", libvirt_virStoragePoolListAllVolumes, METH_VARARGS, NULL},
+    {(char *) "virStoragePoolListAllVolumesInfo", libvirt_virStoragePoolListAllVolumesInfo, METH_VARARGS, NULL},
 #endif /* LIBVIR_CHECK_VERSION(0, 10, 2) */
+    {(char *) "virDomainLookupByNames", libvirt_virDomainLookupByNames, METH_VARARGS, NULL},
+    {(char *) "virDomainLookupByUUIDStrings", libvirt_virDomainLookupByUUIDStrings, METH_VARARGS, NULL},
+    {(char *) "virDomainLookupByIDs", libvirt_virDomainLookupByIDs, METH_VARARGS, NULL},
+    {(char *) "virNetworkLookupByNames", libvirt_virNetworkLookupByNames, METH_VARARGS, NULL},
+    {(char *) "virNetworkLookupByUUIDStrings", libvirt_virNetworkLookupByUUIDStrings, METH_VARARGS, NULL},
+    {(char *) "virStoragePoolLookupByNames", libvirt_virStoragePoolLookupByNames, METH_VARARGS, NULL},
+    {(char *) "virStoragePoolLookupByUUIDStrings", libvirt_virStoragePoolLookupByUUIDStrings, METH_VARARGS, NULL},
+    {(char *) "virStorageVolLookupByNames", libvirt_virStorageVolLookupByNames, METH_VARARGS, NULL},
+    {(char *) "virStorageVolLookupByKeys", libvirt_virStorageVolLookupByKeys, METH_VARARGS, NULL},
+    {(char *) "virStorageVolLookupByPaths", libvirt_virStorageVolLookupByPaths, METH_VARARGS, NULL},
     {(char *) "virStoragePoolGetInfo", libvirt_virStoragePoolGetInfo, METH_VARARGS, NULL},
     {(char *) "virStorageVolGetInfo", libvirt_virStorageVolGetInfo, METH_VARARGS, NULL},
+    {(char *) "virStoragePoolGetInfoBulk", libvirt_virStoragePoolGetInfoBulk, METH_VARARGS, NULL},
+    {(char *) "virStorageVolGetInfoBulk", libvirt_virStorageVolGetInfoBulk, METH_VARARGS, NULL},
 #if LIBVIR_CHECK_VERSION(3, 0, 0)
     {(char *) "virStorageVolGetInfoFlags", libvirt_virStorageVolGetInfoFlags, METH_VARARGS, NULL},
 #endif /* LIBVIR_CHECK_VERSION(3, 0, 0) */
@@ -11167,6 +12858,8 @@ static PyMethodDef libvirtMethods[] = {
     {(char *) "virEventInvokeHandleCallback", libvirt_virEventInvokeHandleCallback, METH_VARARGS, NULL},
     {(char *) "virEventInvokeTimeoutCallback", libvirt_virEventInvokeTimeoutCallback, METH_VARARGS, NULL},
     {(char *) "virEventInvokeFreeCallback", libvirt_virEventInvokeFreeCallback, METH_VARARGS, NULL},
+    {(char *) "virEventStartDefaultImplThread", libvirt_virEventStartDefaultImplThread, METH_VARARGS, NULL},
+    {(char *) "virEventStopDefaultImplThread", libvirt_virEventStopDefaultImplThread, METH_VARARGS, NULL},
     {(char *) "virNodeListDevices", libvirt_virNodeListDevices, METH_VARARGS, NULL},
 #if LIBVIR_CHECK_VERSION(0, 10, 2)
     {(char *) "virConnectListAllNodeDevices", libvirt_virConnectListAllNodeDevices, METH_VARARGS, NULL},
@@ -11367,7 +13060,32 @@ PyInit_cygvirtmod
     if (virInitialize() < 0)
         return NULL;
 
-    module = PyModule_Create(&moduledef);
+    if (!(module = PyModule_Create(&moduledef)))
+        return NULL;
+
+    /* The shared state of the module is protected by its own locks
+     * when there is no GIL, see VIR_PY_MUTEX */
+#ifdef Py_GIL_DISABLED
+    if (PyUnstable_Module_SetGIL(module, Py_MOD_GIL_NOT_USED) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+#endif
+
+    /* Lets the constructors of the classes wrapping the C objects check
+     * their argument with a plain identity comparison */
+    Py_INCREF((PyObject *) &PyCapsule_Type);
+    if (PyModule_AddObject(module, "_CapsuleType",
+                           (PyObject *) &PyCapsule_Type) < 0) {
+        Py_DECREF((PyObject *) &PyCapsule_Type);
+        Py_DECREF(module);
+        return NULL;
+    }
+
+    if (libvirt_addNativeTypes(module) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
 
     return module;
 }
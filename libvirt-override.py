@@ -1,6 +1,12 @@
 
+import atexit
+import bisect
+import collections
+import threading
+import time
+import weakref
 from types import TracebackType
-from typing import Any, Callable, Dict, List, Optional, overload, Tuple, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, overload, Set, Tuple, Type, TypeVar, Union
 _T = TypeVar('_T')
 _EventCB = Callable[[int, int, int, _T], None]
 _EventAddHandleFunc = Callable[[int, int, _EventCB[_T], _T], int]
@@ -11,12 +17,17 @@ _EventAddTimeoutFunc = Callable[[int, _TimerCB[_T], _T], int]
 _EventUpdateTimeoutFunc = Callable[[int, int], None]
 _EventRemoveTimeoutFunc = Callable[[int], int]
 _DomainCB = Callable[['virConnect', 'virDomain', int, int, _T], Optional[int]]
+_EventDispatcher = Callable[[Callable[..., Any], Tuple[Any, ...]], None]
 _BlkioParameter = Dict[str, Any]
 _MemoryParameter = Dict[str, Any]
 _SchedParameter = Dict[str, Any]
 _TypedParameter = Dict[str, Any]
 _RawError = Tuple[int, int, str, int, str, Optional[str], Optional[str], int, int]
 
+# The type of the objects wrapping the C pointers, which the
+# constructors of the classes check their argument against
+_CapsuleType = libvirtmod._CapsuleType  # type: type
+
 
 # The root of all libvirt errors.
 class libvirtError(Exception):
@@ -258,6 +269,628 @@ def virEventAddTimeout(timeout: int, cb: _TimerCB[_T], opaque: _T) -> int:
     return ret
 
 
+_defaultEventLoopAtExit = False
+
+
+def startDefaultEventLoopThread() -> None:
+    """
+    Register libvirt's default event loop implementation and run
+    it on a native background thread.
+
+    The thread only acquires the GIL while python callbacks are
+    being dispatched, so unlike a python thread spinning on
+    virEventRunDefaultImpl() no python code runs to poll file
+    handles. Calling this again while the thread is running is a
+    no-op, while stopDefaultEventLoopThread() is stopping it, a
+    RuntimeError.
+
+    This cannot be combined with an event loop implementation
+    registered through virEventRegisterImpl().
+    """
+    global _defaultEventLoopAtExit
+    ret = libvirtmod.virEventStartDefaultImplThread()
+    if ret == -1:
+        raise libvirtError('virEventStartDefaultImplThread() failed')
+    if not _defaultEventLoopAtExit:
+        # The thread must not try to grab the GIL while the
+        # interpreter is being torn down
+        atexit.register(stopDefaultEventLoopThread)
+        _defaultEventLoopAtExit = True
+
+
+def stopDefaultEventLoopThread() -> None:
+    """
+    Stop the thread started by startDefaultEventLoopThread()
+
+    The loop is woken up through a zero length timer and the call
+    waits for the current iteration, including any callbacks it
+    dispatches, to finish. It must not be called from an event
+    callback. Calling this when no thread is running is a no-op.
+    """
+    ret = libvirtmod.virEventStopDefaultImplThread()
+    if ret == -1:
+        raise libvirtError('virEventStopDefaultImplThread() failed')
+
+
+_eventDispatcher = None  # type: Optional[_EventDispatcher]
+
+
+def setEventDispatcher(dispatcher: Optional[_EventDispatcher]) -> None:
+    """
+    Route user event callbacks through @dispatcher instead of calling
+    them directly from the thread running the event loop.
+
+    @dispatcher is called as dispatcher(cb, args) from the event loop
+    thread and is expected to arrange for cb(*args) to be run, for
+    example on another thread. Passing None restores direct calls.
+
+    The dispatcher in effect when a callback is registered through one
+    of the virConnect *EventRegisterAny() methods, domainEventRegister()
+    or registerCloseCallback() is used for the lifetime of that
+    registration, unless a dispatcher is passed to the registration
+    method itself.
+    """
+    global _eventDispatcher
+    _eventDispatcher = dispatcher
+
+
+def _eventCallbackWrap(cb: Callable[..., Any], dispatcher: Optional[_EventDispatcher] = None, event: Optional[str] = None, eventID: Optional[int] = None) -> Callable[..., Any]:
+    """
+    Bind @cb to @dispatcher, or to the current event dispatcher if
+    @dispatcher is None
+
+    If event statistics are enabled, calls are accounted to the name
+    of the @eventID constant starting with @event, or to @event
+    itself if @eventID is None.
+    """
+    if event is not None and _eventStatsEnabled:
+        cb = _eventStatsWrap(cb, _eventStatsName(event, eventID))
+    if dispatcher is None:
+        dispatcher = _eventDispatcher
+    if dispatcher is None:
+        return cb
+
+    def dispatch(*args: Any) -> None:
+        dispatcher(cb, args)  # type: ignore
+
+    return dispatch
+
+
+def _directEventDispatch(cb: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+    """
+    Event dispatcher calling @cb straight from the event loop, for
+    internal callbacks which must not queue behind the user's ones
+    """
+    cb(*args)
+
+
+def _domainEventState(event: int, detail: int) -> Optional[int]:
+    """
+    Return the virDomainState a domain is left in by a lifecycle
+    @event, or None if the event does not change it
+    """
+    if event in (VIR_DOMAIN_EVENT_STARTED, VIR_DOMAIN_EVENT_RESUMED):
+        return VIR_DOMAIN_RUNNING
+    if event == VIR_DOMAIN_EVENT_SUSPENDED:
+        return VIR_DOMAIN_PAUSED
+    if event == VIR_DOMAIN_EVENT_STOPPED:
+        return VIR_DOMAIN_SHUTOFF
+    if event == VIR_DOMAIN_EVENT_SHUTDOWN:
+        return VIR_DOMAIN_SHUTDOWN
+    if event == VIR_DOMAIN_EVENT_PMSUSPENDED:
+        return VIR_DOMAIN_PMSUSPENDED
+    if event == VIR_DOMAIN_EVENT_CRASHED:
+        return VIR_DOMAIN_CRASHED
+    # DEFINED and UNDEFINED
+    return None
+
+
+class _EventStats(object):
+    """
+    Call count and latency histogram for one kind of event callback
+    """
+    # Upper bounds in seconds of the histogram buckets, the last
+    # bucket counts anything slower
+    buckets = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'histogram')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(self.buckets) + 1)
+
+    def record(self, elapsed: float, failed: bool = False) -> None:
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.histogram[bisect.bisect_left(self.buckets, elapsed)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"count": self.count,
+                "errors": self.errors,
+                "total": self.total,
+                "max": self.max,
+                "buckets": list(self.buckets),
+                "histogram": list(self.histogram)}
+
+
+_eventStatsEnabled = False
+_eventStatsLock = threading.Lock()
+_eventStatsByEvent = {}  # type: Dict[str, _EventStats]
+_eventStatsByConnection = {}  # type: Dict[str, _EventStats]
+
+
+def enableEventStats(enable: bool = True) -> None:
+    """
+    Turn collection of event callback statistics on or off
+
+    Only callbacks registered while collection is enabled are
+    accounted, so this should be called before registering them.
+    Turning collection off again takes effect immediately. The
+    figures collected so far are kept, see resetEventStats().
+    """
+    global _eventStatsEnabled
+    _eventStatsEnabled = enable
+
+
+def resetEventStats() -> None:
+    """
+    Discard the event callback statistics collected so far
+    """
+    with _eventStatsLock:
+        _eventStatsByEvent.clear()
+        _eventStatsByConnection.clear()
+
+
+def getEventStats() -> Dict[str, Any]:
+    """
+    Return a snapshot of the event callback statistics
+
+    The result is a dict with the keys:
+
+      "enabled": whether collection is currently turned on
+      "events": a dict keyed by event ID constant name, e.g.
+                "VIR_DOMAIN_EVENT_ID_LIFECYCLE", or by "close" and
+                "qemuMonitor" for the close and QEMU monitor callbacks
+      "connections": a dict keyed by connection URI
+
+    Each value of "events" and "connections" is a dict holding the
+    number of callbacks run ("count"), how many raised an exception
+    ("errors"), the total and maximum time in seconds spent in them
+    ("total", "max") and a histogram of that time: "histogram"[i]
+    counts the callbacks which took up to "buckets"[i] seconds, the
+    last entry the ones which took longer.
+
+    The time is measured around the user callback itself, on the
+    thread which runs it, so it does not include any time spent
+    queued by an event dispatcher.
+    """
+    with _eventStatsLock:
+        return {"enabled": _eventStatsEnabled,
+                "events": {name: stats.snapshot() for name, stats in _eventStatsByEvent.items()},
+                "connections": {uri: stats.snapshot() for uri, stats in _eventStatsByConnection.items()}}
+
+
+def _eventStatsName(event: str, eventID: Optional[int]) -> str:
+    """
+    Map an event ID to the name of its constant, e.g. the
+    VIR_DOMAIN_EVENT_ID_ constant matching @eventID
+    """
+    if eventID is None:
+        return event
+    consts = dict(_lazyConstants())
+    consts.update(globals())
+    for name, value in consts.items():
+        if name.startswith(event) and not name.endswith("_LAST") and value == eventID:
+            return name
+    return "%s%d" % (event, eventID)
+
+
+def _eventStatsWrap(cb: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """
+    Wrap @cb to account its calls to the @name event statistics
+    """
+    uri = None  # type: Optional[str]
+
+    def account(*args: Any) -> Any:
+        nonlocal uri
+        if not _eventStatsEnabled:
+            return cb(*args)
+
+        # Every callback gets the virConnect as first argument, and its
+        # URI is formatted locally without a daemon round trip
+        if uri is None:
+            try:
+                uri = args[0].getURI()
+            except libvirtError:
+                uri = ""
+
+        failed = True
+        start = time.perf_counter()
+        try:
+            ret = cb(*args)
+            failed = False
+            return ret
+        finally:
+            elapsed = time.perf_counter() - start
+            with _eventStatsLock:
+                stats = _eventStatsByEvent.get(name)
+                if stats is None:
+                    stats = _eventStatsByEvent[name] = _EventStats()
+                stats.record(elapsed, failed)
+                stats = _eventStatsByConnection.get(uri)  # type: ignore
+                if stats is None:
+                    stats = _eventStatsByConnection[uri] = _EventStats()  # type: ignore
+                stats.record(elapsed, failed)
+
+    return account
+
+
+# Upper bounds in seconds of the buckets of the call and GIL statistics,
+# which double from a microsecond on, see virPyTimeStats in typewrappers.h
+_callStatsBuckets = tuple(1e-6 * 2 ** i for i in range(24))
+_callStatsEnabled = False
+_gilStatsEnabled = False
+
+
+def enableCallStats(enable: bool = True) -> None:
+    """
+    Turn collection of libvirt API call statistics on or off
+
+    While it is on, every call the bindings make to libvirt is timed.
+    Turning collection off again takes effect immediately. The figures
+    collected so far are kept, see resetCallStats().
+    """
+    global _callStatsEnabled
+    libvirtmod._enableCallStats(enable)
+    _callStatsEnabled = enable
+
+
+def resetCallStats() -> None:
+    """
+    Discard the libvirt API call statistics collected so far
+    """
+    libvirtmod._resetCallStats()
+
+
+def getCallStats() -> Dict[str, Any]:
+    """
+    Return a snapshot of the libvirt API call statistics
+
+    The result is a dict with the keys:
+
+      "enabled": whether collection is currently turned on
+      "calls": a dict keyed by libvirt API name, e.g. "virDomainGetInfo"
+
+    Each value of "calls" is a dict holding the number of calls made
+    ("count"), how many failed ("errors"), the total and maximum time
+    in seconds spent in them ("total", "max"), estimates of the median,
+    90th and 99th percentile of that time ("p50", "p90", "p99") and its
+    histogram: "histogram"[i] counts the calls which took up to
+    "buckets"[i] seconds, the last entry the ones which took longer.
+    The percentiles are the upper bounds of the buckets they fall in.
+
+    The time is measured while the GIL is released for the call, so it
+    does not include waiting to take the GIL back. The bulk getters of
+    libvirt.bulk and the batch lookups such as virConnect.lookupByNames()
+    are accounted once per call under their own name, for example
+    "virDomainGetInfoBulk" or "virDomainLookupByNames". The methods making
+    several libvirt calls, such as virDomain.setSchedulerParameters(),
+    which fetches the current parameters first, account each under the
+    API it calls. Only the calls made through this module are accounted,
+    not the ones of libvirt_qemu and libvirt_lxc.
+    """
+    calls = {}  # type: Dict[str, Dict[str, Any]]
+    for name, count, errors, total, slowest, histogram in libvirtmod._getCallStats():
+        name = _callStatsName(name)
+        stats = calls.get(name)
+        if stats is None:
+            stats = calls[name] = {"count": 0, "errors": 0}
+        stats["count"] += count
+        stats["errors"] += errors
+        stats.update(_timeStats(total, slowest, histogram, stats))
+
+    return {"enabled": _callStatsEnabled, "calls": calls}
+
+
+def enableGILStats(enable: bool = True) -> None:
+    """
+    Turn collection of GIL statistics of the callbacks on or off
+
+    While it is on, every time a libvirt thread runs python code, be it
+    an event, error, authentication or stream callback or a function of
+    the event loop implementation registered with virEventRegisterImpl(),
+    the time it waits to get the GIL and then holds it are measured.
+    Turning collection off again takes effect immediately. The figures
+    collected so far are kept, see resetGILStats().
+    """
+    global _gilStatsEnabled
+    libvirtmod._enableGILStats(enable)
+    _gilStatsEnabled = enable
+
+
+def resetGILStats() -> None:
+    """
+    Discard the GIL statistics of the callbacks collected so far
+    """
+    libvirtmod._resetGILStats()
+
+
+def getGILStats() -> Dict[str, Any]:
+    """
+    Return a snapshot of the GIL statistics of the callbacks
+
+    The result is a dict with the keys:
+
+      "enabled": whether collection is currently turned on
+      "callbacks": a dict keyed by the kind of callback, that is the
+                   name of the C function running it, for example
+                   "virConnectDomainEventLifecycleCallback" or
+                   "virErrorFuncHandler"
+
+    Each value of "callbacks" is a dict holding the number of times it
+    ran ("count"), and the statistics of the time spent waiting for the
+    GIL ("wait") and holding it ("hold"). Those have the same keys as
+    the ones of getCallStats(): "total", "max", "p50", "p90", "p99",
+    "buckets" and "histogram".
+
+    A wait much longer than the hold means that the thread running the
+    callbacks, typically the libvirt event loop, is starved by python
+    threads keeping the GIL busy. Only the callbacks run through this
+    module are accounted, not the QEMU monitor ones of libvirt_qemu.
+    """
+    callbacks = {}  # type: Dict[str, Dict[str, Any]]
+    for name, count, waitTotal, waitMax, waitHistogram, holdTotal, holdMax, holdHistogram in libvirtmod._getGILStats():
+        name = _callStatsName(name)
+        stats = callbacks.get(name)
+        if stats is None:
+            stats = callbacks[name] = {"count": 0, "wait": {}, "hold": {}}
+        stats["count"] += count
+        stats["wait"] = _timeStats(waitTotal, waitMax, waitHistogram, stats["wait"])
+        stats["hold"] = _timeStats(holdTotal, holdMax, holdHistogram, stats["hold"])
+
+    return {"enabled": _gilStatsEnabled, "callbacks": callbacks}
+
+
+def _callStatsName(name: str) -> str:
+    """
+    Map the name of the C function making a call to the libvirt API name,
+    or of the one running a callback to the name of the callback
+    """
+    if name.startswith("libvirt_native"):
+        return "vir" + name[14:]
+    if name.startswith("libvirt_"):
+        return name[8:]
+    return name
+
+
+def _timeStats(total: int, slowest: int, histogram: List[int], stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the time statistics of a C call site, in nanoseconds, to
+    seconds and add them to the ones in @stats of other sites
+    """
+    if stats.get("histogram"):
+        histogram = [a + b for a, b in zip(stats["histogram"], histogram)]
+    ret = {"total": stats.get("total", 0.0) + total / 1e9,
+           "max": max(stats.get("max", 0.0), slowest / 1e9),
+           "buckets": list(_callStatsBuckets),
+           "histogram": histogram}
+    count = sum(histogram)
+    for key, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        ret[key] = _timePercentile(ret, count, fraction)
+    return ret
+
+
+def _timePercentile(stats: Dict[str, Any], count: int, fraction: float) -> float:
+    """
+    Estimate the time under which @fraction of the @count times of
+    @stats were
+    """
+    rank = fraction * count
+    seen = 0
+    for bound, n in zip(stats["buckets"], stats["histogram"]):
+        seen += n
+        if seen >= rank:
+            return min(bound, stats["max"])
+    return stats["max"]
+
+
+class _DomainXMLCache(object):
+    """
+    Least recently used cache of domain XML documents, keyed by
+    (UUID string, flags) and invalidated by the domain events which
+    can change them, see virConnect.enableDomainXMLCache()
+    """
+    def __init__(self, conn: 'virConnect', maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # type: collections.OrderedDict[Tuple[str, int], str]
+        self._flags = {}  # type: Dict[str, Set[int]]
+        # Invalidations made while lookups are in flight are recorded
+        # with a sequence number, so that a lookup racing with an event
+        # does not store the XML it fetched before it
+        self._seq = 0
+        self._inflight = 0
+        self._invalidated = {}  # type: Dict[Optional[str], int]
+
+        self._callbackIDs = []  # type: List[int]
+        for eventID in (VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                        VIR_DOMAIN_EVENT_ID_DEVICE_ADDED,
+                        VIR_DOMAIN_EVENT_ID_DEVICE_REMOVED,
+                        VIR_DOMAIN_EVENT_ID_TUNABLE,
+                        VIR_DOMAIN_EVENT_ID_METADATA_CHANGE,
+                        VIR_DOMAIN_EVENT_ID_BLOCK_JOB,
+                        VIR_DOMAIN_EVENT_ID_DISK_CHANGE,
+                        VIR_DOMAIN_EVENT_ID_TRAY_CHANGE):
+            try:
+                self._callbackIDs.append(conn.domainEventRegisterAny(
+                    None, eventID, self._event, None,
+                    dispatcher=_directEventDispatch))
+            except libvirtError:
+                self.close(conn)
+                raise
+
+    def _event(self, conn: 'virConnect', dom: 'virDomain', *args: Any) -> None:
+        self.invalidate(dom.UUIDString())
+
+    def invalidate(self, uuid: Optional[str] = None) -> None:
+        with self._lock:
+            self._seq += 1
+            self.invalidations += 1
+            if self._inflight:
+                self._invalidated[uuid] = self._seq
+            if uuid is None:
+                self._entries.clear()
+                self._flags.clear()
+                return
+            for flags in self._flags.pop(uuid, ()):
+                del self._entries[(uuid, flags)]
+
+    def get(self, dom: 'virDomain', flags: int) -> str:
+        key = (dom.UUIDString(), flags)
+        with self._lock:
+            xml = self._entries.get(key)
+            if xml is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return xml
+            self.misses += 1
+            self._inflight += 1
+            seq = self._seq
+
+        ret = None
+        try:
+            ret = libvirtmod.virDomainGetXMLDesc(dom._o, flags)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+                if (ret is not None and key not in self._entries and
+                        self._invalidated.get(key[0], 0) <= seq and
+                        self._invalidated.get(None, 0) <= seq):
+                    self._store(key, ret)
+                if not self._inflight:
+                    self._invalidated.clear()
+        if ret is None:
+            raise libvirtError('virDomainGetXMLDesc() failed')
+        return ret
+
+    def _store(self, key: Tuple[str, int], xml: str) -> None:
+        self._entries[key] = xml
+        self._flags.setdefault(key[0], set()).add(key[1])
+        while len(self._entries) > self.maxsize:
+            (uuid, flags), _ = self._entries.popitem(last=False)
+            self._flags[uuid].discard(flags)
+            if not self._flags[uuid]:
+                del self._flags[uuid]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries),
+                    "maxsize": self.maxsize,
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "invalidations": self.invalidations}
+
+    def close(self, conn: 'virConnect') -> None:
+        callbackIDs = self._callbackIDs
+        self._callbackIDs = []
+        for callbackID in callbackIDs:
+            try:
+                conn.domainEventDeregisterAny(callbackID)
+            except libvirtError:
+                pass
+        self.invalidate()
+
+
+class _WrapperCache(object):
+    """
+    Weak value cache of the wrappers of the domains, networks, storage
+    pools and storage volumes of a connection, keyed by UUID, or by key
+    for volumes, see virConnect.enableWrapperCache()
+    """
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._wrappers = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary[Tuple[str, str], Any]
+
+    def wrap(self, klass: Type[_T], conn: 'virConnect', obj: Any) -> _T:
+        getKey, free = _wrapperIdentity[klass.__name__]
+        objKey = getKey(obj)
+        if objKey is None:
+            return klass(conn, _obj=obj)  # type: ignore
+
+        key = (klass.__name__, objKey)
+        with self._lock:
+            wrapper = self._wrappers.get(key)
+            # The ID of a domain handle is the one it had when looked up,
+            # so a domain restarted since gets a new wrapper
+            if wrapper is not None and (
+                    klass is not virDomain or
+                    wrapper.ID() == libvirtmod.virDomainGetID(obj)):
+                self.hits += 1
+            else:
+                wrapper = klass(conn, _obj=obj)  # type: ignore
+                self._wrappers[key] = wrapper
+                self.misses += 1
+                return wrapper
+
+        # Release the duplicate handle now rather than when collected
+        free(obj)
+        return wrapper
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._wrappers),
+                    "hits": self.hits,
+                    "misses": self.misses}
+
+
+# The functions giving the cache key and freeing the handle of the
+# objects whose wrappers can be cached
+_wrapperIdentity = {
+    "virDomain": (libvirtmod.virDomainGetUUIDString, libvirtmod.virDomainFree),
+    "virNetwork": (libvirtmod.virNetworkGetUUIDString, libvirtmod.virNetworkFree),
+    "virStoragePool": (libvirtmod.virStoragePoolGetUUIDString, libvirtmod.virStoragePoolFree),
+    "virStorageVol": (libvirtmod.virStorageVolGetKey, libvirtmod.virStorageVolFree),
+}  # type: Dict[str, Tuple[Callable[[Any], Optional[str]], Callable[[Any], int]]]
+
+
+def _wrapObject(klass: Type[_T], conn: 'virConnect', obj: Any) -> _T:
+    """
+    Wrap the C object @obj of @conn in an instance of @klass, or return
+    the one already wrapping it if the wrapper cache of @conn is enabled
+    """
+    cache = getattr(conn, '_wrapperCache', None)
+    if cache is None:
+        return klass(conn, _obj=obj)  # type: ignore
+    return cache.wrap(klass, conn, obj)
+
+
+def _wrapObjects(klass: Type[_T], conn: 'virConnect', objs: List[Any]) -> List[_T]:
+    """
+    Wrap a list of C objects of @conn, as _wrapObject() does
+    """
+    cache = getattr(conn, '_wrapperCache', None)
+    if cache is None:
+        return [klass(conn, _obj=obj) for obj in objs]  # type: ignore
+    return [cache.wrap(klass, conn, obj) for obj in objs]
+
+
 #
 # a caller for the ff callbacks for custom event loop implementations
 #
@@ -279,3 +912,117 @@ def virEventInvokeFreeCallback(opaque: Any) -> None:
     """
 
     libvirtmod.virEventInvokeFreeCallback(opaque[2], opaque[1])
+
+
+#
+# Lazy module layout
+#
+# When built with it, the generated code at the end of this module keeps
+# the source of rarely used classes and the constants not referenced by
+# the module itself in _lazyClassSources, _lazyConstantsTable and
+# _lazyParamsTable, to be compiled and parsed on first access instead of
+# at import time. With the default layout those are all empty.
+#
+
+_lazyLock = threading.Lock()
+_lazyConstantsCache = None  # type: Optional[Dict[str, Union[int, str]]]
+_docstrings = None  # type: Optional[Dict[str, str]]
+
+
+def _lazyConstants() -> Dict[str, Union[int, str]]:
+    """
+    Parse the tables of the constants not defined up front
+    """
+    global _lazyConstantsCache
+    if _lazyConstantsCache is None:
+        consts = {}  # type: Dict[str, Union[int, str]]
+        for line in _lazyConstantsTable.splitlines():
+            name, value = line.split(" ", 1)
+            consts[name] = int(value)
+        for line in _lazyParamsTable.splitlines():
+            name, value = line.split(" ", 1)
+            consts[name] = value
+        _lazyConstantsCache = consts
+    return _lazyConstantsCache
+
+
+def _lazyClass(name: str) -> Any:
+    """
+    Get the class @name, compiling it first if it was not loaded yet
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+
+    with _lazyLock:
+        if name not in globals():
+            import linecache
+
+            source = _lazyClassSources[name]
+            filename = "<libvirt %s>" % name
+            # Let tracebacks show the code of the class
+            linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+            exec(compile(source, filename, "exec"), globals())
+            if _docstrings is not None:
+                _applyDocstrings(_docstrings, name + ".")
+        return globals()[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazyClassSources:
+        return _lazyClass(name)
+
+    consts = _lazyConstants()
+    if name in consts:
+        value = globals()[name] = consts[name]
+        return value
+
+    if name == "__all__" and (_lazyClassSources or consts):
+        # "from libvirt import *" must still see every public name
+        public = [n for n in list(globals()) if not n.startswith("_")]
+        value = globals()[name] = public + list(_lazyClassSources) + list(consts)
+        return value
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_lazyClassSources) | set(_lazyConstants()))
+
+
+def _applyDocstrings(docs: Dict[str, str], prefix: str) -> None:
+    module = globals()
+    for qualname, doc in docs.items():
+        if not qualname.startswith(prefix):
+            continue
+        owner, _, attr = qualname.rpartition(".")
+        if owner:
+            # Lazy classes get theirs when they are loaded
+            if owner not in module:
+                continue
+            func = getattr(module[owner], attr, None)
+        else:
+            func = module.get(attr)
+        # Keep the ones of the manually written methods
+        if func is not None and func.__doc__ is None:
+            func.__doc__ = doc
+
+
+def loadDocstrings() -> bool:
+    """Attach the documentation of the generated functions and methods
+       when the module was built with it split into the separate
+       libvirt_docstrings module, which keeps it out of the import time
+       and memory of applications not looking at it.
+       Returns False if there is no such module, in which case the
+       documentation is already in place."""
+    global _docstrings
+    try:
+        import libvirt_docstrings  # type: ignore
+    except ImportError:
+        return False
+
+    with _lazyLock:
+        _docstrings = libvirt_docstrings.docstrings
+        _applyDocstrings(libvirt_docstrings.docstrings, "")
+    return True
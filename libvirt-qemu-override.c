@@ -44,41 +44,70 @@
 #if LIBVIR_CHECK_VERSION(1, 2, 3)
 static PyObject *libvirt_qemu_module;
 static PyObject *libvirt_qemu_dict;
+VIR_PY_MUTEX(libvirt_qemu_moduleLock);
 
 static PyObject *
 getLibvirtQemuModuleObject(void)
 {
-    if (libvirt_qemu_module)
-        return libvirt_qemu_module;
+    PyObject *module;
+
+    VIR_PY_MUTEX_LOCK(libvirt_qemu_moduleLock);
+    module = libvirt_qemu_module;
+    VIR_PY_MUTEX_UNLOCK(libvirt_qemu_moduleLock);
+    if (module)
+        return module;
 
     // PyImport_ImportModule returns a new reference
     /* Bogus (char *) cast for RHEL-5 python API brokenness */
-    libvirt_qemu_module = PyImport_ImportModule((char *)"libvirt_qemu");
-    if (!libvirt_qemu_module) {
+    module = PyImport_ImportModule((char *)"libvirt_qemu");
+    if (!module) {
         DEBUG("%s Error importing libvirt_qemu module\n", __FUNCTION__);
         PyErr_Print();
         return NULL;
     }
 
-    return libvirt_qemu_module;
+    VIR_PY_MUTEX_LOCK(libvirt_qemu_moduleLock);
+    if (libvirt_qemu_module)
+        Py_DECREF(module);
+    else
+        libvirt_qemu_module = module;
+    module = libvirt_qemu_module;
+    VIR_PY_MUTEX_UNLOCK(libvirt_qemu_moduleLock);
+
+    return module;
 }
 
 static PyObject *
 getLibvirtQemuDictObject(void)
 {
-    if (libvirt_qemu_dict)
-        return libvirt_qemu_dict;
+    PyObject *module;
+    PyObject *dict;
+
+    VIR_PY_MUTEX_LOCK(libvirt_qemu_moduleLock);
+    dict = libvirt_qemu_dict;
+    VIR_PY_MUTEX_UNLOCK(libvirt_qemu_moduleLock);
+    if (dict)
+        return dict;
+
+    if (!(module = getLibvirtQemuModuleObject()))
+        return NULL;
 
     // PyModule_GetDict returns a borrowed reference
-    libvirt_qemu_dict = PyModule_GetDict(getLibvirtQemuModuleObject());
-    if (!libvirt_qemu_dict) {
+    dict = PyModule_GetDict(module);
+    if (!dict) {
         DEBUG("%s Error importing libvirt_qemu dictionary\n", __FUNCTION__);
         PyErr_Print();
         return NULL;
     }
 
-    Py_INCREF(libvirt_qemu_dict);
-    return libvirt_qemu_dict;
+    VIR_PY_MUTEX_LOCK(libvirt_qemu_moduleLock);
+    if (!libvirt_qemu_dict) {
+        Py_INCREF(dict);
+        libvirt_qemu_dict = dict;
+    }
+    VIR_PY_MUTEX_UNLOCK(libvirt_qemu_moduleLock);
+
+    return dict;
 }
 
 
@@ -485,7 +514,15 @@ PyInit_cygvirtmod_qemu
     if (virInitialize() < 0)
         return NULL;
 
-    module = PyModule_Create(&moduledef);
+    if (!(module = PyModule_Create(&moduledef)))
+        return NULL;
+
+#ifdef Py_GIL_DISABLED
+    if (PyUnstable_Module_SetGIL(module, Py_MOD_GIL_NOT_USED) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+#endif
 
     return module;
 }
@@ -28,7 +28,7 @@ def qemuMonitorEventRegister(conn: libvirt.virConnect, dom: libvirt.virDomain, e
        callback will enable delivery of the events"""
     if not hasattr(conn, 'qemuMonitorEventCallbackID'):
         conn.qemuMonitorEventCallbackID = {}  # type: ignore
-    cbData = {"cb": cb, "conn": conn, "opaque": opaque}
+    cbData = {"cb": libvirt._eventCallbackWrap(cb, None, "qemuMonitor"), "conn": conn, "opaque": opaque}
     if dom is None:
         ret = libvirtmod_qemu.virConnectDomainQemuMonitorEventRegister(conn._o, None, event, cbData, flags)
     else:
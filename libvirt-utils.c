@@ -609,3 +609,285 @@ virPyCpumapConvert(int cpunum,
 
     return 0;
 }
+
+
+typedef struct {
+    virPyParallelFunc func;
+    void *opaque;
+    ssize_t n;
+    ssize_t next;               /* next item to run @func on, under @lock */
+    int running;                /* workers not yet exited, under @lock */
+    PyThread_type_lock lock;
+    PyThread_type_lock done;    /* released by the last worker exiting */
+} virPyParallelJob;
+
+static void
+virPyParallelWork(virPyParallelJob *job)
+{
+    ssize_t i;
+
+    for (;;) {
+        PyThread_acquire_lock(job->lock, WAIT_LOCK);
+        i = job->next++;
+        PyThread_release_lock(job->lock);
+
+        if (i >= job->n)
+            return;
+
+        job->func(job->opaque, i);
+    }
+}
+
+static void
+virPyParallelWorkerExit(virPyParallelJob *job)
+{
+    int last;
+
+    PyThread_acquire_lock(job->lock, WAIT_LOCK);
+    last = --job->running == 0;
+    PyThread_release_lock(job->lock);
+
+    /* @job lives on the caller's stack and is gone once this is done */
+    if (last)
+        PyThread_release_lock(job->done);
+}
+
+static void
+virPyParallelWorker(void *opaque)
+{
+    virPyParallelJob *job = opaque;
+
+    virPyParallelWork(job);
+    virPyParallelWorkerExit(job);
+}
+
+
+/* virPyParallelRun
+ * @n: the number of items
+ * @nworkers: the number of extra threads
+ * @func: the function to run on every item
+ * @opaque: data passed to @func
+ *
+ * Run @func on the items 0 to @n - 1, the calling thread and up to
+ * @nworkers extra ones, at most VIR_PY_MAX_WORKERS, sharing them. The
+ * items are all done when this returns, by the calling thread alone if
+ * the workers cannot be set up.
+ *
+ * Must be called without the GIL, @func must not touch any Python
+ * object.
+ */
+void
+virPyParallelRun(ssize_t n,
+                 int nworkers,
+                 virPyParallelFunc func,
+                 void *opaque)
+{
+    virPyParallelJob job;
+    ssize_t i;
+    int w;
+
+    if (nworkers > VIR_PY_MAX_WORKERS)
+        nworkers = VIR_PY_MAX_WORKERS;
+    if (nworkers > n - 1)
+        nworkers = n - 1;
+
+    memset(&job, 0, sizeof(job));
+    job.func = func;
+    job.opaque = opaque;
+    job.n = n;
+
+    if (nworkers > 0 &&
+        (!(job.lock = PyThread_allocate_lock()) ||
+         !(job.done = PyThread_allocate_lock())))
+        nworkers = 0;
+
+    if (nworkers <= 0) {
+        for (i = 0; i < n; i++)
+            func(opaque, i);
+        goto cleanup;
+    }
+
+    PyThread_acquire_lock(job.done, WAIT_LOCK);
+    job.running = nworkers;
+    for (w = 0; w < nworkers; w++) {
+        if (PyThread_start_new_thread(virPyParallelWorker,
+                                      &job) == (unsigned long)-1)
+            virPyParallelWorkerExit(&job);
+    }
+    virPyParallelWork(&job);
+    PyThread_acquire_lock(job.done, WAIT_LOCK);
+    PyThread_release_lock(job.done);
+
+ cleanup:
+    if (job.lock)
+        PyThread_free_lock(job.lock);
+    if (job.done)
+        PyThread_free_lock(job.done);
+}
+
+
+typedef struct {
+    void **objs;
+    unsigned int flags;
+    char *results;
+    size_t size;
+    virErrorPtr errors;
+    virPyBulkFunc call;
+} virPyBulkJob;
+
+static void
+virPyBulkOne(void *opaque,
+             ssize_t i)
+{
+    virPyBulkJob *job = opaque;
+    virErrorPtr err;
+
+    job->call(job->objs[i], job->flags, job->results + i * job->size);
+
+    /* The libvirt APIs reset the thread local error on entry, so it
+     * is set if and only if this call failed */
+    if ((err = virGetLastError()) && err->code != VIR_ERR_OK)
+        virCopyLastError(&job->errors[i]);
+}
+
+static PyObject *
+virPyBulkError(const char *name,
+               virErrorPtr err,
+               PyObject **klass)
+{
+    PyObject *module;
+    PyObject *exc;
+    PyObject *info;
+
+    if (!*klass) {
+        if (!(module = PyImport_ImportModule("libvirt")))
+            return NULL;
+        *klass = PyObject_GetAttrString(module, "libvirtError");
+        Py_DECREF(module);
+        if (!*klass)
+            return NULL;
+    }
+
+    /* libvirtError picks the error of the calling thread up, which was
+     * reset, so the one of the worker is filled in afterwards */
+    if (!(exc = PyObject_CallFunction(*klass, (char *) "s",
+                                      err->message ? err->message : name)))
+        return NULL;
+
+    if (!(info = libvirt_virErrorPtrWrap(err)) ||
+        PyObject_SetAttrString(exc, "err", info) < 0) {
+        Py_XDECREF(info);
+        Py_DECREF(exc);
+        return NULL;
+    }
+
+    Py_DECREF(info);
+    return exc;
+}
+
+
+/* virPyBulkCall
+ * @name: the name of the bulk function, for the call statistics
+ * @capsule: the name of the capsules holding the objects
+ * @pyobj_objs: python list of the objects, None for the closed ones
+ * @flags: flags passed to @call
+ * @nworkers: the number of extra threads, see virPyParallelRun()
+ * @size: the size of the result of @call
+ * @call: the function calling the API on one object
+ * @wrap: the function converting one result of @call
+ * @release: the function freeing one result of @call, or NULL
+ *
+ * Call the per object getter @call on every object of @pyobj_objs,
+ * with the GIL released once for all of them.
+ *
+ * Returns a python list holding, for every object, its converted
+ * result or the libvirtError it failed with, or NULL with an error set.
+ */
+PyObject *
+virPyBulkCall(const char *name,
+              const char *capsule,
+              PyObject *pyobj_objs,
+              unsigned int flags,
+              int nworkers,
+              size_t size,
+              virPyBulkFunc call,
+              virPyBulkWrapFunc wrap,
+              virPyBulkFreeFunc release)
+{
+    PyObject *py_retval = NULL;
+    PyObject *pyobj_held = NULL;
+    PyObject *klass = NULL;
+    PyObject *item;
+    virPyBulkJob job;
+    ssize_t nobjs = 0;
+    ssize_t i;
+
+    if (!PyList_Check(pyobj_objs)) {
+        PyErr_SetString(PyExc_TypeError, "objects must be a list");
+        return NULL;
+    }
+
+    memset(&job, 0, sizeof(job));
+    job.flags = flags;
+    job.size = size;
+    job.call = call;
+
+    /* Keeps the objects alive whatever happens to the list once the GIL
+     * is released */
+    if (!(pyobj_held = PyList_GetSlice(pyobj_objs, 0, PyList_Size(pyobj_objs))))
+        return NULL;
+    nobjs = PyList_Size(pyobj_held);
+
+    if (VIR_ALLOC_N(job.objs, nobjs > 0 ? nobjs : 1) < 0 ||
+        virAllocN(&job.results, size, nobjs > 0 ? nobjs : 1) < 0 ||
+        VIR_ALLOC_N(job.errors, nobjs > 0 ? nobjs : 1) < 0) {
+        PyErr_NoMemory();
+        goto cleanup;
+    }
+
+    for (i = 0; i < nobjs; i++) {
+        item = PyList_GetItem(pyobj_held, i);
+
+        /* The object was closed or freed, libvirt rejects it in the
+         * same way as when calling its method */
+        if (item == Py_None)
+            continue;
+
+        if (!(job.objs[i] = PyCapsule_GetPointer(item, capsule)))
+            goto cleanup;
+    }
+
+    LIBVIRT_BEGIN_ALLOW_THREADS_AS(name);
+    virPyParallelRun(nobjs, nworkers, virPyBulkOne, &job);
+    virResetLastError();
+    LIBVIRT_END_ALLOW_THREADS;
+
+    if (!(py_retval = PyList_New(nobjs)))
+        goto cleanup;
+
+    for (i = 0; i < nobjs; i++) {
+        if (job.errors[i].code == VIR_ERR_OK)
+            item = wrap(job.results + i * size);
+        else
+            item = virPyBulkError(name, &job.errors[i], &klass);
+        VIR_PY_LIST_SET_GOTO(py_retval, i, item, error);
+    }
+
+ cleanup:
+    for (i = 0; i < nobjs; i++) {
+        if (job.results && release)
+            release(job.results + i * size);
+        if (job.errors)
+            virResetError(&job.errors[i]);
+    }
+    VIR_FREE(job.objs);
+    VIR_FREE(job.results);
+    VIR_FREE(job.errors);
+    Py_XDECREF(klass);
+    Py_DECREF(pyobj_held);
+    return py_retval;
+
+ error:
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
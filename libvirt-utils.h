@@ -351,4 +351,53 @@ int virPyCpumapConvert(int cpunum,
                        unsigned char **cpumapptr,
                        int *cpumaplen);
 
+/* The free threaded builds of python have no GIL serializing the
+ * accesses to the global state of the modules, so these mutexes do it
+ * there instead. They must not be held while calling python code, and
+ * cost nothing with the GIL. */
+# ifdef Py_GIL_DISABLED
+#  define VIR_PY_MUTEX(name) static PyMutex name
+#  define VIR_PY_MUTEX_LOCK(name) PyMutex_Lock(&(name))
+#  define VIR_PY_MUTEX_UNLOCK(name) PyMutex_Unlock(&(name))
+# else
+#  define VIR_PY_MUTEX(name) static char name ATTRIBUTE_UNUSED
+#  define VIR_PY_MUTEX_LOCK(name)
+#  define VIR_PY_MUTEX_UNLOCK(name)
+# endif
+
+/* Serializes the accesses to the fields of a python object on the free
+ * threaded builds, where other threads may be updating them. */
+# ifdef Py_GIL_DISABLED
+#  define VIR_PY_BEGIN_CRITICAL_SECTION(obj) Py_BEGIN_CRITICAL_SECTION(obj)
+#  define VIR_PY_END_CRITICAL_SECTION() Py_END_CRITICAL_SECTION()
+# else
+#  define VIR_PY_BEGIN_CRITICAL_SECTION(obj) {
+#  define VIR_PY_END_CRITICAL_SECTION() }
+# endif
+
+/* Upper bound on the extra threads of virPyParallelRun() */
+# define VIR_PY_MAX_WORKERS 32
+
+typedef void (*virPyParallelFunc)(void *opaque, ssize_t i);
+
+void virPyParallelRun(ssize_t n,
+                      int nworkers,
+                      virPyParallelFunc func,
+                      void *opaque);
+
+/* Called without the GIL, stores the result of the API in @result */
+typedef void (*virPyBulkFunc)(void *obj, unsigned int flags, void *result);
+typedef PyObject *(*virPyBulkWrapFunc)(void *result);
+typedef void (*virPyBulkFreeFunc)(void *result);
+
+PyObject *virPyBulkCall(const char *name,
+                        const char *capsule,
+                        PyObject *pyobj_objs,
+                        unsigned int flags,
+                        int nworkers,
+                        size_t size,
+                        virPyBulkFunc call,
+                        virPyBulkWrapFunc wrap,
+                        virPyBulkFreeFunc release);
+
 #endif /* __LIBVIRT_UTILS_H__ */
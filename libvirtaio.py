@@ -43,26 +43,56 @@ If Python >= 3.7 can be required then
 
     asyncio.run(myapp())
 
+Alternatively, libvirt's own event loop can service the connections on
+a native thread, with only the callbacks being run by asyncio:
+
+    async def myapp():
+      impl = libvirtaio.virEventRegisterAsyncIOHybridImpl()
+
+      conn = libvirt.open("test:///default")
+      ...
+      impl.close()
+
+Callbacks which block can be moved off the loop with a dispatcher, which
+runs them in an executor (or awaits them, for coroutine functions) while
+keeping the events for each object in order:
+
+    dispatcher = libvirtaio.virEventAsyncIODispatcher()
+    conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                                lifecycle, None, dispatcher=dispatcher)
+
 .. seealso::
     https://libvirt.org/html/libvirt-libvirt-event.html
 '''
 
 import asyncio
+import collections
+import functools
 import itertools
 import logging
+import os
+import threading
+import time
 import warnings
 
 import libvirt
+import libvirtevents
 
-from typing import Any, Callable, Dict, Generator, Optional, TypeVar  # noqa F401
+from typing import Any, Callable, Deque, Dict, Generator, Hashable, Iterable, List, Optional, Set, Tuple, TypeVar, Union  # noqa F401
 _T = TypeVar('_T')
 
 __author__ = 'Wojtek Porczyk <woju@invisiblethingslab.com>'
 __license__ = 'LGPL-2.1+'
 __all__ = [
     'getCurrentImpl',
+    'getEventStats',
+    'virEventAsyncIODispatcher',
+    'virEventAsyncIOHybridImpl',
     'virEventAsyncIOImpl',
+    'virEventRegisterAsyncIOHybridImpl',
     'virEventRegisterAsyncIOImpl',
+    'waitForDomainState',
+    'waitForDomainsState',
 ]
 
 
@@ -113,43 +143,36 @@ class Descriptor(object):
 
         :param int event: The event (from libvirt's constants) being dispatched
         '''
-        for callback in list(self.callbacks.values()):
+        stats = self.impl.handleStats if libvirt._eventStatsEnabled else None
+        with self.impl._lock:
+            callbacks = list(self.callbacks.values())
+        for callback in callbacks:
             if callback.event is not None and callback.event & event:
+                if stats is None:
+                    callback.cb(callback.iden, self.fd, event, callback.opaque)
+                    continue
+                start = time.perf_counter()
                 callback.cb(callback.iden, self.fd, event, callback.opaque)
+                stats.record(time.perf_counter() - start)
 
     def update(self) -> None:
         '''Register or unregister callbacks at event loop
 
         This should be called after change of any ``.event`` in callbacks.
         '''
-        # It seems like loop.add_{reader,writer} can be run multiple times
-        # and will still register the callback only once. Likewise,
-        # remove_{reader,writer} may be run even if the reader/writer
-        # is not registered (and will just return False).
-
         # For the edge case of empty callbacks, any() returns False.
-        if any(callback.event & ~(
+        with self.impl._lock:
+            events = [callback.event for callback in self.callbacks.values()]
+        if any(event & ~(
             libvirt.VIR_EVENT_HANDLE_READABLE |
             libvirt.VIR_EVENT_HANDLE_WRITABLE)
-                for callback in self.callbacks.values()):
+                for event in events):
             warnings.warn(
                 'The only event supported are VIR_EVENT_HANDLE_READABLE '
                 'and VIR_EVENT_HANDLE_WRITABLE',
                 UserWarning)
 
-        if any(callback.event & libvirt.VIR_EVENT_HANDLE_READABLE
-                for callback in self.callbacks.values()):
-            self.impl.loop.add_reader(
-                self.fd, self._handle, libvirt.VIR_EVENT_HANDLE_READABLE)
-        else:
-            self.impl.loop.remove_reader(self.fd)
-
-        if any(callback.event & libvirt.VIR_EVENT_HANDLE_WRITABLE
-                for callback in self.callbacks.values()):
-            self.impl.loop.add_writer(
-                self.fd, self._handle, libvirt.VIR_EVENT_HANDLE_WRITABLE)
-        else:
-            self.impl.loop.remove_writer(self.fd)
+        self.impl._call(self.impl._sync_descriptor, self.fd)
 
     def add_handle(self, callback: "FDCallback") -> None:
         '''Add a callback to the descriptor
@@ -236,6 +259,7 @@ class TimeoutCallback(Callback):
         This is a coroutine.
         '''
         while True:
+            start = self.impl.loop.time()
             try:
                 if self.timeout > 0:
                     timeout = self.timeout * 1e-3
@@ -243,19 +267,35 @@ class TimeoutCallback(Callback):
                     await asyncio.sleep(timeout)
                 else:
                     # scheduling timeout for next loop iteration
+                    timeout = 0
                     await asyncio.sleep(0)
 
             except asyncio.CancelledError:
                 self.impl.log.debug('timer %d cancelled', self.iden)
                 break
 
-            self.cb(self.iden, self.opaque)
+            if libvirt._eventStatsEnabled:
+                # How late the loop got round to firing the timer
+                self.impl.loopLag = max(
+                    0.0, self.impl.loop.time() - start - timeout)
+                self.impl.loopLagStats.record(self.impl.loopLag)
+                start = time.perf_counter()
+                self.cb(self.iden, self.opaque)
+                self.impl.timerStats.record(time.perf_counter() - start)
+            else:
+                self.cb(self.iden, self.opaque)
             self.impl.log.debug('timer %r callback ended', self.iden)
 
     def update(self, timeout: int) -> None:
         '''Start or the timer, possibly updating timeout'''
         self.timeout = timeout
+        self.impl._call(self._sync)
 
+    def _sync(self) -> None:
+        '''Start or stop the timer task to match the timeout
+
+        This must run on the event loop.
+        '''
         if self.timeout >= 0 and self._task is None:
             self.impl.log.debug('timer %r start', self.iden)
             self._task = asyncio.ensure_future(self._timer(),
@@ -282,6 +322,10 @@ class virEventAsyncIOImpl(object):
     :param loop: asyncio's event loop
 
     If *loop* is not specified, the current (or default) event loop is used.
+
+    Libvirt API calls may be made from other threads than the one running
+    the loop, e.g. with ``loop.run_in_executor()``; the handles and timers
+    libvirt adds from those threads are handed over to the loop.
     '''
 
     def __init__(self, loop: asyncio.AbstractEventLoop = None) -> None:
@@ -290,28 +334,96 @@ class virEventAsyncIOImpl(object):
         self.descriptors = DescriptorDict(self)
         self.log = logging.getLogger(self.__class__.__name__)
 
+        # libvirt may call the _add/_update/_remove methods from any
+        # thread, e.g. from blocking API calls offloaded to an executor.
+        # The callbacks and descriptors are guarded by this lock, while
+        # anything touching the asyncio loop itself is handed over with
+        # _call().
+        self._lock = threading.RLock()
+
+        # Only updated while libvirt.enableEventStats() is on
+        self.handleStats = libvirt._EventStats()
+        self.timerStats = libvirt._EventStats()
+        self.loopLagStats = libvirt._EventStats()
+        self.loopLag = 0.0
+
         self._pending = 0
         # Transient asyncio.Event instance dynamically created
         # and destroyed by drain()
-        # NOTE invariant: _finished.is_set() iff _pending == 0
+        # NOTE invariant: _finished.is_set() iff _pending == 0, once
+        # any _pending_sync() handed over by _call() has run
         self._finished = None
 
     def __repr__(self) -> str:
         return '<{} callbacks={} descriptors={}>'.format(
             type(self).__name__, self.callbacks, self.descriptors)
 
+    def _call(self, func: Callable[..., None], *args: Any) -> None:
+        '''Run *func* on the event loop
+
+        It is run straight away if called from the thread running the
+        loop, and scheduled with ``call_soon_threadsafe()`` otherwise.
+        Callers must only hand over operations which bring the loop in
+        line with the current state, as those from other threads run
+        later than the ones made from the loop thread in the meantime.
+        '''
+        try:
+            running = asyncio.get_running_loop()  # type: Optional[asyncio.AbstractEventLoop]
+        except RuntimeError:
+            running = None
+        if running is self.loop or self.loop.is_closed():
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def _sync_descriptor(self, fd: int) -> None:
+        '''Watch *fd* for the events its callbacks are interested in
+
+        This must run on the event loop.
+        '''
+        # It seems like loop.add_{reader,writer} can be run multiple times
+        # and will still register the callback only once. Likewise,
+        # remove_{reader,writer} may be run even if the reader/writer
+        # is not registered (and will just return False).
+        with self._lock:
+            descriptor = self.descriptors.get(fd)
+            events = 0
+            if descriptor is not None:
+                for callback in descriptor.callbacks.values():
+                    events |= callback.event
+
+        if events & libvirt.VIR_EVENT_HANDLE_READABLE:
+            self.loop.add_reader(
+                fd, descriptor._handle, libvirt.VIR_EVENT_HANDLE_READABLE)
+        else:
+            self.loop.remove_reader(fd)
+
+        if events & libvirt.VIR_EVENT_HANDLE_WRITABLE:
+            self.loop.add_writer(
+                fd, descriptor._handle, libvirt.VIR_EVENT_HANDLE_WRITABLE)
+        else:
+            self.loop.remove_writer(fd)
+
     def _pending_inc(self) -> None:
         '''Increase the count of pending affairs. Do not use directly.'''
-        self._pending += 1
-        if self._finished is not None:
-            self._finished.clear()
+        with self._lock:
+            self._pending += 1
+        self._call(self._pending_sync)
 
     def _pending_dec(self) -> None:
         '''Decrease the count of pending affairs. Do not use directly.'''
-        assert self._pending > 0
-        self._pending -= 1
-        if self._pending == 0 and self._finished is not None:
-            self._finished.set()
+        with self._lock:
+            assert self._pending > 0
+            self._pending -= 1
+        self._pending_sync()
+
+    def _pending_sync(self) -> None:
+        '''Update the drain() event to match the count. Do not use directly.'''
+        if self._finished is not None:
+            if self._pending:
+                self._finished.clear()
+            else:
+                self._finished.set()
 
     def register(self) -> "virEventAsyncIOImpl":
         '''Register this instance as event loop implementation'''
@@ -324,6 +436,9 @@ class virEventAsyncIOImpl(object):
 
     def schedule_ff_callback(self, iden: int, opaque: _T) -> None:
         '''Schedule a ff callback from one of the handles or timers'''
+        self._call(self._schedule_ff_callback, iden, opaque)
+
+    def _schedule_ff_callback(self, iden: int, opaque: _T) -> None:
         asyncio.ensure_future(self._ff_callback(iden, opaque), loop=self.loop)
 
     async def _ff_callback(self, iden: int, opaque: _T) -> None:
@@ -357,6 +472,24 @@ class virEventAsyncIOImpl(object):
         '''
         return not self.callbacks and not self._pending
 
+    def getStats(self) -> Dict[str, Any]:
+        '''Return a snapshot of the event loop statistics
+
+        "handles" and "timers" account the time spent in libvirt's
+        file handle and timer callbacks, in the format described by
+        :py:func:`libvirt.getEventStats`. "loopLag" accounts how late
+        timers fired compared to their requested timeout, with "last"
+        holding the most recent value in seconds.
+
+        Statistics are only collected while
+        :py:func:`libvirt.enableEventStats` is on.
+        '''
+        loopLag = self.loopLagStats.snapshot()
+        loopLag['last'] = self.loopLag
+        return {'handles': self.handleStats.snapshot(),
+                'timers': self.timerStats.snapshot(),
+                'loopLag': loopLag}
+
     def _add_handle(self, fd: int, event: int, cb: libvirt._EventCB, opaque: _T) -> int:
         '''Register a callback for monitoring file handle events
 
@@ -370,14 +503,15 @@ class virEventAsyncIOImpl(object):
         .. seealso::
             https://libvirt.org/html/libvirt-libvirt-event.html#virEventAddHandleFuncFunc
         '''
-        callback = FDCallback(self, cb, opaque,
-                              descriptor=self.descriptors[fd], event=event)
-        assert callback.iden not in self.callbacks
-
-        self.log.debug('add_handle(fd=%d, event=%d, cb=..., opaque=...) = %d',
-                       fd, event, callback.iden)
-        self.callbacks[callback.iden] = callback
-        self.descriptors[fd].add_handle(callback)
+        with self._lock:
+            callback = FDCallback(self, cb, opaque,
+                                  descriptor=self.descriptors[fd], event=event)
+            assert callback.iden not in self.callbacks
+
+            self.log.debug('add_handle(fd=%d, event=%d, cb=..., opaque=...) = %d',
+                           fd, event, callback.iden)
+            self.callbacks[callback.iden] = callback
+            self.descriptors[fd].add_handle(callback)
         self._pending_inc()
         return callback.iden
 
@@ -391,9 +525,10 @@ class virEventAsyncIOImpl(object):
             https://libvirt.org/html/libvirt-libvirt-event.html#virEventUpdateHandleFunc
         '''
         self.log.debug('update_handle(watch=%d, event=%d)', watch, event)
-        callback = self.callbacks[watch]
-        assert isinstance(callback, FDCallback)
-        callback.update(event=event)
+        with self._lock:
+            callback = self.callbacks[watch]
+            assert isinstance(callback, FDCallback)
+            callback.update(event=event)
 
     def _remove_handle(self, watch: int) -> int:
         '''Unregister a callback from a file handle.
@@ -405,16 +540,17 @@ class virEventAsyncIOImpl(object):
             https://libvirt.org/html/libvirt-libvirt-event.html#virEventRemoveHandleFunc
         '''
         self.log.debug('remove_handle(watch=%d)', watch)
-        try:
-            callback = self.callbacks.pop(watch)
-        except KeyError as err:
-            self.log.warning('remove_handle(): no such handle: %r', err.args[0])
-            return -1
-        assert isinstance(callback, FDCallback)
-        fd = callback.descriptor.fd
-        assert callback is self.descriptors[fd].remove_handle(watch)
-        if len(self.descriptors[fd].callbacks) == 0:
-            del self.descriptors[fd]
+        with self._lock:
+            try:
+                callback = self.callbacks.pop(watch)
+            except KeyError as err:
+                self.log.warning('remove_handle(): no such handle: %r', err.args[0])
+                return -1
+            assert isinstance(callback, FDCallback)
+            fd = callback.descriptor.fd
+            assert callback is self.descriptors[fd].remove_handle(watch)
+            if len(self.descriptors[fd].callbacks) == 0:
+                del self.descriptors[fd]
         callback.close()
         return 0
 
@@ -435,7 +571,8 @@ class virEventAsyncIOImpl(object):
 
         self.log.debug('add_timeout(timeout=%d, cb=..., opaque=...) = %d',
                        timeout, callback.iden)
-        self.callbacks[callback.iden] = callback
+        with self._lock:
+            self.callbacks[callback.iden] = callback
         callback.update(timeout=timeout)
         self._pending_inc()
         return callback.iden
@@ -450,7 +587,8 @@ class virEventAsyncIOImpl(object):
             https://libvirt.org/html/libvirt-libvirt-event.html#virEventUpdateTimeoutFunc
         '''
         self.log.debug('update_timeout(timer=%d, timeout=%d)', timer, timeout)
-        callback = self.callbacks[timer]
+        with self._lock:
+            callback = self.callbacks[timer]
         assert isinstance(callback, TimeoutCallback)
         callback.update(timeout=timeout)
 
@@ -464,23 +602,251 @@ class virEventAsyncIOImpl(object):
             https://libvirt.org/html/libvirt-libvirt-event.html#virEventRemoveTimeoutFunc
         '''
         self.log.debug('remove_timeout(timer=%d)', timer)
-        try:
-            callback = self.callbacks.pop(timer)
-        except KeyError as err:
-            self.log.warning('remove_timeout(): no such timeout: %r', err.args[0])
-            return -1
+        with self._lock:
+            try:
+                callback = self.callbacks.pop(timer)
+            except KeyError as err:
+                self.log.warning('remove_timeout(): no such timeout: %r', err.args[0])
+                return -1
         callback.close()
         return 0
 
 
-_current_impl = None  # type: Optional[virEventAsyncIOImpl]
+#
+# hybrid implementation
+#
+
+class virEventAsyncIOHybridImpl(object):
+    '''Libvirt native event loop delivering callbacks to asyncio.
+
+    :param loop: asyncio's event loop
+
+    Libvirt's default event loop runs on a native thread started by
+    :py:func:`libvirt.startDefaultEventLoopThread`, so the connection
+    sockets and keepalive timers are never serviced by Python code. Only
+    the user callbacks (domain events, close callbacks, ...) are queued
+    and run on the asyncio loop, which is woken through a single
+    eventfd (or a pipe where eventfd is not available).
+
+    If *loop* is not specified, the current (or default) event loop is used.
+    '''
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None) -> None:
+        self.loop = loop or asyncio.get_event_loop()
+        self.log = logging.getLogger(self.__class__.__name__)
 
+        # deque.append() and deque.popleft() are atomic, so the
+        # libvirt thread and the asyncio loop never need a lock
+        self._queue = collections.deque()  # type: Deque[Tuple[Callable[..., Any], Tuple[Any, ...], float]]
+        # NOTE invariant: a wakeup is pending if _signalled is True
+        self._signalled = False
+        # Only updated while libvirt.enableEventStats() is on
+        self.callbackStats = libvirt._EventStats()
+        self.loopLagStats = libvirt._EventStats()
+        self.loopLag = 0.0
+        if hasattr(os, 'eventfd'):
+            self._rfd = self._wfd = os.eventfd(
+                0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)  # type: ignore
+        else:
+            self._rfd, self._wfd = os.pipe()
+            os.set_blocking(self._rfd, False)
+
+    def __repr__(self) -> str:
+        return '<{} queued={}>'.format(type(self).__name__, len(self._queue))
 
-def getCurrentImpl() -> Optional[virEventAsyncIOImpl]:
+    def register(self) -> "virEventAsyncIOHybridImpl":
+        '''Start libvirt's event loop thread and deliver callbacks here'''
+        self.log.debug('register()')
+        self.loop.add_reader(self._rfd, self._wakeup)
+        libvirt.setEventDispatcher(self.dispatch)
+        libvirt.startDefaultEventLoopThread()
+        return self
+
+    def close(self) -> None:
+        '''Stop libvirt's event loop thread and release the wakeup fd
+
+        Callbacks still queued at this point are run before returning.
+        '''
+        self.log.debug('close()')
+        libvirt.stopDefaultEventLoopThread()
+        libvirt.setEventDispatcher(None)
+        self.loop.remove_reader(self._rfd)
+        self._dispatch_pending()
+        os.close(self._rfd)
+        if self._wfd != self._rfd:
+            os.close(self._wfd)
+
+    def dispatch(self, cb: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        '''Queue a callback from libvirt's event loop thread'''
+        self._queue.append((cb, args, time.perf_counter() if libvirt._eventStatsEnabled else 0.0))
+        if not self._signalled:
+            self._signalled = True
+            if self._wfd == self._rfd:
+                os.eventfd_write(self._wfd, 1)  # type: ignore
+            else:
+                os.write(self._wfd, b'\0')
+
+    def _wakeup(self) -> None:
+        '''Reader callback for the wakeup fd, runs on the asyncio loop'''
+        try:
+            if self._wfd == self._rfd:
+                os.eventfd_read(self._rfd)  # type: ignore
+            else:
+                os.read(self._rfd, 4096)
+        except BlockingIOError:
+            pass
+        # Reset before draining, so that anything queued from now on
+        # triggers another wakeup rather than being missed
+        self._signalled = False
+        self._dispatch_pending()
+
+    def _dispatch_pending(self) -> None:
+        '''Run all queued callbacks'''
+        while True:
+            try:
+                cb, args, queued = self._queue.popleft()
+            except IndexError:
+                break
+            start = time.perf_counter() if queued else 0.0
+            try:
+                cb(*args)
+            except Exception:
+                self.log.exception('event callback %r failed', cb)
+            if queued:
+                # How long the callback waited for the asyncio loop
+                self.loopLag = start - queued
+                self.loopLagStats.record(self.loopLag)
+                self.callbackStats.record(time.perf_counter() - start)
+
+    async def drain(self) -> None:
+        '''Run the callbacks which are already queued.
+
+        This is a coroutine.
+        '''
+        self.log.debug('drain()')
+        self._dispatch_pending()
+
+    def is_idle(self) -> bool:
+        '''Returns False if there are callbacks waiting to be run'''
+        return not self._queue
+
+    def getStats(self) -> Dict[str, Any]:
+        '''Return a snapshot of the callback queue statistics
+
+        "callbacks" accounts the time spent running queued callbacks,
+        in the format described by :py:func:`libvirt.getEventStats`.
+        "loopLag" accounts how long callbacks waited in the queue for
+        the asyncio loop, with "last" holding the most recent value in
+        seconds.
+
+        Statistics are only collected while
+        :py:func:`libvirt.enableEventStats` is on.
+        '''
+        loopLag = self.loopLagStats.snapshot()
+        loopLag['last'] = self.loopLag
+        return {'callbacks': self.callbackStats.snapshot(),
+                'loopLag': loopLag}
+
+
+class virEventAsyncIODispatcher(object):
+    '''Run event callbacks in an executor, scheduled by asyncio.
+
+    :param loop: asyncio's event loop
+    :param executor: a concurrent.futures.Executor passed on to
+        ``loop.run_in_executor()``, the loop's default executor if None
+
+    Instances are callable as dispatcher(cb, args), from any thread, and
+    can be passed as the dispatcher argument of the virConnect event
+    registration methods. Callbacks which are coroutine functions are
+    awaited on the loop, others are run in the executor. Callbacks for
+    the same object, as returned by
+    :py:func:`libvirtevents.dispatchKey`, are run one at a time in
+    delivery order; callbacks for unrelated objects run concurrently.
+
+    If *loop* is not specified, the current (or default) event loop is used.
+    '''
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, executor: Any = None) -> None:
+        self.loop = loop or asyncio.get_event_loop()
+        self.executor = executor
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        # Only ever touched from the asyncio loop
+        self._pending = {}  # type: Dict[Hashable, Deque[Tuple[Callable[..., Any], Tuple[Any, ...]]]]
+        self._tasks = set()  # type: Set[asyncio.Future]
+
+    def __repr__(self) -> str:
+        return '<{} keys={}>'.format(type(self).__name__, len(self._pending))
+
+    def __call__(self, cb: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        self.loop.call_soon_threadsafe(self._enqueue, cb, args)
+
+    def _enqueue(self, cb: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        key = libvirtevents.dispatchKey(args)
+        queue = self._pending.get(key)
+        if queue is not None:
+            # The task running this key will pick it up
+            queue.append((cb, args))
+            return
+        self._pending[key] = collections.deque(((cb, args),))
+        task = asyncio.ensure_future(self._run(key), loop=self.loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable) -> None:
+        '''Run the callbacks queued for *key*
+
+        This is a coroutine.
+        '''
+        queue = self._pending[key]
+        while queue:
+            cb, args = queue.popleft()
+            try:
+                if asyncio.iscoroutinefunction(cb):
+                    await cb(*args)
+                else:
+                    await self.loop.run_in_executor(
+                        self.executor, functools.partial(cb, *args))
+            except Exception:
+                self.log.exception('event callback %r failed', cb)
+        del self._pending[key]
+
+    async def drain(self) -> None:
+        '''Wait for the callbacks dispatched so far to finish.
+
+        This is a coroutine.
+        '''
+        self.log.debug('drain()')
+        # Let callbacks handed over from other threads reach _enqueue()
+        await asyncio.sleep(0)
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    def is_idle(self) -> bool:
+        '''Returns False if there are callbacks waiting or running'''
+        return not self._pending
+
+
+_current_impl = None  # type: Optional[Union[virEventAsyncIOImpl, virEventAsyncIOHybridImpl]]
+
+
+def getCurrentImpl() -> Optional[Union[virEventAsyncIOImpl, virEventAsyncIOHybridImpl]]:
     '''Return the current implementation, or None if not yet registered'''
     return _current_impl
 
 
+def getEventStats() -> Dict[str, Any]:
+    '''Return a snapshot of the event statistics
+
+    This is :py:func:`libvirt.getEventStats` with an extra "loop" key
+    holding the ``getStats()`` snapshot of the current implementation,
+    or None if none is registered.
+    '''
+    stats = libvirt.getEventStats()
+    stats['loop'] = None if _current_impl is None else _current_impl.getStats()
+    return stats
+
+
 def virEventRegisterAsyncIOImpl(loop: asyncio.AbstractEventLoop = None) -> virEventAsyncIOImpl:
     '''Arrange for libvirt's callbacks to be dispatched via asyncio event loop
 
@@ -490,3 +856,93 @@ def virEventRegisterAsyncIOImpl(loop: asyncio.AbstractEventLoop = None) -> virEv
     global _current_impl
     _current_impl = virEventAsyncIOImpl(loop=loop).register()
     return _current_impl
+
+
+def virEventRegisterAsyncIOHybridImpl(loop: asyncio.AbstractEventLoop = None) -> virEventAsyncIOHybridImpl:
+    '''Run libvirt's native event loop on a thread, delivering callbacks via asyncio
+
+    Unlike :py:func:`virEventRegisterAsyncIOImpl`, the asyncio loop is only
+    woken up for actual callbacks, not for I/O on libvirt's sockets. The
+    implementation object is returned; call its ``close()`` method to stop
+    the native event loop thread.
+    '''
+    global _current_impl
+    _current_impl = virEventAsyncIOHybridImpl(loop=loop).register()
+    return _current_impl
+
+
+async def waitForDomainsState(conn: libvirt.virConnect, doms: List[libvirt.virDomain], states: Union[int, Iterable[int]], timeout: Optional[float] = None) -> List[Optional[int]]:
+    '''Wait for each of *doms* to be in one of *states*
+
+    This is the asyncio equivalent of
+    :py:meth:`libvirt.virConnect.waitForDomainsState`: one lifecycle
+    event registration covers all the domains and their current state is
+    checked once after registering. The blocking libvirt calls are run in
+    the loop's default executor.
+
+    :param conn: the connection the domains belong to
+    :param doms: the domains to wait for
+    :param states: one or more virDomainState values
+    :param timeout: in seconds, None waits forever
+    :returns: the state each domain reached, in the order of *doms*, None
+        for the ones still not in one of *states* when *timeout* expired
+
+    This is a coroutine.
+    '''
+    if not doms:
+        return []
+    if isinstance(states, int):
+        states = (states,)
+    wanted = frozenset(states)
+    loop = asyncio.get_event_loop()
+    result = [None] * len(doms)  # type: List[Optional[int]]
+    pending = {}  # type: Dict[str, List[int]]
+    for idx, dom in enumerate(doms):
+        pending.setdefault(dom.UUIDString(), []).append(idx)
+    done = asyncio.Event()
+
+    def reached(uuid: str, state: int) -> None:
+        '''Record *state* for *uuid*, this must run on the loop'''
+        for idx in pending.pop(uuid, ()):
+            result[idx] = state
+        if not pending:
+            done.set()
+
+    def lifecycle(conn: libvirt.virConnect, dom: libvirt.virDomain, event: int, detail: int, opaque: Any) -> None:
+        state = libvirt._domainEventState(event, detail)
+        if state in wanted:
+            loop.call_soon_threadsafe(reached, dom.UUIDString(), state)
+
+    # Delivered straight from whichever thread runs libvirt's event loop,
+    # and handed over to this loop by the callback itself
+    callbackID = await loop.run_in_executor(None, functools.partial(
+        conn.domainEventRegisterAny, None,
+        libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycle, None,
+        dispatcher=libvirt._directEventDispatch))
+    try:
+        stats = await loop.run_in_executor(
+            None, conn.domainListGetStats, doms, libvirt.VIR_DOMAIN_STATS_STATE)
+        for dom, stat in stats:
+            if stat['state.state'] in wanted:
+                reached(dom.UUIDString(), stat['state.state'])
+
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        await loop.run_in_executor(None, conn.domainEventDeregisterAny, callbackID)
+
+    return result
+
+
+async def waitForDomainState(dom: libvirt.virDomain, states: Union[int, Iterable[int]], timeout: Optional[float] = None) -> Optional[int]:
+    '''Wait for *dom* to be in one of *states*
+
+    This is the asyncio equivalent of
+    :py:meth:`libvirt.virDomain.waitForState`, see
+    :py:func:`waitForDomainsState`.
+
+    This is a coroutine.
+    '''
+    return (await waitForDomainsState(dom.connect(), [dom], states, timeout))[0]
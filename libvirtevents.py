@@ -0,0 +1,321 @@
+#
+# libvirtevents -- helpers for consuming libvirt domain events
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+'''Helpers for consuming libvirt domain events
+
+Every domainEventRegisterAny() call is a round trip to the daemon and
+an entry in its callback list, so watching many domains individually
+is expensive. An EventRouter registers a single connection wide
+callback per event ID and fans events out to per-domain subscribers
+locally:
+
+    import libvirt
+    import libvirtevents
+
+    libvirt.startDefaultEventLoopThread()
+
+    conn = libvirt.open("test:///default")
+    router = libvirtevents.EventRouter(conn)
+
+    def lifecycle(conn, dom, event, detail, opaque):
+      ...
+
+    token = router.subscribe(conn.lookupByName("test"),
+                             libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                             lifecycle)
+    ...
+    router.unsubscribe(token)
+    router.close()
+
+Subscriber callbacks have the same signature as the ones passed to
+virConnect.domainEventRegisterAny() for the given event ID.
+
+Callbacks which block, for example by calling back into libvirt or
+writing to a database, hold up every other event and the connection
+keepalive. An ExecutorDispatcher runs them on a bounded thread pool
+instead, keeping events for the same object in order:
+
+    dispatcher = libvirtevents.ExecutorDispatcher(max_workers=4)
+    conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                                lifecycle, None, dispatcher=dispatcher)
+    ...
+    dispatcher.shutdown()
+
+.. seealso::
+    https://libvirt.org/html/libvirt-libvirt-domain.html#virConnectDomainEventRegisterAny
+'''
+
+import collections
+import concurrent.futures
+import itertools
+import logging
+import threading
+
+import libvirt
+
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Optional, Tuple, Union  # noqa F401
+
+__license__ = 'LGPL-2.1+'
+__all__ = [
+    'EventRouter',
+    'ExecutorDispatcher',
+    'dispatchKey',
+]
+
+_Subscriber = Tuple[Callable[..., Any], Any]
+_Pending = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+def dispatchKey(args: Tuple[Any, ...]) -> Hashable:
+    '''Return the ordering key for an event callback invocation
+
+    Event callbacks are called as cb(conn, obj, ..., opaque), where obj
+    is the domain, network, storage pool, node device or secret the
+    event is about. Events with the same key must be run in the order
+    they were delivered. The close callback has no such object and is
+    given the key None.
+
+    :param args: the arguments the callback is called with
+    '''
+    if len(args) < 2:
+        return None
+    obj = args[1]
+    # Both are answered from the local object without a daemon round trip
+    if hasattr(obj, 'UUIDString'):
+        return (obj.__class__.__name__, obj.UUIDString())
+    if isinstance(obj, libvirt.virNodeDevice):
+        return (obj.__class__.__name__, obj.name())
+    return None
+
+
+class ExecutorDispatcher(object):
+    '''Run event callbacks on a thread pool
+
+    Instances are callable as dispatcher(cb, args) and can be passed as
+    the dispatcher argument of the virConnect event registration
+    methods, or to libvirt.setEventDispatcher().
+
+    Callbacks for the same object, as returned by dispatchKey(), are
+    run one at a time in delivery order; callbacks for unrelated objects
+    run in parallel.
+
+    :param max_workers: size of the thread pool created when no executor
+        is given
+    :param executor: a concurrent.futures.Executor to run callbacks on
+        instead; it is not shut down by shutdown()
+    '''
+
+    def __init__(self, max_workers: Optional[int] = None, executor: Optional[concurrent.futures.Executor] = None) -> None:
+        self.log = logging.getLogger(self.__class__.__name__)
+        self._ownExecutor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='libvirt-event')
+        self.executor = executor
+
+        self._lock = threading.Lock()
+        # key -> callbacks waiting behind the one being run
+        self._pending = {}  # type: Dict[Hashable, Deque[_Pending]]
+
+    def __repr__(self) -> str:
+        return '<{} executor={!r} keys={}>'.format(
+            self.__class__.__name__, self.executor, len(self._pending))
+
+    def __call__(self, cb: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        key = dispatchKey(args)
+        with self._lock:
+            queue = self._pending.get(key)
+            if queue is not None:
+                # A worker is already running this key and will pick it up
+                queue.append((cb, args))
+                return
+            self._pending[key] = collections.deque(((cb, args),))
+        try:
+            self.executor.submit(self._run, key)
+        except RuntimeError:
+            # The executor has been shut down
+            with self._lock:
+                del self._pending[key]
+            raise
+
+    def _run(self, key: Hashable) -> None:
+        while True:
+            with self._lock:
+                queue = self._pending[key]
+                if not queue:
+                    del self._pending[key]
+                    return
+                cb, args = queue.popleft()
+            try:
+                cb(*args)
+            except Exception:
+                self.log.exception('Exception in event callback %r', cb)
+
+    def shutdown(self, wait: bool = True) -> None:
+        '''Shut down the thread pool created by the constructor
+
+        Callbacks already queued are still run.
+
+        :param bool wait: wait for the queued callbacks to finish
+        '''
+        if self._ownExecutor:
+            self.executor.shutdown(wait=wait)
+
+
+class EventRouter(object):
+    '''Demultiplex domain events by domain UUID
+
+    The router registers with the daemon once per event ID, the first
+    time that event ID is subscribed to, and stays registered until
+    close() is called. Subscribing and unsubscribing afterwards only
+    touches local dictionaries.
+
+    :param conn: the connection to route events for
+    :param eventIDs: event IDs to register for up front, instead of on
+        first subscription
+    :param dispatcher: passed on to domainEventRegisterAny(), e.g. an
+        ExecutorDispatcher to run the subscribers on a thread pool
+    '''
+
+    def __init__(self, conn: libvirt.virConnect, eventIDs: Iterable[int] = (), dispatcher: Optional[libvirt._EventDispatcher] = None) -> None:
+        self.conn = conn
+        self.dispatcher = dispatcher
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        # eventID -> callbackID returned by domainEventRegisterAny()
+        self._callbackIDs = {}  # type: Dict[int, int]
+        # eventID -> UUID string (None for all domains) -> token -> subscriber
+        self._routes = {}  # type: Dict[int, Dict[Optional[str], Dict[int, _Subscriber]]]
+        # token -> (eventID, UUID string)
+        self._subscriptions = {}  # type: Dict[int, Tuple[int, Optional[str]]]
+
+        for eventID in eventIDs:
+            self._register(eventID)
+
+    def __repr__(self) -> str:
+        return '<{} eventIDs={} subscriptions={}>'.format(
+            self.__class__.__name__, sorted(self._callbackIDs),
+            len(self._subscriptions))
+
+    def _register(self, eventID: int) -> None:
+        with self._lock:
+            if eventID in self._callbackIDs:
+                return
+            self._routes.setdefault(eventID, {})
+            self._callbackIDs[eventID] = self.conn.domainEventRegisterAny(
+                None, eventID, self._dispatch, eventID,
+                dispatcher=self.dispatcher)
+
+    def _dispatch(self, conn: libvirt.virConnect, dom: libvirt.virDomain, *args: Any) -> None:
+        # The opaque passed at registration time is the event ID, and
+        # is always the last argument whatever the callback signature
+        eventID = args[-1]
+        args = args[:-1]
+        routes = self._routes.get(eventID)
+        if not routes:
+            return
+
+        # virDomainGetUUIDString() is answered from the local object
+        # and never goes to the daemon
+        subscribers = routes.get(dom.UUIDString())
+        wildcard = routes.get(None)
+
+        for bucket in (subscribers, wildcard):
+            if not bucket:
+                continue
+            # Take a copy, callbacks are allowed to unsubscribe
+            for cb, opaque in tuple(bucket.values()):
+                try:
+                    cb(conn, dom, *args, opaque)
+                except Exception:
+                    self.log.exception('Exception in event callback %r', cb)
+
+    def subscribe(self, dom: Union[libvirt.virDomain, str, None], eventID: int, cb: Callable[..., Any], opaque: Any = None) -> int:
+        '''Subscribe to events for a single domain
+
+        :param dom: the domain, its UUID string, or None to receive the
+            event for every domain
+        :param int eventID: one of the VIR_DOMAIN_EVENT_ID_* constants
+        :param cb: the callback, with the same signature as for
+            virConnect.domainEventRegisterAny()
+        :param opaque: passed to the callback as its last argument
+        :returns: a token to pass to unsubscribe()
+        '''
+        if isinstance(dom, libvirt.virDomain):
+            uuid = dom.UUIDString()  # type: Optional[str]
+        else:
+            uuid = dom
+
+        if eventID not in self._callbackIDs:
+            self._register(eventID)
+
+        with self._lock:
+            token = next(self._tokens)
+            self._routes[eventID].setdefault(uuid, {})[token] = (cb, opaque)
+            self._subscriptions[token] = (eventID, uuid)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        '''Remove a subscription made by subscribe()
+
+        The event ID stays registered with the daemon until close().
+
+        :param int token: the value returned by subscribe()
+        :raises KeyError: if the token is not subscribed
+        '''
+        with self._lock:
+            eventID, uuid = self._subscriptions.pop(token)
+            routes = self._routes[eventID]
+            bucket = routes[uuid]
+            del bucket[token]
+            if not bucket:
+                del routes[uuid]
+
+    def unsubscribeDomain(self, dom: Union[libvirt.virDomain, str]) -> None:
+        '''Remove all subscriptions for a domain, e.g. once it is undefined
+
+        :param dom: the domain or its UUID string
+        '''
+        if isinstance(dom, libvirt.virDomain):
+            uuid = dom.UUIDString()
+        else:
+            uuid = dom
+
+        with self._lock:
+            for routes in self._routes.values():
+                bucket = routes.pop(uuid, None)
+                if bucket:
+                    for token in bucket:
+                        del self._subscriptions[token]
+
+    def close(self) -> None:
+        '''Deregister from the daemon and drop all subscriptions'''
+        with self._lock:
+            callbackIDs = list(self._callbackIDs.values())
+            self._callbackIDs.clear()
+            self._routes.clear()
+            self._subscriptions.clear()
+
+        for callbackID in callbackIDs:
+            try:
+                self.conn.domainEventDeregisterAny(callbackID)
+            except libvirt.libvirtError:
+                # The connection may already be gone
+                pass
@@ -0,0 +1,1349 @@
+#
+# libvirtinventory -- event driven mirrors of libvirt objects
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+'''Event driven mirrors of libvirt objects
+
+Listing the domains and querying each of them is a handful of RPCs per
+domain, which adds up when done several times a second. A DomainInventory
+bootstraps an in-memory index with two calls and then keeps it current
+from domain events, so that lookups never leave the process:
+
+    import libvirt
+    import libvirtinventory
+
+    libvirt.startDefaultEventLoopThread()
+
+    conn = libvirt.open("test:///default")
+    inventory = libvirtinventory.DomainInventory(conn)
+
+    entry = inventory.lookupByName("test")
+    if entry is not None and entry.state == libvirt.VIR_DOMAIN_RUNNING:
+      ...
+
+    def changed(inventory, old, new, opaque):
+      ...
+
+    inventory.subscribe(changed)
+    ...
+    inventory.close()
+
+Short lived programs, such as command line tools talking to many hosts,
+cannot wait for events. An InventorySnapshot is a compact file per
+connection URI which is read back without any RPC and brought up to
+date with a single listAllDomains() call, refetching only the domains
+which were started, stopped, defined or undefined since it was saved:
+
+    snapshot = libvirtinventory.loadSnapshot(uri)
+    if snapshot is not None:
+      render(snapshot)      # immediately, possibly out of date
+
+    conn = libvirt.openReadOnly(uri)
+    if snapshot is None:
+      snapshot = libvirtinventory.InventorySnapshot.capture(conn)
+    else:
+      snapshot = snapshot.refresh(conn)
+    snapshot.save()
+
+A NodeDeviceInventory does the same as a DomainInventory for host
+devices, indexing them by capability, parent, PCI address and IOMMU
+group, e.g. for picking devices to pass through:
+
+    devices = libvirtinventory.NodeDeviceInventory(conn)
+    for entry in devices.listByCapability("pci"):
+      group = devices.listByIOMMUGroup(entry.iommuGroup)
+      ...
+
+A StorageVolumeInventory indexes the volumes of the active storage
+pools, and coalesces and rate limits refreshes so that components which
+each want an up to date listing do not stack rescans of the pool:
+
+    volumes = libvirtinventory.StorageVolumeInventory(conn, minInterval=10)
+    pool = conn.storagePoolLookupByName("default")
+    for entry in volumes.refresh(pool):
+      ...
+    entry = volumes.lookupByPath("/var/lib/libvirt/images/test.qcow2")
+
+.. seealso::
+    https://libvirt.org/html/libvirt-libvirt-domain.html#virConnectDomainEventRegisterAny
+'''
+
+import collections
+import concurrent.futures
+import hashlib
+import itertools
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid as _uuid
+import xml.etree.ElementTree as ET
+
+import libvirt
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union  # noqa F401
+
+__license__ = 'LGPL-2.1+'
+__all__ = [
+    'DomainEntry',
+    'DomainInventory',
+    'InventorySnapshot',
+    'NodeDeviceEntry',
+    'NodeDeviceInventory',
+    'StorageVolumeEntry',
+    'StorageVolumeInventory',
+    'SnapshotEntry',
+    'loadSnapshot',
+    'snapshotPath',
+]
+
+
+DomainEntry = collections.namedtuple(
+    'DomainEntry', ['uuid', 'name', 'id', 'state', 'persistent', 'generation'])
+DomainEntry.__doc__ = '''Snapshot of what a DomainInventory knows about a domain
+
+:param str uuid: the UUID string
+:param str name: the name
+:param int id: the ID, -1 when the domain is not running
+:param int state: one of the VIR_DOMAIN_* virDomainState values
+:param bool persistent: whether the domain has a persistent definition
+:param int generation: bumped on every change to the domain the inventory
+    hears of, including metadata and device changes
+'''
+
+_Subscriber = Callable[['_Inventory', Any, Any, Any], None]
+
+
+class _Inventory(object):
+    '''Plumbing shared by the event driven inventories
+
+    Subclasses register their event callbacks in _registerEvents(), with
+    _event() as the callback and the method handling the event as the
+    opaque, and list the objects in _bootstrap().
+    '''
+
+    # virConnect method deregistering the callbacks of _registerEvents()
+    _deregisterEvent = ''
+
+    def __init__(self, conn: libvirt.virConnect, reopen: Optional[Callable[[], libvirt.virConnect]] = None, dispatcher: Optional[libvirt._EventDispatcher] = None) -> None:
+        self.conn = conn
+        self.reopen = reopen
+        self.dispatcher = dispatcher
+        self.stale = True
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.RLock()
+        self._tokens = itertools.count(1)
+        self._subscribers = {}  # type: Dict[int, Tuple[_Subscriber, Any]]
+        self._callbackIDs = []  # type: List[int]
+        # Whether the close callback of the connection is this one's
+        self._closeRegistered = False
+        # Events received while bootstrapping, replayed afterwards
+        self._backlog = None  # type: Optional[List[Tuple[Callable[..., None], Tuple[Any, ...]]]]
+
+    #
+    # change subscriptions
+    #
+
+    def subscribe(self, cb: _Subscriber, opaque: Any = None) -> int:
+        '''Call *cb* on every change to the inventory
+
+        The callback is called as cb(inventory, old, new, opaque), with
+        *old* None for an object which appeared and *new* None for one
+        which went away. It runs on the thread applying the change,
+        normally the one running the event loop, after the indexes have
+        been updated.
+
+        :returns: a token to pass to unsubscribe()
+        '''
+        with self._lock:
+            token = next(self._tokens)
+            self._subscribers[token] = (cb, opaque)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        '''Remove a subscription made by subscribe()
+
+        :raises KeyError: if the token is not subscribed
+        '''
+        with self._lock:
+            del self._subscribers[token]
+
+    def _notify(self, old: Any, new: Any) -> None:
+        for cb, opaque in list(self._subscribers.values()):
+            try:
+                cb(self, old, new, opaque)
+            except Exception:
+                self.log.exception('Exception in inventory subscriber %r', cb)
+
+    #
+    # events
+    #
+
+    def _registerEvents(self) -> List[int]:
+        raise NotImplementedError
+
+    def _register(self) -> None:
+        self._callbackIDs = self._registerEvents()
+        try:
+            self.conn.registerCloseCallback(self._closed, None)
+            self._closeRegistered = True
+        except libvirt.libvirtError:
+            # Most likely the application or another inventory has it
+            self._closeRegistered = False
+            self.log.warning('Cannot register close callback, call '
+                             'connectionClosed() from your own instead')
+
+    def _deregister(self, conn: libvirt.virConnect) -> None:
+        callbackIDs = self._callbackIDs
+        self._callbackIDs = []
+        deregister = getattr(conn, self._deregisterEvent)
+        for callbackID in callbackIDs:
+            try:
+                deregister(callbackID)
+            except libvirt.libvirtError:
+                pass
+        if not self._closeRegistered:
+            return
+        self._closeRegistered = False
+        try:
+            conn.unregisterCloseCallback()
+        except libvirt.libvirtError:
+            pass
+
+    def _event(self, conn: libvirt.virConnect, obj: Any, *args: Any) -> None:
+        # The opaque is the handler, always the last argument
+        handler = args[-1]
+        args = (obj,) + args[:-1]
+        with self._lock:
+            if self._backlog is not None:
+                self._backlog.append((handler, args))
+                return
+        handler(*args)
+
+    #
+    # (re)synchronisation
+    #
+
+    def _bootstrap(self) -> List[Tuple[Any, Any]]:
+        '''List the objects and update the indexes
+
+        :returns: the (old, new) changes to notify subscribers of
+        '''
+        raise NotImplementedError
+
+    def resync(self, conn: Optional[libvirt.virConnect] = None) -> None:
+        '''Rebuild the inventory from scratch
+
+        Subscribers are told about the differences with the previous
+        contents.
+
+        :param conn: a new connection to mirror from now on, e.g. after
+            the previous one was closed
+        '''
+        if conn is not None and conn is not self.conn:
+            self._deregister(self.conn)
+            self.conn = conn
+            self._register()
+
+        with self._lock:
+            self._backlog = []
+        try:
+            changes = self._bootstrap()
+        except Exception:
+            with self._lock:
+                self._backlog = None
+            raise
+        self.stale = False
+
+        for old, new in changes:
+            self._notify(old, new)
+
+        # Replay what happened while listing, some of it may already be
+        # reflected but applying it again is harmless
+        while True:
+            with self._lock:
+                backlog = self._backlog
+                if not backlog:
+                    self._backlog = None
+                    break
+                self._backlog = []
+            for handler, args in backlog:  # type: ignore
+                handler(*args)
+
+    def connectionClosed(self, reason: int = libvirt.VIR_CONNECT_CLOSE_REASON_ERROR) -> None:
+        '''Handle the connection being closed
+
+        This is called from the close callback the inventory registers;
+        applications with their own close callback, or more than one
+        inventory on the connection, should call it from there instead.
+        '''
+        self.log.debug('connection closed, reason %d', reason)
+        self.stale = True
+        if self.reopen is not None:
+            # Reconnecting blocks, keep it off the event loop
+            threading.Thread(target=self._reconnect, name='libvirt-inventory-resync',
+                             daemon=True).start()
+
+    def _closed(self, conn: libvirt.virConnect, reason: int, opaque: Any) -> None:
+        self.connectionClosed(reason)
+
+    def _reconnect(self) -> None:
+        try:
+            self.resync(self.reopen())  # type: ignore
+        except Exception:
+            self.log.exception('Cannot resync the inventory')
+
+    def close(self) -> None:
+        '''Stop tracking the connection's events'''
+        self._deregister(self.conn)
+        self.stale = True
+
+
+class DomainInventory(_Inventory):
+    '''In-memory index of the domains of a connection
+
+    The inventory is bootstrapped with one listAllDomains() and one
+    getAllDomainStats() call, and then updated from LIFECYCLE,
+    METADATA_CHANGE, DEVICE_ADDED and DEVICE_REMOVED domain events, so an
+    event loop implementation must be running. Lookups are dictionary
+    reads and can be made from any thread.
+
+    When the connection closes the inventory is marked stale; if *reopen*
+    is given it is called on a new thread to get a replacement connection,
+    which the inventory then resyncs from.
+
+    :param conn: the connection to mirror
+    :param reopen: callable returning a new connection, used when *conn*
+        is closed
+    :param dispatcher: passed on to domainEventRegisterAny()
+    '''
+
+    _deregisterEvent = 'domainEventDeregisterAny'
+
+    def __init__(self, conn: libvirt.virConnect, reopen: Optional[Callable[[], libvirt.virConnect]] = None, dispatcher: Optional[libvirt._EventDispatcher] = None) -> None:
+        super().__init__(conn, reopen, dispatcher)
+        self._byUUID = {}  # type: Dict[str, DomainEntry]
+        self._byName = {}  # type: Dict[str, DomainEntry]
+        self._byID = {}  # type: Dict[int, DomainEntry]
+        self._generations = itertools.count(1)
+
+        self._register()
+        self.resync()
+
+    def __repr__(self) -> str:
+        return '<{} domains={} stale={}>'.format(
+            self.__class__.__name__, len(self._byUUID), self.stale)
+
+    def __len__(self) -> int:
+        return len(self._byUUID)
+
+    def __iter__(self) -> Iterator[DomainEntry]:
+        return iter(list(self._byUUID.values()))
+
+    #
+    # queries
+    #
+
+    def lookupByUUIDString(self, uuid: str) -> Optional[DomainEntry]:
+        '''Return the entry for the domain with UUID string *uuid*, or None'''
+        return self._byUUID.get(uuid)
+
+    def lookupByName(self, name: str) -> Optional[DomainEntry]:
+        '''Return the entry for the domain called *name*, or None'''
+        return self._byName.get(name)
+
+    def lookupByID(self, id: int) -> Optional[DomainEntry]:
+        '''Return the entry for the running domain with ID *id*, or None'''
+        return self._byID.get(id)
+
+    def listAllDomains(self, state: Optional[int] = None) -> List[DomainEntry]:
+        '''Return the entries of all domains, or those in *state*'''
+        entries = list(self._byUUID.values())
+        if state is None:
+            return entries
+        return [entry for entry in entries if entry.state == state]
+
+    #
+    # index maintenance
+    #
+
+    def _store(self, new: DomainEntry) -> None:
+        '''Add or replace the entry for new.uuid, with the lock held'''
+        old = self._byUUID.get(new.uuid)
+        if old is not None:
+            if self._byName.get(old.name) is old:
+                del self._byName[old.name]
+            if self._byID.get(old.id) is old:
+                del self._byID[old.id]
+        self._byUUID[new.uuid] = new
+        self._byName[new.name] = new
+        if new.id != -1:
+            self._byID[new.id] = new
+
+    def _drop(self, uuid: str) -> Optional[DomainEntry]:
+        '''Remove the entry for *uuid*, with the lock held'''
+        old = self._byUUID.pop(uuid, None)
+        if old is not None:
+            if self._byName.get(old.name) is old:
+                del self._byName[old.name]
+            if self._byID.get(old.id) is old:
+                del self._byID[old.id]
+        return old
+
+    def _update(self, dom: libvirt.virDomain, **changes: Any) -> None:
+        '''Apply *changes* to the entry for *dom*, creating it if needed
+
+        The name and ID are always refreshed from *dom*, they are part
+        of the event and do not need a daemon round trip.
+        '''
+        uuid = dom.UUIDString()
+        with self._lock:
+            old = self._byUUID.get(uuid)
+            if old is None:
+                new = DomainEntry(uuid, dom.name(), dom.ID(),
+                                  libvirt.VIR_DOMAIN_NOSTATE, False, 0)
+            else:
+                new = old._replace(name=dom.name(), id=dom.ID())
+            new = new._replace(generation=next(self._generations), **changes)
+            self._store(new)
+        self._notify(old, new)
+
+    def _remove(self, uuid: str) -> None:
+        with self._lock:
+            old = self._drop(uuid)
+        if old is not None:
+            self._notify(old, None)
+
+    #
+    # events
+    #
+
+    def _registerEvents(self) -> List[int]:
+        callbacks = (
+            (libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, self._lifecycle),
+            (libvirt.VIR_DOMAIN_EVENT_ID_METADATA_CHANGE, self._changed),
+            (libvirt.VIR_DOMAIN_EVENT_ID_DEVICE_ADDED, self._changed),
+            (libvirt.VIR_DOMAIN_EVENT_ID_DEVICE_REMOVED, self._changed),
+        )
+        return [self.conn.domainEventRegisterAny(None, eventID, self._event, handler,
+                                                 dispatcher=self.dispatcher)
+                for eventID, handler in callbacks]
+
+    def _lifecycle(self, dom: libvirt.virDomain, event: int, detail: int) -> None:
+        uuid = dom.UUIDString()
+        old = self._byUUID.get(uuid)
+        if event == libvirt.VIR_DOMAIN_EVENT_DEFINED:
+            if old is None:
+                # A newly defined domain is not running
+                self._update(dom, persistent=True, id=-1,
+                             state=libvirt.VIR_DOMAIN_SHUTOFF)
+            else:
+                self._update(dom, persistent=True)
+        elif event == libvirt.VIR_DOMAIN_EVENT_UNDEFINED:
+            if old is None:
+                return
+            if (detail == libvirt.VIR_DOMAIN_EVENT_UNDEFINED_RENAMED and
+                    old.name != dom.name()):
+                # The definition under the new name came first
+                return
+            if old.state == libvirt.VIR_DOMAIN_SHUTOFF:
+                self._remove(uuid)
+            else:
+                self._update(dom, persistent=False)
+        elif event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+            if old is None:
+                # Already gone, e.g. a transient domain dropped by a
+                # resync, whose events are replayed afterwards
+                return
+            if not old.persistent:
+                self._remove(uuid)
+            else:
+                self._update(dom, id=-1, state=libvirt.VIR_DOMAIN_SHUTOFF)
+        else:
+            state = libvirt._domainEventState(event, detail)
+            if state is not None:
+                self._update(dom, state=state)
+
+    def _changed(self, dom: libvirt.virDomain, *args: Any) -> None:
+        # Metadata and device changes only bump the generation
+        if dom.UUIDString() in self._byUUID:
+            self._update(dom)
+
+    def _bootstrap(self) -> List[Tuple[Any, Any]]:
+        transient = {dom.UUIDString() for dom in
+                     self.conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_TRANSIENT)}
+        stats = self.conn.getAllDomainStats(libvirt.VIR_DOMAIN_STATS_STATE)
+
+        changes = []  # type: List[Tuple[Any, Any]]
+        with self._lock:
+            seen = set()
+            for dom, record in stats:
+                uuid = dom.UUIDString()
+                seen.add(uuid)
+                old = self._byUUID.get(uuid)
+                new = DomainEntry(uuid, dom.name(), dom.ID(), record['state.state'],
+                                  uuid not in transient, 0)
+                if old is not None and old._replace(generation=0) == new:
+                    continue
+                new = new._replace(generation=next(self._generations))
+                self._store(new)
+                changes.append((old, new))
+            for uuid in list(self._byUUID):
+                if uuid not in seen:
+                    changes.append((self._drop(uuid), None))
+        return changes
+
+
+NodeDeviceEntry = collections.namedtuple(
+    'NodeDeviceEntry', ['name', 'parent', 'caps', 'driver', 'pciAddress',
+                        'iommuGroup', 'xml'])
+NodeDeviceEntry.__doc__ = '''What a NodeDeviceInventory knows about a host device
+
+:param str name: the device name
+:param parent: the name of the parent device, or None
+:param caps: tuple of capability names, as returned by
+    virNodeDevice.listCaps(), e.g. ('pci', 'virt_functions')
+:param driver: the name of the bound driver, or None
+:param pciAddress: the PCI address as "dddd:bb:ss.f", or None
+:param iommuGroup: the IOMMU group number, or None
+:param str xml: the XML description the entry was parsed from
+'''
+
+
+def _parseNodeDevice(xml: str) -> NodeDeviceEntry:
+    root = ET.fromstring(xml)
+    caps = []
+    pciAddress = None
+    iommuGroup = None
+    for cap in root.findall('capability'):
+        caps.append(cap.get('type'))
+        # Nested ones, e.g. virt_functions or fc_host, are reported by
+        # listCaps() too
+        caps.extend(sub.get('type') for sub in cap.findall('capability'))
+        if cap.get('type') == 'pci':
+            try:
+                pciAddress = '%04x:%02x:%02x.%x' % tuple(
+                    int(cap.findtext(field), 0)  # type: ignore
+                    for field in ('domain', 'bus', 'slot', 'function'))
+            except (TypeError, ValueError):
+                pass
+        group = cap.find('iommuGroup')
+        if group is not None and group.get('number') is not None:
+            iommuGroup = int(group.get('number'))  # type: ignore
+    return NodeDeviceEntry(root.findtext('name'), root.findtext('parent'),
+                           tuple(caps), root.findtext('driver/name'),
+                           pciAddress, iommuGroup, xml)
+
+
+class NodeDeviceInventory(_Inventory):
+    '''In-memory index of the host devices of a connection
+
+    The inventory is bootstrapped with one listAllDevices() call and one
+    XMLDesc() call per device, and then updated from node device
+    LIFECYCLE and UPDATE events, refetching only the XML of the device
+    concerned. An event loop implementation must be running. Lookups
+    are dictionary reads and can be made from any thread.
+
+    Refetching happens on the thread running the event callbacks; pass a
+    *dispatcher* such as libvirtevents.ExecutorDispatcher to keep it off
+    the event loop.
+
+    :param conn: the connection to mirror
+    :param reopen: callable returning a new connection, used when *conn*
+        is closed
+    :param dispatcher: passed on to nodeDeviceEventRegisterAny()
+    '''
+
+    _deregisterEvent = 'nodeDeviceEventDeregisterAny'
+
+    def __init__(self, conn: libvirt.virConnect, reopen: Optional[Callable[[], libvirt.virConnect]] = None, dispatcher: Optional[libvirt._EventDispatcher] = None) -> None:
+        super().__init__(conn, reopen, dispatcher)
+        self._byName = {}  # type: Dict[str, NodeDeviceEntry]
+        self._byCap = {}  # type: Dict[str, Set[str]]
+        self._byParent = {}  # type: Dict[str, Set[str]]
+        self._byPCIAddress = {}  # type: Dict[str, str]
+        self._byIOMMUGroup = {}  # type: Dict[int, Set[str]]
+
+        self._register()
+        self.resync()
+
+    def __repr__(self) -> str:
+        return '<{} devices={} stale={}>'.format(
+            self.__class__.__name__, len(self._byName), self.stale)
+
+    def __len__(self) -> int:
+        return len(self._byName)
+
+    def __iter__(self) -> Iterator[NodeDeviceEntry]:
+        return iter(list(self._byName.values()))
+
+    #
+    # queries
+    #
+
+    def _entries(self, names: Optional[Set[str]]) -> List[NodeDeviceEntry]:
+        if not names:
+            return []
+        byName = self._byName
+        with self._lock:
+            return [byName[name] for name in sorted(names)]
+
+    def lookupByName(self, name: str) -> Optional[NodeDeviceEntry]:
+        '''Return the entry for the device called *name*, or None'''
+        return self._byName.get(name)
+
+    def lookupByPCIAddress(self, address: str) -> Optional[NodeDeviceEntry]:
+        '''Return the entry for the PCI device at *address*, or None
+
+        :param address: the address as "dddd:bb:ss.f", e.g. "0000:3b:00.1"
+        '''
+        name = self._byPCIAddress.get(address.lower())
+        return None if name is None else self._byName.get(name)
+
+    def listByCapability(self, cap: str) -> List[NodeDeviceEntry]:
+        '''Return the entries of the devices with capability *cap*, e.g.
+        "pci", "net", "mdev" or "virt_functions"'''
+        return self._entries(self._byCap.get(cap))
+
+    def listChildren(self, parent: str) -> List[NodeDeviceEntry]:
+        '''Return the entries of the devices whose parent is *parent*'''
+        return self._entries(self._byParent.get(parent))
+
+    def listByIOMMUGroup(self, group: int) -> List[NodeDeviceEntry]:
+        '''Return the entries of the devices in IOMMU group *group*'''
+        return self._entries(self._byIOMMUGroup.get(group))
+
+    #
+    # index maintenance
+    #
+
+    def _store(self, new: NodeDeviceEntry) -> Optional[NodeDeviceEntry]:
+        '''Add or replace the entry for new.name, with the lock held'''
+        old = self._drop(new.name)
+        self._byName[new.name] = new
+        for cap in new.caps:
+            self._byCap.setdefault(cap, set()).add(new.name)
+        if new.parent is not None:
+            self._byParent.setdefault(new.parent, set()).add(new.name)
+        if new.pciAddress is not None:
+            self._byPCIAddress[new.pciAddress] = new.name
+        if new.iommuGroup is not None:
+            self._byIOMMUGroup.setdefault(new.iommuGroup, set()).add(new.name)
+        return old
+
+    def _drop(self, name: str) -> Optional[NodeDeviceEntry]:
+        '''Remove the entry for *name*, with the lock held'''
+        old = self._byName.pop(name, None)
+        if old is None:
+            return None
+
+        def discard(index: Dict[Any, Set[str]], key: Any) -> None:
+            names = index.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[key]
+
+        for cap in old.caps:
+            discard(self._byCap, cap)
+        discard(self._byParent, old.parent)
+        discard(self._byIOMMUGroup, old.iommuGroup)
+        if old.pciAddress is not None and self._byPCIAddress.get(old.pciAddress) == name:
+            del self._byPCIAddress[old.pciAddress]
+        return old
+
+    def _refetch(self, dev: libvirt.virNodeDevice) -> None:
+        name = dev.name()
+        try:
+            new = _parseNodeDevice(dev.XMLDesc(0))  # type: Optional[NodeDeviceEntry]
+        except libvirt.libvirtError:
+            # Gone again before we got to it
+            new = None
+        with self._lock:
+            if new is None:
+                old = self._drop(name)
+            elif self._byName.get(name) == new:
+                return
+            else:
+                old = self._store(new)
+        if old is not None or new is not None:
+            self._notify(old, new)
+
+    #
+    # events
+    #
+
+    def _registerEvents(self) -> List[int]:
+        callbacks = (
+            (libvirt.VIR_NODE_DEVICE_EVENT_ID_LIFECYCLE, self._lifecycle),
+            (libvirt.VIR_NODE_DEVICE_EVENT_ID_UPDATE, self._refetch),
+        )
+        return [self.conn.nodeDeviceEventRegisterAny(None, eventID, self._event, handler,
+                                                     dispatcher=self.dispatcher)
+                for eventID, handler in callbacks]
+
+    def _lifecycle(self, dev: libvirt.virNodeDevice, event: int, detail: int) -> None:
+        if event == libvirt.VIR_NODE_DEVICE_EVENT_DELETED:
+            with self._lock:
+                old = self._drop(dev.name())
+            if old is not None:
+                self._notify(old, None)
+        else:
+            # CREATED, DEFINED and UNDEFINED; the latter leaves an active
+            # device in place, or makes the XMLDesc() call fail
+            self._refetch(dev)
+
+    def _bootstrap(self) -> List[Tuple[Any, Any]]:
+        fetched = []
+        for dev in self.conn.listAllDevices(0):
+            try:
+                fetched.append(_parseNodeDevice(dev.XMLDesc(0)))
+            except libvirt.libvirtError:
+                # Removed since it was listed
+                continue
+
+        changes = []  # type: List[Tuple[Any, Any]]
+        with self._lock:
+            seen = set()
+            for new in fetched:
+                seen.add(new.name)
+                if self._byName.get(new.name) == new:
+                    continue
+                changes.append((self._store(new), new))
+            for name in list(self._byName):
+                if name not in seen:
+                    changes.append((self._drop(name), None))
+        return changes
+
+
+StorageVolumeEntry = collections.namedtuple(
+    'StorageVolumeEntry', ['pool', 'name', 'key', 'path', 'type',
+                           'capacity', 'allocation'])
+StorageVolumeEntry.__doc__ = '''What a StorageVolumeInventory knows about a volume
+
+:param str pool: the UUID string of the pool holding the volume
+:param str name: the volume name
+:param str key: the volume key
+:param str path: the volume path
+:param int type: one of the VIR_STORAGE_VOL_* virStorageVolType values
+:param int capacity: the logical size in bytes
+:param int allocation: the current allocation in bytes
+'''
+
+
+class _PoolState(object):
+    '''Volumes and refresh bookkeeping of one pool'''
+
+    __slots__ = ('volumes', 'flight', 'refreshed')
+
+    def __init__(self) -> None:
+        self.volumes = {}  # type: Dict[str, StorageVolumeEntry]
+        # Future of the refresh in progress, shared by its callers
+        self.flight = None  # type: Optional[concurrent.futures.Future]
+        # time.monotonic() when the last refresh completed
+        self.refreshed = float('-inf')
+
+
+class StorageVolumeInventory(_Inventory):
+    '''In-memory index of the volumes of the active storage pools
+
+    The inventory lists the volumes of every active pool when it is
+    created, and again when a storage pool LIFECYCLE event reports a
+    pool started, or a REFRESH event reports it rescanned. Stopped and
+    deleted pools are dropped. Reads never go to the daemon.
+
+    Listing a pool only reads what the daemon already knows; refresh()
+    makes the daemon rescan it first. Concurrent refresh() calls for a
+    pool share a single virStoragePool.refresh(), and refreshes within
+    *minInterval* seconds of the previous one are answered from the
+    index instead. The REFRESH event caused by refresh() itself is
+    ignored, as the pool was just listed; so is any other REFRESH event
+    of the same pool within *minInterval* of it.
+
+    Listing happens on the thread running the event callbacks; pass a
+    *dispatcher* such as libvirtevents.ExecutorDispatcher to keep it off
+    the event loop.
+
+    :param conn: the connection to mirror
+    :param minInterval: minimum number of seconds between two refreshes
+        of a pool
+    :param workers: passed on to virStoragePool.listAllVolumesInfo()
+    :param reopen: callable returning a new connection, used when *conn*
+        is closed
+    :param dispatcher: passed on to storagePoolEventRegisterAny()
+    '''
+
+    _deregisterEvent = 'storagePoolEventDeregisterAny'
+
+    def __init__(self, conn: libvirt.virConnect, minInterval: float = 5.0, workers: int = 0, reopen: Optional[Callable[[], libvirt.virConnect]] = None, dispatcher: Optional[libvirt._EventDispatcher] = None) -> None:
+        super().__init__(conn, reopen, dispatcher)
+        self.minInterval = minInterval
+        self.workers = workers
+        self._pools = {}  # type: Dict[str, _PoolState]
+        self._byKey = {}  # type: Dict[str, StorageVolumeEntry]
+        self._byPath = {}  # type: Dict[str, StorageVolumeEntry]
+
+        self._register()
+        self.resync()
+
+    def __repr__(self) -> str:
+        return '<{} pools={} volumes={} stale={}>'.format(
+            self.__class__.__name__, len(self._pools), len(self._byKey), self.stale)
+
+    def __len__(self) -> int:
+        return len(self._byKey)
+
+    def __iter__(self) -> Iterator[StorageVolumeEntry]:
+        return iter(list(self._byKey.values()))
+
+    #
+    # queries
+    #
+
+    @staticmethod
+    def _poolUUID(pool: Union[libvirt.virStoragePool, str]) -> str:
+        if isinstance(pool, libvirt.virStoragePool):
+            return pool.UUIDString()
+        return pool
+
+    def listVolumes(self, pool: Union[libvirt.virStoragePool, str]) -> List[StorageVolumeEntry]:
+        '''Return the entries of the volumes of *pool*
+
+        :param pool: the pool or its UUID string
+        '''
+        with self._lock:
+            state = self._pools.get(self._poolUUID(pool))
+            if state is None:
+                return []
+            return list(state.volumes.values())
+
+    def lookupByName(self, pool: Union[libvirt.virStoragePool, str], name: str) -> Optional[StorageVolumeEntry]:
+        '''Return the entry for the volume *name* of *pool*, or None'''
+        state = self._pools.get(self._poolUUID(pool))
+        return None if state is None else state.volumes.get(name)
+
+    def lookupByKey(self, key: str) -> Optional[StorageVolumeEntry]:
+        '''Return the entry for the volume with key *key*, or None'''
+        return self._byKey.get(key)
+
+    def lookupByPath(self, path: str) -> Optional[StorageVolumeEntry]:
+        '''Return the entry for the volume at *path*, or None'''
+        return self._byPath.get(path)
+
+    #
+    # refresh scheduling
+    #
+
+    def refresh(self, pool: libvirt.virStoragePool, force: bool = False) -> List[StorageVolumeEntry]:
+        '''Rescan *pool* and return the entries of its volumes
+
+        If a refresh of the pool is already in progress, wait for it and
+        return its result instead of starting another one. Unless
+        *force* is set, a pool refreshed less than minInterval seconds
+        ago is not rescanned, its entries are returned straight away.
+
+        :raises libvirtError: if refreshing or listing the pool failed,
+            including for the callers which joined the refresh
+        '''
+        uuid = pool.UUIDString()
+        with self._lock:
+            state = self._pools.setdefault(uuid, _PoolState())
+            flight = state.flight
+            if flight is None:
+                if not force and time.monotonic() - state.refreshed < self.minInterval:
+                    return list(state.volumes.values())
+                flight = state.flight = concurrent.futures.Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            return flight.result()
+
+        try:
+            pool.refresh(0)
+            entries = self._reindex(pool)
+        except BaseException as ex:
+            with self._lock:
+                state.flight = None
+                if not state.volumes and self._pools.get(uuid) is state:
+                    # Not an active pool we know about
+                    del self._pools[uuid]
+            flight.set_exception(ex)
+            raise
+        with self._lock:
+            state.flight = None
+            state.refreshed = time.monotonic()
+        flight.set_result(entries)
+        return entries
+
+    #
+    # index maintenance
+    #
+
+    def _list(self, pool: libvirt.virStoragePool) -> Dict[str, StorageVolumeEntry]:
+        uuid = pool.UUIDString()
+        return {info[0]: StorageVolumeEntry(uuid, *info)
+                for info in pool.listAllVolumesInfo(0, self.workers)}
+
+    def _replace(self, uuid: str, volumes: Optional[Dict[str, StorageVolumeEntry]]) -> List[Tuple[Any, Any]]:
+        '''Replace the volumes of pool *uuid*, or drop the pool if
+        *volumes* is None, with the lock held'''
+        if volumes is None:
+            state = self._pools.pop(uuid, None)
+            if state is None:
+                return []
+        else:
+            state = self._pools.setdefault(uuid, _PoolState())
+
+        changes = []  # type: List[Tuple[Any, Any]]
+        for name, old in state.volumes.items():
+            if volumes is None or name not in volumes:
+                changes.append((old, None))
+                if self._byKey.get(old.key) is old:
+                    del self._byKey[old.key]
+                if self._byPath.get(old.path) is old:
+                    del self._byPath[old.path]
+        if volumes is None:
+            return changes
+
+        for name, new in volumes.items():
+            old = state.volumes.get(name)
+            if old == new:
+                volumes[name] = old  # type: ignore
+                continue
+            changes.append((old, new))
+            if old is not None:
+                if self._byKey.get(old.key) is old:
+                    del self._byKey[old.key]
+                if self._byPath.get(old.path) is old:
+                    del self._byPath[old.path]
+            self._byKey[new.key] = new
+            self._byPath[new.path] = new
+        state.volumes = volumes
+        return changes
+
+    def _reindex(self, pool: libvirt.virStoragePool) -> List[StorageVolumeEntry]:
+        volumes = self._list(pool)
+        with self._lock:
+            changes = self._replace(pool.UUIDString(), volumes)
+            entries = list(volumes.values())
+        for old, new in changes:
+            self._notify(old, new)
+        return entries
+
+    def _drop(self, uuid: str) -> None:
+        with self._lock:
+            changes = self._replace(uuid, None)
+        for old, new in changes:
+            self._notify(old, new)
+
+    #
+    # events
+    #
+
+    def _registerEvents(self) -> List[int]:
+        callbacks = (
+            (libvirt.VIR_STORAGE_POOL_EVENT_ID_LIFECYCLE, self._lifecycle),
+            (libvirt.VIR_STORAGE_POOL_EVENT_ID_REFRESH, self._refreshed),
+        )
+        return [self.conn.storagePoolEventRegisterAny(None, eventID, self._event, handler,
+                                                      dispatcher=self.dispatcher)
+                for eventID, handler in callbacks]
+
+    def _lifecycle(self, pool: libvirt.virStoragePool, event: int, detail: int) -> None:
+        if event == libvirt.VIR_STORAGE_POOL_EVENT_STARTED:
+            self._relist(pool)
+        elif event in (libvirt.VIR_STORAGE_POOL_EVENT_STOPPED,
+                       libvirt.VIR_STORAGE_POOL_EVENT_DELETED,
+                       libvirt.VIR_STORAGE_POOL_EVENT_UNDEFINED):
+            self._drop(pool.UUIDString())
+
+    def _refreshed(self, pool: libvirt.virStoragePool) -> None:
+        with self._lock:
+            state = self._pools.get(pool.UUIDString())
+            if state is not None and (state.flight is not None or
+                                      time.monotonic() - state.refreshed < self.minInterval):
+                # Ours, or close enough to it
+                return
+        self._relist(pool)
+
+    def _relist(self, pool: libvirt.virStoragePool) -> None:
+        try:
+            self._reindex(pool)
+        except libvirt.libvirtError:
+            # Stopped again, its own event will follow
+            self.log.debug('Cannot list the volumes of %s', pool.name())
+
+    def _bootstrap(self) -> List[Tuple[Any, Any]]:
+        fetched = {}
+        for pool in self.conn.listAllStoragePools(libvirt.VIR_CONNECT_LIST_STORAGE_POOLS_ACTIVE):
+            try:
+                fetched[pool.UUIDString()] = self._list(pool)
+            except libvirt.libvirtError:
+                continue
+
+        changes = []  # type: List[Tuple[Any, Any]]
+        with self._lock:
+            for uuid in list(self._pools):
+                if uuid not in fetched:
+                    changes.extend(self._replace(uuid, None))
+            for uuid, volumes in fetched.items():
+                changes.extend(self._replace(uuid, volumes))
+        return changes
+
+
+SnapshotEntry = collections.namedtuple(
+    'SnapshotEntry', ['uuid', 'name', 'id', 'state', 'persistent',
+                      'maxMem', 'memory', 'nrVirtCpu', 'xmlHash'])
+SnapshotEntry.__doc__ = '''What an InventorySnapshot records about a domain
+
+:param str uuid: the UUID string
+:param str name: the name
+:param int id: the ID, -1 when the domain was not running
+:param int state: one of the VIR_DOMAIN_* virDomainState values
+:param bool persistent: whether the domain had a persistent definition
+:param int maxMem: the maximum memory in KiB
+:param int memory: the current memory in KiB
+:param int nrVirtCpu: the number of virtual CPUs
+:param xmlHash: SHA-256 digest of the XML description, or None if it
+    was not captured
+'''
+
+# File layout, all integers little endian:
+#
+#   header     magic, version, count, save time, URI and name table sizes
+#   URI        UTF-8, padded to 8 bytes
+#   records    count fixed size records, sorted by UUID
+#   names      UTF-8 domain names, referenced by offset and length
+#
+# Fixed size records let a reader find the n-th domain, or bisect for
+# a UUID, straight from the mapped file without parsing the rest.
+_SNAPSHOT_MAGIC = b'LVINVENT'
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<8sHHIdII')
+_SNAPSHOT_RECORD = struct.Struct('<16siiBB2xQQIII32s4x')
+_SNAPSHOT_NO_HASH = bytes(32)
+_SNAPSHOT_STATS = libvirt.VIR_DOMAIN_STATS_STATE | libvirt.VIR_DOMAIN_STATS_BALLOON | libvirt.VIR_DOMAIN_STATS_VCPU
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def snapshotPath(uri: str, directory: Optional[str] = None) -> str:
+    '''Return the file an InventorySnapshot of *uri* is saved to
+
+    :param uri: the connection URI, as returned by virConnect.getURI()
+    :param directory: where snapshots are kept, by default
+        $XDG_CACHE_HOME/libvirt-python/inventory
+    '''
+    if directory is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(base, 'libvirt-python', 'inventory')
+    name = hashlib.sha256(uri.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(directory, name + '.inv')
+
+
+def loadSnapshot(uri: str, directory: Optional[str] = None) -> Optional['InventorySnapshot']:
+    '''Load the snapshot saved for *uri*
+
+    :returns: the snapshot, or None if there is none or it cannot be
+        used, e.g. because it was written by an incompatible version
+    '''
+    try:
+        return InventorySnapshot.load(snapshotPath(uri, directory))
+    except (OSError, ValueError):
+        return None
+
+
+class InventorySnapshot(object):
+    '''Domain inventory of a connection, as saved at some point in time
+
+    Loading maps the file and only decodes the records which are looked
+    at: UUID lookups bisect the mapped records, the name index is built
+    on first use.
+
+    :param uri: the connection URI
+    :param entries: the SnapshotEntry records
+    :param saved: when the inventory was captured, as a time.time() value
+    :param path: the file the snapshot is saved to by save()
+    '''
+
+    def __init__(self, uri: str, entries: Iterable[SnapshotEntry] = (), saved: Optional[float] = None, path: Optional[str] = None) -> None:
+        self.uri = uri
+        self.saved = time.time() if saved is None else saved
+        self.path = path
+        self._entries = sorted(entries, key=lambda e: _uuid.UUID(e.uuid).bytes)  # type: Optional[List[SnapshotEntry]]
+        self._count = len(self._entries)  # type: ignore
+        self._mm = None  # type: Optional[mmap.mmap]
+        self._records = 0
+        self._names = 0
+        self._byUUID = None  # type: Optional[Dict[str, int]]
+        self._byName = None  # type: Optional[Dict[str, int]]
+
+    def __repr__(self) -> str:
+        return '<{} uri={!r} domains={} saved={}>'.format(
+            self.__class__.__name__, self.uri, self._count,
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.saved)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> SnapshotEntry:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        if self._entries is not None:
+            return self._entries[index]
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[SnapshotEntry]:
+        for index in range(self._count):
+            yield self[index]
+
+    @property
+    def age(self) -> float:
+        '''Seconds since the inventory was captured'''
+        return time.time() - self.saved
+
+    def lookupByUUIDString(self, uuid: str) -> Optional[SnapshotEntry]:
+        '''Return the entry for the domain with UUID string *uuid*, or None'''
+        if self._mm is not None:
+            # Records are sorted by raw UUID, bisect the mapped file
+            try:
+                key = _uuid.UUID(uuid).bytes
+            except ValueError:
+                return None
+            lo, hi = 0, self._count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                offset = self._records + mid * _SNAPSHOT_RECORD.size
+                raw = self._mm[offset:offset + 16]
+                if raw < key:
+                    lo = mid + 1
+                elif raw > key:
+                    hi = mid
+                else:
+                    return self._decode(mid)
+            return None
+        if self._byUUID is None:
+            self._byUUID = {entry.uuid: index for index, entry in enumerate(self)}
+        index = self._byUUID.get(uuid)
+        return None if index is None else self[index]
+
+    def lookupByName(self, name: str) -> Optional[SnapshotEntry]:
+        '''Return the entry for the domain called *name*, or None'''
+        if self._byName is None:
+            self._byName = {entry.name: index for index, entry in enumerate(self)}
+        index = self._byName.get(name)
+        return None if index is None else self[index]
+
+    #
+    # file format
+    #
+
+    def _decode(self, index: int) -> SnapshotEntry:
+        mm = self._mm
+        (rawUUID, id, state, persistent, hasXML, maxMem, memory, nrVirtCpu,
+         nameOffset, nameLength, xmlHash) = _SNAPSHOT_RECORD.unpack_from(
+             mm, self._records + index * _SNAPSHOT_RECORD.size)  # type: ignore
+        start = self._names + nameOffset
+        name = mm[start:start + nameLength].decode('utf-8')  # type: ignore
+        return SnapshotEntry(str(_uuid.UUID(bytes=rawUUID)), name, id, state,
+                             bool(persistent), maxMem, memory, nrVirtCpu,
+                             xmlHash if hasXML else None)
+
+    @classmethod
+    def load(cls, path: str) -> 'InventorySnapshot':
+        '''Map the snapshot saved in *path*
+
+        :raises OSError: if the file cannot be read
+        :raises ValueError: if it is not a snapshot this version can read
+        '''
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mm) < _SNAPSHOT_HEADER.size:
+                raise ValueError('%s: truncated inventory snapshot' % path)
+            magic, version, _, count, saved, uriLength, namesLength = _SNAPSHOT_HEADER.unpack_from(mm, 0)
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise ValueError('%s: not a version %d inventory snapshot' % (path, _SNAPSHOT_VERSION))
+            records = _SNAPSHOT_HEADER.size + _pad8(uriLength)
+            names = records + count * _SNAPSHOT_RECORD.size
+            if len(mm) < names + namesLength:
+                raise ValueError('%s: truncated inventory snapshot' % path)
+            uri = mm[_SNAPSHOT_HEADER.size:_SNAPSHOT_HEADER.size + uriLength].decode('utf-8')
+        except Exception:
+            mm.close()
+            raise
+
+        snapshot = cls(uri, saved=saved, path=path)
+        snapshot._entries = None
+        snapshot._count = count
+        snapshot._mm = mm
+        snapshot._records = records
+        snapshot._names = names
+        return snapshot
+
+    def save(self, path: Optional[str] = None) -> str:
+        '''Write the snapshot out
+
+        The file is replaced atomically, so concurrent readers see either
+        the old or the new snapshot.
+
+        :param path: where to write it, by default the file it was loaded
+            from or else snapshotPath() of its URI
+        :returns: the path written to
+        '''
+        if path is None:
+            path = self.path or snapshotPath(self.uri)
+
+        uri = self.uri.encode('utf-8')
+        records = []
+        names = []
+        nameOffset = 0
+        for entry in self:
+            name = entry.name.encode('utf-8')
+            records.append(_SNAPSHOT_RECORD.pack(
+                _uuid.UUID(entry.uuid).bytes, entry.id, entry.state,
+                entry.persistent, entry.xmlHash is not None,
+                entry.maxMem, entry.memory, entry.nrVirtCpu,
+                nameOffset, len(name), entry.xmlHash or _SNAPSHOT_NO_HASH))
+            names.append(name)
+            nameOffset += len(name)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, 0,
+                                              len(records), self.saved,
+                                              len(uri), nameOffset))
+                f.write(uri.ljust(_pad8(len(uri)), b'\0'))
+                f.writelines(records)
+                f.writelines(names)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self.path = path
+        return path
+
+    def close(self) -> None:
+        '''Unmap the file, decoding all the entries first'''
+        if self._mm is not None:
+            self._entries = [self._decode(index) for index in range(self._count)]
+            self._mm.close()
+            self._mm = None
+
+    #
+    # capture and revalidation
+    #
+
+    @staticmethod
+    def _capture(records: Iterable[Tuple[libvirt.virDomain, Dict[str, Any]]], persistent: Callable[[libvirt.virDomain], bool], xmlFlags: Optional[int]) -> Dict[str, SnapshotEntry]:
+        entries = {}
+        for dom, record in records:
+            xmlHash = None
+            if xmlFlags is not None:
+                try:
+                    xmlHash = hashlib.sha256(dom.XMLDesc(xmlFlags).encode('utf-8')).digest()
+                except libvirt.libvirtError:
+                    # Undefined since it was listed
+                    continue
+            uuid = dom.UUIDString()
+            entries[uuid] = SnapshotEntry(
+                uuid, dom.name(), dom.ID(),
+                record.get('state.state', libvirt.VIR_DOMAIN_NOSTATE),
+                persistent(dom),
+                record.get('balloon.maximum', 0), record.get('balloon.current', 0),
+                record.get('vcpu.current', 0), xmlHash)
+        return entries
+
+    @classmethod
+    def capture(cls, conn: libvirt.virConnect, xmlFlags: Optional[int] = 0, path: Optional[str] = None) -> 'InventorySnapshot':
+        '''Take a snapshot of the domains of *conn*
+
+        This costs a listAllDomains() and a getAllDomainStats() call, plus
+        one XMLDesc() call per domain unless *xmlFlags* is None.
+
+        :param xmlFlags: flags for XMLDesc(), or None to not record the
+            XML hashes
+        :param path: where save() writes it, by default snapshotPath()
+        '''
+        transient = {dom.UUIDString() for dom in
+                     conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_TRANSIENT)}
+        records = conn.getAllDomainStats(_SNAPSHOT_STATS)
+        entries = cls._capture(
+            records, lambda dom: dom.UUIDString() not in transient, xmlFlags)
+        return cls(conn.getURI(), entries.values(), path=path)
+
+    def changes(self, conn: libvirt.virConnect) -> Tuple[List[libvirt.virDomain], List[str]]:
+        '''Compare the snapshot with the domains of *conn*
+
+        This is a single listAllDomains() call, comparing UUIDs and IDs:
+        it finds domains which were defined, undefined, started or stopped
+        since the snapshot was captured, but not ones which were only
+        paused, resumed or reconfigured.
+
+        :returns: the domains which are new or changed, and the UUID
+            strings of the ones which are gone
+        '''
+        changed = []
+        seen = set()
+        for dom in conn.listAllDomains():
+            uuid = dom.UUIDString()
+            seen.add(uuid)
+            entry = self.lookupByUUIDString(uuid)
+            if entry is None or entry.id != dom.ID() or entry.name != dom.name():
+                changed.append(dom)
+        gone = [entry.uuid for entry in self if entry.uuid not in seen]
+        return changed, gone
+
+    def refresh(self, conn: libvirt.virConnect, xmlFlags: Optional[int] = 0) -> 'InventorySnapshot':
+        '''Return a snapshot brought up to date with *conn*
+
+        Only the domains reported by changes() are queried again, with a
+        single domainListGetStats() call plus one XMLDesc() and one
+        isPersistent() call each. The result keeps the path of this
+        snapshot, but is not saved.
+
+        :param xmlFlags: flags for XMLDesc(), or None to not record the
+            XML hashes of the changed domains
+        '''
+        changed, gone = self.changes(conn)
+        if not changed and not gone:
+            entries = list(self)
+        else:
+            entries = [entry for entry in self if entry.uuid not in gone]
+            if changed:
+                records = conn.domainListGetStats(changed, _SNAPSHOT_STATS)
+                fresh = self._capture(
+                    records, lambda dom: bool(dom.isPersistent()), xmlFlags)
+                entries = [entry for entry in entries if entry.uuid not in fresh]
+                entries.extend(fresh.values())
+        return self.__class__(self.uri, entries, path=self.path)
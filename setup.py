@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import re
 import shutil
 import subprocess
+import sysconfig
 import time
 
 from pathlib import Path
@@ -77,6 +79,21 @@ def get_api_xml_files():
     return (libvirt_api, libvirt_qemu_api, libvirt_lxc_api)
 
 
+def get_py_options():
+    """Optional layout of the generated libvirt module, from the
+    environment, as flags for the generator"""
+    options = ""
+    if os.environ.get("LIBVIRT_PYTHON_LAZY") == "1":
+        # The lazy layout relies on the module __getattr__ of PEP 562
+        if sys.version_info < (3, 7):
+            print("LIBVIRT_PYTHON_LAZY=1 requires Python >= 3.7")
+            sys.exit(1)
+        options += ",lazy"
+    if os.environ.get("LIBVIRT_PYTHON_SPLIT_DOCSTRINGS") == "1":
+        options += ",splitdoc"
+    return options
+
+
 def get_module_lists():
     """
     Determine which modules we are actually building, and all their
@@ -88,7 +105,13 @@ def get_module_lists():
     cflags = get_pkgconfig_data(["--cflags"], "libvirt", False).split()
 
     cflags += ["-Ibuild"]
-    cflags += ["-Wp,-DPy_LIMITED_API=0x03060000"]
+    # The free threaded builds of python have no limited API
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        # METH_FASTCALL only became part of the limited API in 3.10
+        if sys.version_info >= (3, 10):
+            cflags += ["-Wp,-DPy_LIMITED_API=0x030A0000"]
+        else:
+            cflags += ["-Wp,-DPy_LIMITED_API=0x03060000"]
 
     module = Extension("libvirtmod",
                        sources=[
@@ -104,6 +127,8 @@ def get_module_lists():
 
     c_modules.append(module)
     py_modules.append("libvirt")
+    if "splitdoc" in get_py_options():
+        py_modules.append("libvirt_docstrings")
 
     moduleqemu = Extension("libvirtmod_qemu",
                            sources=[
@@ -137,6 +162,8 @@ def get_module_lists():
         py_modules.append("libvirt_lxc")
 
     py_modules.append("libvirtaio")
+    py_modules.append("libvirtevents")
+    py_modules.append("libvirtinventory")
 
     return c_modules, py_modules
 
@@ -165,11 +192,13 @@ class my_build_py(build_py):
         check_minimum_libvirt_version()
         apis = get_api_xml_files()
 
-        subprocess.check_call([sys.executable, "generator.py", "libvirt", apis[0], "py"])
+        subprocess.check_call([sys.executable, "generator.py", "libvirt", apis[0], "py" + get_py_options()])
         subprocess.check_call([sys.executable, "generator.py", "libvirt-qemu", apis[1], "py"])
         if have_libvirt_lxc():
             subprocess.check_call([sys.executable, "generator.py", "libvirt-lxc", apis[2], "py"])
         shutil.copy("libvirtaio.py", "build")
+        shutil.copy("libvirtevents.py", "build")
+        shutil.copy("libvirtinventory.py", "build")
 
         build_py.run(self)
 
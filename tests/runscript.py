@@ -0,0 +1,13 @@
+import subprocess
+import sys
+import textwrap
+
+
+# The event loop implementation and the error handler are process wide,
+# register once settings, so the tests depending on them run their
+# scenario in a fresh interpreter.
+def run_script(script, timeout=30):
+    proc = subprocess.run([sys.executable, "-c", textwrap.dedent(script)],
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True, timeout=timeout)
+    return proc.returncode, proc.stdout
@@ -154,3 +154,113 @@ class TestLibvirtAio(unittest.TestCase):
         loop.close()
         asyncio.set_event_loop(None)
         mock_event_register.assert_called_once()
+
+    @mock.patch('libvirt.virEventRegisterImpl',
+                side_effect=eventmock.virEventRegisterImplMock)
+    def testEventStats(self, mock_event_register):
+        libvirt.resetEventStats()
+        libvirt.enableEventStats()
+        self.addCleanup(libvirt.resetEventStats)
+        self.addCleanup(libvirt.enableEventStats, False)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        loop.run_until_complete(self._run(register=True))
+
+        loop.close()
+        asyncio.set_event_loop(None)
+
+        stats = libvirtaio.getEventStats()
+        self.assertTrue(stats["enabled"])
+        lifecycle = stats["events"]["VIR_DOMAIN_EVENT_ID_LIFECYCLE"]
+        self.assertGreaterEqual(lifecycle["count"], 2)
+        self.assertEqual(lifecycle["errors"], 0)
+        self.assertEqual(sum(lifecycle["histogram"]), lifecycle["count"])
+        self.assertEqual(len(lifecycle["histogram"]), len(lifecycle["buckets"]) + 1)
+        self.assertEqual(stats["connections"]["test:///default"]["count"],
+                         lifecycle["count"])
+        self.assertGreater(stats["loop"]["handles"]["count"], 0)
+        self.assertGreaterEqual(stats["loop"]["loopLag"]["last"], 0)
+
+    async def _runFromExecutor(self):
+        # Blocking libvirt calls offloaded to worker threads make libvirt
+        # add and remove handles and timers from those threads
+        loop = asyncio.get_event_loop()
+        libvirtEvents = libvirtaio.virEventRegisterAsyncIOImpl()
+
+        def lifecycleCallback(conn, dom, event, detail, domainChangedEvent):
+            if event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+                domainChangedEvent.set()
+
+        conn = await loop.run_in_executor(None, libvirt.open, "test:///default")
+        dom = await loop.run_in_executor(None, conn.lookupByName, "test")
+
+        domainChangedEvent = asyncio.Event()
+        callbackID = await loop.run_in_executor(
+            None, conn.domainEventRegisterAny, dom,
+            libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycleCallback,
+            domainChangedEvent)
+        self.assertFalse(libvirtEvents.is_idle())
+
+        try:
+            await loop.run_in_executor(None, dom.destroy)
+            await asyncio.wait_for(domainChangedEvent.wait(), 2)
+        finally:
+            await loop.run_in_executor(None, conn.domainEventDeregisterAny, callbackID)
+            await loop.run_in_executor(None, dom.create)
+            await loop.run_in_executor(None, conn.close)
+
+        await libvirtEvents.drain()
+        self.assertTrue(libvirtEvents.is_idle())
+
+    @mock.patch('libvirt.virEventRegisterImpl',
+                side_effect=eventmock.virEventRegisterImplMock)
+    def testEventsFromExecutor(self, mock_event_register):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        loop.run_until_complete(self._runFromExecutor())
+
+        loop.close()
+        asyncio.set_event_loop(None)
+        mock_event_register.assert_called_once()
+
+    async def _runWaitForState(self):
+        libvirtEvents = libvirtaio.virEventRegisterAsyncIOImpl()
+        loop = asyncio.get_event_loop()
+
+        conn = libvirt.open("test:///default")
+        dom = conn.lookupByName("test")
+        try:
+            state = await libvirtaio.waitForDomainState(
+                dom, libvirt.VIR_DOMAIN_RUNNING, 1)
+            self.assertEqual(state, libvirt.VIR_DOMAIN_RUNNING)
+
+            state = await libvirtaio.waitForDomainState(
+                dom, libvirt.VIR_DOMAIN_PAUSED, 0.1)
+            self.assertIsNone(state)
+
+            loop.call_later(0.1, dom.destroy)
+            states = await libvirtaio.waitForDomainsState(
+                conn, [dom], libvirt.VIR_DOMAIN_SHUTOFF, 2)
+            self.assertEqual(states, [libvirt.VIR_DOMAIN_SHUTOFF])
+        finally:
+            if dom.isActive() == 0:
+                dom.create()
+            conn.close()
+
+        await libvirtEvents.drain()
+        self.assertTrue(libvirtEvents.is_idle())
+
+    @mock.patch('libvirt.virEventRegisterImpl',
+                side_effect=eventmock.virEventRegisterImplMock)
+    def testWaitForDomainState(self, mock_event_register):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        loop.run_until_complete(self._runWaitForState())
+
+        loop.close()
+        asyncio.set_event_loop(None)
+        mock_event_register.assert_called_once()
@@ -345,7 +345,29 @@ def validate_python_to_c_api_mappings(gotfunctions, usedfunctions):
             # These are pure python methods with no C APi
             if func in ["connect", "getConnect", "domain", "getDomain",
                         "virEventInvokeFreeCallback", "network",
-                        "sparseRecvAll", "sparseSendAll"]:
+                        "sparseRecvAll", "sparseSendAll",
+                        "startDefaultEventLoopThread",
+                        "stopDefaultEventLoopThread",
+                        "setEventDispatcher",
+                        "enableEventStats", "resetEventStats",
+                        "getEventStats",
+                        "enableCallStats", "resetCallStats",
+                        "getCallStats", "enableGILStats",
+                        "resetGILStats", "getGILStats",
+                        "waitForState", "waitForDomainsState",
+                        "waitForBlockJob", "waitForBlockJobs",
+                        "enableDomainXMLCache", "disableDomainXMLCache",
+                        "getDomainXMLCacheStats", "listAllVolumesInfo",
+                        "enableWrapperCache", "disableWrapperCache",
+                        "getWrapperCacheStats",
+                        "lookupByNames", "lookupByUUIDStrings",
+                        "lookupByIDs", "networkLookupByNames",
+                        "networkLookupByUUIDStrings",
+                        "storagePoolLookupByNames",
+                        "storagePoolLookupByUUIDStrings",
+                        "storageVolLookupByNames", "storageVolLookupByKeys",
+                        "storageVolLookupByPaths",
+                        "loadDocstrings"]:
                 continue
 
             key = "%s.%s" % (klass, func)
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "benchmarks")
+
+
+# Only make sure the benchmarks keep working, with tiny workloads,
+# the figures they report are not checked
+class TestEventStorm(unittest.TestCase):
+    def testNative(self):
+        out = subprocess.check_output(
+            [sys.executable, os.path.join(BENCHMARKS, "eventstorm.py"),
+             "--loop", "native", "--iterations", "2", "--domains", "2",
+             "--stats"],
+            universal_newlines=True, timeout=120)
+        report = json.loads(out)
+        result, = report["results"]
+        self.assertTrue(result["complete"])
+        # 4 events per domain, plus define/undefine, network and pool
+        self.assertEqual(result["events_expected"], 2 * (2 * 4 + 2 + 2 + 2))
+        self.assertEqual(result["events_received"], result["events_expected"])
+        self.assertIn("VIR_DOMAIN_EVENT_ID_LIFECYCLE",
+                      result["event_stats"]["events"])
+
+
+class TestCallBench(unittest.TestCase):
+    def testRun(self):
+        out = subprocess.check_output(
+            [sys.executable, os.path.join(BENCHMARKS, "callbench.py"),
+             "--number", "10", "--repeat", "1"],
+            universal_newlines=True, timeout=120)
+        report = json.loads(out)
+        calls = [result["call"] for result in report["results"]]
+        self.assertIn("libvirtmod.virDomainGetName", calls)
+        self.assertIn("virDomain.info", calls)
+        for result in report["results"]:
+            self.assertGreater(result["ns_per_call"], 0)
+
+
+class TestImportTime(unittest.TestCase):
+    def testRun(self):
+        out = subprocess.check_output(
+            [sys.executable, os.path.join(BENCHMARKS, "importtime.py"),
+             "--runs", "2"],
+            universal_newlines=True, timeout=120)
+        report = json.loads(out)
+        self.assertIn(report["layout"], ("eager", "lazy"))
+        self.assertIn("libvirt", report["modules"])
+        self.assertGreater(report["modules"]["libvirt"]["cumulative_us"]["min"], 0)
+        self.assertGreater(report["import_us"]["min"], 0)
+
+
+class TestWrapperMem(unittest.TestCase):
+    def testRun(self):
+        out = subprocess.check_output(
+            [sys.executable, os.path.join(BENCHMARKS, "wrappermem.py"),
+             "--count", "100"],
+            universal_newlines=True, timeout=120)
+        report = json.loads(out)
+        classes = [result["class"] for result in report["results"]]
+        self.assertEqual(classes, ["virDomain", "virStorageVol"])
+        for result in report["results"]:
+            self.assertTrue(result["slots"])
+            self.assertGreater(result["bytes_per_wrapper"], 0)
+            self.assertGreater(result["ns_per_construction"], 0)
+
+
+class TestBulkCalls(unittest.TestCase):
+    def testRun(self):
+        out = subprocess.check_output(
+            [sys.executable, os.path.join(BENCHMARKS, "bulkcalls.py"),
+             "--count", "10", "--repeat", "1", "--workers", "2"],
+            universal_newlines=True, timeout=120)
+        report = json.loads(out)
+        getters = [result["getter"] for result in report["results"]]
+        self.assertEqual(getters, ["info", "state", "isActive", "maxMemory"])
+        for result in report["results"]:
+            self.assertGreater(result["ns_per_object_loop"], 0)
+            self.assertGreater(result["ns_per_object_bulk"], 0)
@@ -18,6 +18,153 @@ class TestLibvirtConn(unittest.TestCase):
         self.assertEqual(type(doms[0]), libvirt.virDomain)
         self.assertEqual(doms[0].name(), "test")
 
+    def testWrapperCache(self):
+        self.assertIsNone(self.conn.getWrapperCacheStats())
+        self.assertIsNot(self.conn.lookupByName("test"),
+                         self.conn.lookupByName("test"))
+
+        self.conn.enableWrapperCache()
+        dom = self.conn.lookupByName("test")
+        self.assertIs(self.conn.listAllDomains()[0], dom)
+        self.assertIs(self.conn.lookupByUUIDString(dom.UUIDString()), dom)
+        self.assertIs(self.conn.getAllDomainStats()[0][0], dom)
+        pool = self.conn.storagePoolLookupByName("default-pool")
+        self.assertIs(self.conn.listAllStoragePools()[0], pool)
+        net = self.conn.networkLookupByName("default")
+        self.assertIs(self.conn.listAllNetworks()[0], net)
+        stats = self.conn.getWrapperCacheStats()
+        self.assertEqual(stats["size"], 3)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["hits"], 5)
+
+        self.conn.disableWrapperCache()
+        self.assertIsNone(self.conn.getWrapperCacheStats())
+        self.assertIsNot(self.conn.lookupByName("test"), dom)
+
+    def testSlots(self):
+        # Every attribute libvirt, libvirt_qemu and libvirt_lxc set on
+        # these must have a slot, as their instances have no __dict__
+        dom = self.conn.lookupByName("test")
+        for obj, attrs in ((self.conn, ["domainEventCallbacks", "domainEventCallbackID",
+                                        "networkEventCallbackID", "storagePoolEventCallbackID",
+                                        "nodeDeviceEventCallbackID", "secretEventCallbackID",
+                                        "qemuMonitorEventCallbackID",
+                                        "_domainXMLCache", "_wrapperCache"]),
+                           (dom, ["_conn"])):
+            self.assertFalse(hasattr(obj, "__dict__"))
+            for attr in attrs:
+                value = getattr(obj, attr, None)
+                setattr(obj, attr, value)
+                if value is None:
+                    delattr(obj, attr)
+            self.assertRaises(AttributeError, setattr, obj, "noSuchAttribute", 1)
+
+        # The test driver has no QEMU monitor, the registration must get
+        # as far as telling so
+        import libvirt_qemu
+        self.assertRaises(libvirt.libvirtError, libvirt_qemu.qemuMonitorEventRegister,
+                          self.conn, None, None, lambda *args: None, None)
+
+    def testBatchLookup(self):
+        dom = self.conn.lookupByName("test")
+        for workers in (0, 1, 8):
+            doms = self.conn.lookupByNames(["test", "missing", "test"], workers)
+            self.assertEqual([d and d.name() for d in doms], ["test", None, "test"])
+        doms = self.conn.lookupByUUIDStrings([dom.UUIDString(), "not-a-uuid"])
+        self.assertEqual([d and d.name() for d in doms], ["test", None])
+        doms = self.conn.lookupByIDs(iter([dom.ID(), 4242]), 2)
+        self.assertEqual([d and d.name() for d in doms], ["test", None])
+        self.assertEqual(self.conn.lookupByNames([]), [])
+
+        nets = self.conn.networkLookupByNames(["missing", "default"])
+        self.assertEqual([n and n.name() for n in nets], [None, "default"])
+        pools = self.conn.storagePoolLookupByNames(["default-pool", "missing"])
+        self.assertEqual([p and p.name() for p in pools], ["default-pool", None])
+        self.assertEqual(self.conn.storagePoolLookupByUUIDStrings([pools[0].UUIDString()])[0].name(),
+                         "default-pool")
+
+        self.conn.enableWrapperCache()
+        dom = self.conn.lookupByName("test")
+        self.assertIs(self.conn.lookupByNames(["test"])[0], dom)
+
+    def testCallStats(self):
+        libvirt.resetCallStats()
+        self.conn.lookupByName("test").info()
+        self.assertEqual(libvirt.getCallStats(), {"enabled": False, "calls": {}})
+
+        libvirt.enableCallStats()
+        self.addCleanup(libvirt.resetCallStats)
+        self.addCleanup(libvirt.enableCallStats, False)
+        dom = self.conn.lookupByName("test")
+        for _ in range(3):
+            dom.info()
+        self.assertRaises(libvirt.libvirtError, self.conn.lookupByName, "missing")
+        self.conn.lookupByNames(["test", "missing"])
+        libvirt.bulk.virDomainGetInfo([dom, dom])
+
+        stats = libvirt.getCallStats()
+        self.assertTrue(stats["enabled"])
+        calls = stats["calls"]
+        self.assertEqual(calls["virDomainGetInfo"]["count"], 3)
+        self.assertEqual(calls["virDomainGetInfo"]["errors"], 0)
+        self.assertEqual(calls["virDomainLookupByName"]["count"], 2)
+        self.assertEqual(calls["virDomainLookupByName"]["errors"], 1)
+        self.assertEqual(calls["virDomainLookupByNames"]["count"], 1)
+        self.assertEqual(calls["virDomainGetInfoBulk"]["count"], 1)
+        info = calls["virDomainGetInfo"]
+        self.assertEqual(sum(info["histogram"]), 3)
+        self.assertEqual(len(info["histogram"]), len(info["buckets"]) + 1)
+        self.assertGreater(info["total"], 0)
+        self.assertLessEqual(info["p50"], info["p99"])
+        self.assertLessEqual(info["p99"], info["max"])
+
+        libvirt.resetCallStats()
+        self.assertEqual(libvirt.getCallStats()["calls"], {})
+
+    def testCallStatsSections(self):
+        dom = self.conn.lookupByName("test")
+        params = dom.schedulerParameters()
+
+        libvirt.enableCallStats()
+        self.addCleanup(libvirt.resetCallStats)
+        self.addCleanup(libvirt.enableCallStats, False)
+        libvirt.resetCallStats()
+        dom.setSchedulerParameters(params)
+
+        # Each libvirt call the override makes is accounted to its API
+        calls = libvirt.getCallStats()["calls"]
+        self.assertEqual({name: stats["count"] for name, stats in calls.items()},
+                         {"virDomainGetSchedulerType": 1,
+                          "virDomainGetSchedulerParameters": 1,
+                          "virDomainSetSchedulerParameters": 1})
+
+    def testGILStats(self):
+        errors = []
+        libvirt.registerErrorHandler(lambda ctx, err: errors.append(err), None)
+        self.addCleanup(libvirt.registerErrorHandler, None, None)
+        libvirt.resetGILStats()
+        libvirt.enableGILStats()
+        self.addCleanup(libvirt.resetGILStats)
+        self.addCleanup(libvirt.enableGILStats, False)
+
+        for _ in range(2):
+            self.assertRaises(libvirt.libvirtError, self.conn.lookupByName, "missing")
+        self.assertEqual(len(errors), 2)
+
+        stats = libvirt.getGILStats()
+        self.assertTrue(stats["enabled"])
+        handler = stats["callbacks"]["virErrorFuncHandler"]
+        self.assertEqual(handler["count"], 2)
+        for kind in ("wait", "hold"):
+            self.assertEqual(sum(handler[kind]["histogram"]), 2)
+            self.assertLessEqual(handler[kind]["p50"], handler[kind]["max"])
+        self.assertGreater(handler["hold"]["total"], 0)
+
+        libvirt.enableGILStats(False)
+        self.conn.lookupByName("test").UUIDString()
+        self.assertRaises(libvirt.libvirtError, self.conn.lookupByName, "missing")
+        self.assertEqual(libvirt.getGILStats()["callbacks"]["virErrorFuncHandler"]["count"], 2)
+
 class TestLibvirtConnAuth(unittest.TestCase):
     connXML = """
 <node>
@@ -23,3 +23,74 @@ class TestLibvirtDomain(unittest.TestCase):
     def testScreenshot(self):
         stream = self.conn.newStream()
         ss = self.dom.screenshot(stream, 0, 0)
+
+    def testArgumentChecking(self):
+        libvirtmod = libvirt.libvirtmod
+        self.assertEqual(libvirtmod.virDomainGetName(self.dom._o), "test")
+        self.assertEqual(libvirtmod.virDomainGetState(self.dom._o, 0),
+                         self.dom.state())
+        self.assertRaises(TypeError, libvirtmod.virDomainGetName)
+        self.assertRaises(TypeError, libvirtmod.virDomainGetName,
+                          self.dom._o, 0)
+        self.assertRaises(TypeError, libvirtmod.virDomainGetState,
+                          self.dom._o)
+        self.assertRaises(TypeError, self.dom.state, "0")
+        self.assertRaises(TypeError, self.dom.setMetadata,
+                          libvirt.VIR_DOMAIN_METADATA_DESCRIPTION, 42,
+                          None, None)
+        self.assertRaises(ValueError, self.conn.lookupByName, "te\0st")
+        self.assertRaises(TypeError, self.conn.lookupByName, b"test")
+
+    def testNativeMethods(self):
+        libvirtmod = libvirt.libvirtmod
+        self.assertIsInstance(self.dom, libvirtmod._virDomainBase)
+        self.assertEqual(self.dom.name(), "test")
+        self.assertEqual(self.dom.UUIDString(),
+                         libvirtmod.virDomainGetUUIDString(self.dom._o))
+        self.assertEqual(self.dom.info(), libvirtmod.virDomainGetInfo(self.dom._o))
+        self.assertEqual(self.dom.state(flags=0), self.dom.state())
+        self.assertTrue(self.dom.isActive())
+
+        class MyDomain(libvirt.virDomain):
+            pass
+
+        dom = MyDomain(self.conn,
+                       _obj=libvirtmod.virDomainLookupByName(self.conn._o, "test"))
+        dom.tag = "mine"
+        self.assertEqual(dom.ID(), self.dom.ID())
+        libvirtmod.virDomainFree(dom._o)
+        dom._o = None
+        self.assertRaises(libvirt.libvirtError, dom.info)
+
+    def testBulk(self):
+        gone = self.conn.defineXML("<domain type='test'><name>bulk</name>"
+                                   "<memory>8192</memory><os><type>hvm</type></os>"
+                                   "</domain>")
+        gone.undefine()
+        doms = [self.dom, gone, self.dom]
+
+        for workers in (0, 2):
+            infos = libvirt.bulk.virDomainGetInfo(doms, workers)
+            self.assertEqual(infos[0], self.dom.info())
+            self.assertIsInstance(infos[1], libvirt.libvirtError)
+            self.assertEqual(infos[1].get_error_code(), libvirt.VIR_ERR_NO_DOMAIN)
+            self.assertEqual(infos[2], self.dom.info())
+
+        self.assertEqual(libvirt.bulk.virDomainGetState([self.dom], 0), [self.dom.state()])
+        self.assertEqual(libvirt.bulk.virDomainIsActive(iter([self.dom])), [1])
+        self.assertEqual(libvirt.bulk.virDomainGetXMLDesc([self.dom], 0, 8),
+                         [self.dom.XMLDesc()])
+        self.assertEqual(libvirt.bulk.virDomainGetMaxMemory([]), [])
+
+        # The wrappers of the generator are only referenced by the call
+        infos = libvirt.bulk.virDomainGetInfo(self.conn.lookupByName(name)
+                                              for name in ["test"] * 8)
+        self.assertEqual(infos, [self.dom.info()] * 8)
+
+        closed = self.conn.lookupByName("test")
+        libvirt.libvirtmod.virDomainFree(closed._o)
+        closed._o = None
+        infos = libvirt.bulk.virDomainGetInfo([self.dom, closed])
+        self.assertEqual(infos[0], self.dom.info())
+        self.assertIsInstance(infos[1], libvirt.libvirtError)
+        self.assertEqual(infos[1].get_error_code(), libvirt.VIR_ERR_INVALID_DOMAIN)
@@ -0,0 +1,138 @@
+import unittest
+
+from runscript import run_script
+
+
+class TestDefaultEventLoopThread(unittest.TestCase):
+    def testLifecycleEvents(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+
+            libvirt.startDefaultEventLoopThread()
+            # A second start is a no-op
+            libvirt.startDefaultEventLoopThread()
+
+            stopped = threading.Event()
+
+            def lifecycleCallback(conn, dom, event, detail, opaque):
+                if event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+                    opaque.set()
+
+            conn = libvirt.open("test:///default")
+            dom = conn.lookupByName("test")
+            cbid = conn.domainEventRegisterAny(
+                dom, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                lifecycleCallback, stopped)
+            dom.destroy()
+            assert stopped.wait(5), "no lifecycle event"
+            conn.domainEventDeregisterAny(cbid)
+            conn.close()
+
+            libvirt.stopDefaultEventLoopThread()
+            # A second stop is a no-op
+            libvirt.stopDefaultEventLoopThread()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testRestart(self):
+        ret, out = run_script("""
+            import libvirt
+
+            for i in range(3):
+                libvirt.startDefaultEventLoopThread()
+                libvirt.stopDefaultEventLoopThread()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testStartWhileStopping(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+
+            for i in range(20):
+                libvirt.startDefaultEventLoopThread()
+                stopper = threading.Thread(target=libvirt.stopDefaultEventLoopThread)
+                stopper.start()
+                try:
+                    libvirt.startDefaultEventLoopThread()
+                except RuntimeError:
+                    # The thread was being stopped
+                    pass
+                stopper.join()
+
+            # Whatever thread survived still runs the loop, and stops
+            libvirt.startDefaultEventLoopThread()
+            stopped = threading.Event()
+            conn = libvirt.open("test:///default")
+            cbid = conn.domainEventRegisterAny(
+                None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                lambda conn, dom, event, detail, opaque: stopped.set(), None)
+            conn.lookupByName("test").destroy()
+            assert stopped.wait(5), "no lifecycle event"
+            conn.domainEventDeregisterAny(cbid)
+            conn.close()
+            libvirt.stopDefaultEventLoopThread()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testStopAtExit(self):
+        ret, out = run_script("""
+            import libvirt
+
+            libvirt.startDefaultEventLoopThread()
+            conn = libvirt.open("test:///default")
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+class TestAsyncIOHybridImpl(unittest.TestCase):
+    def testLifecycleEvents(self):
+        ret, out = run_script("""
+            import asyncio
+            import threading
+            import libvirt
+            import libvirtaio
+
+            async def main():
+                impl = libvirtaio.virEventRegisterAsyncIOHybridImpl()
+                assert libvirtaio.getCurrentImpl() is impl
+
+                stopped = asyncio.Event()
+                threads = []
+
+                def lifecycleCallback(conn, dom, event, detail, opaque):
+                    threads.append(threading.current_thread())
+                    if event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+                        opaque.set()
+
+                conn = libvirt.open("test:///default")
+                dom = conn.lookupByName("test")
+                cbid = conn.domainEventRegisterAny(
+                    dom, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                    lifecycleCallback, stopped)
+                dom.destroy()
+                await asyncio.wait_for(stopped.wait(), 5)
+
+                # Callbacks must have been run by the asyncio loop
+                assert threads == [threading.main_thread()], threads
+
+                conn.domainEventDeregisterAny(cbid)
+                conn.close()
+                await impl.drain()
+                assert impl.is_idle()
+                impl.close()
+
+            asyncio.run(main())
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
@@ -0,0 +1,349 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import libvirt
+import libvirtaio
+import libvirtevents
+
+from runscript import run_script
+
+
+class FakeDomain:
+    def __init__(self, uuid):
+        self.uuid = uuid
+
+    def UUIDString(self):
+        return self.uuid
+
+
+class TestDispatchers(unittest.TestCase):
+    def setUp(self):
+        self.doms = [FakeDomain("uuid-%d" % i) for i in range(4)]
+        self.seen = {}
+
+    def callback(self, conn, dom, seq, opaque):
+        # Give other events a chance to overtake this one
+        time.sleep(0.001)
+        self.seen.setdefault(dom.UUIDString(), []).append(seq)
+
+    def assertOrdered(self, count):
+        self.assertEqual(sorted(self.seen), [dom.uuid for dom in self.doms])
+        for seqs in self.seen.values():
+            self.assertEqual(seqs, list(range(count)))
+
+    def testExecutorDispatcher(self):
+        dispatcher = libvirtevents.ExecutorDispatcher(max_workers=4)
+        for seq in range(20):
+            for dom in self.doms:
+                dispatcher(self.callback, (None, dom, seq, None))
+        dispatcher.shutdown()
+        self.assertOrdered(20)
+
+    def testAsyncIODispatcher(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.addCleanup(loop.close)
+
+        dispatcher = libvirtaio.virEventAsyncIODispatcher(loop=loop)
+
+        async def acallback(conn, dom, seq, opaque):
+            await asyncio.sleep(0.001)
+            self.seen.setdefault(dom.UUIDString(), []).append(seq)
+
+        def feed():
+            for seq in range(20):
+                for dom in self.doms:
+                    cb = acallback if seq % 2 else self.callback
+                    dispatcher(cb, (None, dom, seq, None))
+
+        # Dispatchers are called from libvirt's event loop thread
+        thread = threading.Thread(target=feed)
+        thread.start()
+        thread.join()
+        loop.run_until_complete(dispatcher.drain())
+        self.assertTrue(dispatcher.is_idle())
+        self.assertOrdered(20)
+
+
+class TestEventRouter(unittest.TestCase):
+    def testRouteByUUID(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+            import libvirtevents
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            other = conn.createXML(
+                "<domain type='test'><name>other</name><memory>8192</memory>"
+                "<os><type>hvm</type></os></domain>")
+            dom = conn.lookupByName("test")
+
+            router = libvirtevents.EventRouter(
+                conn, [libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE])
+            seen = []
+            done = threading.Event()
+
+            def lifecycle(conn, dom, event, detail, opaque):
+                seen.append((opaque, dom.name(), event))
+                if opaque == "all" and dom.name() == "other":
+                    done.set()
+
+            token = router.subscribe(
+                dom, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycle, "test")
+            router.subscribe(
+                other.UUIDString(), libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                lifecycle, "other")
+            router.subscribe(
+                None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycle, "all")
+            # Only one registration with the daemon per event ID
+            assert len(conn.domainEventCallbackID) == 1, conn.domainEventCallbackID
+
+            router.unsubscribe(token)
+            dom.suspend()
+            other.destroy()
+            assert done.wait(5), "no lifecycle event"
+
+            assert ("test", "test", libvirt.VIR_DOMAIN_EVENT_SUSPENDED) not in seen, seen
+            assert ("all", "test", libvirt.VIR_DOMAIN_EVENT_SUSPENDED) in seen, seen
+            assert ("other", "other", libvirt.VIR_DOMAIN_EVENT_STOPPED) in seen, seen
+            assert ("all", "other", libvirt.VIR_DOMAIN_EVENT_STOPPED) in seen, seen
+
+            try:
+                router.unsubscribe(token)
+                raise AssertionError("unsubscribed twice")
+            except KeyError:
+                pass
+
+            router.close()
+            assert not conn.domainEventCallbackID
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testDispatcher(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+            import libvirtevents
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            dispatcher = libvirtevents.ExecutorDispatcher(max_workers=2)
+            router = libvirtevents.EventRouter(conn, dispatcher=dispatcher)
+            done = threading.Event()
+            threads = []
+
+            def lifecycle(conn, dom, event, detail, opaque):
+                threads.append(threading.current_thread().name)
+                if event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+                    done.set()
+
+            router.subscribe(conn.lookupByName("test"),
+                             libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, lifecycle)
+            conn.lookupByName("test").destroy()
+            assert done.wait(5), "no lifecycle event"
+            assert all(t.startswith("libvirt-event") for t in threads), threads
+
+            router.close()
+            dispatcher.shutdown()
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+class TestWaitForState(unittest.TestCase):
+    def testWaitForState(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            dom = conn.lookupByName("test")
+
+            # Already there, answered by the initial check
+            assert dom.waitForState(libvirt.VIR_DOMAIN_RUNNING, 1) == libvirt.VIR_DOMAIN_RUNNING
+            # Never gets there
+            assert dom.waitForState(libvirt.VIR_DOMAIN_PAUSED, 0.1) is None
+
+            threading.Timer(0.2, dom.destroy).start()
+            state = dom.waitForState([libvirt.VIR_DOMAIN_SHUTOFF,
+                                      libvirt.VIR_DOMAIN_CRASHED], 5)
+            assert state == libvirt.VIR_DOMAIN_SHUTOFF, state
+
+            xml = ("<domain type='test'><name>%s</name><memory>8192</memory>"
+                   "<os><type>hvm</type></os></domain>")
+            doms = [conn.createXML(xml % name) for name in ("a", "b")]
+
+            def destroy():
+                for d in doms:
+                    d.destroy()
+
+            threading.Timer(0.2, destroy).start()
+            states = conn.waitForDomainsState(doms, libvirt.VIR_DOMAIN_SHUTOFF, 5)
+            assert states == [libvirt.VIR_DOMAIN_SHUTOFF] * 2, states
+
+            assert not conn.domainEventCallbackID, conn.domainEventCallbackID
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+class FakeBlockJobConn:
+    """
+    Stands in for virConnect, delivering the block job events of the
+    FakeBlockJobDomain objects straight away
+    """
+    waitForBlockJobs = libvirt.virConnect.waitForBlockJobs
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def domainEventRegisterAny(self, dom, eventID, cb, opaque, dispatcher=None):
+        cbid = len(self.callbacks) + 1
+        self.callbacks[cbid] = (cb, opaque)
+        return cbid
+
+    def domainEventDeregisterAny(self, cbid):
+        del self.callbacks[cbid]
+
+    def emit(self, dom, disk, status):
+        for cb, opaque in list(self.callbacks.values()):
+            cb(self, dom, disk, libvirt.VIR_DOMAIN_BLOCK_JOB_TYPE_COPY,
+               status, opaque)
+
+
+class FakeBlockJobDomain(FakeDomain):
+    waitForBlockJob = libvirt.virDomain.waitForBlockJob
+
+    def __init__(self, uuid, conn, cur=0, end=100):
+        super().__init__(uuid)
+        self._conn = conn
+        self.job = {"type": libvirt.VIR_DOMAIN_BLOCK_JOB_TYPE_COPY,
+                    "bandwidth": 0, "cur": cur, "end": end}
+        self.aborts = []
+
+    def blockJobInfo(self, disk, flags=0):
+        return self.job or {}
+
+    def end(self, status=None, delay=0.05):
+        """Make the job disappear after @delay, with an event reporting
+        @status unless it is None"""
+        def run():
+            self.job = None
+            if status is not None:
+                self._conn.emit(self, "vda", status)
+        threading.Timer(delay, run).start()
+
+    def blockJobAbort(self, disk, flags=0):
+        self.aborts.append(flags)
+        self.end(libvirt.VIR_DOMAIN_BLOCK_JOB_COMPLETED
+                 if flags & libvirt.VIR_DOMAIN_BLOCK_JOB_ABORT_PIVOT else
+                 libvirt.VIR_DOMAIN_BLOCK_JOB_CANCELED)
+
+
+class TestWaitForBlockJob(unittest.TestCase):
+    def setUp(self):
+        self.conn = FakeBlockJobConn()
+
+    def tearDown(self):
+        self.assertEqual(self.conn.callbacks, {})
+
+    def testEventCompletion(self):
+        doms = [FakeBlockJobDomain("uuid-%d" % i, self.conn) for i in range(2)]
+        doms[0].end(libvirt.VIR_DOMAIN_BLOCK_JOB_FAILED)
+        doms[1].end(libvirt.VIR_DOMAIN_BLOCK_JOB_COMPLETED, 0.1)
+        self.assertEqual(self.conn.waitForBlockJobs([(dom, "vda") for dom in doms], 5),
+                         [libvirt.VIR_DOMAIN_BLOCK_JOB_FAILED,
+                          libvirt.VIR_DOMAIN_BLOCK_JOB_COMPLETED])
+        self.assertEqual(self.conn.waitForBlockJobs([]), [])
+
+    def testReady(self):
+        dom = FakeBlockJobDomain("uuid", self.conn, 100)
+        self.assertEqual(dom.waitForBlockJob("vda", 5),
+                         libvirt.VIR_DOMAIN_BLOCK_JOB_READY)
+        self.assertEqual(dom.aborts, [])
+
+    def testPivot(self):
+        dom = FakeBlockJobDomain("uuid", self.conn, 100)
+        self.assertEqual(dom.waitForBlockJob("vda", 5, pivot=True),
+                         libvirt.VIR_DOMAIN_BLOCK_JOB_COMPLETED)
+        self.assertEqual(dom.aborts, [libvirt.VIR_DOMAIN_BLOCK_JOB_ABORT_PIVOT])
+
+    def testAbort(self):
+        dom = FakeBlockJobDomain("uuid", self.conn, 100)
+        self.assertEqual(dom.waitForBlockJob("vda", 5, abort=True),
+                         libvirt.VIR_DOMAIN_BLOCK_JOB_CANCELED)
+        self.assertEqual(dom.aborts, [0])
+
+    def testUnknown(self):
+        # Already gone when the wait starts
+        dom = FakeBlockJobDomain("uuid", self.conn)
+        dom.job = None
+        self.assertIsNone(dom.waitForBlockJob("vda", 5))
+
+        # Its event is lost, polling finds it gone
+        dom = FakeBlockJobDomain("uuid", self.conn)
+        dom.end()
+        polled = []
+        self.assertIsNone(dom.waitForBlockJob(
+            "vda", 5, interval=0.01,
+            progress=lambda dom, disk, info: polled.append(info)))
+        self.assertEqual(polled[-2:], [{}, {}])
+
+    def testTimeout(self):
+        dom = FakeBlockJobDomain("uuid", self.conn)
+        start = time.monotonic()
+        self.assertIsNone(dom.waitForBlockJob("vda", 0.1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+class TestDomainXMLCache(unittest.TestCase):
+    def testCache(self):
+        ret, out = run_script("""
+            import time
+            import libvirt
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            dom = conn.lookupByName("test")
+            assert conn.getDomainXMLCacheStats() is None
+
+            conn.enableDomainXMLCache(maxsize=1)
+            xml = dom.XMLDesc()
+            assert dom.XMLDesc() is xml
+            dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE)
+            stats = conn.getDomainXMLCacheStats()
+            assert stats["hits"] == 1 and stats["misses"] == 2, stats
+            assert stats["size"] == 1 and stats["evictions"] == 1, stats
+
+            dom.suspend()
+            deadline = time.monotonic() + 5
+            while conn.getDomainXMLCacheStats()["invalidations"] == 0:
+                assert time.monotonic() < deadline, "no invalidation"
+                time.sleep(0.01)
+            assert conn.getDomainXMLCacheStats()["size"] == 0
+            assert dom.XMLDesc() == xml
+
+            conn.disableDomainXMLCache()
+            assert conn.getDomainXMLCacheStats() is None
+            assert not conn.domainEventCallbackID, conn.domainEventCallbackID
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
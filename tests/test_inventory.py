@@ -0,0 +1,343 @@
+import tempfile
+import unittest
+
+import libvirt
+import libvirtinventory
+
+from runscript import run_script
+
+
+class TestDomainInventory(unittest.TestCase):
+    def testInventory(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+            import libvirtinventory
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            inventory = libvirtinventory.DomainInventory(conn)
+            test = conn.lookupByName("test")
+
+            entry = inventory.lookupByName("test")
+            assert entry is not None
+            assert entry.uuid == test.UUIDString()
+            assert entry.state == libvirt.VIR_DOMAIN_RUNNING, entry
+            assert entry.persistent
+            assert inventory.lookupByID(test.ID()) is entry
+            assert inventory.lookupByUUIDString(test.UUIDString()) is entry
+            assert len(inventory) == len(conn.listAllDomains())
+
+            changes = []
+            cond = threading.Condition()
+
+            def changed(inventory, old, new, opaque):
+                with cond:
+                    changes.append((opaque, old, new))
+                    cond.notify_all()
+
+            def wait(pred):
+                with cond:
+                    assert cond.wait_for(pred, 5), changes
+
+            inventory.subscribe(changed, "sub")
+
+            test.destroy()
+            wait(lambda: inventory.lookupByName("test").state == libvirt.VIR_DOMAIN_SHUTOFF)
+            assert inventory.lookupByID(entry.id) is None
+            assert inventory.lookupByName("test").id == -1
+
+            xml = ("<domain type='test'><name>transient</name><memory>8192</memory>"
+                   "<os><type>hvm</type></os></domain>")
+            dom = conn.createXML(xml)
+            wait(lambda: inventory.lookupByName("transient") is not None)
+            assert not inventory.lookupByName("transient").persistent
+            assert inventory.lookupByID(dom.ID()).name == "transient"
+
+            dom.destroy()
+            wait(lambda: inventory.lookupByName("transient") is None)
+            assert changes[-1][2] is None, changes[-1]
+
+            # A full resync finds nothing to change
+            del changes[:]
+            inventory.resync()
+            assert changes == [], changes
+
+            inventory.close()
+            assert not conn.domainEventCallbackID, conn.domainEventCallbackID
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testLifecycle(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+            import libvirtinventory
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            inventory = libvirtinventory.DomainInventory(conn)
+            cond = threading.Condition()
+
+            def changed(inventory, old, new, opaque):
+                with cond:
+                    cond.notify_all()
+
+            def wait(pred):
+                with cond:
+                    assert cond.wait_for(pred, 5), list(inventory)
+
+            inventory.subscribe(changed, None)
+
+            xml = ("<domain type='test'><name>defined</name><memory>8192</memory>"
+                   "<os><type>hvm</type></os></domain>")
+            dom = conn.defineXML(xml)
+            wait(lambda: inventory.lookupByName("defined") is not None)
+            entry = inventory.lookupByName("defined")
+            assert entry.uuid == dom.UUIDString(), entry
+            assert entry.state == libvirt.VIR_DOMAIN_SHUTOFF, entry
+            assert entry.id == -1, entry
+            assert entry.persistent, entry
+
+            dom.rename("renamed")
+            wait(lambda: inventory.lookupByName("renamed") is not None)
+            assert inventory.lookupByName("defined") is None
+            entry = inventory.lookupByName("renamed")
+            assert inventory.lookupByUUIDString(dom.UUIDString()) is entry
+            assert entry.state == libvirt.VIR_DOMAIN_SHUTOFF, entry
+            assert entry.persistent, entry
+
+            # A domain stopped after the inventory dropped it stays gone
+            inventory._remove(dom.UUIDString())
+            inventory._lifecycle(dom, libvirt.VIR_DOMAIN_EVENT_STOPPED,
+                                 libvirt.VIR_DOMAIN_EVENT_STOPPED_DESTROYED)
+            assert inventory.lookupByUUIDString(dom.UUIDString()) is None
+
+            inventory.close()
+            dom.undefine()
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+    def testForeignCloseCallback(self):
+        ret, out = run_script("""
+            import libvirt
+            import libvirtinventory
+            import libvirtmod
+
+            class Conn(libvirt.virConnect):
+                # The test driver accepts any number of close callbacks,
+                # unlike the remote one which only takes one at a time
+                owner = None
+
+                def registerCloseCallback(self, cb, opaque, dispatcher=None):
+                    if Conn.owner is not None:
+                        raise libvirt.libvirtError("close callback already registered")
+                    Conn.owner = cb
+                    return 0
+
+                def unregisterCloseCallback(self):
+                    if Conn.owner is None:
+                        raise libvirt.libvirtError("no close callback registered")
+                    Conn.owner = None
+
+            libvirt.startDefaultEventLoopThread()
+            conn = Conn(_obj=libvirtmod.virConnectOpen("test:///default"))
+
+            def closed(conn, reason, opaque):
+                pass
+
+            # The application's close callback is left alone
+            conn.registerCloseCallback(closed, None)
+            inventory = libvirtinventory.DomainInventory(conn)
+            inventory.close()
+            assert Conn.owner is closed, Conn.owner
+            conn.unregisterCloseCallback()
+
+            # Otherwise the inventory uses it, and gives it back
+            inventory = libvirtinventory.DomainInventory(conn)
+            assert Conn.owner == inventory._closed, Conn.owner
+            inventory.close()
+            assert Conn.owner is None, Conn.owner
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+class TestInventorySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.conn = libvirt.open("test:///default")
+        self.addCleanup(self.conn.close)
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def testSaveLoad(self):
+        uri = self.conn.getURI()
+        self.assertIsNone(libvirtinventory.loadSnapshot(uri, self.dir.name))
+
+        snapshot = libvirtinventory.InventorySnapshot.capture(self.conn)
+        path = snapshot.save(libvirtinventory.snapshotPath(uri, self.dir.name))
+
+        loaded = libvirtinventory.loadSnapshot(uri, self.dir.name)
+        self.addCleanup(loaded.close)
+        self.assertEqual(loaded.path, path)
+        self.assertEqual(loaded.uri, uri)
+        self.assertEqual(list(loaded), list(snapshot))
+
+        dom = self.conn.lookupByName("test")
+        entry = loaded.lookupByUUIDString(dom.UUIDString())
+        self.assertEqual(entry, loaded.lookupByName("test"))
+        self.assertEqual(entry.id, dom.ID())
+        self.assertEqual(entry.state, libvirt.VIR_DOMAIN_RUNNING)
+        self.assertTrue(entry.persistent)
+        self.assertEqual(entry.nrVirtCpu, dom.info()[3])
+        self.assertEqual(len(entry.xmlHash), 32)
+        self.assertEqual(loaded.changes(self.conn), ([], []))
+
+    def testRefresh(self):
+        snapshot = libvirtinventory.InventorySnapshot.capture(self.conn, xmlFlags=None)
+        self.assertIsNone(snapshot[0].xmlHash)
+
+        dom = self.conn.lookupByName("test")
+        dom.destroy()
+        other = self.conn.createXML(
+            "<domain type='test'><name>other</name><memory>8192</memory>"
+            "<os><type>hvm</type></os></domain>")
+
+        changed, gone = snapshot.changes(self.conn)
+        self.assertEqual(sorted(d.name() for d in changed), ["other", "test"])
+        self.assertEqual(gone, [])
+
+        refreshed = snapshot.refresh(self.conn)
+        self.assertEqual(refreshed.lookupByName("test").id, -1)
+        self.assertFalse(refreshed.lookupByName("other").persistent)
+        self.assertIsNotNone(refreshed.lookupByName("other").xmlHash)
+
+        other.destroy()
+        changed, gone = refreshed.changes(self.conn)
+        self.assertEqual((changed, gone), ([], [other.UUIDString()]))
+        self.assertIsNone(refreshed.refresh(self.conn).lookupByName("other"))
+
+    def testCorrupt(self):
+        path = libvirtinventory.snapshotPath("test:///default", self.dir.name)
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot")
+        self.assertIsNone(libvirtinventory.loadSnapshot("test:///default", self.dir.name))
+
+
+class TestNodeDeviceInventory(unittest.TestCase):
+    def testInventory(self):
+        ret, out = run_script("""
+            import threading
+            import libvirt
+            import libvirtinventory
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            devices = libvirtinventory.NodeDeviceInventory(conn)
+
+            listed = conn.listAllDevices(0)
+            assert len(devices) == len(listed), (devices, listed)
+            for dev in listed:
+                entry = devices.lookupByName(dev.name())
+                assert entry.parent == dev.parent(), entry
+                assert entry.caps[0] == dev.listCaps()[0], entry
+                assert entry in devices.listByCapability(entry.caps[0])
+                if entry.parent is not None:
+                    assert entry in devices.listChildren(entry.parent)
+            assert devices.lookupByName("computer").caps == ("system",)
+
+            changes = []
+            cond = threading.Condition()
+
+            def changed(inventory, old, new, opaque):
+                with cond:
+                    changes.append((old, new))
+                    cond.notify_all()
+
+            def wait(pred):
+                with cond:
+                    assert cond.wait_for(pred, 5), changes
+
+            devices.subscribe(changed)
+            hosts = len(devices.listByCapability("scsi_host"))
+
+            vhba = conn.nodeDeviceCreateXML(
+                "<device><parent>scsi_host1</parent>"
+                "<capability type='scsi_host'><capability type='fc_host'>"
+                "<wwnn>2000000012341234</wwnn><wwpn>1000000012341234</wwpn>"
+                "</capability></capability></device>")
+            wait(lambda: devices.lookupByName(vhba.name()) is not None)
+            entry = devices.lookupByName(vhba.name())
+            assert entry.parent == "scsi_host1", entry
+            assert len(devices.listByCapability("scsi_host")) == hosts + 1
+
+            vhba.destroy()
+            wait(lambda: devices.lookupByName(entry.name) is None)
+            assert changes[-1] == (entry, None), changes
+            assert len(devices.listByCapability("scsi_host")) == hosts
+
+            devices.close()
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+class TestStorageVolumeInventory(unittest.TestCase):
+    def testInventory(self):
+        ret, out = run_script("""
+            import time
+            import libvirt
+            import libvirtinventory
+
+            libvirt.startDefaultEventLoopThread()
+
+            conn = libvirt.open("test:///default")
+            pool = conn.storagePoolLookupByName("default-pool")
+            volumes = libvirtinventory.StorageVolumeInventory(conn, minInterval=60)
+            assert len(volumes) == len(pool.listAllVolumes()), volumes
+
+            xml = ("<volume><name>%s</name><capacity>1048576</capacity>"
+                   "<allocation>0</allocation></volume>")
+            vol = pool.createXML(xml % "vol1")
+            # Creating a volume does not emit any event
+            assert volumes.lookupByName(pool, "vol1") is None
+
+            entries = volumes.refresh(pool)
+            assert [e.name for e in entries] == ["vol1"], entries
+            entry = volumes.lookupByPath(vol.path())
+            assert entry == volumes.lookupByKey(vol.key()) == entries[0]
+            assert entry.capacity == 1048576, entry
+            assert entry.pool == pool.UUIDString()
+
+            pool.createXML(xml % "vol2")
+            # Rate limited, answered from the index
+            assert len(volumes.refresh(pool)) == 1
+            assert len(volumes.refresh(pool, force=True)) == 2
+            assert len(volumes.listVolumes(pool.UUIDString())) == 2
+
+            pool.destroy()
+            deadline = time.monotonic() + 5
+            while volumes.listVolumes(pool):
+                assert time.monotonic() < deadline, volumes
+                time.sleep(0.01)
+            assert volumes.lookupByPath(vol.path()) is None
+
+            volumes.close()
+            conn.close()
+            print("OK")
+        """)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
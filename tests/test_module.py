@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import libvirt
+import libvirtmod
+
+
+# These hold for both the default and the lazy module layouts
+class TestModuleLayout(unittest.TestCase):
+    def testConstants(self):
+        self.assertEqual(libvirt.VIR_DOMAIN_RUNNING, 1)
+        self.assertEqual(libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, 0)
+        self.assertEqual(libvirt.VIR_DOMAIN_SCHEDULER_CPU_SHARES, "cpu_shares")
+        self.assertIn("VIR_DOMAIN_RUNNING", dir(libvirt))
+        self.assertFalse(hasattr(libvirt, "VIR_NO_SUCH_CONSTANT"))
+
+    def testClasses(self):
+        for name in ("virNetworkPort", "virNWFilterBinding", "virDomainCheckpoint"):
+            self.assertIn(name, dir(libvirt))
+            klass = getattr(libvirt, name)
+            self.assertIs(klass, getattr(libvirt, name))
+            self.assertEqual(klass.__module__, "libvirt")
+            self.assertEqual(klass.__name__, name)
+
+    def testStarImport(self):
+        out = subprocess.check_output(
+            [sys.executable, "-c",
+             "from libvirt import *\n"
+             "print(VIR_DOMAIN_RUNNING, virDomainCheckpoint.__name__, open.__name__)"],
+            universal_newlines=True)
+        self.assertEqual(out.split(), ["1", "virDomainCheckpoint", "open"])
+
+    def testDocstrings(self):
+        libvirt.loadDocstrings()
+        self.assertTrue(libvirt.virDomain.name.__doc__)
+        self.assertTrue(libvirt.virNetworkPort.XMLDesc.__doc__)
+
+
+# Prints what the libvirt module found first on the path offers
+LAYOUT_SCRIPT = """
+import json
+import libvirt
+
+names = [name for name in dir(libvirt) if not name.startswith("_")]
+missing = [name for name in names if not hasattr(libvirt, name)]
+before = libvirt.virDomain.name.__doc__
+split = libvirt.loadDocstrings()
+print(json.dumps({
+    "file": libvirt.__file__,
+    "names": names,
+    "missing": missing,
+    "docBefore": bool(before),
+    "split": split,
+    "doc": bool(libvirt.virDomain.name.__doc__ and
+                libvirt.virNetworkPort.XMLDesc.__doc__),
+}))
+"""
+
+
+def apiXMLFile():
+    try:
+        path = subprocess.check_output(
+            ["pkg-config", "--variable", "libvirt_api", "libvirt"],
+            universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return path if os.path.exists(path) else None
+
+
+# The layouts setup.py builds with LIBVIRT_PYTHON_LAZY=1 and
+# LIBVIRT_PYTHON_SPLIT_DOCSTRINGS=1, generated aside the one in use
+class TestGeneratedLayouts(unittest.TestCase):
+    def setUp(self):
+        self.apiXML = apiXMLFile()
+        if self.apiXML is None:
+            self.skipTest("the libvirt API XML file is not available")
+        self.srcDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def layout(self, options):
+        buildDir = os.path.join(self.tmp.name, options.replace(",", "-"))
+        subprocess.check_call(
+            [sys.executable, os.path.join(self.srcDir, "generator.py"),
+             "libvirt", self.apiXML, options, self.srcDir, buildDir],
+            stdout=subprocess.DEVNULL)
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [buildDir, os.path.dirname(libvirtmod.__file__)] +
+            [p for p in [os.environ.get("PYTHONPATH")] if p])
+        out = subprocess.check_output([sys.executable, "-c", LAYOUT_SCRIPT],
+                                      env=env, cwd=buildDir,
+                                      universal_newlines=True)
+        result = json.loads(out)
+        self.assertEqual(os.path.dirname(result["file"]), buildDir)
+        self.assertEqual(result["missing"], [])
+        self.assertTrue(result["doc"])
+        return result
+
+    def testLayouts(self):
+        default = self.layout("py")
+        self.assertTrue(default["docBefore"])
+        self.assertFalse(default["split"])
+
+        for options in ("py,lazy", "py,splitdoc", "py,lazy,splitdoc"):
+            with self.subTest(options=options):
+                result = self.layout(options)
+                self.assertEqual(sorted(result["names"]), sorted(default["names"]))
+                splitdoc = "splitdoc" in options
+                self.assertEqual(result["split"], splitdoc)
+                self.assertEqual(result["docBefore"], not splitdoc)
@@ -1,3 +1,4 @@
+import threading
 import unittest
 import libvirt
 
@@ -22,3 +23,68 @@ class TestLibvirtStorage(unittest.TestCase):
 </volume>'''
 
         vol = self.pool.createXML(volxml)
+
+    def testListAllVolumesInfo(self):
+        volxml = '''<volume type="file">
+  <name>%s</name>
+  <allocation unit="M">10</allocation>
+  <capacity unit="M">1000</capacity>
+</volume>'''
+
+        names = ["vol%d.img" % i for i in range(8)]
+        for name in names:
+            self.pool.createXML(volxml % name)
+
+        expected = sorted((vol.name(), vol.key(), vol.path()) + tuple(vol.info())
+                          for vol in self.pool.listAllVolumes())
+        self.assertEqual(sorted(self.pool.listAllVolumesInfo()), expected)
+        self.assertEqual(sorted(self.pool.listAllVolumesInfo(0, 3)), expected)
+        self.assertEqual(sorted(info[0] for info in expected), names)
+
+        for vol in self.pool.listAllVolumes():
+            vol.delete()
+        self.assertEqual(self.pool.listAllVolumesInfo(0, 3), [])
+
+    def testListAllVolumesInfoError(self):
+        volxml = '''<volume type="file">
+  <name>%s</name>
+  <allocation unit="M">10</allocation>
+  <capacity unit="M">1000</capacity>
+</volume>'''
+
+        pool = self.conn.storagePoolDefineXML(
+            "<pool type='dir'><name>stopping</name>"
+            "<target><path>/stopping</path></target></pool>")
+        pool.create()
+        self.addCleanup(pool.undefine)
+        for i in range(64):
+            pool.createXML(volxml % ("vol%d.img" % i))
+
+        # Stopping the pool while its volumes are looked up is not taken
+        # for their deletion, which would leave them out
+        done = threading.Event()
+
+        def toggle():
+            while not done.is_set():
+                pool.destroy()
+                pool.create()
+
+        thread = threading.Thread(target=toggle)
+        thread.start()
+        errors = []
+        try:
+            for _ in range(200):
+                try:
+                    self.assertEqual(len(pool.listAllVolumesInfo(0, 4)), 64)
+                except libvirt.libvirtError as e:
+                    errors.append(e)
+        finally:
+            done.set()
+            thread.join()
+            if pool.isActive():
+                pool.destroy()
+
+        if not errors:
+            self.skipTest("the pool was never stopped during a listing")
+        for e in errors:
+            self.assertNotEqual(e.get_error_code(), libvirt.VIR_ERR_NO_STORAGE_VOL)
@@ -0,0 +1,112 @@
+import unittest
+
+from runscript import run_script
+
+
+class TestThreads(unittest.TestCase):
+    # Most interesting on the free threaded builds of python, where
+    # nothing but the locks of the bindings serialize the threads
+    def testConcurrentCalls(self):
+        ret, out = run_script("""
+            import threading
+            import time
+            import libvirt
+
+            THREADS = 4
+            ITERATIONS = 50
+
+            libvirt.startDefaultEventLoopThread()
+            conn = libvirt.open("test:///default")
+            libvirt.enableCallStats()
+            libvirt.enableGILStats()
+
+            events = {"count": 0}
+            eventsLock = threading.Lock()
+
+            def lifecycleCallback(conn, dom, event, detail, opaque):
+                if (dom.name().startswith("stress") and
+                        event in (libvirt.VIR_DOMAIN_EVENT_DEFINED,
+                                  libvirt.VIR_DOMAIN_EVENT_UNDEFINED)):
+                    with eventsLock:
+                        events["count"] += 1
+
+            cbid = conn.domainEventRegisterAny(
+                None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE,
+                lifecycleCallback, None)
+
+            failures = []
+
+            def worker(func):
+                def run(n):
+                    try:
+                        for i in range(ITERATIONS):
+                            func(n, i)
+                    except Exception as ex:
+                        failures.append(repr(ex))
+                return run
+
+            @worker
+            def lookups(n, i):
+                dom = conn.lookupByName("test")
+                assert conn.lookupByUUIDString(dom.UUIDString()).name() == "test"
+                doms = conn.lookupByNames(["test", "missing"])
+                assert doms[0].name() == "test" and doms[1] is None
+
+            @worker
+            def stats(n, i):
+                assert len(conn.getAllDomainStats()) >= 1
+                doms = conn.listAllDomains()
+                assert len(libvirt.bulk.virDomainGetInfo(doms)) == len(doms)
+                libvirt.getCallStats()
+                libvirt.getGILStats()
+
+            @worker
+            def defines(n, i):
+                xml = ("<domain type='test'><name>stress%d_%d</name>"
+                       "<memory>8192</memory><os><type>hvm</type></os>"
+                       "</domain>" % (n, i))
+                conn.defineXML(xml).undefine()
+
+            @worker
+            def errors(n, i):
+                seen = []
+                libvirt.registerErrorHandler(lambda ctx, err: seen.append(err), None)
+                try:
+                    conn.lookupByName("missing%d" % n)
+                    raise AssertionError("unexpected lookup success")
+                except libvirt.libvirtError:
+                    pass
+                libvirt.registerErrorHandler(None, None)
+
+            threads = [threading.Thread(target=func, args=(n,))
+                       for func in (lookups, stats, defines, errors)
+                       for n in range(THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert not failures, failures
+
+            expected = 2 * THREADS * ITERATIONS
+            deadline = time.monotonic() + 30
+            while events["count"] < expected and time.monotonic() < deadline:
+                time.sleep(0.1)
+            assert events["count"] == expected, events["count"]
+
+            calls = libvirt.getCallStats()["calls"]
+            lookup = calls["virDomainLookupByName"]
+            assert lookup["count"] == 2 * THREADS * ITERATIONS, lookup
+            assert lookup["errors"] == THREADS * ITERATIONS, lookup
+            assert sum(lookup["histogram"]) == lookup["count"], lookup
+
+            conn.domainEventDeregisterAny(cbid)
+            conn.close()
+            libvirt.stopDefaultEventLoopThread()
+            print("OK")
+        """, timeout=120)
+        self.assertEqual(ret, 0, out)
+        self.assertIn("OK", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
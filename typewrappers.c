@@ -15,6 +15,7 @@
 #include <Python.h>
 #include <stdio.h>
 #include <string.h>
+#include <time.h>
 #include "typewrappers.h"
 #include "libvirt-utils.h"
 
@@ -323,6 +324,95 @@ libvirt_charPtrSizeUnwrap(PyObject *obj,
     return PyBytes_AsStringAndSize(obj, str, size);
 }
 
+#ifdef LIBVIRT_FASTCALL
+/* Same semantics as the "I" format unit: no overflow checking */
+int
+libvirt_uintMaskUnwrap(PyObject *obj,
+                       unsigned int *val)
+{
+    unsigned long long_val;
+
+    if (!obj) {
+        PyErr_SetString(PyExc_TypeError, "unexpected type");
+        return -1;
+    }
+
+    long_val = PyLong_AsUnsignedLongMask(obj);
+    if ((long_val == (unsigned long)-1) && PyErr_Occurred())
+        return -1;
+
+    *val = (unsigned int) long_val;
+    return 0;
+}
+
+int
+libvirt_ssizeUnwrap(PyObject *obj,
+                    Py_ssize_t *val)
+{
+    Py_ssize_t ssize_val;
+
+    if (!obj) {
+        PyErr_SetString(PyExc_TypeError, "unexpected type");
+        return -1;
+    }
+
+    ssize_val = PyLong_AsSsize_t(obj);
+    if ((ssize_val == -1) && PyErr_Occurred())
+        return -1;
+
+    *val = ssize_val;
+    return 0;
+}
+
+/* Same semantics as the "z" format unit: None maps to NULL and the
+ * returned buffer is owned by @obj, so it must not be freed */
+int
+libvirt_constcharPtrUnwrap(PyObject *obj,
+                           const char **str)
+{
+    Py_ssize_t size;
+
+    *str = NULL;
+    if (!obj) {
+        PyErr_SetString(PyExc_TypeError, "unexpected type");
+        return -1;
+    }
+
+    if (obj == Py_None)
+        return 0;
+
+    if (!PyUnicode_Check(obj)) {
+        PyErr_SetString(PyExc_TypeError, "expected str or None");
+        return -1;
+    }
+
+    if (!(*str = PyUnicode_AsUTF8AndSize(obj, &size)))
+        return -1;
+
+    if (strlen(*str) != (size_t) size) {
+        *str = NULL;
+        PyErr_SetString(PyExc_ValueError, "embedded null character");
+        return -1;
+    }
+
+    return 0;
+}
+
+int
+libvirt_checkArgs(const char *name,
+                  Py_ssize_t nargs,
+                  Py_ssize_t expected)
+{
+    if (nargs == expected)
+        return 0;
+
+    PyErr_Format(PyExc_TypeError,
+                 "%s() takes exactly %zd argument%s (%zd given)",
+                 name, expected, expected == 1 ? "" : "s", nargs);
+    return -1;
+}
+#endif /* LIBVIRT_FASTCALL */
+
 PyObject *
 libvirt_virDomainPtrWrap(virDomainPtr node)
 {
@@ -505,6 +595,35 @@ libvirt_virDomainSnapshotPtrWrap(virDomainSnapshotPtr node)
     return ret;
 }
 
+PyObject *
+libvirt_virErrorPtrWrap(virErrorPtr err)
+{
+    PyObject *info;
+
+    if (err == NULL) {
+        return VIR_PY_NONE;
+    }
+
+    if ((info = PyTuple_New(9)) == NULL)
+        return NULL;
+
+    VIR_PY_TUPLE_SET_GOTO(info, 0, libvirt_intWrap(err->code), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 1, libvirt_intWrap(err->domain), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 2, libvirt_constcharPtrWrap(err->message), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 3, libvirt_intWrap(err->level), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 4, libvirt_constcharPtrWrap(err->str1), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 5, libvirt_constcharPtrWrap(err->str2), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 6, libvirt_constcharPtrWrap(err->str3), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 7, libvirt_intWrap(err->int1), error);
+    VIR_PY_TUPLE_SET_GOTO(info, 8, libvirt_intWrap(err->int2), error);
+
+    return info;
+
+ error:
+    Py_XDECREF(info);
+    return NULL;
+}
+
 PyObject *
 libvirt_virEventHandleCallbackWrap(virEventHandleCallback node)
 {
@@ -558,3 +677,317 @@ libvirt_virVoidPtrWrap(void* node)
     ret = libvirt_buildPyObject(node, "void*", NULL);
     return ret;
 }
+
+
+/* The call sites accounted so far, see LIBVIRT_BEGIN_ALLOW_THREADS, and
+ * the callback ones, see LIBVIRT_ENSURE_THREAD_STATE. The lists and the
+ * figures are only accessed with the GIL held, and virPyStatsLock. */
+bool virPyCallStatsEnabled;
+bool virPyGILStatsEnabled;
+static virPyCallSite *virPyCallSites;
+static virPyCallbackSite *virPyCallbackSites;
+VIR_PY_MUTEX(virPyStatsLock);
+
+unsigned long long
+virPyStatsNow(void)
+{
+    struct timespec ts;
+
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+static void
+virPyTimeStatsAdd(virPyTimeStats *stats,
+                  unsigned long long elapsed)
+{
+    unsigned long long bound = 1000;
+    size_t i;
+
+    for (i = 0; i < VIR_PY_CALL_STATS_BUCKETS && elapsed > bound; i++)
+        bound <<= 1;
+
+    stats->total += elapsed;
+    if (elapsed > stats->max)
+        stats->max = elapsed;
+    stats->histogram[i]++;
+}
+
+/* Sets the items @index to @index + 2 of @tuple to the total, maximum
+ * and histogram of @stats */
+static int
+virPyTimeStatsWrap(PyObject *tuple,
+                   ssize_t index,
+                   virPyTimeStats *stats)
+{
+    PyObject *py_histogram;
+    size_t i;
+
+    VIR_PY_TUPLE_SET_GOTO(tuple, index, libvirt_ulonglongWrap(stats->total), error);
+    VIR_PY_TUPLE_SET_GOTO(tuple, index + 1, libvirt_ulonglongWrap(stats->max), error);
+    VIR_PY_TUPLE_SET_GOTO(tuple, index + 2,
+                          py_histogram = PyList_New(VIR_PY_CALL_STATS_BUCKETS + 1),
+                          error);
+    for (i = 0; i <= VIR_PY_CALL_STATS_BUCKETS; i++)
+        VIR_PY_LIST_SET_GOTO(py_histogram, i,
+                             libvirt_ulonglongWrap(stats->histogram[i]),
+                             error);
+
+    return 0;
+
+ error:
+    return -1;
+}
+
+/* virPyCallStatsStart
+ * @site: the call site, or NULL to use the one of @name
+ * @name: the name to account the call to if @site is NULL
+ * @start: filled with the time the call starts at
+ *
+ * Registers @site if needed. Must be called with the GIL held.
+ *
+ * Returns the call site to pass to virPyCallStatsStop(), or NULL if it
+ * could not be allocated, in which case the call is not accounted.
+ */
+virPyCallSite *
+virPyCallStatsStart(virPyCallSite *site,
+                    const char *name,
+                    unsigned long long *start)
+{
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+
+    if (!site) {
+        for (site = virPyCallSites; site; site = site->next) {
+            if (site->name == name || STREQ(site->name, name))
+                break;
+        }
+        if (!site && VIR_ALLOC(site) == 0)
+            site->name = name;
+    }
+
+    if (site && !site->registered) {
+        site->next = virPyCallSites;
+        site->registered = true;
+        virPyCallSites = site;
+    }
+
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+
+    *start = virPyStatsNow();
+    return site;
+}
+
+/* virPyCallStatsStop
+ * @site: the call site returned by virPyCallStatsStart()
+ * @start: the time the call started at
+ * @save: the thread state to restore
+ *
+ * Accounts the call which just ended on @site, and takes the GIL back
+ * by restoring @save. Must be called without the GIL, from the thread
+ * which made the call, as whether it failed is told by its last error.
+ */
+void
+virPyCallStatsStop(virPyCallSite *site,
+                   unsigned long long start,
+                   PyThreadState *save)
+{
+    unsigned long long elapsed = virPyStatsNow() - start;
+    bool failed = virGetLastError() != NULL;
+
+    if (save)
+        PyEval_RestoreThread(save);
+
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+    site->calls++;
+    if (failed)
+        site->errors++;
+    virPyTimeStatsAdd(&site->time, elapsed);
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+}
+
+/* virPyCallStatsGet
+ *
+ * Returns a python list of (name, calls, errors, total, max, histogram)
+ * tuples, one for every call site which was called, where @name is the
+ * name of the C function it is in, or NULL with an error set.
+ */
+PyObject *
+virPyCallStatsGet(void)
+{
+    PyObject *py_retval = NULL;
+    PyObject *py_site = NULL;
+    virPyCallSite *sites = NULL;
+    virPyCallSite *site;
+    size_t nsites = 0;
+    size_t i;
+
+    /* The figures are copied so that no python object gets allocated,
+     * possibly running code making calls, with the lock held */
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+    for (site = virPyCallSites; site; site = site->next)
+        nsites++;
+    if (VIR_ALLOC_N(sites, nsites + 1) == 0) {
+        for (i = 0, site = virPyCallSites; site; site = site->next)
+            sites[i++] = *site;
+    }
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+
+    if (!sites)
+        return PyErr_NoMemory();
+
+    if (!(py_retval = PyList_New(0)))
+        goto cleanup;
+
+    for (i = 0; i < nsites; i++) {
+        site = &sites[i];
+        if (!site->calls)
+            continue;
+
+        if (!(py_site = PyTuple_New(6)))
+            goto error;
+        VIR_PY_TUPLE_SET_GOTO(py_site, 0, libvirt_constcharPtrWrap(site->name), error);
+        VIR_PY_TUPLE_SET_GOTO(py_site, 1, libvirt_ulonglongWrap(site->calls), error);
+        VIR_PY_TUPLE_SET_GOTO(py_site, 2, libvirt_ulonglongWrap(site->errors), error);
+        if (virPyTimeStatsWrap(py_site, 3, &site->time) < 0)
+            goto error;
+
+        if (PyList_Append(py_retval, py_site) < 0)
+            goto error;
+        Py_CLEAR(py_site);
+    }
+
+ cleanup:
+    VIR_FREE(sites);
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_site);
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
+
+/* virPyCallStatsReset
+ *
+ * Clears the figures of all the call sites.
+ */
+void
+virPyCallStatsReset(void)
+{
+    virPyCallSite *site;
+
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+    for (site = virPyCallSites; site; site = site->next) {
+        site->calls = 0;
+        site->errors = 0;
+        memset(&site->time, 0, sizeof(site->time));
+    }
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+}
+
+/* virPyGILStatsRecord
+ * @site: the callback site
+ * @start: the time the callback started waiting for the GIL at
+ * @acquired: the time it got the GIL at
+ *
+ * Accounts the callback which is about to release the GIL on @site,
+ * registering it if needed. Must be called with the GIL held.
+ */
+void
+virPyGILStatsRecord(virPyCallbackSite *site,
+                    unsigned long long start,
+                    unsigned long long acquired)
+{
+    unsigned long long now = virPyStatsNow();
+
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+
+    if (!site->registered) {
+        site->next = virPyCallbackSites;
+        site->registered = true;
+        virPyCallbackSites = site;
+    }
+
+    site->calls++;
+    virPyTimeStatsAdd(&site->wait, acquired - start);
+    virPyTimeStatsAdd(&site->hold, now - acquired);
+
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+}
+
+/* virPyGILStatsGet
+ *
+ * Returns a python list of (name, calls, wait total, wait max, wait
+ * histogram, hold total, hold max, hold histogram) tuples, one for
+ * every callback site which was run, where @name is the name of the C
+ * function it is in, or NULL with an error set.
+ */
+PyObject *
+virPyGILStatsGet(void)
+{
+    PyObject *py_retval = NULL;
+    PyObject *py_site = NULL;
+    virPyCallbackSite *sites = NULL;
+    virPyCallbackSite *site;
+    size_t nsites = 0;
+    size_t i;
+
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+    for (site = virPyCallbackSites; site; site = site->next)
+        nsites++;
+    if (VIR_ALLOC_N(sites, nsites + 1) == 0) {
+        for (i = 0, site = virPyCallbackSites; site; site = site->next)
+            sites[i++] = *site;
+    }
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+
+    if (!sites)
+        return PyErr_NoMemory();
+
+    if (!(py_retval = PyList_New(0)))
+        goto cleanup;
+
+    for (i = 0; i < nsites; i++) {
+        site = &sites[i];
+        if (!site->calls)
+            continue;
+
+        if (!(py_site = PyTuple_New(8)))
+            goto error;
+        VIR_PY_TUPLE_SET_GOTO(py_site, 0, libvirt_constcharPtrWrap(site->name), error);
+        VIR_PY_TUPLE_SET_GOTO(py_site, 1, libvirt_ulonglongWrap(site->calls), error);
+        if (virPyTimeStatsWrap(py_site, 2, &site->wait) < 0 ||
+            virPyTimeStatsWrap(py_site, 5, &site->hold) < 0)
+            goto error;
+
+        if (PyList_Append(py_retval, py_site) < 0)
+            goto error;
+        Py_CLEAR(py_site);
+    }
+
+ cleanup:
+    VIR_FREE(sites);
+    return py_retval;
+
+ error:
+    Py_XDECREF(py_site);
+    Py_CLEAR(py_retval);
+    goto cleanup;
+}
+
+/* virPyGILStatsReset
+ *
+ * Clears the figures of all the callback sites.
+ */
+void
+virPyGILStatsReset(void)
+{
+    virPyCallbackSite *site;
+
+    VIR_PY_MUTEX_LOCK(virPyStatsLock);
+    for (site = virPyCallbackSites; site; site = site->next) {
+        site->calls = 0;
+        memset(&site->wait, 0, sizeof(site->wait));
+        memset(&site->hold, 0, sizeof(site->hold));
+    }
+    VIR_PY_MUTEX_UNLOCK(virPyStatsLock);
+}
@@ -32,6 +32,25 @@ typedef struct _virNetworkPort *virNetworkPortPtr;
 typedef struct _virDomainCheckpoint *virDomainCheckpointPtr;
 #endif
 
+/* METH_FASTCALL hands the positional arguments over as a C array instead
+ * of a tuple, which saves building and parsing the tuple on every call.
+ * It is only part of the stable ABI since 3.10, so older limited API
+ * builds keep using METH_VARARGS. */
+#if PY_VERSION_HEX >= 0x03070000 && \
+    (!defined(Py_LIMITED_API) || Py_LIMITED_API+0 >= 0x030a0000)
+# define LIBVIRT_FASTCALL
+# define LIBVIRT_METH_ARGS PyObject *const *args, Py_ssize_t nargs
+# define LIBVIRT_METH_NOARGS \
+    PyObject *const *args ATTRIBUTE_UNUSED, Py_ssize_t nargs ATTRIBUTE_UNUSED
+# define LIBVIRT_METH_FLAGS METH_FASTCALL
+#else
+# define LIBVIRT_METH_ARGS PyObject *args
+# define LIBVIRT_METH_NOARGS PyObject *args ATTRIBUTE_UNUSED
+# define LIBVIRT_METH_FLAGS METH_VARARGS
+#endif
+
+#define LIBVIRT_METH(func) ((PyCFunction)(void (*)(void))(func))
+
 #define PyvirConnect_Get(v) (((v) == Py_None) ? NULL : \
         (((PyvirConnect_Object *)(v))->obj))
 
@@ -208,6 +227,12 @@ int libvirt_doubleUnwrap(PyObject *obj, double *val);
 int libvirt_boolUnwrap(PyObject *obj, bool *val);
 int libvirt_charPtrUnwrap(PyObject *obj, char **str);
 int libvirt_charPtrSizeUnwrap(PyObject *obj, char **str, Py_ssize_t *size);
+#ifdef LIBVIRT_FASTCALL
+int libvirt_uintMaskUnwrap(PyObject *obj, unsigned int *val);
+int libvirt_ssizeUnwrap(PyObject *obj, Py_ssize_t *val);
+int libvirt_constcharPtrUnwrap(PyObject *obj, const char **str);
+int libvirt_checkArgs(const char *name, Py_ssize_t nargs, Py_ssize_t expected);
+#endif
 PyObject * libvirt_virConnectPtrWrap(virConnectPtr node);
 PyObject * libvirt_virDomainPtrWrap(virDomainPtr node);
 PyObject * libvirt_virNetworkPtrWrap(virNetworkPtr node);
@@ -226,6 +251,7 @@ PyObject * libvirt_virNWFilterBindingPtrWrap(virNWFilterBindingPtr node);
 PyObject * libvirt_virStreamPtrWrap(virStreamPtr node);
 PyObject * libvirt_virDomainCheckpointPtrWrap(virDomainCheckpointPtr node);
 PyObject * libvirt_virDomainSnapshotPtrWrap(virDomainSnapshotPtr node);
+PyObject * libvirt_virErrorPtrWrap(virErrorPtr err);
 
 
 /* Provide simple macro statement wrappers (adapted from GLib, in turn from Perl):
@@ -255,46 +281,141 @@ PyObject * libvirt_virDomainSnapshotPtrWrap(virDomainSnapshotPtr node);
 # endif /* !(__GNUC__ && !__STRICT_ANSI__ && !__cplusplus) */
 #endif
 
+/*
+ * Every GIL released section is a call site, whose calls are accounted
+ * to the name of the function it is in while the call statistics are
+ * enabled, see libvirt.getCallStats(). When they are not, all it costs
+ * is a test of virPyCallStatsEnabled on entry and of _callSite on exit.
+ *
+ * Likewise, every section running python code from a libvirt thread is
+ * a callback site, which accounts the time spent waiting for the GIL
+ * and holding it while the GIL statistics are enabled, see
+ * libvirt.getGILStats().
+ *
+ * histogram[i] counts the times which took up to 2^i microseconds, the
+ * last entry the ones which took longer.
+ */
+#define VIR_PY_CALL_STATS_BUCKETS 24
+
+typedef struct _virPyTimeStats virPyTimeStats;
+struct _virPyTimeStats {
+    unsigned long long total;    /* nanoseconds */
+    unsigned long long max;      /* nanoseconds */
+    unsigned long long histogram[VIR_PY_CALL_STATS_BUCKETS + 1];
+};
+
+typedef struct _virPyCallSite virPyCallSite;
+struct _virPyCallSite {
+    const char *name;
+    virPyCallSite *next;
+    bool registered;
+    unsigned long long calls;
+    unsigned long long errors;
+    virPyTimeStats time;
+};
+
+typedef struct _virPyCallbackSite virPyCallbackSite;
+struct _virPyCallbackSite {
+    const char *name;
+    virPyCallbackSite *next;
+    bool registered;
+    unsigned long long calls;
+    virPyTimeStats wait;
+    virPyTimeStats hold;
+};
+
+extern bool virPyCallStatsEnabled;
+extern bool virPyGILStatsEnabled;
+
+unsigned long long virPyStatsNow(void);
+virPyCallSite *virPyCallStatsStart(virPyCallSite *site,
+                                   const char *name,
+                                   unsigned long long *start);
+void virPyCallStatsStop(virPyCallSite *site,
+                        unsigned long long start,
+                        PyThreadState *save);
+PyObject *virPyCallStatsGet(void);
+void virPyCallStatsReset(void);
+void virPyGILStatsRecord(virPyCallbackSite *site,
+                         unsigned long long start,
+                         unsigned long long acquired);
+PyObject *virPyGILStatsGet(void);
+void virPyGILStatsReset(void);
+
+#define LIBVIRT_CALL_STATS_START(site, name)                        \
+    unsigned long long _callStart = 0;                              \
+    virPyCallSite *_callSite = virPyCallStatsEnabled ?              \
+        virPyCallStatsStart(site, name, &_callStart) : NULL;
+
+/* Like LIBVIRT_BEGIN_ALLOW_THREADS, for sections run on behalf of
+ * several APIs or calling another API than the function they are in,
+ * whose calls are accounted to @name instead */
+#define LIBVIRT_BEGIN_ALLOW_THREADS_AS(name)                        \
+  LIBVIRT_STMT_START {                                              \
+    LIBVIRT_CALL_STATS_START(NULL, name)                            \
+    LIBVIRT_SAVE_THREAD
+
+#define LIBVIRT_BEGIN_ALLOW_THREADS                                 \
+  LIBVIRT_STMT_START {                                              \
+    static virPyCallSite _callSiteStatic = { .name = __func__ };    \
+    LIBVIRT_CALL_STATS_START(&_callSiteStatic, NULL)                \
+    LIBVIRT_SAVE_THREAD
+
+#define LIBVIRT_END_ALLOW_THREADS                                   \
+    if (_callSite)                                                  \
+      virPyCallStatsStop(_callSite, _callStart, _save);             \
+    else                                                            \
+      LIBVIRT_RESTORE_THREAD;                                       \
+  } LIBVIRT_STMT_END
+
+#define LIBVIRT_ENSURE_THREAD_STATE                                 \
+  LIBVIRT_STMT_START {                                              \
+    static virPyCallbackSite _gilSite = { .name = __func__ };       \
+    unsigned long long _gilStart =                                  \
+        virPyGILStatsEnabled ? virPyStatsNow() : 0;                 \
+    unsigned long long _gilAcquired = 0;                            \
+    LIBVIRT_GIL_ENSURE                                              \
+    if (_gilStart)                                                  \
+      _gilAcquired = virPyStatsNow();
+
+#define LIBVIRT_RELEASE_THREAD_STATE                                \
+    if (_gilStart)                                                  \
+      virPyGILStatsRecord(&_gilSite, _gilStart, _gilAcquired);      \
+    LIBVIRT_GIL_RELEASE;                                            \
+  } LIBVIRT_STMT_END
+
 #if PY_MAJOR_VERSION == 3 && PY_MINOR_VERSION < 7
-# define LIBVIRT_BEGIN_ALLOW_THREADS			\
-  LIBVIRT_STMT_START {					\
+# define LIBVIRT_SAVE_THREAD				\
     PyThreadState *_save = NULL;			\
     if (PyEval_ThreadsInitialized())			\
       _save = PyEval_SaveThread();
 
-# define LIBVIRT_END_ALLOW_THREADS                           \
-  if (PyEval_ThreadsInitialized())			    \
-    PyEval_RestoreThread(_save);			    \
-    } LIBVIRT_STMT_END
+# define LIBVIRT_RESTORE_THREAD				\
+    if (PyEval_ThreadsInitialized())			\
+      PyEval_RestoreThread(_save)
 
-# define LIBVIRT_ENSURE_THREAD_STATE			\
-  LIBVIRT_STMT_START {					\
+# define LIBVIRT_GIL_ENSURE				\
     PyGILState_STATE _save = PyGILState_UNLOCKED;	\
     if (PyEval_ThreadsInitialized())			\
       _save = PyGILState_Ensure();
 
-# define LIBVIRT_RELEASE_THREAD_STATE                           \
-  if (PyEval_ThreadsInitialized())			       \
-    PyGILState_Release(_save);				       \
-  } LIBVIRT_STMT_END
+# define LIBVIRT_GIL_RELEASE				\
+    if (PyEval_ThreadsInitialized())			\
+      PyGILState_Release(_save)
 
 #else
 
-# define LIBVIRT_BEGIN_ALLOW_THREADS			\
-  LIBVIRT_STMT_START {					\
+# define LIBVIRT_SAVE_THREAD				\
     PyThreadState *_save = PyEval_SaveThread();
 
-# define LIBVIRT_END_ALLOW_THREADS                           \
-    PyEval_RestoreThread(_save);			    \
-  } LIBVIRT_STMT_END
+# define LIBVIRT_RESTORE_THREAD				\
+    PyEval_RestoreThread(_save)
 
-# define LIBVIRT_ENSURE_THREAD_STATE			\
-  LIBVIRT_STMT_START {					\
+# define LIBVIRT_GIL_ENSURE				\
     PyGILState_STATE _save = PyGILState_Ensure();
 
-# define LIBVIRT_RELEASE_THREAD_STATE                           \
-    PyGILState_Release(_save);				       \
-  } LIBVIRT_STMT_END
+# define LIBVIRT_GIL_RELEASE				\
+    PyGILState_Release(_save)
 #endif
 
 #ifndef NULLSTR